@@ -8,6 +8,7 @@ from argon2 import PasswordHasher
 from backend.config import get_config_from_env
 from backend.auth import jwt, refresh_token
 from backend.schemas import spec
+from backend.services.response_cache import response_cache
 from backend.routes.sources import bp as sources_bp
 from backend.routes.complaints import bp as complaints_bp
 from backend.routes.officers import bp as officers_bp
@@ -20,13 +21,14 @@ from backend.routes.healthcheck import bp as healthcheck_bp
 from backend.routes.users import bp as users_bp
 from backend.utils import dev_only
 from backend.importer.loop import Importer
-from neo4j import GraphDatabase
+from backend.database.pool import PoolMetrics, create_driver
+from backend.database.instrumentation import query_instrumentation
 from neomodel import db, install_all_labels, config as neo_config
 
 mail = Mail()
 
 
-def create_app(config: Optional[str] = None):
+def create_app(config: Optional[str] = None, start_importer: bool = True):
     """Create the API application."""
     app = Flask(__name__)
     config_obj = get_config_from_env(config or app.env)
@@ -42,7 +44,7 @@ def create_app(config: Optional[str] = None):
     #     db.create_all()
 
     # start background processor for SQS imports
-    if config_obj.SCRAPER_SQS_QUEUE_NAME:
+    if start_importer and config_obj.SCRAPER_SQS_QUEUE_NAME:
         importer = Importer(queue_name=config_obj.SCRAPER_SQS_QUEUE_NAME)
         importer.start()
 
@@ -52,30 +54,26 @@ def create_app(config: Optional[str] = None):
 
 def register_extensions(app: Flask):
     # Neo4j setup
-    # Driver setup
-    db_driver = GraphDatabase.driver(
-        f'bolt://{app.config["GRAPH_NM_URI"]}',
-        auth=(
-            app.config["GRAPH_USER"],
-            app.config["GRAPH_PASSWORD"]
-        ))
+    # One driver and pool, shared by neomodel and the raw sessions of
+    # backend.database.core.
+    db_driver = create_driver(app.config)
 
     try:
         db_driver.verify_connectivity()
         app.config['DB_DRIVER'] = db_driver
-        neo_config.DRIVER = app.config['DB_DRIVER']
+        app.config['DB_POOL_METRICS'] = PoolMetrics(
+            max_size=app.config['GRAPH_POOL_SIZE']).attach(db_driver)
         print("Connected to Neo4j")
     except Exception as e:
         print(f"Error connecting to Database: {e}")
         raise e
 
     # Neomodel setup
-    neo_url = "bolt://{user}:{pw}@{uri}".format(
-        user=app.config["GRAPH_USER"],
-        pw=app.config["GRAPH_PASSWORD"],
-        uri=app.config["GRAPH_NM_URI"]
-    )
-    neo_config.DATABASE_URL = neo_url
+    # `db` is thread local. With no DATABASE_URL, every thread connects
+    # through this driver instead of opening a pool of its own.
+    neo_config.DATABASE_URL = None
+    neo_config.DRIVER = db_driver
+    db.set_connection(driver=db_driver)
 
     spec.register(app)
 
@@ -84,6 +82,9 @@ def register_extensions(app: Flask):
     app.config['PASSWORD_HASHER'] = ph
     jwt.init_app(app)
 
+    response_cache.init_app(app)
+    query_instrumentation.init_app(app)
+
     Mail(app)
     CORS(app, resources={r"/api/*": {"origins": "*"}})
 
@@ -180,45 +181,163 @@ def register_commands(app: Flask):
         index_db()
 
     @app.cli.command("refresh-location-cache")
-    def refresh_location_cache():
+    @click.option(
+        "--incremental",
+        is_flag=True,
+        help="Only recompute what changed since the last refresh.",
+    )
+    @click.option(
+        "--workers",
+        default=1,
+        show_default=True,
+        help="Number of uid shards to refresh concurrently.",
+    )
+    def refresh_location_cache(incremental: bool, workers: int):
         """Refresh cached city richness fields."""
         from backend.services.location_cache_service import (
             LocationCacheService,
         )
 
-        result = LocationCacheService().refresh_location_richness_cache()
+        result = LocationCacheService().refresh_location_richness_cache(
+            incremental=incremental, workers=workers)
         click.echo(result)
 
     @app.cli.command("refresh-agency-cache")
-    def refresh_agency_cache():
+    @click.option(
+        "--incremental",
+        is_flag=True,
+        help="Only recompute what changed since the last refresh.",
+    )
+    @click.option(
+        "--in-database",
+        is_flag=True,
+        help="Compute and write the metrics inside Neo4j.",
+    )
+    @click.option(
+        "--workers",
+        default=1,
+        show_default=True,
+        help="Number of uid shards to refresh concurrently.",
+    )
+    def refresh_agency_cache(
+        incremental: bool,
+        in_database: bool,
+        workers: int,
+    ):
         """Refresh cached agency metric fields."""
         from backend.services.agency_cache_service import (
             AgencyCacheService,
         )
+        from backend.services.sharded_refresh import run_sharded
 
-        result = AgencyCacheService().refresh_agency_metrics_cache()
+        service = AgencyCacheService()
+        refresh = (
+            service.refresh_agency_metrics_cache_in_database if in_database
+            else service.refresh_agency_metrics_cache
+        )
+        result = run_sharded(
+            refresh, workers,
+            last_refresh=service.queries.fetch_last_refresh,
+            incremental=incremental)
         click.echo(result)
 
     @app.cli.command("refresh-unit-cache")
-    def refresh_unit_cache():
+    @click.option(
+        "--incremental",
+        is_flag=True,
+        help="Only recompute what changed since the last refresh.",
+    )
+    @click.option(
+        "--in-database",
+        is_flag=True,
+        help="Compute and write the metrics inside Neo4j.",
+    )
+    @click.option(
+        "--workers",
+        default=1,
+        show_default=True,
+        help="Number of uid shards to refresh concurrently.",
+    )
+    def refresh_unit_cache(
+        incremental: bool,
+        in_database: bool,
+        workers: int,
+    ):
         """Refresh cached unit metric fields."""
         from backend.services.unit_cache_service import (
             UnitCacheService,
         )
+        from backend.services.sharded_refresh import run_sharded
 
-        result = UnitCacheService().refresh_unit_metrics_cache()
+        service = UnitCacheService()
+        refresh = (
+            service.refresh_unit_metrics_cache_in_database if in_database
+            else service.refresh_unit_metrics_cache
+        )
+        result = run_sharded(
+            refresh, workers,
+            last_refresh=service.queries.fetch_last_refresh,
+            incremental=incremental)
         click.echo(result)
 
     @app.cli.command("refresh-officer-cache")
-    def refresh_officer_cache():
+    @click.option(
+        "--incremental",
+        is_flag=True,
+        help="Only recompute what changed since the last refresh.",
+    )
+    @click.option(
+        "--in-database",
+        is_flag=True,
+        help="Compute and write the metrics inside Neo4j.",
+    )
+    @click.option(
+        "--workers",
+        default=1,
+        show_default=True,
+        help="Number of uid shards to refresh concurrently.",
+    )
+    def refresh_officer_cache(
+        incremental: bool,
+        in_database: bool,
+        workers: int,
+    ):
         """Refresh cached officer metric fields."""
         from backend.services.officer_cache_service import (
             OfficerCacheService,
         )
+        from backend.services.sharded_refresh import run_sharded
 
-        result = OfficerCacheService().refresh_officer_metrics_cache()
+        service = OfficerCacheService()
+        refresh = (
+            service.refresh_officer_metrics_cache_in_database if in_database
+            else service.refresh_officer_metrics_cache
+        )
+        result = run_sharded(
+            refresh, workers,
+            last_refresh=service.queries.fetch_last_refresh,
+            incremental=incremental)
         click.echo(result)
 
+    @app.cli.command("refresh-metrics-cache")
+    def refresh_metrics_cache():
+        """Refresh every cached metric from a single officer pass."""
+        from backend.services.metrics_refresh_service import (
+            MetricsRefreshService,
+        )
+
+        result = MetricsRefreshService().refresh_all_metrics_cache()
+        click.echo(result)
+
+    @app.cli.command("cache-freshness")
+    def cache_freshness():
+        """Report how recently each label's cached metrics were refreshed."""
+        from backend.services.cache_freshness_service import (
+            CacheFreshnessService,
+        )
+
+        click.echo(CacheFreshnessService().freshness_report())
+
 
 def register_routes(app: Flask):
     app.register_blueprint(sources_bp)
@@ -0,0 +1,3 @@
+from .read_only import create_read_app
+
+app = create_read_app()
@@ -20,6 +20,23 @@ class Config(object):
     GRAPH_NM_URI = os.environ.get("GRAPH_NM_URI", "localhost:7687")
     GRAPH_PASSWORD = os.environ.get("GRAPH_PASSWORD", "password")
     GRAPH_DB = os.environ.get("GRAPH_DB", "police_data")
+    # Connection pool of the Neo4j driver shared by every thread of a
+    # worker. Timeout and lifetime are in seconds; size the pool to at
+    # least the number of requests a worker serves at once.
+    GRAPH_POOL_SIZE = int(os.environ.get("GRAPH_POOL_SIZE", 100))
+    GRAPH_POOL_ACQUISITION_TIMEOUT = float(
+        os.environ.get("GRAPH_POOL_ACQUISITION_TIMEOUT", 60))
+    GRAPH_POOL_MAX_LIFETIME = float(
+        os.environ.get("GRAPH_POOL_MAX_LIFETIME", 3600))
+    GRAPH_POOL_KEEP_ALIVE = os.environ.get(
+        "GRAPH_POOL_KEEP_ALIVE", "true").lower() == "true"
+    # Threads the read only ASGI app runs requests on. See
+    # backend.read_only; GRAPH_POOL_SIZE should be at least this.
+    ASGI_READ_THREADS = int(os.environ.get("ASGI_READ_THREADS", 32))
+    # Connect to GRAPH_NM_URI as a cluster and serve the read only query
+    # helpers from its read replicas. See backend.database.routing.
+    GRAPH_ROUTING = os.environ.get(
+        "GRAPH_ROUTING", "false").lower() == "true"
 
     # Flask-Mail SMTP server settings
     """
@@ -68,6 +85,45 @@ class Config(object):
 
     SCRAPER_SQS_QUEUE_NAME = os.environ.get("SCRAPER_SQS_QUEUE_NAME")
 
+    # Response cache for profile, location and search reads. It is on when
+    # RESPONSE_CACHE_URL (e.g. redis://redis:6379/1) shares it between
+    # workers. RESPONSE_CACHE_ENABLED=true without it keeps one LRU per
+    # process: invalidations then only reach the process that made the
+    # change, and other workers serve stale entries until their TTL.
+    RESPONSE_CACHE_URL = os.environ.get("RESPONSE_CACHE_URL")
+    RESPONSE_CACHE_ENABLED = os.environ.get(
+        "RESPONSE_CACHE_ENABLED",
+        "true" if RESPONSE_CACHE_URL else "false",
+    ).lower() == "true"
+    RESPONSE_CACHE_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", 2048))
+    # Per-endpoint TTL overrides in seconds, e.g. {"officer.profile": 60}
+    RESPONSE_CACHE_TTLS = {}
+
+    # How search computes totalMatches: "exact", "capped" or "cached". See
+    # backend.queries.search.CountStrategy.
+    SEARCH_COUNT_STRATEGY = os.environ.get("SEARCH_COUNT_STRATEGY", "exact")
+
+    # Profiles compute unit and agency counts live when their cached
+    # metrics are older than this many seconds. Unset always reads the
+    # cache.
+    METRICS_MAX_AGE = (
+        int(os.environ["METRICS_MAX_AGE"])
+        if os.environ.get("METRICS_MAX_AGE") else None
+    )
+
+    # Cypher instrumentation, see backend.database.instrumentation. Set
+    # SLOW_QUERY_MS or REPEATED_QUERY_LIMIT to "" to turn off its warning.
+    SLOW_QUERY_MS = (
+        float(os.environ.get("SLOW_QUERY_MS", 500))
+        if os.environ.get("SLOW_QUERY_MS") != "" else None
+    )
+    REPEATED_QUERY_LIMIT = (
+        int(os.environ.get("REPEATED_QUERY_LIMIT", 25))
+        if os.environ.get("REPEATED_QUERY_LIMIT") != "" else None
+    )
+    SERVER_TIMING = os.environ.get(
+        "SERVER_TIMING", "false").lower() == "true"
+
     @property
     def NEO4J_BOLT_URI(self):
         return "bolt://{user}:{pw}@{uri}".format(
@@ -110,6 +166,7 @@ class TestingConfig(Config):
     SECRET_KEY = "my-secret-key"
     JWT_SECRET_KEY = "my-jwt-secret-key"
     MIXPANEL_TOKEN = "mixpanel-token"
+    RESPONSE_CACHE_ENABLED = False
 
 
 def get_config_from_env(env: str) -> Config:
@@ -5,6 +5,7 @@ Do not import anything directly from `backend.database._core`. Instead, import
 from `backend.database`.
 """
 import os
+import time
 from typing import Optional
 
 import click
@@ -16,6 +17,7 @@ from neo4j import Driver
 from typing import List, Dict, Any
 
 from ..utils import dev_only
+from .instrumentation import query_instrumentation
 
 
 QUERIES_DIR = os.path.abspath(
@@ -38,9 +40,12 @@ def execute_query(filename: str) -> Optional[List[Dict[str, Any]]]:
     neo4j_conn = current_app.config['DB_DRIVER']
 
     # Execute the query using the existing connection
+    started = time.perf_counter()
     with neo4j_conn.session() as session:
         result = session.run(query)
         records = list(result)
+        query_instrumentation.record(
+            query, time.perf_counter() - started, len(records))
 
         if records:
             # Convert Neo4j records to a list of dictionaries
@@ -0,0 +1,144 @@
+"""
+Per-request Cypher instrumentation. Every query run through neomodel's
+`db.cypher_query`, or through the raw sessions of backend.database.core,
+is timed and counted against the current request under its shape id: its
+name in the query catalogue, or a hash of its text for the queries
+neomodel builds itself.
+"""
+import hashlib
+import logging
+import time
+from collections import Counter
+from functools import lru_cache, wraps
+
+from flask import Flask, g, has_request_context, request
+from neomodel.sync_.core import Database
+
+from backend.queries.templates import query_templates
+
+
+@lru_cache(maxsize=4096)
+def _hashed_shape(cypher: str) -> str:
+    text = " ".join(cypher.split())
+    return "cypher:" + hashlib.sha1(text.encode()).hexdigest()[:10]
+
+
+def query_shape_id(cypher: str) -> str:
+    return query_templates.name_of(cypher) or _hashed_shape(cypher)
+
+
+class QueryStats:
+    """The queries run while serving one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.rows = 0
+        self.shapes: Counter = Counter()
+
+    def record(self, shape: str, seconds: float, rows: int) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.rows += rows
+        self.shapes[shape] += 1
+
+    def summary(self) -> dict:
+        return {
+            "queries": self.count,
+            "db_ms": round(self.seconds * 1000, 1),
+            "rows": self.rows,
+            "shapes": dict(self.shapes.most_common()),
+        }
+
+
+class QueryInstrumentation:
+    """
+    Logs queries slower than SLOW_QUERY_MS, and requests that run one
+    shape more than REPEATED_QUERY_LIMIT times, the mark of an N+1. With
+    SERVER_TIMING on, responses report their database time in a
+    Server-Timing header.
+    """
+
+    def __init__(
+        self,
+        slow_query_ms: float | None = None,
+        repeated_query_limit: int | None = None,
+        server_timing: bool = False,
+    ):
+        self.slow_query_ms = slow_query_ms
+        self.repeated_query_limit = repeated_query_limit
+        self.server_timing = server_timing
+
+    def init_app(self, app: Flask) -> None:
+        self.slow_query_ms = app.config.get("SLOW_QUERY_MS")
+        self.repeated_query_limit = app.config.get("REPEATED_QUERY_LIMIT")
+        self.server_timing = app.config.get("SERVER_TIMING", False)
+        _instrument_cypher_query()
+        app.before_request(self._begin_request)
+        app.after_request(self._end_request)
+
+    def record(self, cypher: str, seconds: float, rows: int) -> None:
+        shape = query_shape_id(cypher)
+        if has_request_context() and "query_stats" in g:
+            g.query_stats.record(shape, seconds, rows)
+        if (
+            self.slow_query_ms is not None
+            and seconds * 1000 >= self.slow_query_ms
+        ):
+            logging.warning(
+                "Slow Cypher query %s: %.1f ms, %d rows",
+                shape, seconds * 1000, rows,
+            )
+
+    def _begin_request(self) -> None:
+        g.query_stats = QueryStats()
+
+    def _end_request(self, response):
+        stats = g.pop("query_stats", None)
+        if stats is None:
+            return response
+
+        logging.debug(
+            "%s %s ran Cypher: %s", request.method, request.path,
+            stats.summary(),
+        )
+        if self.repeated_query_limit is not None and stats.shapes:
+            shape, times = stats.shapes.most_common(1)[0]
+            if times > self.repeated_query_limit:
+                logging.warning(
+                    "%s %s ran Cypher query %s %d times",
+                    request.method, request.path, shape, times,
+                )
+        if self.server_timing:
+            response.headers.add(
+                "Server-Timing",
+                f'db;dur={stats.seconds * 1000:.1f};'
+                f'desc="{stats.count} queries, {stats.rows} rows"',
+            )
+        return response
+
+
+query_instrumentation = QueryInstrumentation()
+
+
+def _instrument_cypher_query() -> None:
+    # `db` is thread local, so the method is wrapped on its class for the
+    # queries of every thread.
+    cypher_query = Database.cypher_query
+    if getattr(cypher_query, "instrumented", False):
+        return
+
+    @wraps(cypher_query)
+    def timed_cypher_query(self, query, *args, **kwargs):
+        started = time.perf_counter()
+        rows = 0
+        try:
+            results, meta = cypher_query(self, query, *args, **kwargs)
+            rows = len(results)
+            return results, meta
+        finally:
+            query_instrumentation.record(
+                query, time.perf_counter() - started, rows)
+
+    timed_cypher_query.instrumented = True
+    Database.cypher_query = timed_cypher_query
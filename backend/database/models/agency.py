@@ -1,11 +1,15 @@
 from backend.schemas import (JsonSerializable, PropertyEnum, RelQuery,
-                             SearchableMixin)
+                             SearchableMixin, RANKED_KEYSET_FILTER,
+                             keyset_params)
 from backend.database.models.types.enums import State
 from backend.database.models.source import HasCitations
 from backend.database.properties.datetime import DateNeo4jFormatProperty
+from backend.queries.templates import (
+    projected_row, projection_return, query_templates)
 
 from neomodel import (
     db,
+    ArrayProperty,
     StructuredNode,
     DateTimeNeo4jFormatProperty,
     IntegerProperty,
@@ -50,6 +54,11 @@ class Unit(StructuredNode, HasCitations, JsonSerializable, SearchableMixin):
         "citations", "city_node",
         "officer_count_cached", "complaint_count_cached",
         "allegation_count_cached", "metrics_updated_at",
+        "metrics_changed_at",
+        "allegation_types_cached", "allegation_occurrences_cached",
+        "allegation_substantiated_cached", "allegation_earliest_cached",
+        "allegation_latest_cached", "allegation_summary_updated_at",
+        "reported_officer_uids_cached", "ranking_updated_at",
     ]
 
     uid = UniqueIdProperty()
@@ -66,7 +75,19 @@ class Unit(StructuredNode, HasCitations, JsonSerializable, SearchableMixin):
     officer_count_cached = IntegerProperty(default=0, index=True)
     complaint_count_cached = IntegerProperty(default=0, index=True)
     allegation_count_cached = IntegerProperty(default=0, index=True)
-    metrics_updated_at = DateTimeNeo4jFormatProperty()
+    metrics_updated_at = DateTimeNeo4jFormatProperty(index=True)
+    metrics_changed_at = DateTimeNeo4jFormatProperty(index=True)
+    # Per-type allegation summary, one list per field; see
+    # backend.queries.allegation_summary.
+    allegation_types_cached = ArrayProperty(StringProperty())
+    allegation_occurrences_cached = ArrayProperty(IntegerProperty())
+    allegation_substantiated_cached = ArrayProperty(IntegerProperty())
+    allegation_earliest_cached = ArrayProperty(StringProperty())
+    allegation_latest_cached = ArrayProperty(StringProperty())
+    allegation_summary_updated_at = DateTimeNeo4jFormatProperty()
+    # Uids of the most reported officers, most reported first.
+    reported_officer_uids_cached = ArrayProperty(StringProperty())
+    ranking_updated_at = DateTimeNeo4jFormatProperty()
 
     # Relationships
     agency = RelationshipTo("Agency", "ESTABLISHED_BY", cardinality=One)
@@ -123,7 +144,8 @@ class Unit(StructuredNode, HasCitations, JsonSerializable, SearchableMixin):
     @classmethod
     def search(cls, query: str = None, filters: dict = None,
                count: bool = False, skip: int = 0, limit: int = 25,
-               inflate: bool = False):
+               inflate: bool = False, after: list | None = None,
+               with_score: bool = False, fields: list[str] | None = None):
         """
         Model-specific search method.
         Decides which fulltext index to use and delegates to the mixin.
@@ -132,7 +154,7 @@ class Unit(StructuredNode, HasCitations, JsonSerializable, SearchableMixin):
         if query:
             fulltext_index_cypher = (
                 """CALL db.index.fulltext.queryNodes('unitNames', $query)
-                YIELD node as n"""
+                YIELD node AS n, score"""
             )
             params = {"query": query}
         else:
@@ -148,7 +170,10 @@ class Unit(StructuredNode, HasCitations, JsonSerializable, SearchableMixin):
             skip=skip,
             limit=limit,
             extra_params=params,  # pass parameter dict to _search()
-            inflate=inflate
+            inflate=inflate,
+            after=after,
+            with_score=with_score,
+            fields=fields,
         )
 
 
@@ -163,7 +188,11 @@ class Agency(StructuredNode, HasCitations, JsonSerializable, SearchableMixin):
         "citations", "state_node", "county_node", "city_node",
         "unit_count_cached", "officer_count_cached",
         "complaint_count_cached", "allegation_count_cached",
-        "metrics_updated_at",
+        "metrics_updated_at", "metrics_changed_at",
+        "allegation_types_cached", "allegation_occurrences_cached",
+        "allegation_substantiated_cached", "allegation_earliest_cached",
+        "allegation_latest_cached", "allegation_summary_updated_at",
+        "reported_unit_uids_cached", "ranking_updated_at",
     ]
     __virtual_relationships__ = ["units"]
 
@@ -183,7 +212,19 @@ class Agency(StructuredNode, HasCitations, JsonSerializable, SearchableMixin):
     officer_count_cached = IntegerProperty(default=0, index=True)
     complaint_count_cached = IntegerProperty(default=0, index=True)
     allegation_count_cached = IntegerProperty(default=0, index=True)
-    metrics_updated_at = DateTimeNeo4jFormatProperty()
+    metrics_updated_at = DateTimeNeo4jFormatProperty(index=True)
+    metrics_changed_at = DateTimeNeo4jFormatProperty(index=True)
+    # Per-type allegation summary, one list per field; see
+    # backend.queries.allegation_summary.
+    allegation_types_cached = ArrayProperty(StringProperty())
+    allegation_occurrences_cached = ArrayProperty(IntegerProperty())
+    allegation_substantiated_cached = ArrayProperty(IntegerProperty())
+    allegation_earliest_cached = ArrayProperty(StringProperty())
+    allegation_latest_cached = ArrayProperty(StringProperty())
+    allegation_summary_updated_at = DateTimeNeo4jFormatProperty()
+    # Uids of the most reported units, most reported first.
+    reported_unit_uids_cached = ArrayProperty(StringProperty())
+    ranking_updated_at = DateTimeNeo4jFormatProperty()
 
     # Relationships
     city_node = RelationshipTo(
@@ -255,79 +296,54 @@ class Agency(StructuredNode, HasCitations, JsonSerializable, SearchableMixin):
         source_uids: list[str] | None = None,
         count: bool = False,
         skip: int = 0,
-        limit: int = 25
+        limit: int = 25,
+        after: list | None = None,
+        with_score: bool = False,
+        fields: list[str] | None = None,
     ):
         """
         Model-specific search for Agency.
         Decides which fulltext index to use and delegates to the
-        shared _search() in the mixin.
+        shared _search() in the mixin. With `fields`, rows are dicts of
+        only those properties rather than nodes.
         """
 
         filters = filters or {}
+        ranked = bool(query)
         params = {
             **filters,
             "city_uids": city_uids or [],
             "source_uids": source_uids or [],
+            **keyset_params(after, ranked),
         }
-        cypher_parts = []
-
         if query:
-            cypher_parts.append("""
-            CALL db.index.fulltext.queryNodes('agencyNames', $query)
-            YIELD node, score
-            WITH DISTINCT node AS n, score
-            """)
             params["query"] = query
+
+        if count:
+            mode = "count"
+        elif not ranked and after is not None:
+            mode = "after"
         else:
-            cypher_parts.append("""
-            MATCH (n:Agency)
-            WITH DISTINCT n, 0 AS score
-            """)
-
-        where_clauses = []
-        for key, value in filters.items():
-            if isinstance(value, list):
-                where_clauses.append(f"n.{key} IN ${key}")
-            else:
-                where_clauses.append(f"n.{key} = ${key}")
-        where_clauses.append("""
-        (
-            size($city_uids) = 0 OR EXISTS {
-                MATCH (n)-[:LOCATED_IN]->(city:CityNode)
-                WHERE city.uid IN $city_uids
-            }
-        )
-        """)
-        where_clauses.append("""
-        (
-            size($source_uids) = 0
-            OR EXISTS {
-                MATCH (n)<-[:CHANGE_TO]-(:Change)-[:ATTRIBUTED_TO]->
-                (source:Source)
-                WHERE source.uid IN $source_uids
-            }
-            OR EXISTS {
-                MATCH (n)-[:UPDATED_BY]->(source:Source)
-                WHERE source.uid IN $source_uids
-            }
+            mode = "page"
+        filter_shape = tuple(
+            (key, isinstance(value, list))
+            for key, value in sorted(filters.items())
         )
-        """)
-        cypher_parts.append("WHERE " + " AND ".join(where_clauses))
-        cypher_parts.append("WITH n, max(score) AS score")
+        projected = bool(fields) and not count
+        cypher = _agency_search_cypher(ranked, filter_shape, mode, projected)
 
         if count:
-            cypher_parts.append("RETURN count(n) AS count")
-            rows, _ = db.cypher_query("\n".join(cypher_parts), params)
+            rows, _ = db.cypher_query(cypher, params)
             return rows[0][0] if rows else 0
 
-        cypher_parts.append("""
-        RETURN n
-        ORDER BY score DESC, n.uid ASC
-        SKIP $skip
-        LIMIT $limit
-        """)
         params.update({"skip": skip, "limit": limit})
-        rows, _ = db.cypher_query("\n".join(cypher_parts), params)
+        if projected:
+            params["fields"] = fields
+        rows, _ = db.cypher_query(cypher, params)
+        if projected:
+            rows = [[projected_row(fields, row[0]), row[1]] for row in rows]
+        if with_score:
+            return [(row[0], row[1]) for row in rows]
         return [row[0] for row in rows]
 
     @classmethod
@@ -343,3 +359,82 @@ class Agency(StructuredNode, HasCitations, JsonSerializable, SearchableMixin):
         watchlist = ["police", "department", "sheriff", "office", "of", "the"]
 
         return cls._preprocess_query(query, watchlist)
+
+
+@query_templates.shape("agency.search")
+def _agency_search_cypher(
+    ranked: bool,
+    filter_shape: tuple[tuple[str, bool], ...],
+    mode: str,
+    projected: bool,
+) -> str:
+    """
+    Build the `Agency.search` query for one shape: fulltext or not, the
+    filtered property names (and whether each is a list), whether it
+    counts, pages, or resumes after a cursor, and whether it returns
+    nodes or only the `$fields` properties.
+    """
+    cypher_parts = []
+
+    if ranked:
+        cypher_parts.append("""
+        CALL db.index.fulltext.queryNodes('agencyNames', $query)
+        YIELD node, score
+        WITH DISTINCT node AS n, score
+        """)
+    else:
+        cypher_parts.append("MATCH (n:Agency)")
+
+    where_clauses = []
+    for key, is_list in filter_shape:
+        if is_list:
+            where_clauses.append(f"n.{key} IN ${key}")
+        else:
+            where_clauses.append(f"n.{key} = ${key}")
+    where_clauses.append("""
+    (
+        size($city_uids) = 0 OR EXISTS {
+            MATCH (n)-[:LOCATED_IN]->(city:CityNode)
+            WHERE city.uid IN $city_uids
+        }
+    )
+    """)
+    where_clauses.append("""
+    (
+        size($source_uids) = 0
+        OR EXISTS {
+            MATCH (n)<-[:CHANGE_TO]-(:Change)-[:ATTRIBUTED_TO]->
+            (source:Source)
+            WHERE source.uid IN $source_uids
+        }
+        OR EXISTS {
+            MATCH (n)-[:UPDATED_BY]->(source:Source)
+            WHERE source.uid IN $source_uids
+        }
+    )
+    """)
+    if mode == "after":
+        where_clauses.append("n.uid > $after_uid")
+    cypher_parts.append("WHERE " + " AND ".join(where_clauses))
+
+    if mode == "count":
+        cypher_parts.append("RETURN count(DISTINCT n) AS count")
+    elif ranked:
+        cypher_parts.append("WITH n, max(score) AS score")
+        cypher_parts.append("WHERE " + RANKED_KEYSET_FILTER.format(var="n"))
+        cypher_parts.append(f"""
+        RETURN {projection_return("n", projected)}, score
+        ORDER BY score DESC, n.uid ASC
+        SKIP $skip
+        LIMIT $limit
+        """)
+    else:
+        # Unranked listings follow the uid index, so resuming after a
+        # cursor is a range seek rather than a skip over earlier pages.
+        cypher_parts.append(f"""
+        RETURN {projection_return("n", projected)}, 0.0 AS score
+        ORDER BY n.uid ASC
+        SKIP $skip
+        LIMIT $limit
+        """)
+    return "\n".join(cypher_parts)
@@ -102,7 +102,7 @@ class CountyNode(Place):
     officer_count_cached = IntegerProperty(default=0, index=True)
     complaint_count_cached = IntegerProperty(default=0, index=True)
     richness_score_cached = FloatProperty(default=0.0, index=True)
-    richness_updated_at = DateTimeNeo4jFormatProperty()
+    richness_updated_at = DateTimeNeo4jFormatProperty(index=True)
 
     # Relationships
     state = RelationshipTo("StateNode", "WITHIN_STATE", cardinality=One)
@@ -118,7 +118,9 @@ class CityNode(Place):
     officer_count_cached = IntegerProperty(default=0, index=True)
     complaint_count_cached = IntegerProperty(default=0, index=True)
     richness_score_cached = FloatProperty(default=0.0, index=True)
-    richness_updated_at = DateTimeNeo4jFormatProperty()
+    richness_updated_at = DateTimeNeo4jFormatProperty(index=True)
+    # Stamped by the complaint deltas; read by incremental refreshes.
+    metrics_changed_at = DateTimeNeo4jFormatProperty(index=True)
 
     # Relationships
     county = RelationshipTo("CountyNode", "WITHIN_COUNTY", cardinality=One)
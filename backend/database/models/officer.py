@@ -1,14 +1,18 @@
 from datetime import date
-from backend.schemas import JsonSerializable, PropertyEnum, RelQuery
+from enum import IntEnum
+from backend.schemas import (JsonSerializable, PropertyEnum, RelQuery,
+                             RANKED_KEYSET_FILTER, keyset_params)
 from backend.database.models.types.enums import State, Ethnicity, Gender
 from backend.database.models.source import HasCitations
 from backend.database.models.agency import Unit
 from backend.database.models.employment import Employment
+from backend.queries.templates import (
+    projected_row, projection_return, query_templates)
 import logging
 
 from neomodel import (
     db, StructuredNode, Relationship,
-    StringProperty, IntegerProperty,
+    StringProperty, IntegerProperty, ArrayProperty,
     DateTimeNeo4jFormatProperty,
     UniqueIdProperty, One
 )
@@ -47,6 +51,11 @@ class Officer(StructuredNode, HasCitations, JsonSerializable):
         "allegation_count_cached",
         "substantiated_count_cached",
         "metrics_updated_at",
+        "metrics_changed_at",
+        "complaint_history_years_cached",
+        "complaint_history_counts_cached",
+        "complaint_history_closed_cached",
+        "complaint_history_updated_at",
     ]
     __virtual_relationships__ = ["state_ids"]
 
@@ -61,7 +70,14 @@ class Officer(StructuredNode, HasCitations, JsonSerializable):
     complaint_count_cached = IntegerProperty(default=0, index=True)
     allegation_count_cached = IntegerProperty(default=0, index=True)
     substantiated_count_cached = IntegerProperty(default=0, index=True)
-    metrics_updated_at = DateTimeNeo4jFormatProperty()
+    metrics_updated_at = DateTimeNeo4jFormatProperty(index=True)
+    metrics_changed_at = DateTimeNeo4jFormatProperty(index=True)
+    # Complaints per incident year, one list per field; see
+    # backend.queries.complaint_history.
+    complaint_history_years_cached = ArrayProperty(IntegerProperty())
+    complaint_history_counts_cached = ArrayProperty(IntegerProperty())
+    complaint_history_closed_cached = ArrayProperty(IntegerProperty())
+    complaint_history_updated_at = DateTimeNeo4jFormatProperty()
 
     def __repr__(self):
         return f"<Officer {self.uid}>"
@@ -198,7 +214,10 @@ class Officer(StructuredNode, HasCitations, JsonSerializable):
         skip: int = 0,
         limit: int = 25,
         count: bool = False,
-        inflate: bool = True
+        inflate: bool = True,
+        after: list | None = None,
+        with_score: bool = False,
+        fields: list[str] | None = None,
     ):
         """
         Search for officers based on filters.
@@ -206,6 +225,11 @@ class Officer(StructuredNode, HasCitations, JsonSerializable):
             filters (dict): A dictionary of filters to apply.
             skip (int): Number of records to skip for pagination.
             limit (int): Number of records to return.
+            after (list): Decoded cursor; results resume after this
+                sort key.
+            with_score (bool): Return `(officer, score)` pairs.
+            fields (list): Return only these properties, as dicts, instead
+                of officers.
             """
 
         # convert date strings to date objects
@@ -214,116 +238,168 @@ class Officer(StructuredNode, HasCitations, JsonSerializable):
         if isinstance(active_before, str):
             active_before = date.fromisoformat(active_before)  # YYYY-MM-DD
 
-        # Build MATCH clauses
-        match_clauses = []
-        requires_employment_path = bool(
-            unit
-            or active_after
-            or active_before
-            or badge_number
-            or agency
-            or agency_uid
-            or city_uids
-        )
-        requires_agency_path = bool(agency or agency_uid or city_uids)
-
+        # The query text depends only on which optional paths are needed;
+        # every filter value is passed as a parameter so Neo4j can reuse
+        # the cached plan for each shape.
         if name:
-            match_clauses.append(f"""
-                CALL db.index.fulltext.queryNodes('officerNames',
-                                '{name}') YIELD node AS o
-            """)
+            fulltext = "name"
         elif rank:
-            match_clauses.append(f"""
-                CALL db.index.fulltext.queryNodes('officerRanks',
-                                '{rank}') YIELD node AS e
-            """)
-
-        match_clauses.append("MATCH (o:Officer)")
-
-        if requires_employment_path:
-            match_clauses.append("MATCH (o)-[]-(e:Employment)-[]-(u:Unit)")
-
-        if requires_agency_path:
-            match_clauses.append("MATCH (u)-[:ESTABLISHED_BY]->(a:Agency)")
+            fulltext = "rank"
+        else:
+            fulltext = None
+        ranked = fulltext is not None
 
         if city_uids:
-            match_clauses.append("MATCH (a)-[:LOCATED_IN]->(city:CityNode)")
-
-        # Build WHERE clauses and params
-        where_clauses = ["TRUE"]
-        params = {}
-
-        if active_after:
-            where_clauses.append("e.latest_date > $active_after")
-            params["active_after"] = active_after
-
-        if active_before:
-            where_clauses.append("e.earliest_date < $active_before")
-            params["active_before"] = active_before
-
-        if agency:
-            where_clauses.append("ANY(n IN $agency WHERE a.name CONTAINS n)")
-            params["agency"] = agency
-
-        if agency_uid:
-            where_clauses.append("a.uid IN $agency_uid")
-            params["agency_uid"] = agency_uid
-
-        if badge_number:
-            where_clauses.append(
-                "ANY(n IN $badge_number WHERE e.badge_number CONTAINS n)")
-            params["badge_number"] = badge_number
-
-        if ethnicity:
-            where_clauses.append("o.ethnicity IN $ethnicity")
-            params["ethnicity"] = ethnicity
-
-        if unit:
-            where_clauses.append("ANY(n IN $unit WHERE u.name CONTAINS n)")
-            params["unit"] = unit
+            path = OfficerSearchPath.CITY
+        elif agency or agency_uid:
+            path = OfficerSearchPath.AGENCY
+        elif (unit or active_after or active_before or badge_number
+              or fulltext == "rank"):
+            path = OfficerSearchPath.EMPLOYMENT
+        else:
+            path = OfficerSearchPath.OFFICER
 
-        if city_uids:
-            where_clauses.append("city.uid IN $city_uids")
-            params["city_uids"] = city_uids
-
-        if source_uids:
-            where_clauses.append("""
-            (
-                EXISTS {
-                    MATCH (o)<-[:CHANGE_TO]-(:Change)-[:ATTRIBUTED_TO]->
-                    (source:Source)
-                    WHERE source.uid IN $source_uids
-                }
-                OR EXISTS {
-                    MATCH (o)-[:UPDATED_BY]->(source:Source)
-                    WHERE source.uid IN $source_uids
-                }
-            )
-            """)
-            params["source_uids"] = source_uids
-
-        # Combine query
-        match_str = "\n".join(match_clauses)
-        where_str = "\nAND ".join(where_clauses)
-        cypher_query = f"""
-        {match_str}
-        WHERE {where_str}"""
+        if count:
+            mode = "count"
+        elif not ranked and after is not None:
+            mode = "after"
+        else:
+            mode = "page"
+
+        params = {
+            "name": name,
+            "rank": rank,
+            "unit": unit or [],
+            "agency": agency or [],
+            "agency_uid": agency_uid or [],
+            "badge_number": badge_number or [],
+            "ethnicity": ethnicity or [],
+            "active_after": active_after,
+            "active_before": active_before,
+            "city_uids": city_uids or [],
+            "source_uids": source_uids or [],
+            "skip": skip,
+            "limit": limit,
+            "fields": fields or [],
+            **keyset_params(after, ranked),
+        }
+        projected = bool(fields) and not count
+        cypher_query = _officer_search_cypher(
+            fulltext, path, mode, projected)
+        logging.debug("Cypher query:\n%s", cypher_query)
+        logging.debug("Params: %s", params)
 
         if count:
-            cypher_query += "\nRETURN count(DISTINCT o) as c"
-            logging.debug("Cypher count query:\n%s", cypher_query)
-            logging.debug("Params: %s", params)
-            logging.debug("Query: %s", cypher_query)
             count_results, _ = db.cypher_query(cypher_query, params)
             return count_results[0][0] if count_results else 0
-        else:
-            cypher_query += f"""
-                RETURN DISTINCT o SKIP {skip} LIMIT {limit}
-            """
 
-            logging.debug("Cypher query:\n%s", cypher_query)
-            logging.debug("Params: %s", params)
+        rows, _ = db.cypher_query(cypher_query, params,
+                                  resolve_objects=inflate and not projected)
+        if projected:
+            rows = [[projected_row(fields, row[0]), row[1]] for row in rows]
+        if with_score:
+            return [(row[0], row[1]) for row in rows]
+        return [row[0] for row in rows]
+
+
+class OfficerSearchPath(IntEnum):
+    """How far `Officer.search` has to traverse from the officer. Each
+    level includes the ones before it."""
+    OFFICER = 0
+    EMPLOYMENT = 1
+    AGENCY = 2
+    CITY = 3
+
+
+@query_templates.shape("officer.search")
+def _officer_search_cypher(
+    fulltext: str | None,
+    path: OfficerSearchPath,
+    mode: str,
+    projected: bool,
+) -> str:
+    """
+    Build the `Officer.search` query for one shape. Filters that belong
+    to a traversed path are always present and pass when their parameter
+    is empty, so there is one query per (fulltext, path, mode, projected).
+    """
+    match_clauses = []
+    if fulltext == "name":
+        match_clauses.append("""
+            CALL db.index.fulltext.queryNodes('officerNames', $name)
+            YIELD node AS o, score
+        """)
+    elif fulltext == "rank":
+        match_clauses.append("""
+            CALL db.index.fulltext.queryNodes('officerRanks', $rank)
+            YIELD node AS e, score
+        """)
+
+    match_clauses.append("MATCH (o:Officer)")
+
+    where_clauses = [
+        "(size($ethnicity) = 0 OR o.ethnicity IN $ethnicity)",
+        """
+        (
+            size($source_uids) = 0
+            OR EXISTS {
+                MATCH (o)<-[:CHANGE_TO]-(:Change)-[:ATTRIBUTED_TO]->
+                (source:Source)
+                WHERE source.uid IN $source_uids
+            }
+            OR EXISTS {
+                MATCH (o)-[:UPDATED_BY]->(source:Source)
+                WHERE source.uid IN $source_uids
+            }
+        )
+        """,
+    ]
 
-            rows, _ = db.cypher_query(cypher_query, params,
-                                      resolve_objects=inflate)
-            return [row[0] for row in rows]
+    if path >= OfficerSearchPath.EMPLOYMENT:
+        match_clauses.append("MATCH (o)-[]-(e:Employment)-[]-(u:Unit)")
+        where_clauses.extend([
+            "($active_after IS NULL OR e.latest_date > $active_after)",
+            "($active_before IS NULL OR e.earliest_date < $active_before)",
+            "(size($badge_number) = 0"
+            " OR ANY(n IN $badge_number WHERE e.badge_number CONTAINS n))",
+            "(size($unit) = 0 OR ANY(n IN $unit WHERE u.name CONTAINS n))",
+        ])
+
+    if path >= OfficerSearchPath.AGENCY:
+        match_clauses.append("MATCH (u)-[:ESTABLISHED_BY]->(a:Agency)")
+        where_clauses.extend([
+            "(size($agency) = 0 OR ANY(n IN $agency WHERE a.name CONTAINS n))",
+            "(size($agency_uid) = 0 OR a.uid IN $agency_uid)",
+        ])
+
+    if path >= OfficerSearchPath.CITY:
+        match_clauses.append("MATCH (a)-[:LOCATED_IN]->(city:CityNode)")
+        where_clauses.append("city.uid IN $city_uids")
+
+    if mode == "after":
+        where_clauses.append("o.uid > $after_uid")
+
+    match_str = "\n".join(match_clauses)
+    where_str = "\nAND ".join(where_clauses)
+    cypher_query = f"""
+    {match_str}
+    WHERE {where_str}"""
+
+    if mode == "count":
+        cypher_query += "\nRETURN count(DISTINCT o) as c"
+    elif fulltext:
+        cypher_query += f"""
+        WITH o, max(score) AS score
+        WHERE {RANKED_KEYSET_FILTER.format(var="o")}
+        RETURN {projection_return("o", projected)}, score
+        ORDER BY score DESC, o.uid ASC
+        SKIP $skip LIMIT $limit
+        """
+    else:
+        cypher_query += f"""
+        WITH DISTINCT o
+        RETURN {projection_return("o", projected)}, 0.0 AS score
+        ORDER BY o.uid ASC
+        SKIP $skip LIMIT $limit
+        """
+    return cypher_query
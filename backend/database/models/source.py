@@ -6,6 +6,9 @@ from collections import OrderedDict
 from backend.schemas import (
     JsonSerializable, PropertyEnum, NodeConflictException)
 from backend.database.models.contact import SocialMediaContact, EmailContact
+from backend.queries.changes import ChangeQueries
+from backend.queries.templates import query_templates
+from backend.services.response_cache import response_cache
 from datetime import datetime
 from slugify import slugify
 from neomodel import (
@@ -13,7 +16,7 @@ from neomodel import (
     RelationshipTo, RelationshipFrom,
     Relationship,
     StringProperty, DateTimeNeo4jFormatProperty,
-    UniqueIdProperty, BooleanProperty,
+    IntegerProperty, UniqueIdProperty, BooleanProperty,
     EmailProperty, One, ZeroOrOne, db
 )
 from neomodel.exceptions import DoesNotExist
@@ -131,6 +134,13 @@ class Citation(StructuredRel, JsonSerializable):
         return f"<Citation {self.timestamp}>"
 
 
+class LabelWatermark(StructuredNode):
+    """How many times the nodes of a label have changed, and when last."""
+    label = StringProperty(unique_index=True)
+    version = IntegerProperty(default=0)
+    changed_at = DateTimeNeo4jFormatProperty()
+
+
 class Change(StructuredNode, JsonSerializable):
     uid = UniqueIdProperty()
     timestamp = DateTimeNeo4jFormatProperty(
@@ -208,11 +218,15 @@ class HasCitations:
             if user is not None:
                 change.user.connect(user)
             self.changes.connect(change)
-            return change
         except Exception as e:
             logging.error(f"Error adding change: {e} to {self.uid}")
             raise e
 
+        labels = self.inherited_labels()
+        ChangeQueries().touch_labels(labels)
+        response_cache.invalidate_node(self.uid, labels)
+        return change
+
     def add_citation(
         self,
         source,
@@ -589,28 +603,14 @@ class Source(StructuredNode, JsonSerializable):
             Sources: A list of matching Source nodes.
             Count: Total count of matching nodes.
         """
-        match_statements = ["MATCH (s:Source)\n"]
-        where_clauses = []
         if name is not None:
-            where_clauses.append("""
-            WHERE toLower(s.name) CONTAINS toLower($name)
-            """)
+            filter_kind = "name"
         elif name__in is not None:
-            where_clauses.append("""
-            WHERE s.name IN $name__in
-            """)
-        count_query = f"""
-        {' '.join(match_statements)}
-        {' AND '.join(where_clauses) if where_clauses else ''}
-        RETURN count(s)
-        """
-        response_query = f"""
-        {' '.join(match_statements)}
-        {' AND '.join(where_clauses) if where_clauses else ''}
-        RETURN s
-        SKIP $skip
-        LIMIT $limit
-        """
+            filter_kind = "name__in"
+        else:
+            filter_kind = None
+        count_query = _source_filter_cypher(filter_kind, True)
+        response_query = _source_filter_cypher(filter_kind, False)
 
         params = {
             "name": name,
@@ -623,3 +623,25 @@ class Source(StructuredNode, JsonSerializable):
         return [
             row[0] for row in rows
             ], count_results[0][0] if count_results else 0
+
+
+@query_templates.shape("source.filter")
+def _source_filter_cypher(filter_kind: str | None, count: bool) -> str:
+    where_clause = {
+        "name": "WHERE toLower(s.name) CONTAINS toLower($name)",
+        "name__in": "WHERE s.name IN $name__in",
+        None: "",
+    }[filter_kind]
+    if count:
+        return f"""
+    MATCH (s:Source)
+    {where_clause}
+    RETURN count(s)
+    """
+    return f"""
+    MATCH (s:Source)
+    {where_clause}
+    RETURN s
+    SKIP $skip
+    LIMIT $limit
+    """
@@ -0,0 +1,120 @@
+"""
+The Neo4j driver shared by neomodel and the raw sessions of the app,
+with its connection pool sized from Config, and the metrics used to size
+that pool for the number of workers and threads.
+"""
+import logging
+import threading
+import time
+
+from neo4j import Driver, GraphDatabase
+
+
+def create_driver(config) -> Driver:
+    """
+    A driver for GRAPH_NM_URI with the GRAPH_POOL_* settings, routing
+    across the cluster when GRAPH_ROUTING is on.
+    """
+    scheme = "neo4j" if config.get("GRAPH_ROUTING") else "bolt"
+    return GraphDatabase.driver(
+        f'{scheme}://{config["GRAPH_NM_URI"]}',
+        auth=(config["GRAPH_USER"], config["GRAPH_PASSWORD"]),
+        max_connection_pool_size=config["GRAPH_POOL_SIZE"],
+        connection_acquisition_timeout=config[
+            "GRAPH_POOL_ACQUISITION_TIMEOUT"],
+        max_connection_lifetime=config["GRAPH_POOL_MAX_LIFETIME"],
+        keep_alive=config["GRAPH_POOL_KEEP_ALIVE"],
+    )
+
+
+class PoolMetrics:
+    """
+    Counts and times the connection acquisitions of a driver, and reports
+    how many of its pooled connections are in use.
+
+    The driver has no public API for either, so `attach` wraps the
+    `acquire` of its private pool, which every session goes through, and
+    `snapshot` reads the pool's connections. Both check for what they
+    use, so a driver release that changes its internals only turns the
+    affected figures into None rather than breaking the app.
+    """
+
+    def __init__(self, max_size: int | None = None):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._pool = None
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.acquisitions = 0
+            self.failures = 0
+            self.wait_seconds = 0.0
+            self.max_wait_seconds = 0.0
+
+    def attach(self, driver: Driver) -> "PoolMetrics":
+        pool = getattr(driver, "_pool", None)
+        acquire = getattr(pool, "acquire", None)
+        if not callable(acquire):
+            logging.warning(
+                "Neo4j driver has no pool to instrument; "
+                "pool metrics are unavailable")
+            return self
+
+        def timed_acquire(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                connection = acquire(*args, **kwargs)
+            except Exception:
+                self._record(time.perf_counter() - started, failed=True)
+                raise
+            self._record(time.perf_counter() - started)
+            return connection
+
+        pool.acquire = timed_acquire
+        self._pool = pool
+        return self
+
+    def _record(self, waited: float, failed: bool = False) -> None:
+        with self._lock:
+            self.acquisitions += 1
+            self.failures += failed
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def _usage(self) -> tuple[int | None, int | None]:
+        """Connections in use and idle, or None when they cannot be read."""
+        try:
+            in_use = idle = 0
+            for address, connections in list(self._pool.connections.items()):
+                busy = self._pool.in_use_connection_count(address)
+                in_use += busy
+                idle += len(connections) - busy
+            return in_use, idle
+        except (AttributeError, TypeError):
+            return None, None
+
+    def snapshot(self) -> dict:
+        """The pool's current usage and the acquisition waits so far."""
+        in_use, idle = (
+            self._usage() if self._pool is not None else (None, None))
+
+        with self._lock:
+            acquisitions = self.acquisitions
+            return {
+                "max_size": self.max_size,
+                "in_use": in_use,
+                "idle": idle,
+                "utilization": (
+                    round(in_use / self.max_size, 3)
+                    if in_use is not None and self.max_size else None
+                ),
+                "acquisitions": acquisitions,
+                "acquisition_failures": self.failures,
+                "wait_ms_total": round(self.wait_seconds * 1000, 3),
+                "wait_ms_avg": (
+                    round(self.wait_seconds * 1000 / acquisitions, 3)
+                    if acquisitions else 0.0
+                ),
+                "wait_ms_max": round(self.max_wait_seconds * 1000, 3),
+            }
@@ -0,0 +1,40 @@
+"""
+Read routing. With GRAPH_ROUTING on, the driver connects with the
+`neo4j://` scheme, and the query helpers marked `read_only` run in a READ
+transaction, which a cluster serves from its followers or read replicas.
+Everything else, from the `from_dict` writes to the metrics refresh,
+keeps the default WRITE access mode and goes to the leader.
+
+Only mark helpers that never write. The READ transaction carries no
+bookmarks, so a replica may not have caught up with a write the same
+client has just made; handlers that read back their own writes should
+not go through these helpers.
+"""
+from functools import wraps
+
+from flask import current_app, has_app_context
+from neomodel import db
+
+
+def _routing_enabled() -> bool:
+    return has_app_context() and bool(
+        current_app.config.get("GRAPH_ROUTING"))
+
+
+def read_only(func):
+    """
+    Run `func` in a READ transaction when GRAPH_ROUTING is on. Inside a
+    transaction that is already open, e.g. a write or an outer read only
+    helper, it runs in that one instead.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if (
+            not _routing_enabled()
+            or getattr(db, "_active_transaction", None) is not None
+        ):
+            return func(*args, **kwargs)
+        with db.read_transaction:
+            return func(*args, **kwargs)
+
+    return wrapper
@@ -1,6 +1,6 @@
 from pydantic import AliasChoices, BaseModel, Field, field_validator
 from typing import Optional
-from backend.database.models.agency import Jurisdiction
+from backend.database.models.agency import Agency, Jurisdiction
 from backend.database.models.employment import (
     EmploymentStatus, EmploymentType, Rank)
 from backend.dto.common_filters import (
@@ -8,7 +8,9 @@ from backend.dto.common_filters import (
     normalize_upper_string_or_list,
     validate_state_code,
 )
-from backend.dto.common import PaginatedRequest, RequestDTO
+from backend.dto.common import (
+    BatchRequest, CursorPaginatedRequest, PaginatedRequest, ProjectedRequest,
+    RequestDTO)
 from typing import List
 
 
@@ -27,7 +29,9 @@ class AddOfficerListSchema(BaseModel):
     officers: List[AddOfficerSchema]
 
 
-class AgencyQueryParams(PaginatedRequest):
+class AgencyQueryParams(CursorPaginatedRequest, ProjectedRequest):
+    projection_model = Agency
+
     term: str | None = Field(
         default=None,
         validation_alias=AliasChoices("term", "name"),
@@ -92,7 +96,9 @@ class RelevantAgencyLookupParams(PaginatedRequest):
     per_page: int = Field(5, ge=1, le=25)
 
 
-class GetAgencyParams(BaseModel):
+class GetAgencyParams(ProjectedRequest):
+    projection_model = Agency
+
     include: Optional[List[str]] = Field(
         None, description="Related data to include in the response."
     )
@@ -106,6 +112,7 @@ class GetAgencyParams(BaseModel):
             "allegations",
             "reported_units",
             "location",
+            "metrics_as_of",
         }
         if v:
             invalid = set(v) - allowed_includes
@@ -115,6 +122,10 @@ class GetAgencyParams(BaseModel):
         return v
 
 
+class GetAgencyBatchParams(BatchRequest, GetAgencyParams):
+    pass
+
+
 class CreateAgency(RequestDTO):
     source_uid: str = Field(
         ...,
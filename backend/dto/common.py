@@ -1,8 +1,32 @@
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional
+import base64
+import binascii
+import json
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+from typing import ClassVar, List, Optional
 from datetime import date
 
 
+MAX_BATCH_UIDS = 50
+
+
+def encode_cursor(*values) -> str:
+    """Encode the sort key of the last row on a page as an opaque token."""
+    payload = json.dumps(list(values), separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> list:
+    """Decode a token produced by `encode_cursor` back into its sort key."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or not values:
+        raise ValueError("Invalid cursor")
+    return values
+
+
 class RequestDTO(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -22,6 +46,65 @@ class PaginatedRequest(RequestDTO):
         return self.per_page
 
 
+class CursorPaginatedRequest(PaginatedRequest):
+    cursor: Optional[str] = Field(
+        None, description=(
+            "Opaque token from `next_cursor` of the previous response. "
+            "When set, results resume after it and `page` is ignored."))
+
+    @field_validator("cursor")
+    @classmethod
+    def validate_cursor(cls, value):
+        if value is not None:
+            decode_cursor(value)
+        return value
+
+    @property
+    def after(self) -> list | None:
+        return decode_cursor(self.cursor) if self.cursor else None
+
+
+class ProjectedRequest(BaseModel):
+    # The JsonSerializable model whose public properties may be requested.
+    projection_model: ClassVar[type | None] = None
+
+    fields: Optional[List[str]] = Field(
+        None, description=(
+            "Comma-separated properties to return for each record instead "
+            "of the full record. `uid` is always included."))
+
+    @field_validator("fields", mode="before")
+    @classmethod
+    def split_fields(cls, value):
+        if isinstance(value, str):
+            value = [value]
+        if value is None:
+            return None
+        fields = [
+            field.strip() for item in value for field in item.split(",")
+            if field.strip()
+        ]
+        return fields or None
+
+    @field_validator("fields")
+    @classmethod
+    def validate_fields(cls, value):
+        if value and cls.projection_model is not None:
+            return cls.projection_model.projection_fields(value)
+        return value
+
+
+class BatchRequest(RequestDTO):
+    uid: List[str] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_UIDS,
+        description="UIDs of the records to fetch, in response order.")
+
+    @property
+    def uids(self) -> list[str]:
+        """Requested uids in order, without repeats."""
+        return list(dict.fromkeys(self.uid))
+
+
 class PaginatedResponse(BaseModel):
     page: Optional[int] = Field(None, description="The current page number.")
     per_page: Optional[int] = Field(
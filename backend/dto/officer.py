@@ -5,11 +5,15 @@ from backend.dto.common_filters import (
     normalize_upper_string_or_list,
     validate_state_code,
 )
-from backend.dto.common import PaginatedRequest, RequestDTO
+from backend.database.models.officer import Officer
+from backend.dto.common import (
+    BatchRequest, CursorPaginatedRequest, ProjectedRequest, RequestDTO)
 from typing import List
 
 
-class OfficerSearchParams(PaginatedRequest):
+class OfficerSearchParams(CursorPaginatedRequest, ProjectedRequest):
+    projection_model = Officer
+
     # Pagination
     # page: int = 1
     # per_page: int = Field(20, alias="per_page")
@@ -117,7 +121,9 @@ class AddEmploymentListSchema(BaseModel):
     agencies: List[AddEmploymentSchema]
 
 
-class GetOfficerParams(RequestDTO):
+class GetOfficerParams(RequestDTO, ProjectedRequest):
+    projection_model = Officer
+
     include: Optional[List[str]] = Field(
         None, description="Related entities to include in the response."
     )
@@ -136,6 +142,10 @@ class GetOfficerParams(RequestDTO):
         return v
 
 
+class GetOfficerBatchParams(BatchRequest, GetOfficerParams):
+    pass
+
+
 class CreateOfficer(RequestDTO):
     source_uid: str = Field(
         ...,
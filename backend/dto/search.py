@@ -5,10 +5,10 @@ from backend.dto.common_filters import (
     normalize_upper_string_or_list,
     validate_state_code,
 )
-from backend.dto.common import PaginatedRequest
+from backend.dto.common import CursorPaginatedRequest
 
 
-class SearchQueryParams(PaginatedRequest):
+class SearchQueryParams(CursorPaginatedRequest):
     term: str = Field(
         ...,
         validation_alias=AliasChoices("term", "query"),
@@ -1,12 +1,16 @@
 from pydantic import Field, field_validator
 from typing import Optional, List
-from backend.database.models.agency import State
+from backend.database.models.agency import State, Unit
 from backend.database.models.employment import (
     EmploymentStatus, EmploymentType, Rank)
-from backend.dto.common import PaginatedRequest, RequestDTO
+from backend.dto.common import (
+    BatchRequest, CursorPaginatedRequest, PaginatedRequest, ProjectedRequest,
+    RequestDTO)
 
 
-class UnitQueryParams(PaginatedRequest):
+class UnitQueryParams(CursorPaginatedRequest, ProjectedRequest):
+    projection_model = Unit
+
     name: Optional[str] = None
     city: Optional[str] = None
     state: Optional[str] = None
@@ -19,7 +23,9 @@ class UnitQueryParams(PaginatedRequest):
         return v
 
 
-class GetUnitParams(RequestDTO):
+class GetUnitParams(RequestDTO, ProjectedRequest):
+    projection_model = Unit
+
     include: Optional[List[str]] = Field(
         None, description="Related entities to include in the response."
     )
@@ -33,6 +39,7 @@ class GetUnitParams(RequestDTO):
             "reported_officers",
             "leadership",
             "location",
+            "metrics_as_of",
         }
         if v:
             invalid = set(v) - allowed_includes
@@ -42,6 +49,10 @@ class GetUnitParams(RequestDTO):
         return v
 
 
+class GetUnitBatchParams(BatchRequest, GetUnitParams):
+    pass
+
+
 class GetUnitOfficersParams(PaginatedRequest):
     term: Optional[str] = Field(
         None,
@@ -1,74 +1,89 @@
+from datetime import datetime
 import logging
 
 from neomodel import db
+from backend.database.routing import read_only
+from backend.queries.allegation_summary import allegation_summary_subquery
+from backend.queries.leaderboards import (
+    REPORTED_UNITS_RANKING, leaderboard_subquery)
+from backend.queries.templates import (
+    cached_or_live, fresh_metrics, include_return_fields, projected_row,
+    projection_return, query_templates)
 
 AGENCY_BASE_MATCH = """
 MATCH (a:Agency {uid: $agency_uid})
 """
 
-UNIT_COUNT_SUBQUERY = """
-CALL (a) {
-  RETURN coalesce(a.unit_count_cached, 0) AS total_units
-}
+AGENCY_BATCH_MATCH = """
+UNWIND $uids AS uid
+MATCH (a:Agency {uid: uid})
 """
 
-OFFICER_COUNT_SUBQUERY = """
-CALL (a) {
+UNIT_COUNT_SUBQUERY = cached_or_live(
+    "a",
+    """
+  RETURN coalesce(a.unit_count_cached, 0) AS total_units
+""",
+    """
+  OPTIONAL MATCH (a)-[:ESTABLISHED_BY]-(u:Unit)
+  RETURN count(DISTINCT u) AS total_units
+""",
+    columns=["total_units"],
+)
+
+OFFICER_COUNT_SUBQUERY = cached_or_live(
+    "a",
+    """
   RETURN coalesce(a.officer_count_cached, 0) AS total_officers
-}
-"""
-
-COMPLAINT_SUBQUERY = """
-CALL (a) {
+""",
+    """
+  OPTIONAL MATCH (a)-[:ESTABLISHED_BY]-(:Unit)<-[:IN_UNIT]
+      -(:Employment)-[:HELD_BY]-(o:Officer)
+  RETURN count(DISTINCT o) AS total_officers
+""",
+    columns=["total_officers"],
+)
+
+COMPLAINT_SUBQUERY = cached_or_live(
+    "a",
+    """
   RETURN
     coalesce(a.complaint_count_cached, 0) AS total_complaints,
     coalesce(a.allegation_count_cached, 0) AS total_allegations
+""",
+    """
+  OPTIONAL MATCH (a)-[:ESTABLISHED_BY]-(:Unit)<-[:IN_UNIT]
+      -(:Employment)-[:HELD_BY]-(:Officer)
+      -[:ACCUSED_OF]->(al:Allegation)-[:ALLEGED]-(c:Complaint)
+  RETURN
+    count(DISTINCT c) AS total_complaints,
+    count(DISTINCT al) AS total_allegations
+""",
+    columns=["total_complaints", "total_allegations"],
+)
+
+# Null when the counts above were computed live.
+METRICS_AS_OF_SUBQUERY = """
+CALL (a) {
+  RETURN CASE WHEN """ + fresh_metrics("a") + """
+    THEN a.metrics_updated_at END AS metrics_as_of
 }
 """
 
-ALLEGATION_SUBQUERY = """
-CALL (a) {
+ALLEGATION_SUBQUERY = allegation_summary_subquery("a", """
   OPTIONAL MATCH (a)-[]-(:Unit)<-[]-(:Employment)-[]->(:Officer)
       -[:ACCUSED_OF]->(allege:Allegation)
   MATCH (allege)-[:ALLEGED]-(c:Complaint)
-  WITH
-    CASE
-      WHEN allege.type IS NULL OR trim(allege.type) = "" THEN "Unknown"
-      ELSE allege.type
-    END AS type,
-    count(*) AS occurrences,
-    sum(
-      CASE
-        WHEN toLower(trim(coalesce(allege.finding, ""))) = "substantiated"
-        THEN 1 ELSE 0
-      END
-    ) AS substantiated_count,
-    min(c.incident_date) AS earliest_incident_date,
-    max(c.incident_date) AS latest_incident_date
-  ORDER BY occurrences DESC, type ASC
-  RETURN collect({
-    type: type,
-    occurrences: occurrences,
-    substantiated_count: substantiated_count,
-    earliest_incident_date: earliest_incident_date,
-    latest_incident_date: latest_incident_date
-  }) AS allegation_summary
-}
-"""
+""")
 
-REPORTED_UNIT_SUBQUERY = """
-CALL (a) {
-  MATCH (a)-[]-(u:Unit)<-[]-(:Employment)-[]->(:Officer)
-      -[:ACCUSED_OF]->(:Allegation)-[:ALLEGED]-(c:Complaint)
-  WITH
-    u,
-    count(DISTINCT c) AS complaint_count,
-    count(*) AS allegation_count
-  ORDER BY complaint_count DESC, allegation_count DESC
-  LIMIT 3
-  RETURN collect(u) AS most_reported_units
-}
-"""
+REPORTED_UNIT_SUBQUERY = leaderboard_subquery(
+    "a",
+    REPORTED_UNITS_RANKING,
+    "u",
+    "reported_unit_uids_cached",
+    "Unit",
+    "most_reported_units",
+)
 
 LOCATION_SUBQUERY = """
 CALL (a) {
@@ -187,6 +202,141 @@ ORDER BY distance_meters ASC,
 LIMIT $limit
 """
 
+# Agency officer search bases, one per search-term strategy. Each ends
+# with `WITH o, e, u, score` for the count and page returns below.
+OFFICER_SEARCH_BASES = {
+    "none": """
+MATCH (a:Agency {uid: $agency_uid})-[:ESTABLISHED_BY]-(u:Unit)
+    -[:IN_UNIT]-(e:Employment)-[:HELD_BY]-(o:Officer)
+WHERE (coalesce($ranks, []) = [] OR e.highest_rank IN $ranks)
+AND (coalesce($statuses, []) = [] OR e.status IN $statuses)
+AND (coalesce($types, []) = [] OR e.type IN $types)
+WITH o, e, u, 0.0 AS score
+""",
+    "name": """
+CALL () {
+    CALL db.index.fulltext.queryNodes("officerNames", $term)
+    YIELD node, score
+    RETURN node AS o, score
+}
+MATCH (o)<-[:HELD_BY]-(e:Employment)-[:IN_UNIT]->
+    (u:Unit)-[:ESTABLISHED_BY]->(a:Agency)
+WHERE a.uid = $agency_uid
+AND (coalesce($ranks, []) = [] OR e.highest_rank IN $ranks)
+AND (coalesce($statuses, []) = [] OR e.status IN $statuses)
+AND (coalesce($types, []) = [] OR e.type IN $types)
+WITH o, e, u, score
+""",
+    "badge": """
+CALL () {
+    CALL db.index.fulltext.queryNodes("officerBadgeNumbers", $term)
+    YIELD node, score
+    RETURN node AS e, score
+}
+MATCH (e)-[:HELD_BY]->(o:Officer)
+MATCH (e)-[:IN_UNIT]->(u:Unit)-[:ESTABLISHED_BY]->(a:Agency)
+WHERE a.uid = $agency_uid
+AND (coalesce($ranks, []) = [] OR e.highest_rank IN $ranks)
+AND (coalesce($statuses, []) = [] OR e.status IN $statuses)
+AND (coalesce($types, []) = [] OR e.type IN $types)
+WITH o, e, u, score
+""",
+    "ambiguous": """
+CALL () {
+    CALL db.index.fulltext.queryNodes("officerNames", $term)
+    YIELD node, score
+    RETURN node AS o, null AS e, score
+
+    UNION
+
+    CALL db.index.fulltext.queryNodes("officerBadgeNumbers", $term)
+    YIELD node, score
+    MATCH (node)-[:HELD_BY]->(o:Officer)
+    RETURN o, node AS e, score
+}
+MATCH (o)<-[:HELD_BY]-(all_e:Employment)-[:IN_UNIT]->
+    (u:Unit)-[:ESTABLISHED_BY]->(a:Agency)
+WHERE a.uid = $agency_uid
+AND (coalesce($ranks, []) = [] OR all_e.highest_rank IN $ranks)
+AND (coalesce($statuses, []) = [] OR all_e.status IN $statuses)
+AND (coalesce($types, []) = [] OR all_e.type IN $types)
+AND (e IS NULL OR all_e = e)
+WITH o, all_e AS e, u, score
+""",
+}
+
+OFFICER_COUNT_RETURN = """
+RETURN count(DISTINCT o) AS total_officers
+"""
+
+OFFICER_PAGE_RETURN = """
+WITH o, max(score) AS score
+RETURN o
+ORDER BY score DESC, o.last_name ASC, o.first_name ASC
+SKIP $skip
+LIMIT $limit
+"""
+
+OFFICER_EMPLOYMENT_PAGE_RETURN = """
+WITH o, e, u, score
+ORDER BY coalesce(e.latest_date, e.earliest_date) DESC
+
+WITH
+    o,
+    max(score) AS score,
+    collect({employment: e, unit: u}) AS rows
+
+WITH
+    o,
+    score,
+    rows,
+    head(rows) AS most_recent,
+    reduce(min_date = null, row IN rows |
+        CASE
+            WHEN min_date IS NULL
+              THEN row.employment.earliest_date
+            WHEN row.employment.earliest_date IS NULL
+              THEN min_date
+            WHEN row.employment.earliest_date < min_date
+            THEN row.employment.earliest_date
+            ELSE min_date
+        END
+    ) AS earliest_date,
+    reduce(max_date = null, row IN rows |
+        CASE
+            WHEN row.employment.latest_date IS NULL THEN null
+            WHEN max_date IS NULL
+              THEN row.employment.latest_date
+            WHEN row.employment.latest_date > max_date
+            THEN row.employment.latest_date
+            ELSE max_date
+        END
+    ) AS latest_date
+
+RETURN
+    o,
+    {
+        uid: most_recent.employment.uid,
+        earliest_date: earliest_date,
+        latest_date: latest_date,
+        badge_number: most_recent.employment.badge_number,
+        rank: most_recent.employment.highest_rank,
+        status: most_recent.employment.status,
+        type: most_recent.employment.type,
+        unit: {
+            uid: most_recent.unit.uid,
+            name: most_recent.unit.name
+        }
+    } AS employment
+ORDER BY score DESC, o.last_name ASC, o.first_name ASC
+SKIP $skip
+LIMIT $limit
+"""
+
+query_templates.register("agency.profile_lookup", PROFILE_AGENCY_LOOKUP_QUERY)
+query_templates.register("agency.rich_lookup", RICH_AGENCY_LOOKUP_QUERY)
+query_templates.register("agency.nearby_lookup", NEARBY_AGENCY_LOOKUP_QUERY)
+
 
 class AgencyQueries:
     INCLUDE_SPECS = {
@@ -214,6 +364,10 @@ class AgencyQueries:
             "subquery": LOCATION_SUBQUERY,
             "return_fields": ["location"],
         },
+        "metrics_as_of": {
+            "subquery": METRICS_AS_OF_SUBQUERY,
+            "return_fields": ["metrics_as_of"],
+        },
     }
 
     def _normalize_officer_filters(self, filters: dict | None) -> dict:
@@ -242,7 +396,7 @@ class AgencyQueries:
 
         return "ambiguous"
 
-    def _build_agency_officer_search_query(
+    def _build_agency_officer_search_params(
         self,
         agency_uid: str,
         term: str | None = None,
@@ -256,128 +410,98 @@ class AgencyQueries:
             "term": term.strip() if term else None,
             **normalized,
         }
+        return strategy, params
 
-        if strategy == "none":
-            cypher = """
-            MATCH (a:Agency {uid: $agency_uid})-[:ESTABLISHED_BY]-(u:Unit)
-                -[:IN_UNIT]-(e:Employment)-[:HELD_BY]-(o:Officer)
-            WHERE (coalesce($ranks, []) = [] OR e.highest_rank IN $ranks)
-            AND (coalesce($statuses, []) = [] OR e.status IN $statuses)
-            AND (coalesce($types, []) = [] OR e.type IN $types)
-            WITH o, e, u, 0.0 AS score
-            """
-            return cypher, params
-
-        if strategy == "name":
-            cypher = """
-            CALL () {
-                CALL db.index.fulltext.queryNodes("officerNames", $term)
-                YIELD node, score
-                RETURN node AS o, score
-            }
-            MATCH (o)<-[:HELD_BY]-(e:Employment)-[:IN_UNIT]->
-            (u:Unit)-[:ESTABLISHED_BY]->(a:Agency)
-            WHERE a.uid = $agency_uid
-            AND (coalesce($ranks, []) = [] OR e.highest_rank IN $ranks)
-            AND (coalesce($statuses, []) = [] OR e.status IN $statuses)
-            AND (coalesce($types, []) = [] OR e.type IN $types)
-            WITH o, e, u, score
-            """
-            return cypher, params
-
-        if strategy == "badge":
-            cypher = """
-            CALL () {
-                CALL db.index.fulltext.queryNodes("officerBadgeNumbers", $term)
-                YIELD node, score
-                RETURN node AS e, score
-            }
-            MATCH (e)-[:HELD_BY]->(o:Officer)
-            MATCH (e)-[:IN_UNIT]->(u:Unit)-[:ESTABLISHED_BY]->(a:Agency)
-            WHERE a.uid = $agency_uid
-            AND (coalesce($ranks, []) = [] OR e.highest_rank IN $ranks)
-            AND (coalesce($statuses, []) = [] OR e.status IN $statuses)
-            AND (coalesce($types, []) = [] OR e.type IN $types)
-            WITH o, e, u, score
-            """
-            return cypher, params
-
-        cypher = """
-        CALL () {
-            CALL db.index.fulltext.queryNodes("officerNames", $term)
-            YIELD node, score
-            RETURN node AS o, null AS e, score
-
-            UNION
-
-            CALL db.index.fulltext.queryNodes("officerBadgeNumbers", $term)
-            YIELD node, score
-            MATCH (node)-[:HELD_BY]->(o:Officer)
-            RETURN o, node AS e, score
-        }
-        MATCH (o)<-[:HELD_BY]-(all_e:Employment)-[:IN_UNIT]->
-        (u:Unit)-[:ESTABLISHED_BY]->(a:Agency)
-        WHERE a.uid = $agency_uid
-        AND (coalesce($ranks, []) = [] OR all_e.highest_rank IN $ranks)
-        AND (coalesce($statuses, []) = [] OR all_e.status IN $statuses)
-        AND (coalesce($types, []) = [] OR all_e.type IN $types)
-        AND (e IS NULL OR all_e = e)
-        WITH o, all_e AS e, u, score
-        """
-        return cypher, params
-
-    def fetch_agency_profile(self, agency_uid: str, includes: list[str]):
-        subqueries = []
-        return_fields = ["a"]
-
-        for include in includes:
-            spec = self.INCLUDE_SPECS.get(include)
-            if not spec:
-                continue
-            subqueries.append(spec["subquery"])
-            return_fields.extend(spec["return_fields"])
-
-        cypher = (
-            AGENCY_BASE_MATCH
-            + "\n"
-            + "\n".join(subqueries)
-            + "\nRETURN "
-            + ", ".join(return_fields)
-        )
+    @read_only
+    def fetch_agency_profile(
+        self,
+        agency_uid: str,
+        includes: list[str],
+        fields: list[str] | None = None,
+        metrics_fresh_after: datetime | None = None,
+    ):
+        includes = tuple(
+            include for include in self.INCLUDE_SPECS if include in includes)
+        cypher = _agency_profile_query(includes, False, bool(fields))
+        return_fields = include_return_fields(
+            ["a"], self.INCLUDE_SPECS, includes)
 
         logging.warning(f"Cypher query: {cypher}")
         rows, _ = db.cypher_query(
-            cypher, {"agency_uid": agency_uid}, resolve_objects=True)
+            cypher,
+            {
+                "agency_uid": agency_uid,
+                "fields": fields or [],
+                "metrics_fresh_after": metrics_fresh_after,
+            },
+            resolve_objects=True)
         if not rows:
             raise ValueError("Agency not found")
 
         logging.warning(f"Cypher query rows: {rows[0]}")
         row = rows[0]
-        return {field: row[idx] for idx, field in enumerate(return_fields)}
+        result = {field: row[idx] for idx, field in enumerate(return_fields)}
+        if fields:
+            result["a"] = projected_row(fields, result["a"])
+        return result
 
+    @read_only
+    def fetch_agency_profiles(
+        self,
+        uids: list[str],
+        includes: list[str],
+        fields: list[str] | None = None,
+        metrics_fresh_after: datetime | None = None,
+    ) -> dict[str, dict]:
+        """Fetch several agency profiles in one query, keyed by uid.
+
+        Unknown uids are left out of the result.
+        """
+        includes = tuple(
+            include for include in self.INCLUDE_SPECS if include in includes)
+        cypher = _agency_profile_query(includes, True, bool(fields))
+        return_fields = include_return_fields(
+            ["a"], self.INCLUDE_SPECS, includes)
+
+        rows, _ = db.cypher_query(
+            cypher,
+            {
+                "uids": uids,
+                "fields": fields or [],
+                "metrics_fresh_after": metrics_fresh_after,
+            },
+            resolve_objects=True)
+        profiles = {}
+        for row in rows:
+            result = dict(zip(return_fields, row))
+            if fields:
+                result["a"] = projected_row(fields, result["a"])
+                uid = result["a"]["uid"]
+            else:
+                uid = result["a"].uid
+            profiles.setdefault(uid, result)
+        return profiles
+
+    @read_only
     def count_agency_officers(
         self,
         agency_uid: str,
         term: str | None = None,
         filters: dict | None = None
     ) -> int:
-        base_query, params = self._build_agency_officer_search_query(
+        strategy, params = self._build_agency_officer_search_params(
             agency_uid=agency_uid,
             term=term,
             filters=filters,
         )
 
-        query = (
-            base_query
-            + """
-            RETURN count(DISTINCT o) AS total_officers
-            """
-        )
+        query = _agency_officers_query(strategy, "count")
         logging.warning(
             f"Counting agency officers: {query} with params {params}")
         rows, _ = db.cypher_query(query, params)
         return rows[0][0] if rows else 0
 
+    @read_only
     def count_agency_units(self, agency_uid: str) -> int:
         query = """
         MATCH (a:Agency {uid: $agency_uid})-[:ESTABLISHED_BY]-(u:Unit)
@@ -386,6 +510,7 @@ class AgencyQueries:
         rows, _ = db.cypher_query(query, {"agency_uid": agency_uid})
         return rows[0][0] if rows else 0
 
+    @read_only
     def fetch_agency_officers(
         self,
         agency_uid: str,
@@ -395,7 +520,7 @@ class AgencyQueries:
         term: str | None = None,
         filters: dict | None = None
     ):
-        base_query, params = self._build_agency_officer_search_query(
+        strategy, params = self._build_agency_officer_search_params(
             agency_uid=agency_uid,
             term=term,
             filters=filters,
@@ -406,75 +531,9 @@ class AgencyQueries:
         })
 
         if include_employment:
-            query = (
-                base_query
-                + """
-                WITH o, e, u, score
-                ORDER BY coalesce(e.latest_date, e.earliest_date) DESC
-
-                WITH
-                    o,
-                    max(score) AS score,
-                    collect({employment: e, unit: u}) AS rows
-
-                WITH
-                    o,
-                    score,
-                    rows,
-                    head(rows) AS most_recent,
-                    reduce(min_date = null, row IN rows |
-                        CASE
-                            WHEN min_date IS NULL
-                              THEN row.employment.earliest_date
-                            WHEN row.employment.earliest_date IS NULL
-                              THEN min_date
-                            WHEN row.employment.earliest_date < min_date
-                            THEN row.employment.earliest_date
-                            ELSE min_date
-                        END
-                    ) AS earliest_date,
-                    reduce(max_date = null, row IN rows |
-                        CASE
-                            WHEN row.employment.latest_date IS NULL THEN null
-                            WHEN max_date IS NULL
-                              THEN row.employment.latest_date
-                            WHEN row.employment.latest_date > max_date
-                            THEN row.employment.latest_date
-                            ELSE max_date
-                        END
-                    ) AS latest_date
-
-                RETURN
-                    o,
-                    {
-                        uid: most_recent.employment.uid,
-                        earliest_date: earliest_date,
-                        latest_date: latest_date,
-                        badge_number: most_recent.employment.badge_number,
-                        rank: most_recent.employment.highest_rank,
-                        status: most_recent.employment.status,
-                        type: most_recent.employment.type,
-                        unit: {
-                            uid: most_recent.unit.uid,
-                            name: most_recent.unit.name
-                        }
-                    } AS employment
-                ORDER BY score DESC, o.last_name ASC, o.first_name ASC
-                SKIP $skip
-                LIMIT $limit
-                """
-            )
+            query = _agency_officers_query(strategy, "employment")
         else:
-            query = (
-                base_query
-                + """
-                WITH o, max(score) AS score
-                RETURN o
-                ORDER BY score DESC, o.last_name ASC, o.first_name ASC
-                SKIP $skip
-                LIMIT $limit
-                """
-            )
+            query = _agency_officers_query(strategy, "page")
 
         logging.warning(
             f"Cypher query for fetching officers: {query} with params {params}"
@@ -482,6 +541,7 @@ class AgencyQueries:
         rows, _ = db.cypher_query(query, params, resolve_objects=True)
         return rows
 
+    @read_only
     def fetch_agency_units(
         self,
         agency_uid: str,
@@ -504,6 +564,7 @@ class AgencyQueries:
         rows, _ = db.cypher_query(query, params, resolve_objects=True)
         return rows
 
+    @read_only
     def fetch_profile_agencies(
         self,
         *,
@@ -521,6 +582,7 @@ class AgencyQueries:
         rows, _ = db.cypher_query(PROFILE_AGENCY_LOOKUP_QUERY, params)
         return rows
 
+    @read_only
     def fetch_rich_agencies(
         self,
         *,
@@ -538,6 +600,7 @@ class AgencyQueries:
         rows, _ = db.cypher_query(RICH_AGENCY_LOOKUP_QUERY, params)
         return rows
 
+    @read_only
     def fetch_nearby_agencies(
         self,
         *,
@@ -554,3 +617,34 @@ class AgencyQueries:
         }
         rows, _ = db.cypher_query(NEARBY_AGENCY_LOOKUP_QUERY, params)
         return rows
+
+
+@query_templates.shape("agency.profile")
+def _agency_profile_query(
+    includes: tuple[str, ...],
+    batch: bool,
+    projected: bool,
+) -> str:
+    return_fields = include_return_fields(
+        ["a"], AgencyQueries.INCLUDE_SPECS, includes)
+    return_fields[0] = projection_return("a", projected, alias="a")
+    return (
+        (AGENCY_BATCH_MATCH if batch else AGENCY_BASE_MATCH)
+        + "\n"
+        + "\n".join(
+            AgencyQueries.INCLUDE_SPECS[include]["subquery"]
+            for include in includes
+        )
+        + "\nRETURN "
+        + ", ".join(return_fields)
+    )
+
+
+@query_templates.shape("agency.officers")
+def _agency_officers_query(strategy: str, mode: str) -> str:
+    returns = {
+        "count": OFFICER_COUNT_RETURN,
+        "page": OFFICER_PAGE_RETURN,
+        "employment": OFFICER_EMPLOYMENT_PAGE_RETURN,
+    }
+    return OFFICER_SEARCH_BASES[strategy] + returns[mode]
@@ -1,8 +1,18 @@
+from datetime import datetime
+
 from neomodel import db
 
+from backend.queries.allegation_summary import (
+    SUMMARY_STAMP, set_summary_arrays, summary_arrays_subquery)
+from backend.queries.clock import as_utc
+from backend.queries.dirty_set import DIRTY_AGENCIES, dirty_params
+from backend.queries.leaderboards import (
+    REPORTED_UNITS_RANKING, ranked_uids_subquery, set_ranked_uids)
+from backend.queries.templates import (
+    iter_uid_pages, run_uid_batches, uid_batch, uid_page)
 
-AGENCY_METRICS_INPUT_QUERY = """
-MATCH (a:Agency)
+
+AGENCY_METRICS_SUBQUERIES = """
 CALL (a) {
     OPTIONAL MATCH (a)-[:ESTABLISHED_BY]-(u:Unit)
     RETURN count(DISTINCT u) AS unit_count
@@ -20,15 +30,49 @@ CALL (a) {
         count(DISTINCT c) AS complaint_count,
         count(DISTINCT al) AS allegation_count
 }
+""" + summary_arrays_subquery("a", """
+    MATCH (a)-[]-(:Unit)<-[]-(:Employment)-[]->(:Officer)
+        -[:ACCUSED_OF]->(allege:Allegation)-[:ALLEGED]-(c:Complaint)
+""") + ranked_uids_subquery(
+    "a", REPORTED_UNITS_RANKING, "u", "reported_unit_uids")
+
+AGENCY_METRICS_INPUT_RETURN = AGENCY_METRICS_SUBQUERIES + """
 RETURN
     a.uid AS agency_uid,
     unit_count,
     officer_count,
     complaint_count,
-    allegation_count
+    allegation_count,
+    allegation_summary,
+    reported_unit_uids
 ORDER BY agency_uid ASC
 """
 
+AGENCY_METRICS_INPUT_QUERY = (
+    "\nMATCH (a:Agency)" + uid_page("a") + AGENCY_METRICS_INPUT_RETURN)
+
+DIRTY_AGENCY_METRICS_INPUT_QUERY = (
+    DIRTY_AGENCIES + uid_page("a") + AGENCY_METRICS_INPUT_RETURN)
+
+AGENCY_METRICS_SET = AGENCY_METRICS_SUBQUERIES + """
+SET
+    a.unit_count_cached = unit_count,
+    a.officer_count_cached = officer_count,
+    a.complaint_count_cached = complaint_count,
+    a.allegation_count_cached = allegation_count,
+    a.metrics_updated_at = datetime($metrics_updated_at)
+""" + set_summary_arrays(
+    "a", "allegation_summary", stamp=SUMMARY_STAMP,
+    updated_at="datetime($metrics_updated_at)") + set_ranked_uids(
+    "a", "reported_unit_uids_cached", "reported_unit_uids",
+    "datetime($metrics_updated_at)")
+
+AGENCY_METRICS_IN_DATABASE_QUERY = (
+    "\nMATCH (a:Agency)" + uid_batch("a", AGENCY_METRICS_SET))
+
+DIRTY_AGENCY_METRICS_IN_DATABASE_QUERY = (
+    DIRTY_AGENCIES + uid_batch("a", AGENCY_METRICS_SET))
+
 UPDATE_AGENCY_METRICS_CACHE_QUERY = """
 UNWIND $updates AS row
 MATCH (a:Agency {uid: row.agency_uid})
@@ -38,15 +82,101 @@ SET
     a.complaint_count_cached = row.complaint_count_cached,
     a.allegation_count_cached = row.allegation_count_cached,
     a.metrics_updated_at = datetime(row.metrics_updated_at)
+""" + set_summary_arrays(
+    "a", "row.allegation_summary", stamp=SUMMARY_STAMP,
+    updated_at="datetime(row.metrics_updated_at)") + set_ranked_uids(
+    "a", "reported_unit_uids_cached", "row.reported_unit_uids",
+    "datetime(row.metrics_updated_at)") + """
 RETURN count(a) AS updated
 """
 
+LAST_AGENCY_REFRESH_QUERY = """
+MATCH (a:Agency)
+RETURN max(a.metrics_updated_at) AS last_refresh
+"""
+
 
 class AgencyCacheQueries:
-    def fetch_agency_metrics_inputs(self):
-        rows, _ = db.cypher_query(AGENCY_METRICS_INPUT_QUERY)
+    def fetch_agency_metrics_inputs(
+        self,
+        *,
+        after: str = "",
+        until: str | None = None,
+        page_size: int = 500,
+        since: datetime | None = None,
+    ):
+        """
+        One uid-ordered page of agency metrics inputs. With `since`, only
+        the agency nodes touched since then are included.
+        """
+        query = (
+            DIRTY_AGENCY_METRICS_INPUT_QUERY if since is not None
+            else AGENCY_METRICS_INPUT_QUERY
+        )
+        rows, _ = db.cypher_query(
+            query,
+            {
+                "after": after,
+                "until": until,
+                "page_size": page_size,
+                **dirty_params(since),
+            },
+        )
         return rows
 
+    def iter_agency_metrics_inputs(
+        self,
+        *,
+        after: str = "",
+        until: str | None = None,
+        page_size: int = 500,
+        since: datetime | None = None,
+    ):
+        """Stream agency metrics inputs one page at a time."""
+        return iter_uid_pages(
+            lambda page_after: self.fetch_agency_metrics_inputs(
+                after=page_after, until=until, page_size=page_size,
+                since=since),
+            page_size,
+            after,
+        )
+
+    def fetch_last_refresh(self) -> datetime | None:
+        rows, _ = db.cypher_query(LAST_AGENCY_REFRESH_QUERY)
+        return as_utc(rows[0][0]) if rows else None
+
+    def refresh_agency_metrics_in_database(
+        self,
+        *,
+        batch_size: int,
+        metrics_updated_at: str,
+        since: datetime | None = None,
+        after: str = "",
+        until: str | None = None,
+    ) -> list[dict]:
+        """
+        Compute and write the cached agency metrics inside Neo4j, one
+        uid-ordered page of `batch_size` nodes per transaction. Returns
+        one entry per batch with its first uid, rows written and elapsed
+        time.
+        """
+        query = (
+            DIRTY_AGENCY_METRICS_IN_DATABASE_QUERY if since is not None
+            else AGENCY_METRICS_IN_DATABASE_QUERY
+        )
+        params = {
+            "page_size": batch_size,
+            "metrics_updated_at": metrics_updated_at,
+            **dirty_params(since),
+            "until": until,
+        }
+
+        def run_batch(after: str) -> list:
+            rows, _ = db.cypher_query(query, {**params, "after": after})
+            return rows
+
+        return run_uid_batches(run_batch, batch_size, after)
+
     def update_agency_metrics_cache(self, updates: list[dict]) -> int:
         if not updates:
             return 0
@@ -0,0 +1,124 @@
+"""
+The per-type allegation summary of a unit or agency, computed live or
+read back from the parallel arrays the metrics refresh stores on the
+node. Node properties cannot hold maps, so each summary field is its own
+list, and incident dates are ISO strings with "" for none.
+"""
+from backend.queries.templates import cached_or_live
+
+# Aggregates `allege` and `c` rows into one row per allegation type.
+SUMMARY_BY_TYPE = """
+  WITH
+    CASE
+      WHEN allege.type IS NULL OR trim(allege.type) = "" THEN "Unknown"
+      ELSE allege.type
+    END AS type,
+    count(*) AS occurrences,
+    sum(
+      CASE
+        WHEN toLower(trim(coalesce(allege.finding, ""))) = "substantiated"
+        THEN 1 ELSE 0
+      END
+    ) AS substantiated_count,
+    min(c.incident_date) AS earliest_incident_date,
+    max(c.incident_date) AS latest_incident_date
+  ORDER BY occurrences DESC, type ASC
+"""
+
+SUMMARY_RETURN = """
+  RETURN collect({
+    type: type,
+    occurrences: occurrences,
+    substantiated_count: substantiated_count,
+    earliest_incident_date: earliest_incident_date,
+    latest_incident_date: latest_incident_date
+  }) AS allegation_summary
+"""
+
+# What the refresh stores, one list per field.
+SUMMARY_ARRAYS_RETURN = """
+  RETURN {
+    types: collect(type),
+    occurrences: collect(occurrences),
+    substantiated: collect(substantiated_count),
+    earliest: collect(coalesce(toString(earliest_incident_date), "")),
+    latest: collect(coalesce(toString(latest_incident_date), ""))
+  } AS allegation_summary
+"""
+
+SUMMARY_PROPERTIES = {
+    "types": "allegation_types_cached",
+    "occurrences": "allegation_occurrences_cached",
+    "substantiated": "allegation_substantiated_cached",
+    "earliest": "allegation_earliest_cached",
+    "latest": "allegation_latest_cached",
+}
+
+# When the stored summary was last rewritten. The orchestrated refresh
+# only rewrites the counts, so `metrics_updated_at` says nothing about it.
+SUMMARY_STAMP = "allegation_summary_updated_at"
+
+
+def summary_arrays_subquery(var: str, match: str) -> str:
+    """The refresh input: the summary of `var` as parallel arrays."""
+    return f"""
+CALL ({var}) {{
+{match}
+{SUMMARY_BY_TYPE}
+{SUMMARY_ARRAYS_RETURN}
+}}
+"""
+
+
+def set_summary_arrays(
+    var: str,
+    summary: str,
+    properties: dict = SUMMARY_PROPERTIES,
+    stamp: str | None = None,
+    updated_at: str | None = None,
+) -> str:
+    """
+    Cypher storing the `summary` arrays on `var`, each under its entry
+    of `properties`, and `updated_at` under `stamp` when given. A null
+    summary leaves the stored one, and its stamp, alone.
+    """
+    sets = [f"{var}.{prop} = summary.{key}" for key, prop in properties.items()]
+    if stamp:
+        sets.append(f"{var}.{stamp} = {updated_at}")
+    sets = ",\n        ".join(sets)
+    return f"""
+FOREACH (summary IN CASE WHEN {summary} IS NULL THEN [] ELSE [{summary}] END |
+    SET
+        {sets}
+)
+"""
+
+
+def stored_summary(var: str) -> str:
+    """Cypher rebuilding the summary maps from the arrays on `var`."""
+    p = {key: f"{var}.{prop}" for key, prop in SUMMARY_PROPERTIES.items()}
+    return f"""
+  RETURN [i IN range(0, size({p["types"]}) - 1) | {{
+    type: {p["types"]}[i],
+    occurrences: {p["occurrences"]}[i],
+    substantiated_count: {p["substantiated"]}[i],
+    earliest_incident_date: CASE {p["earliest"]}[i]
+      WHEN "" THEN null ELSE date({p["earliest"]}[i]) END,
+    latest_incident_date: CASE {p["latest"]}[i]
+      WHEN "" THEN null ELSE date({p["latest"]}[i]) END
+  }}] AS allegation_summary
+"""
+
+
+def allegation_summary_subquery(var: str, match: str) -> str:
+    """
+    The summary include: read from `var` when it has a fresh stored
+    summary, otherwise aggregated live from the rows of `match`.
+    """
+    return cached_or_live(
+        var,
+        stored_summary(var),
+        match + SUMMARY_BY_TYPE + SUMMARY_RETURN,
+        columns=["allegation_summary"],
+        stamp=SUMMARY_STAMP,
+    )
@@ -0,0 +1,94 @@
+from datetime import datetime
+from typing import Iterable
+
+from neomodel import db
+
+from backend.queries.clock import as_utc
+from backend.queries.templates import query_templates
+
+# Labels whose nodes carry Change history and can be validated.
+VALIDATED_LABELS = ("Officer", "Unit", "Agency")
+
+
+@query_templates.shape("changes.node_validator")
+def _node_validator_query(label: str) -> str:
+    return f"""
+MATCH (n:{label} {{uid: $uid}})
+CALL (n) {{
+  OPTIONAL MATCH (n)<-[:CHANGE_TO]-(c:Change)
+  RETURN c.timestamp AS changed_at
+  ORDER BY c.timestamp DESC
+  LIMIT 1
+}}
+RETURN
+  changed_at,
+  n.metrics_updated_at AS metrics_updated_at,
+  n.metrics_changed_at AS metrics_changed_at
+"""
+
+
+# One LabelWatermark per validated label, bumped whenever one of its nodes
+# changes or is deleted, so lists are validated with a single lookup.
+LABEL_WATERMARK_QUERY = query_templates.register(
+    "changes.label_watermark", """
+OPTIONAL MATCH (w:LabelWatermark {label: $label})
+RETURN w.version AS version, w.changed_at AS changed_at
+""")
+
+TOUCH_LABELS_QUERY = query_templates.register("changes.touch_labels", """
+UNWIND $labels AS label
+MERGE (w:LabelWatermark {label: label})
+SET w.version = coalesce(w.version, 0) + 1,
+    w.changed_at = datetime()
+""")
+
+
+class ChangeQueries:
+    """Cheap freshness lookups, run before the expensive profile queries."""
+
+    def fetch_node_last_modified(
+        self,
+        label: str,
+        uid: str,
+    ) -> tuple[bool, datetime | None]:
+        """
+        Whether the node exists, and when it last changed: its newest
+        Change, or its latest metrics refresh or delta if more recent.
+        """
+        rows, _ = db.cypher_query(
+            _node_validator_query(_validated(label)), {"uid": uid})
+        if not rows:
+            return False, None
+        stamps = [
+            as_utc(value).replace(microsecond=0)
+            for value in rows[0] if value is not None
+        ]
+        return True, max(stamps, default=None)
+
+    def fetch_label_last_modified(
+        self,
+        label: str,
+    ) -> tuple[int, datetime | None]:
+        """
+        The watermark of `label`: how many times its nodes have changed,
+        and when they last did. `(0, None)` until the first change.
+        """
+        rows, _ = db.cypher_query(
+            LABEL_WATERMARK_QUERY, {"label": _validated(label)})
+        version, changed_at = rows[0]
+        if changed_at is None:
+            return 0, None
+        return version, as_utc(changed_at).replace(microsecond=0)
+
+    def touch_labels(self, labels: Iterable[str]) -> None:
+        """Bump the watermarks of the validated labels among `labels`."""
+        touched = set(labels)
+        labels = [label for label in VALIDATED_LABELS if label in touched]
+        if labels:
+            db.cypher_query(TOUCH_LABELS_QUERY, {"labels": labels})
+
+
+def _validated(label: str) -> str:
+    if label not in VALIDATED_LABELS:
+        raise ValueError(f"Unsupported label: {label}")
+    return label
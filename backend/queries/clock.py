@@ -0,0 +1,30 @@
+"""
+The timestamps the caches compare. Refreshes and watermarks are stored as
+UTC datetimes. Change timestamps come from neomodel's naive
+`datetime.now()` and are stored as local times, so `$since` is passed
+back in that form when matched against them.
+"""
+from datetime import datetime, timezone
+
+
+def utc_now() -> datetime:
+    """The stamp a refresh writes, as an aware UTC datetime."""
+    return datetime.now(timezone.utc)
+
+
+def as_utc(value) -> datetime | None:
+    """
+    A stored or Python timestamp as an aware UTC datetime. Naive values,
+    like Change timestamps, are local times.
+    """
+    if value is None:
+        return None
+    if hasattr(value, "to_native"):
+        value = value.to_native()
+    return value.astimezone(timezone.utc)
+
+
+def as_change_time(value) -> datetime | None:
+    """`value` as a naive local time, comparable to `Change.timestamp`."""
+    value = as_utc(value)
+    return value.astimezone().replace(tzinfo=None) if value else None
@@ -0,0 +1,144 @@
+"""
+The yearly complaint series of an officer: how many distinct complaints
+with an incident date fall in each year, and how many of those are
+closed. The metrics refresh stores the whole series on the officer as
+parallel arrays keyed by year, so the last `HISTORY_YEARS` years are a
+lookup on the node, and the window rolls over at the turn of the year
+without a refresh.
+"""
+from backend.queries.allegation_summary import set_summary_arrays
+from backend.queries.templates import cached_or_live
+
+HISTORY_YEARS = 7
+
+HISTORY_PROPERTIES = {
+    "years": "complaint_history_years_cached",
+    "complaints": "complaint_history_counts_cached",
+    "closed": "complaint_history_closed_cached",
+}
+
+# When the stored series was last rewritten. The orchestrated refresh
+# stamps metrics_updated_at without touching it.
+HISTORY_STAMP = "complaint_history_updated_at"
+
+# The years of the window, newest first.
+HISTORY_WINDOW = f"range(date().year, date().year - {HISTORY_YEARS - 1}, -1)"
+
+# Leaves one row per incident year of the complaints against `o`.
+HISTORY_BY_YEAR = """
+  MATCH (o)-[:ACCUSED_OF]->(:Allegation)-[:ALLEGED]->(co:Complaint)
+  WHERE co.incident_date IS NOT NULL
+  WITH
+    co.incident_date.year AS year,
+    count(DISTINCT co) AS complaint_count,
+    count(DISTINCT CASE WHEN co.closed_date IS NOT NULL
+      THEN co END) AS closed_count
+  ORDER BY year ASC
+"""
+
+# What the refresh stores, one list per field.
+HISTORY_ARRAYS_SUBQUERY = """
+CALL (o) {
+""" + HISTORY_BY_YEAR + """
+  RETURN {
+    years: collect(year),
+    complaints: collect(complaint_count),
+    closed: collect(closed_count)
+  } AS complaint_history
+}
+"""
+
+_LIVE_HISTORY = f"""
+  UNWIND {HISTORY_WINDOW} AS year
+  OPTIONAL MATCH (o)-[:ACCUSED_OF]->(:Allegation)-[:ALLEGED]->(co:Complaint)
+  WHERE co.incident_date IS NOT NULL AND co.incident_date.year = year
+  WITH
+    year,
+    count(DISTINCT co) AS complaint_count,
+    count(DISTINCT CASE WHEN co.closed_date IS NOT NULL
+      THEN co END) AS closed_count
+  ORDER BY year DESC
+  RETURN collect({{
+    year: year,
+    complaint_count: complaint_count,
+    closed_count: closed_count
+  }}) AS results
+"""
+
+
+def _stored_history(var: str) -> str:
+    """Each year of the window, read from the arrays or zero."""
+    p = {key: f"{var}.{prop}" for key, prop in HISTORY_PROPERTIES.items()}
+    return f"""
+  RETURN [year IN {HISTORY_WINDOW} |
+    head([
+      i IN range(0, size({p["years"]}) - 1)
+      WHERE {p["years"]}[i] = year | {{
+        year: year,
+        complaint_count: {p["complaints"]}[i],
+        closed_count: {p["closed"]}[i]
+      }}
+    ] + [{{year: year, complaint_count: 0, closed_count: 0}}])
+  ] AS results
+"""
+
+
+def set_history_arrays(var: str, history: str, updated_at: str) -> str:
+    """
+    Cypher storing the `history` arrays on `var`, stamped with
+    `updated_at`. A null history leaves the stored one alone.
+    """
+    return set_summary_arrays(
+        var, history, HISTORY_PROPERTIES,
+        stamp=HISTORY_STAMP, updated_at=updated_at)
+
+
+# The complaint_history metric of `o`, returned as `results`.
+COMPLAINT_HISTORY_SUBQUERY = cached_or_live(
+    "o",
+    _stored_history("o"),
+    _LIVE_HISTORY,
+    columns=["results"],
+    stamp=HISTORY_STAMP,
+)
+
+
+def history_delta(var: str) -> str:
+    """
+    Cypher moving the incident year of complaint `c` by `$delta` in the
+    series stored on `var`, inserting the year in order when it is new.
+    A series that was never stored is left for the next refresh.
+    """
+    p = {key: f"{var}.{prop}" for key, prop in HISTORY_PROPERTIES.items()}
+    return f"""
+FOREACH (year IN CASE
+    WHEN {p["years"]} IS NULL OR c.incident_date IS NULL THEN []
+    ELSE [c.incident_date.year]
+END |
+    FOREACH (at IN CASE
+        WHEN year IN {p["years"]} THEN []
+        ELSE [size([known IN {p["years"]} WHERE known < year])]
+    END |
+        SET
+            {p["years"]} =
+                {p["years"]}[..at] + year + {p["years"]}[at..],
+            {p["complaints"]} =
+                {p["complaints"]}[..at] + 0 + {p["complaints"]}[at..],
+            {p["closed"]} =
+                {p["closed"]}[..at] + 0 + {p["closed"]}[at..]
+    )
+    SET
+        {p["complaints"]} = [
+            i IN range(0, size({p["years"]}) - 1) |
+            {p["complaints"]}[i]
+                + CASE WHEN {p["years"]}[i] = year THEN $delta ELSE 0 END
+        ],
+        {p["closed"]} = [
+            i IN range(0, size({p["years"]}) - 1) |
+            {p["closed"]}[i] + CASE
+                WHEN {p["years"]}[i] = year AND c.closed_date IS NOT NULL
+                THEN $delta ELSE 0
+            END
+        ]
+)
+"""
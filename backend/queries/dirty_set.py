@@ -0,0 +1,122 @@
+"""
+Cypher fragments that find the nodes whose cached metrics may be stale:
+those reachable from a node with a Change newer than `$since`, or from a
+node whose `metrics_changed_at` is newer than `$changed_since`. Sources
+record a Change; the API writes go through the metric deltas, which
+stamp `metrics_changed_at` on every node they move, before a delete as
+well. Build both parameters with `dirty_params`.
+
+Each fragment ends with `WITH DISTINCT <var>` and is meant to replace the
+`MATCH (<var>:Label)` head of a full refresh input query. Deletions made
+outside the API leave no trace, so a periodic full refresh is still
+needed to catch them.
+"""
+from datetime import datetime
+
+from backend.queries.clock import as_change_time, as_utc
+
+TOUCHED_NODES = """
+CALL () {
+    MATCH (change:Change)-[:CHANGE_TO]->(n)
+    WHERE change.timestamp > $since
+    RETURN n
+    UNION
+    MATCH (n:Officer) WHERE n.metrics_changed_at > $changed_since
+    RETURN n
+    UNION
+    MATCH (n:Unit) WHERE n.metrics_changed_at > $changed_since
+    RETURN n
+    UNION
+    MATCH (n:Agency) WHERE n.metrics_changed_at > $changed_since
+    RETURN n
+    UNION
+    MATCH (n:CityNode) WHERE n.metrics_changed_at > $changed_since
+    RETURN n
+}
+WITH DISTINCT n
+"""
+
+# Officers whose complaint and allegation counts depend on a touched node.
+DIRTY_OFFICERS = TOUCHED_NODES + """
+CALL (n) {
+    WITH n AS o
+    WHERE o:Officer
+    RETURN o
+    UNION
+    MATCH (o:Officer)-[:ACCUSED_OF]->(n:Allegation)
+    RETURN o
+    UNION
+    MATCH (o:Officer)-[:ACCUSED_OF]->(:Allegation)-[:ALLEGED]-(n:Complaint)
+    RETURN o
+}
+WITH DISTINCT o
+"""
+
+DIRTY_UNITS = """
+CALL () {
+""" + DIRTY_OFFICERS + """
+    MATCH (o)-[:HELD_BY]-(:Employment)-[:IN_UNIT]->(u:Unit)
+    RETURN u
+    UNION
+""" + TOUCHED_NODES + """
+    CALL (n) {
+        WITH n AS u
+        WHERE u:Unit
+        RETURN u
+        UNION
+        MATCH (n:Employment)-[:IN_UNIT]->(u:Unit)
+        RETURN u
+    }
+    RETURN u
+}
+WITH DISTINCT u
+"""
+
+DIRTY_AGENCIES = """
+CALL () {
+""" + DIRTY_UNITS + """
+    MATCH (u)-[:ESTABLISHED_BY]-(a:Agency)
+    RETURN a
+    UNION
+""" + TOUCHED_NODES + """
+    WITH n AS a
+    WHERE a:Agency
+    RETURN a
+}
+WITH DISTINCT a
+"""
+
+DIRTY_CITIES = """
+CALL () {
+""" + DIRTY_AGENCIES + """
+    MATCH (a)-[:LOCATED_IN]->(city:CityNode)
+    RETURN city
+    UNION
+""" + TOUCHED_NODES + """
+    CALL (n) {
+        WITH n AS city
+        WHERE city:CityNode
+        RETURN city
+        UNION
+        MATCH (n:Complaint)-[:OCCURRED_IN]->(:Location)
+            -[:LOCATED_IN]->(city:CityNode)
+        RETURN city
+    }
+    RETURN city
+}
+WITH DISTINCT city
+"""
+
+DIRTY_COUNTIES = DIRTY_CITIES + """
+MATCH (city)-[:WITHIN_COUNTY]->(county:CountyNode)
+WITH DISTINCT county
+"""
+
+
+def dirty_params(since: datetime | None) -> dict:
+    """
+    The parameters of the fragments above for a refresh from `since`:
+    a naive local time like `Change.timestamp` (see backend.queries.clock)
+    and the same instant in UTC for the `metrics_changed_at` stamps.
+    """
+    return {"since": as_change_time(since), "changed_since": as_utc(since)}
@@ -1,4 +1,5 @@
 from neomodel import db
+from backend.database.routing import read_only
 
 
 class FilterResolver:
@@ -9,6 +10,7 @@ class FilterResolver:
             return value
         return [value]
 
+    @read_only
     def resolve_city_uids(
         self,
         *,
@@ -65,6 +67,7 @@ class FilterResolver:
         resolved_uids.extend(row[0] for row in rows)
         return list(dict.fromkeys(resolved_uids))
 
+    @read_only
     def resolve_source_uids(
         self,
         *,
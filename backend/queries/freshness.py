@@ -0,0 +1,79 @@
+from datetime import datetime
+
+from neomodel import db
+
+from backend.database.routing import read_only
+
+# The property each refresh stamps on the nodes it writes. Each is
+# indexed, so the freshness report never reads the nodes themselves.
+CACHE_TIMESTAMPS = {
+    "Officer": "metrics_updated_at",
+    "Unit": "metrics_updated_at",
+    "Agency": "metrics_updated_at",
+    "CityNode": "richness_updated_at",
+    "CountyNode": "richness_updated_at",
+}
+
+
+def _freshness_query(label: str, field: str) -> str:
+    """
+    One row: how many `label` nodes there are, how many were refreshed,
+    how many of those are newer than each of `$cutoffs`, and the oldest
+    and newest refresh. The total comes from the label count and the
+    rest from the index on `field`.
+    """
+    return f"""
+CALL () {{
+  MATCH (n:{label})
+  RETURN count(n) AS total
+}}
+CALL () {{
+  MATCH (n:{label})
+  WHERE n.{field} IS NOT NULL
+  RETURN count(n) AS refreshed
+}}
+CALL () {{
+  UNWIND $cutoffs AS cutoff
+  CALL (cutoff) {{
+    MATCH (n:{label})
+    WHERE n.{field} >= cutoff
+    RETURN count(n) AS newer
+  }}
+  RETURN collect(newer) AS newer
+}}
+CALL () {{
+  MATCH (n:{label})
+  WHERE n.{field} IS NOT NULL
+  WITH n.{field} AS updated_at
+  ORDER BY updated_at ASC
+  LIMIT 1
+  RETURN head(collect(updated_at)) AS oldest
+}}
+CALL () {{
+  MATCH (n:{label})
+  WHERE n.{field} IS NOT NULL
+  WITH n.{field} AS updated_at
+  ORDER BY updated_at DESC
+  LIMIT 1
+  RETURN head(collect(updated_at)) AS newest
+}}
+RETURN total, refreshed, newer, oldest, newest
+"""
+
+
+class FreshnessQueries:
+    @read_only
+    def fetch_freshness(
+        self,
+        label: str,
+        cutoffs: list[datetime],
+    ) -> tuple:
+        """
+        `(total, refreshed, newer, oldest, newest)` for `label`, where
+        `newer[i]` counts the nodes refreshed since `cutoffs[i]`.
+        """
+        rows, _ = db.cypher_query(
+            _freshness_query(label, CACHE_TIMESTAMPS[label]),
+            {"cutoffs": cutoffs},
+        )
+        return tuple(rows[0])
@@ -0,0 +1,93 @@
+"""
+The most reported officers of a unit and units of an agency. The metrics
+refresh stores the uids of the top entries on the node, so the profile
+include only looks them up, and computes them live on a cache miss.
+"""
+from backend.queries.templates import cached_or_live
+
+TOP_K = 3
+
+# When the stored ranking was last rewritten, as the orchestrated refresh
+# stamps metrics_updated_at without ranking anything.
+RANKING_STAMP = "ranking_updated_at"
+
+# Leaves the top `o` officers of `u`, most reported first.
+REPORTED_OFFICERS_RANKING = f"""
+  MATCH (u)<-[]-(:Employment)-[]->(o:Officer)
+    -[:ACCUSED_OF]->(allege:Allegation)-[:ALLEGED]-(c:Complaint)
+  WITH
+    o,
+    count(DISTINCT c) AS complaint_count,
+    count(DISTINCT allege) AS allegation_count
+  ORDER BY complaint_count DESC, allegation_count DESC, o.uid ASC
+  LIMIT {TOP_K}
+"""
+
+# Leaves the top `u` units of `a`, most reported first.
+REPORTED_UNITS_RANKING = f"""
+  MATCH (a)-[]-(u:Unit)<-[]-(:Employment)-[]->(:Officer)
+      -[:ACCUSED_OF]->(:Allegation)-[:ALLEGED]-(c:Complaint)
+  WITH
+    u,
+    count(DISTINCT c) AS complaint_count,
+    count(*) AS allegation_count
+  ORDER BY complaint_count DESC, allegation_count DESC, u.uid ASC
+  LIMIT {TOP_K}
+"""
+
+
+def ranked_uids_subquery(
+    var: str, ranking: str, ranked: str, alias: str
+) -> str:
+    """The refresh input: the uids of the `ranked` nodes, in order."""
+    return f"""
+CALL ({var}) {{
+{ranking}
+  RETURN collect({ranked}.uid) AS {alias}
+}}
+"""
+
+
+def set_ranked_uids(var: str, prop: str, uids: str, updated_at: str) -> str:
+    """
+    Cypher storing the `uids` ranking under `var.prop`, stamped with
+    `updated_at`. A null ranking leaves the stored one alone.
+    """
+    return f"""
+FOREACH (ranked IN CASE WHEN {uids} IS NULL THEN [] ELSE [{uids}] END |
+    SET
+        {var}.{prop} = ranked,
+        {var}.{RANKING_STAMP} = {updated_at}
+)
+"""
+
+
+def _stored_ranking(var: str, prop: str, label: str, alias: str) -> str:
+    return f"""
+  UNWIND range(0, size({var}.{prop}) - 1) AS rank
+  MATCH (ranked:{label} {{uid: {var}.{prop}[rank]}})
+  WITH ranked
+  ORDER BY rank ASC
+  RETURN collect(ranked) AS {alias}
+"""
+
+
+def leaderboard_subquery(
+    var: str,
+    ranking: str,
+    ranked: str,
+    prop: str,
+    label: str,
+    alias: str,
+) -> str:
+    """
+    The include: the `label` nodes whose uids are stored in `var.prop`,
+    or the live `ranking` when those are missing or stale.
+    """
+    return cached_or_live(
+        var,
+        _stored_ranking(var, prop, label, alias),
+        ranking + f"  RETURN collect({ranked}) AS {alias}\n",
+        columns=[alias],
+        stamp=RANKING_STAMP,
+    )
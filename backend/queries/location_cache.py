@@ -1,8 +1,14 @@
+from datetime import datetime
+
 from neomodel import db
 
+from backend.queries.clock import as_utc
+from backend.queries.dirty_set import (
+    DIRTY_CITIES, DIRTY_COUNTIES, dirty_params)
+from backend.queries.templates import iter_uid_pages, uid_page
 
-CITY_RICHNESS_INPUT_QUERY = """
-MATCH (city:CityNode)
+
+CITY_RICHNESS_INPUT_RETURN = """
 CALL (city) {
     OPTIONAL MATCH (a:Agency)-[:LOCATED_IN]->(city)
     RETURN count(DISTINCT a) AS agency_count
@@ -14,7 +20,8 @@ CALL (city) {
     RETURN count(DISTINCT o) AS officer_count
 }
 CALL (city) {
-    OPTIONAL MATCH (c:Complaint)-[:LOCATED_IN]->(city)
+    OPTIONAL MATCH (c:Complaint)-[:OCCURRED_IN]->(:Location)
+        -[:LOCATED_IN]->(city)
     RETURN count(DISTINCT c) AS complaint_count
 }
 RETURN
@@ -26,8 +33,14 @@ RETURN
 ORDER BY city_uid ASC
 """
 
-COUNTY_RICHNESS_INPUT_QUERY = """
-MATCH (county:CountyNode)
+CITY_RICHNESS_INPUT_QUERY = (
+    "\nMATCH (city:CityNode)" + uid_page("city")
+    + CITY_RICHNESS_INPUT_RETURN)
+
+DIRTY_CITY_RICHNESS_INPUT_QUERY = (
+    DIRTY_CITIES + uid_page("city") + CITY_RICHNESS_INPUT_RETURN)
+
+COUNTY_RICHNESS_INPUT_RETURN = """
 CALL (county) {
     OPTIONAL MATCH (city:CityNode)-[:WITHIN_COUNTY]->(county)
     RETURN coalesce(sum(city.population), 0) AS population
@@ -46,7 +59,8 @@ CALL (county) {
 }
 CALL (county) {
     OPTIONAL MATCH (city:CityNode)-[:WITHIN_COUNTY]->(county)
-    OPTIONAL MATCH (c:Complaint)-[:LOCATED_IN]->(city)
+    OPTIONAL MATCH (c:Complaint)-[:OCCURRED_IN]->(:Location)
+        -[:LOCATED_IN]->(city)
     RETURN count(DISTINCT c) AS complaint_count
 }
 RETURN
@@ -58,6 +72,13 @@ RETURN
 ORDER BY county_uid ASC
 """
 
+COUNTY_RICHNESS_INPUT_QUERY = (
+    "\nMATCH (county:CountyNode)" + uid_page("county")
+    + COUNTY_RICHNESS_INPUT_RETURN)
+
+DIRTY_COUNTY_RICHNESS_INPUT_QUERY = (
+    DIRTY_COUNTIES + uid_page("county") + COUNTY_RICHNESS_INPUT_RETURN)
+
 
 UPDATE_CITY_RICHNESS_CACHE_QUERY = """
 UNWIND $updates AS row
@@ -83,16 +104,114 @@ SET
 RETURN count(county) AS updated
 """
 
+LAST_CITY_REFRESH_QUERY = """
+MATCH (city:CityNode)
+RETURN max(city.richness_updated_at) AS last_refresh
+"""
+
+LAST_COUNTY_REFRESH_QUERY = """
+MATCH (county:CountyNode)
+RETURN max(county.richness_updated_at) AS last_refresh
+"""
+
 
 class LocationCacheQueries:
-    def fetch_city_richness_inputs(self):
-        rows, _ = db.cypher_query(CITY_RICHNESS_INPUT_QUERY)
+    def fetch_city_richness_inputs(
+        self,
+        *,
+        after: str = "",
+        until: str | None = None,
+        page_size: int = 500,
+        since: datetime | None = None,
+    ):
+        """
+        One uid-ordered page of city richness inputs. With `since`, only
+        the cities touched since then are included.
+        """
+        query = (
+            DIRTY_CITY_RICHNESS_INPUT_QUERY if since is not None
+            else CITY_RICHNESS_INPUT_QUERY
+        )
+        rows, _ = db.cypher_query(
+            query,
+            {
+                "after": after,
+                "until": until,
+                "page_size": page_size,
+                **dirty_params(since),
+            },
+        )
         return rows
 
-    def fetch_county_richness_inputs(self):
-        rows, _ = db.cypher_query(COUNTY_RICHNESS_INPUT_QUERY)
+    def iter_city_richness_inputs(
+        self,
+        *,
+        after: str = "",
+        until: str | None = None,
+        page_size: int = 500,
+        since: datetime | None = None,
+    ):
+        """Stream city richness inputs one page at a time."""
+        return iter_uid_pages(
+            lambda page_after: self.fetch_city_richness_inputs(
+                after=page_after, until=until, page_size=page_size,
+                since=since),
+            page_size,
+            after,
+        )
+
+    def fetch_county_richness_inputs(
+        self,
+        *,
+        after: str = "",
+        until: str | None = None,
+        page_size: int = 500,
+        since: datetime | None = None,
+    ):
+        """
+        One uid-ordered page of county richness inputs. With `since`, only
+        the counties touched since then are included.
+        """
+        query = (
+            DIRTY_COUNTY_RICHNESS_INPUT_QUERY if since is not None
+            else COUNTY_RICHNESS_INPUT_QUERY
+        )
+        rows, _ = db.cypher_query(
+            query,
+            {
+                "after": after,
+                "until": until,
+                "page_size": page_size,
+                **dirty_params(since),
+            },
+        )
         return rows
 
+    def iter_county_richness_inputs(
+        self,
+        *,
+        after: str = "",
+        until: str | None = None,
+        page_size: int = 500,
+        since: datetime | None = None,
+    ):
+        """Stream county richness inputs one page at a time."""
+        return iter_uid_pages(
+            lambda page_after: self.fetch_county_richness_inputs(
+                after=page_after, until=until, page_size=page_size,
+                since=since),
+            page_size,
+            after,
+        )
+
+    def fetch_last_city_refresh(self) -> datetime | None:
+        rows, _ = db.cypher_query(LAST_CITY_REFRESH_QUERY)
+        return as_utc(rows[0][0]) if rows else None
+
+    def fetch_last_county_refresh(self) -> datetime | None:
+        rows, _ = db.cypher_query(LAST_COUNTY_REFRESH_QUERY)
+        return as_utc(rows[0][0]) if rows else None
+
     def update_city_richness_cache(self, updates: list[dict]) -> int:
         if not updates:
             return 0
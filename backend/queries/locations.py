@@ -1,4 +1,5 @@
 from neomodel import db
+from backend.database.routing import read_only
 
 CITY_LOOKUP_QUERY = """
 CALL db.index.fulltext.queryNodes("cityNames", $term) YIELD node, score
@@ -222,6 +223,7 @@ class LocationQueries:
             raise ValueError("term is required")
         return f"{normalized}*"
 
+    @read_only
     def count_matching_cities(
         self, *, term: str, state: str | None = None
     ) -> int:
@@ -233,6 +235,7 @@ class LocationQueries:
         rows, _ = db.cypher_query(CITY_LOOKUP_COUNT_QUERY, params)
         return rows[0][0] if rows else 0
 
+    @read_only
     def fetch_matching_cities(
         self,
         *,
@@ -251,6 +254,7 @@ class LocationQueries:
         rows, _ = db.cypher_query(CITY_LOOKUP_QUERY, params)
         return rows
 
+    @read_only
     def count_matching_counties(
         self, *, term: str, state: str | None = None
     ) -> int:
@@ -262,6 +266,7 @@ class LocationQueries:
         rows, _ = db.cypher_query(COUNTY_LOOKUP_COUNT_QUERY, params)
         return rows[0][0] if rows else 0
 
+    @read_only
     def fetch_matching_counties(
         self,
         *,
@@ -280,6 +285,7 @@ class LocationQueries:
         rows, _ = db.cypher_query(COUNTY_LOOKUP_QUERY, params)
         return rows
 
+    @read_only
     def count_matching_states(self, *, term: str) -> int:
         params = {
             "normalized_term": " ".join(term.lower().split()),
@@ -287,6 +293,7 @@ class LocationQueries:
         rows, _ = db.cypher_query(STATE_LOOKUP_COUNT_QUERY, params)
         return rows[0][0] if rows else 0
 
+    @read_only
     def fetch_matching_states(
         self,
         *,
@@ -302,6 +309,7 @@ class LocationQueries:
         rows, _ = db.cypher_query(STATE_LOOKUP_QUERY, params)
         return rows
 
+    @read_only
     def fetch_nearby_cities(
         self,
         *,
@@ -317,6 +325,7 @@ class LocationQueries:
         rows, _ = db.cypher_query(NEARBY_CITY_LOOKUP_QUERY, params)
         return rows
 
+    @read_only
     def fetch_profile_city(
         self,
         *,
@@ -330,6 +339,7 @@ class LocationQueries:
         rows, _ = db.cypher_query(PROFILE_CITY_LOOKUP_QUERY, params)
         return rows[0] if rows else None
 
+    @read_only
     def fetch_rich_cities(
         self,
         *,
@@ -345,6 +355,7 @@ class LocationQueries:
         rows, _ = db.cypher_query(RICH_CITY_LOOKUP_QUERY, params)
         return rows
 
+    @read_only
     def fetch_county_rich_cities(
         self,
         *,
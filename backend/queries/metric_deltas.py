@@ -0,0 +1,226 @@
+"""
+Cypher that keeps the `*_count_cached` properties current between full
+refreshes by applying the change made by one allegation or complaint.
+
+Counts are distinct, so a complaint only moves a count when the
+allegation is the sole link between it and the officer, unit or agency.
+A count that was never set stays null, as null plus a delta is null, and
+is filled in by the next full refresh. The same goes for the yearly
+complaint series of the officer.
+
+Each delta stamps `metrics_changed_at` on the nodes it moves, which the
+profile validators and the incremental refreshes read, and returns their
+uids so that cached responses can be dropped. It leaves
+`metrics_updated_at` alone, as incremental refreshes resume from that.
+
+What a delta cannot move, the allegation summary and the most reported
+ranking of a unit or agency, is marked stale by clearing its stamp, so
+profiles compute it live until the next refresh stores it again.
+"""
+from neomodel import db
+
+from backend.queries.allegation_summary import SUMMARY_STAMP
+from backend.queries.complaint_history import HISTORY_STAMP, history_delta
+from backend.queries.leaderboards import RANKING_STAMP
+
+# The label of the nodes in each uid column of the delta queries.
+TOUCHED_LABELS = {
+    "officer_uids": "Officer",
+    "unit_uids": "Unit",
+    "agency_uids": "Agency",
+    "city_uids": "CityNode",
+}
+
+# Another allegation linking the same complaint. Those in `$ignored` are
+# already out of the counts, as when a complaint is removed one
+# allegation at a time.
+OTHER_ALLEGATION = "other <> al AND NOT other.uid IN $ignored"
+
+SUBSTANTIATED_DELTA = """
+CASE
+    WHEN toLower(trim(coalesce(al.finding, ""))) = "substantiated"
+    THEN $delta ELSE 0
+END
+"""
+
+# Must run while the allegation is still connected.
+ALLEGATION_DELTA_QUERY = """
+MATCH (o:Officer)-[:ACCUSED_OF]->(al:Allegation {uid: $allegation_uid})
+    -[:ALLEGED]-(c:Complaint)
+SET
+    o.allegation_count_cached = o.allegation_count_cached + $delta,
+    o.substantiated_count_cached =
+        o.substantiated_count_cached + """ + SUBSTANTIATED_DELTA + """,
+    o.complaint_count_cached = o.complaint_count_cached + CASE
+        WHEN EXISTS {
+            MATCH (o)-[:ACCUSED_OF]->(other:Allegation)-[:ALLEGED]-(c)
+            WHERE """ + OTHER_ALLEGATION + """
+        }
+        THEN 0 ELSE $delta
+    END,
+    o.metrics_changed_at = datetime()
+WITH o, al, c
+CALL (o, al, c) {
+    WITH o, al, c
+    WHERE NOT EXISTS {
+        MATCH (o)-[:ACCUSED_OF]->(other:Allegation)-[:ALLEGED]-(c)
+        WHERE """ + OTHER_ALLEGATION + """
+    }
+""" + history_delta("o") + """
+}
+CALL (o, al, c) {
+    MATCH (o)-[:HELD_BY]-(:Employment)-[:IN_UNIT]->(u:Unit)
+    WITH DISTINCT u, al, c
+    SET
+        u.allegation_count_cached = u.allegation_count_cached + $delta,
+        u.complaint_count_cached = u.complaint_count_cached + CASE
+            WHEN EXISTS {
+                MATCH (u)<-[:IN_UNIT]-(:Employment)-[:HELD_BY]-(:Officer)
+                    -[:ACCUSED_OF]->(other:Allegation)-[:ALLEGED]-(c)
+                WHERE """ + OTHER_ALLEGATION + """
+            }
+            THEN 0 ELSE $delta
+        END,
+        u.metrics_changed_at = datetime(),
+        u.""" + SUMMARY_STAMP + """ = null,
+        u.""" + RANKING_STAMP + """ = null
+    RETURN collect(u.uid) AS unit_uids
+}
+CALL (o, al, c) {
+    MATCH (o)-[:HELD_BY]-(:Employment)-[:IN_UNIT]->(:Unit)
+        -[:ESTABLISHED_BY]-(a:Agency)
+    WITH DISTINCT a, al, c
+    SET
+        a.allegation_count_cached = a.allegation_count_cached + $delta,
+        a.complaint_count_cached = a.complaint_count_cached + CASE
+            WHEN EXISTS {
+                MATCH (a)-[:ESTABLISHED_BY]-(:Unit)<-[:IN_UNIT]
+                    -(:Employment)-[:HELD_BY]-(:Officer)
+                    -[:ACCUSED_OF]->(other:Allegation)-[:ALLEGED]-(c)
+                WHERE """ + OTHER_ALLEGATION + """
+            }
+            THEN 0 ELSE $delta
+        END,
+        a.metrics_changed_at = datetime(),
+        a.""" + SUMMARY_STAMP + """ = null,
+        a.""" + RANKING_STAMP + """ = null
+    RETURN collect(a.uid) AS agency_uids
+}
+RETURN
+    collect(o.uid) AS officer_uids,
+    reduce(uids = [], batch IN collect(unit_uids) | uids + batch)
+        AS unit_uids,
+    reduce(uids = [], batch IN collect(agency_uids) | uids + batch)
+        AS agency_uids
+"""
+
+# A complaint counts towards the city of its location, as in the richness
+# refresh. 5 is the complaint weight of the richness score.
+COMPLAINT_DELTA_QUERY = """
+MATCH (c:Complaint {uid: $complaint_uid})-[:OCCURRED_IN]->(:Location)
+    -[:LOCATED_IN]->(city:CityNode)
+SET
+    city.complaint_count_cached = city.complaint_count_cached + $delta,
+    city.richness_score_cached = city.richness_score_cached + 5 * $delta,
+    city.metrics_changed_at = datetime()
+RETURN collect(city.uid) AS city_uids
+"""
+
+# No delta follows an edit to a complaint, which can move its incident or
+# closed year. The accused officers' stored series and the summaries of
+# their units and agencies, which keep incident dates, are marked stale.
+COMPLAINT_EDITED_QUERY = """
+MATCH (:Complaint {uid: $complaint_uid})-[:ALLEGED]-(:Allegation)
+    <-[:ACCUSED_OF]-(o:Officer)
+WITH DISTINCT o
+SET
+    o.""" + HISTORY_STAMP + """ = null,
+    o.metrics_changed_at = datetime()
+WITH collect(o) AS officers
+CALL (officers) {
+    UNWIND officers AS o
+    MATCH (o)-[:HELD_BY]-(:Employment)-[:IN_UNIT]->(u:Unit)
+    WITH DISTINCT u
+    SET
+        u.""" + SUMMARY_STAMP + """ = null,
+        u.metrics_changed_at = datetime()
+    RETURN collect(u.uid) AS unit_uids
+}
+CALL (officers) {
+    UNWIND officers AS o
+    MATCH (o)-[:HELD_BY]-(:Employment)-[:IN_UNIT]->(:Unit)
+        -[:ESTABLISHED_BY]-(a:Agency)
+    WITH DISTINCT a
+    SET
+        a.""" + SUMMARY_STAMP + """ = null,
+        a.metrics_changed_at = datetime()
+    RETURN collect(a.uid) AS agency_uids
+}
+RETURN [o IN officers | o.uid] AS officer_uids, unit_uids, agency_uids
+"""
+
+COMPLAINT_ALLEGATIONS_QUERY = """
+MATCH (:Complaint {uid: $complaint_uid})-[:ALLEGED]-(al:Allegation)
+RETURN al.uid
+ORDER BY al.uid
+"""
+
+
+def merge_touched(*touched: dict[str, list]) -> dict[str, list]:
+    """Combine the uids returned by several deltas, by label."""
+    merged: dict[str, list] = {}
+    for entry in touched:
+        for label, uids in entry.items():
+            known = merged.setdefault(label, [])
+            known.extend(uid for uid in uids if uid not in known)
+    return merged
+
+
+class MetricDeltaQueries:
+    """
+    Run these inside the transaction that makes the change: after the
+    allegation or complaint is connected, or before it is deleted. Each
+    returns the uids of the nodes it moved, by label.
+    """
+
+    def allegation_added(self, allegation_uid: str) -> dict[str, list]:
+        return self._apply(
+            ALLEGATION_DELTA_QUERY, allegation_uid=allegation_uid, delta=1,
+            ignored=[])
+
+    def allegation_removed(self, allegation_uid: str) -> dict[str, list]:
+        return self._apply(
+            ALLEGATION_DELTA_QUERY, allegation_uid=allegation_uid, delta=-1,
+            ignored=[])
+
+    def complaint_added(self, complaint_uid: str) -> dict[str, list]:
+        return self._apply(
+            COMPLAINT_DELTA_QUERY, complaint_uid=complaint_uid, delta=1)
+
+    def complaint_edited(self, complaint_uid: str) -> dict[str, list]:
+        return self._apply(COMPLAINT_EDITED_QUERY, complaint_uid=complaint_uid)
+
+    def complaint_removed(self, complaint_uid: str) -> dict[str, list]:
+        """
+        Take the complaint and all of its allegations out of the counts.
+        Each allegation is removed as if those before it were gone, so
+        the complaint leaves every count exactly once.
+        """
+        rows, _ = db.cypher_query(
+            COMPLAINT_ALLEGATIONS_QUERY, {"complaint_uid": complaint_uid})
+        touched = [self._apply(
+            COMPLAINT_DELTA_QUERY, complaint_uid=complaint_uid, delta=-1)]
+        removed: list[str] = []
+        for (allegation_uid,) in rows:
+            touched.append(self._apply(
+                ALLEGATION_DELTA_QUERY, allegation_uid=allegation_uid,
+                delta=-1, ignored=list(removed)))
+            removed.append(allegation_uid)
+        return merge_touched(*touched)
+
+    def _apply(self, query: str, **params) -> dict[str, list]:
+        rows, columns = db.cypher_query(query, params)
+        return {
+            TOUCHED_LABELS[column]: uids
+            for column, uids in zip(columns, rows[0] if rows else ())
+        }
@@ -0,0 +1,126 @@
+from neomodel import db
+
+from backend.queries.agency_cache import UPDATE_AGENCY_METRICS_CACHE_QUERY
+from backend.queries.location_cache import (
+    UPDATE_CITY_RICHNESS_CACHE_QUERY,
+    UPDATE_COUNTY_RICHNESS_CACHE_QUERY,
+)
+from backend.queries.officer_cache import UPDATE_OFFICER_METRICS_CACHE_QUERY
+from backend.queries.templates import iter_uid_pages, uid_page
+from backend.queries.unit_cache import UPDATE_UNIT_METRICS_CACHE_QUERY
+
+# The only traversal of the Officer -> Allegation -> Complaint subgraph.
+# Every other level is rolled up from these rows.
+OFFICER_ROLLUP_INPUT_QUERY = """
+MATCH (o:Officer)
+""" + uid_page("o") + """
+CALL (o) {
+    OPTIONAL MATCH (o)-[:HELD_BY]-(:Employment)-[:IN_UNIT]->(u:Unit)
+    RETURN collect(DISTINCT u.uid) AS unit_uids
+}
+CALL (o) {
+    OPTIONAL MATCH (o)-[:ACCUSED_OF]->(al:Allegation)-[:ALLEGED]-(c:Complaint)
+    RETURN
+        collect(DISTINCT c.uid) AS complaint_uids,
+        collect(DISTINCT al.uid) AS allegation_uids,
+        sum(
+            CASE
+                WHEN toLower(trim(coalesce(al.finding, ""))) = "substantiated"
+                THEN 1 ELSE 0
+            END
+        ) AS substantiated_count
+}
+RETURN
+    o.uid AS officer_uid,
+    unit_uids,
+    complaint_uids,
+    allegation_uids,
+    substantiated_count
+ORDER BY officer_uid ASC
+"""
+
+UNIT_AGENCIES_QUERY = """
+MATCH (u:Unit)
+OPTIONAL MATCH (u)-[:ESTABLISHED_BY]-(a:Agency)
+RETURN u.uid AS unit_uid, collect(DISTINCT a.uid) AS agency_uids
+"""
+
+AGENCY_CITIES_QUERY = """
+MATCH (a:Agency)
+OPTIONAL MATCH (a)-[:LOCATED_IN]->(city:CityNode)
+RETURN a.uid AS agency_uid, collect(DISTINCT city.uid) AS city_uids
+"""
+
+CITY_ROLLUP_INPUT_QUERY = """
+MATCH (city:CityNode)
+CALL (city) {
+    OPTIONAL MATCH (city)-[:WITHIN_COUNTY]->(county:CountyNode)
+    RETURN collect(DISTINCT county.uid) AS county_uids
+}
+CALL (city) {
+    OPTIONAL MATCH (c:Complaint)-[:OCCURRED_IN]->(:Location)
+        -[:LOCATED_IN]->(city)
+    RETURN collect(DISTINCT c.uid) AS complaint_uids
+}
+RETURN
+    city.uid AS city_uid,
+    coalesce(city.population, 0) AS population,
+    county_uids,
+    complaint_uids
+"""
+
+COUNTY_UIDS_QUERY = """
+MATCH (county:CountyNode)
+RETURN county.uid AS county_uid
+"""
+
+
+class MetricsRollupQueries:
+    """Reads for the single-pass refresh, and the per-label cache writes."""
+
+    def iter_officer_rollup_inputs(self, *, page_size: int = 500):
+        return iter_uid_pages(
+            lambda after: self._rows(
+                OFFICER_ROLLUP_INPUT_QUERY,
+                {"after": after, "until": None, "page_size": page_size},
+            ),
+            page_size,
+        )
+
+    def fetch_unit_agencies(self) -> list:
+        return self._rows(UNIT_AGENCIES_QUERY)
+
+    def fetch_agency_cities(self) -> list:
+        return self._rows(AGENCY_CITIES_QUERY)
+
+    def fetch_city_rollup_inputs(self) -> list:
+        return self._rows(CITY_ROLLUP_INPUT_QUERY)
+
+    def fetch_county_uids(self) -> list[str]:
+        return [row[0] for row in self._rows(COUNTY_UIDS_QUERY)]
+
+    def update_officer_metrics_cache(self, updates: list[dict]) -> int:
+        return self._write(UPDATE_OFFICER_METRICS_CACHE_QUERY, updates)
+
+    def update_unit_metrics_cache(self, updates: list[dict]) -> int:
+        return self._write(UPDATE_UNIT_METRICS_CACHE_QUERY, updates)
+
+    def update_agency_metrics_cache(self, updates: list[dict]) -> int:
+        return self._write(UPDATE_AGENCY_METRICS_CACHE_QUERY, updates)
+
+    def update_city_richness_cache(self, updates: list[dict]) -> int:
+        return self._write(UPDATE_CITY_RICHNESS_CACHE_QUERY, updates)
+
+    def update_county_richness_cache(self, updates: list[dict]) -> int:
+        return self._write(UPDATE_COUNTY_RICHNESS_CACHE_QUERY, updates)
+
+    def _rows(self, query: str, params: dict | None = None) -> list:
+        rows, _ = db.cypher_query(query, params or {})
+        return rows
+
+    def _write(self, query: str, updates: list[dict]) -> int:
+        if not updates:
+            return 0
+
+        rows, _ = db.cypher_query(query, {"updates": updates})
+        return rows[0][0] if rows else 0
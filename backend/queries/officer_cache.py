@@ -1,8 +1,16 @@
+from datetime import datetime
+
 from neomodel import db
 
+from backend.queries.complaint_history import (
+    HISTORY_ARRAYS_SUBQUERY, set_history_arrays)
+from backend.queries.clock import as_utc
+from backend.queries.dirty_set import DIRTY_OFFICERS, dirty_params
+from backend.queries.templates import (
+    iter_uid_pages, run_uid_batches, uid_batch, uid_page)
 
-OFFICER_METRICS_INPUT_QUERY = """
-MATCH (o:Officer)
+
+OFFICER_METRICS_SUBQUERIES = """
 CALL (o) {
     OPTIONAL MATCH (o)-[:ACCUSED_OF]->(al:Allegation)-[:ALLEGED]->(c:Complaint)
     RETURN
@@ -15,14 +23,39 @@ CALL (o) {
             END
         ) AS substantiated_count
 }
+""" + HISTORY_ARRAYS_SUBQUERY
+
+OFFICER_METRICS_INPUT_RETURN = OFFICER_METRICS_SUBQUERIES + """
 RETURN
     o.uid AS officer_uid,
     complaint_count,
     allegation_count,
-    substantiated_count
+    substantiated_count,
+    complaint_history
 ORDER BY officer_uid ASC
 """
 
+OFFICER_METRICS_INPUT_QUERY = (
+    "\nMATCH (o:Officer)" + uid_page("o") + OFFICER_METRICS_INPUT_RETURN)
+
+DIRTY_OFFICER_METRICS_INPUT_QUERY = (
+    DIRTY_OFFICERS + uid_page("o") + OFFICER_METRICS_INPUT_RETURN)
+
+OFFICER_METRICS_SET = OFFICER_METRICS_SUBQUERIES + """
+SET
+    o.complaint_count_cached = complaint_count,
+    o.allegation_count_cached = allegation_count,
+    o.substantiated_count_cached = substantiated_count,
+    o.metrics_updated_at = datetime($metrics_updated_at)
+""" + set_history_arrays(
+    "o", "complaint_history", "datetime($metrics_updated_at)")
+
+OFFICER_METRICS_IN_DATABASE_QUERY = (
+    "\nMATCH (o:Officer)" + uid_batch("o", OFFICER_METRICS_SET))
+
+DIRTY_OFFICER_METRICS_IN_DATABASE_QUERY = (
+    DIRTY_OFFICERS + uid_batch("o", OFFICER_METRICS_SET))
+
 UPDATE_OFFICER_METRICS_CACHE_QUERY = """
 UNWIND $updates AS row
 MATCH (o:Officer {uid: row.officer_uid})
@@ -31,15 +64,98 @@ SET
     o.allegation_count_cached = row.allegation_count_cached,
     o.substantiated_count_cached = row.substantiated_count_cached,
     o.metrics_updated_at = datetime(row.metrics_updated_at)
+""" + set_history_arrays(
+    "o", "row.complaint_history", "datetime(row.metrics_updated_at)") + """
 RETURN count(o) AS updated
 """
 
+LAST_OFFICER_REFRESH_QUERY = """
+MATCH (o:Officer)
+RETURN max(o.metrics_updated_at) AS last_refresh
+"""
+
 
 class OfficerCacheQueries:
-    def fetch_officer_metrics_inputs(self):
-        rows, _ = db.cypher_query(OFFICER_METRICS_INPUT_QUERY)
+    def fetch_officer_metrics_inputs(
+        self,
+        *,
+        after: str = "",
+        until: str | None = None,
+        page_size: int = 500,
+        since: datetime | None = None,
+    ):
+        """
+        One uid-ordered page of officer metrics inputs. With `since`, only
+        the officer nodes touched since then are included.
+        """
+        query = (
+            DIRTY_OFFICER_METRICS_INPUT_QUERY if since is not None
+            else OFFICER_METRICS_INPUT_QUERY
+        )
+        rows, _ = db.cypher_query(
+            query,
+            {
+                "after": after,
+                "until": until,
+                "page_size": page_size,
+                **dirty_params(since),
+            },
+        )
         return rows
 
+    def iter_officer_metrics_inputs(
+        self,
+        *,
+        after: str = "",
+        until: str | None = None,
+        page_size: int = 500,
+        since: datetime | None = None,
+    ):
+        """Stream officer metrics inputs one page at a time."""
+        return iter_uid_pages(
+            lambda page_after: self.fetch_officer_metrics_inputs(
+                after=page_after, until=until, page_size=page_size,
+                since=since),
+            page_size,
+            after,
+        )
+
+    def fetch_last_refresh(self) -> datetime | None:
+        rows, _ = db.cypher_query(LAST_OFFICER_REFRESH_QUERY)
+        return as_utc(rows[0][0]) if rows else None
+
+    def refresh_officer_metrics_in_database(
+        self,
+        *,
+        batch_size: int,
+        metrics_updated_at: str,
+        since: datetime | None = None,
+        after: str = "",
+        until: str | None = None,
+    ) -> list[dict]:
+        """
+        Compute and write the cached officer metrics inside Neo4j, one
+        uid-ordered page of `batch_size` nodes per transaction. Returns
+        one entry per batch with its first uid, rows written and elapsed
+        time.
+        """
+        query = (
+            DIRTY_OFFICER_METRICS_IN_DATABASE_QUERY if since is not None
+            else OFFICER_METRICS_IN_DATABASE_QUERY
+        )
+        params = {
+            "page_size": batch_size,
+            "metrics_updated_at": metrics_updated_at,
+            **dirty_params(since),
+            "until": until,
+        }
+
+        def run_batch(after: str) -> list:
+            rows, _ = db.cypher_query(query, {**params, "after": after})
+            return rows
+
+        return run_uid_batches(run_batch, batch_size, after)
+
     def update_officer_metrics_cache(self, updates: list[dict]) -> int:
         if not updates:
             return 0
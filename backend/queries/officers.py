@@ -1,123 +1,14 @@
-from neomodel import db
-
-
-EMPLOYMENT_HISTORY_QUERY = """
-    MATCH (o:Officer {uid: $uid})-[:HELD_BY]-(e:Employment)-[:IN_UNIT]
-    -(u:Unit)-[:ESTABLISHED_BY]-(a:Agency)
-    WITH a, u, e
-    ORDER BY coalesce(e.latest_date, e.earliest_date) DESC
-    WITH
-      a,
-      u,
-      head(collect(e)) AS rep,
-      min(e.earliest_date) AS earliest_date,
-      max(e.latest_date)   AS latest_date
-    RETURN {
-      agency_uid:   a.uid,
-      agency_name:  a.name,
-      state:        a.hq_state,
-      unit_uid:     u.uid,
-      unit_name:    u.name,
-      badge_number: rep.badge_number,
-      highest_rank: rep.highest_rank,
-      salary:       rep.salary,
-      earliest_date: earliest_date,
-      latest_date:   latest_date
-    } AS item
-    LIMIT 20;
-    """
-
-ALLEGATION_SUMMARY_QUERY = """
-MATCH (o:Officer {uid: $uid})-[:ACCUSED_OF]->(a:Allegation)
-MATCH (a)-[:ALLEGED]->(c:Complaint)
-WITH
-  CASE
-    WHEN a.type IS NULL OR trim(a.type) = "" THEN "Unknown"
-    ELSE a.type
-  END AS type,
-  count(*) AS occurrences,
-  count(DISTINCT c.uid) AS complaint_count,
-  sum(CASE WHEN toLower(
-    trim(coalesce(a.finding,""))) = "substantiated" THEN 1 ELSE 0 END)
-    AS substantiated_count,
-  min(c.incident_date) AS earliest_incident_date,
-  max(c.incident_date) AS latest_incident_date
-ORDER BY occurrences DESC, type ASC
-RETURN
-  type,
-  complaint_count,
-  occurrences,
-  substantiated_count,
-  earliest_incident_date,
-  latest_incident_date
-LIMIT 10;
-"""
-
-SOURCES_QUERY = """
-MATCH (o:Officer {uid: $uid})
-CALL {
-  WITH o
-  MATCH (o)<-[:CHANGE_TO]-(:Change)-[:ATTRIBUTED_TO]->(s:Source)
-  RETURN s
-
-  UNION
-
-  WITH o
-  MATCH (o)-[:UPDATED_BY]->(s:Source)
-  RETURN s
-}
-RETURN DISTINCT {
-  name: s.name,
-  url: s.url,
-  contact_email: s.contact_email
-} AS source
-"""
-
-METRICS_COMPLAINTS_CYPHER = """
-MATCH (o:Officer {uid: $uid})-[:ACCUSED_OF]->
-(:Allegation)-[:ALLEGED]->(co:Complaint)
-WHERE co.incident_date IS NOT NULL
-WITH
-  co.incident_date.year AS year,
-  co
-WITH
-  year,
-  count(DISTINCT co) AS complaint_count,
-  count(DISTINCT CASE WHEN co.closed_date IS NOT NULL
-  THEN co END) AS closed_count
-ORDER BY year DESC
-LIMIT 7
-RETURN collect({
-  year: year,
-  complaint_count: complaint_count,
-  closed_count: closed_count
-}) AS results;
-"""
-
+from datetime import datetime
 
-# Last 7 Calendar years of complaint counts
-METRICS_COMPLAINT_HISTORY_QUERY = """
-WITH range(date().year - 6, date().year) AS years
-UNWIND years AS year
-OPTIONAL MATCH (o:Officer {uid: $uid})-
-[:ACCUSED_OF]->(:Allegation)-[:ALLEGED]->(co:Complaint)
-WHERE co.incident_date IS NOT NULL AND co.incident_date.year = year
-WITH
-  year,
-  count(DISTINCT co) AS complaint_count,
-  count(DISTINCT CASE WHEN co.closed_date IS NOT NULL
-  THEN co END) AS closed_count
-ORDER BY year DESC
-RETURN collect({
-  year: year,
-  complaint_count: complaint_count,
-  closed_count: closed_count
-}) AS results;
-"""
+from neomodel import db
+from backend.database.routing import read_only
+from backend.queries.complaint_history import COMPLAINT_HISTORY_SUBQUERY
+from backend.queries.templates import (
+    include_return_fields, projected_row, projection_return, query_templates)
 
-METRICS_ALLEGATION_TYPES_QUERY = """
-MATCH (o:Officer {uid: $uid})
 
+# The officer metrics below run as subqueries of `o` and return `result`.
+METRICS_ALLEGATION_TYPES = """
 CALL (o) {
   MATCH (o)-[:ACCUSED_OF]->(al:Allegation)
   RETURN count(al) AS total_allegations
@@ -141,11 +32,10 @@ WITH
 RETURN {
   total_allegations: total_allegations,
   top_types: top_types
-} AS result;
+} AS result
 """
 
-METRICS_ALLEGATION_OUTCOMES_QUERY = """
-MATCH (o:Officer {uid: $uid})
+METRICS_ALLEGATION_OUTCOMES = """
 OPTIONAL MATCH (o)-[:ACCUSED_OF]->(al:Allegation)
 WITH
   // keep only non-null / non-blank outcomes
@@ -200,12 +90,11 @@ RETURN {
     }
     ELSE NULL
   END
-} AS result;
+} AS result
 """
 
-METRICS_COMPLAINANT_DEMOGRAPHICS_QUERY = """
-MATCH (o:Officer {uid: $uid})-[:ACCUSED_OF]->
-(:Allegation)-[:REPORTED_BY]-(c:Civilian)
+METRICS_COMPLAINANT_DEMOGRAPHICS = """
+MATCH (o)-[:ACCUSED_OF]->(:Allegation)-[:REPORTED_BY]-(c:Civilian)
 WITH o, collect(DISTINCT c) AS civilians
 
 CALL (civilians) {
@@ -334,41 +223,230 @@ RETURN {
   ethnicity: ethnicity_breakdown,
   gender:    gender_breakdown,
   age_range: age_range_breakdown
-} AS result;
+} AS result
+"""
+
+OFFICER_BATCH_MATCH = """
+UNWIND $uids AS uid
+MATCH (o:Officer {uid: uid})
 """
 
+SOURCES_SUBQUERY = """
+CALL (o) {
+  CALL (o) {
+    MATCH (o)<-[:CHANGE_TO]-(:Change)-[:ATTRIBUTED_TO]->(s:Source)
+    RETURN s
+
+    UNION
+
+    MATCH (o)-[:UPDATED_BY]->(s:Source)
+    RETURN s
+  }
+  RETURN collect(DISTINCT {
+    name: s.name,
+    url: s.url,
+    contact_email: s.contact_email
+  }) AS sources
+}
+"""
+
+EMPLOYMENT_HISTORY_SUBQUERY = """
+CALL (o) {
+  MATCH (o)-[:HELD_BY]-(e:Employment)-[:IN_UNIT]
+  -(u:Unit)-[:ESTABLISHED_BY]-(a:Agency)
+  WITH a, u, e
+  ORDER BY coalesce(e.latest_date, e.earliest_date) DESC
+  WITH
+    a,
+    u,
+    head(collect(e)) AS rep,
+    min(e.earliest_date) AS earliest_date,
+    max(e.latest_date)   AS latest_date
+  WITH {
+    agency_uid:   a.uid,
+    agency_name:  a.name,
+    state:        a.hq_state,
+    unit_uid:     u.uid,
+    unit_name:    u.name,
+    badge_number: rep.badge_number,
+    highest_rank: rep.highest_rank,
+    salary:       rep.salary,
+    earliest_date: earliest_date,
+    latest_date:   latest_date
+  } AS item
+  LIMIT 20
+  RETURN collect(item) AS employment_history
+}
+"""
+
+ALLEGATION_SUMMARY_SUBQUERY = """
+CALL (o) {
+  MATCH (o)-[:ACCUSED_OF]->(al:Allegation)
+  MATCH (al)-[:ALLEGED]->(c:Complaint)
+  WITH
+    CASE
+      WHEN al.type IS NULL OR trim(al.type) = "" THEN "Unknown"
+      ELSE al.type
+    END AS type,
+    count(*) AS occurrences,
+    count(DISTINCT c.uid) AS complaint_count,
+    sum(CASE WHEN toLower(
+      trim(coalesce(al.finding,""))) = "substantiated" THEN 1 ELSE 0 END)
+      AS substantiated_count,
+    min(c.incident_date) AS earliest_incident_date,
+    max(c.incident_date) AS latest_incident_date
+  ORDER BY occurrences DESC, type ASC
+  LIMIT 10
+  RETURN collect([
+    type,
+    complaint_count,
+    occurrences,
+    substantiated_count,
+    earliest_incident_date,
+    latest_incident_date
+  ]) AS allegation_summary
+}
+"""
+
+# The employment tab reads the history on its own, from the same subquery
+# the profiles include.
+EMPLOYMENT_HISTORY_QUERY = query_templates.register(
+    "officer.employment_history",
+    "MATCH (o:Officer {uid: $uid})"
+    + EMPLOYMENT_HISTORY_SUBQUERY
+    + "UNWIND employment_history AS item\nRETURN item\n",
+)
+
+
+def _metric_subquery(body: str, alias: str) -> str:
+    """
+    Wrap a metric as a subquery of `o` that always returns one row, so a
+    metric with no data cannot drop the officer. It is null then.
+    """
+    return f"""
+CALL (o) {{
+  CALL (o) {{
+{body}
+  }}
+  RETURN head(collect(result)) AS {alias}
+}}
+"""
+
+
+METRIC_SUBQUERIES = {
+    "allegation_types": _metric_subquery(
+        METRICS_ALLEGATION_TYPES, "allegation_types"),
+    "allegation_outcomes": _metric_subquery(
+        METRICS_ALLEGATION_OUTCOMES, "allegation_outcomes"),
+    "complaint_history": _metric_subquery(
+        COMPLAINT_HISTORY_SUBQUERY + "  RETURN results AS result\n",
+        "complaint_history"),
+    "complainant_demographics": _metric_subquery(
+        METRICS_COMPLAINANT_DEMOGRAPHICS, "complainant_demographics"),
+}
+
 
 class OfficerQueries:
-    def fetch_sources(self, officer_uid: str):
-        rows, _ = db.cypher_query(SOURCES_QUERY, {"uid": officer_uid})
-        return [row[0] for row in rows]
+    INCLUDE_SPECS = {
+        "employment": {
+            "subquery": EMPLOYMENT_HISTORY_SUBQUERY,
+            "return_fields": ["employment_history"],
+        },
+        "allegations": {
+            "subquery": ALLEGATION_SUMMARY_SUBQUERY,
+            "return_fields": ["allegation_summary"],
+        },
+    }
+
+    @read_only
+    def fetch_officer_profiles(
+        self,
+        uids: list[str],
+        includes: list[str],
+        fields: list[str] | None = None,
+    ) -> dict[str, dict]:
+        """Fetch several officer profiles in one query, keyed by uid.
 
+        Each result carries the officer, or only its `fields` when given,
+        its sources and the requested includes. Unknown uids are left out
+        of the result.
+        """
+        includes = tuple(
+            include for include in self.INCLUDE_SPECS if include in includes)
+        cypher = _officer_profiles_query(includes, bool(fields))
+        return_fields = include_return_fields(
+            ["o", "sources"], self.INCLUDE_SPECS, includes)
+
+        rows, _ = db.cypher_query(
+            cypher, {"uids": uids, "fields": fields or []},
+            resolve_objects=True)
+        profiles = {}
+        for row in rows:
+            result = dict(zip(return_fields, row))
+            if fields:
+                result["o"] = projected_row(fields, result["o"])
+                uid = result["o"]["uid"]
+            else:
+                uid = result["o"].uid
+            profiles.setdefault(uid, result)
+        return profiles
+
+    @read_only
     def fetch_emp_history(self, officer_uid: str):
         rows, _ = db.cypher_query(
             EMPLOYMENT_HISTORY_QUERY, {"uid": officer_uid})
         return [row[0] for row in rows]
 
-    def fetch_alleg_summary(self, officer_uid: str):
+    @read_only
+    def fetch_officer_metrics(
+        self,
+        officer_uid: str,
+        includes: list[str],
+        metrics_fresh_after: datetime | None = None,
+    ) -> dict | None:
+        """
+        The requested metrics of one officer in a single query, each under
+        its include name and {} when it has no data. None when there is
+        no such officer.
+        """
+        includes = tuple(
+            include for include in METRIC_SUBQUERIES if include in includes)
         rows, _ = db.cypher_query(
-            ALLEGATION_SUMMARY_QUERY, {"uid": officer_uid})
-        return rows
+            _officer_metrics_query(includes),
+            {"uid": officer_uid, "metrics_fresh_after": metrics_fresh_after})
+        if not rows:
+            return None
+        return {
+            include: {} if value is None else value
+            for include, value in zip(includes, rows[0][1:])
+        }
 
-    def fetch_metric_a_types(self, officer_uid: str):
-        rows, _ = db.cypher_query(
-            METRICS_ALLEGATION_TYPES_QUERY, {"uid": officer_uid})
-        return rows[0][0] if rows else {}
 
-    def fetch_metric_a_outcomes(self, officer_uid: str):
-        rows, _ = db.cypher_query(
-            METRICS_ALLEGATION_OUTCOMES_QUERY, {"uid": officer_uid})
-        return rows[0][0] if rows else {}
+@query_templates.shape("officer.profiles")
+def _officer_profiles_query(
+    includes: tuple[str, ...],
+    projected: bool,
+) -> str:
+    return_fields = include_return_fields(
+        ["o", "sources"], OfficerQueries.INCLUDE_SPECS, includes)
+    return_fields[0] = projection_return("o", projected, alias="o")
+    return (
+        OFFICER_BATCH_MATCH
+        + SOURCES_SUBQUERY
+        + "\n".join(
+            OfficerQueries.INCLUDE_SPECS[include]["subquery"]
+            for include in includes
+        )
+        + "\nRETURN "
+        + ", ".join(return_fields)
+    )
 
-    def fetch_metric_comp_history(self, officer_uid: str):
-        rows, _ = db.cypher_query(
-            METRICS_COMPLAINT_HISTORY_QUERY, {"uid": officer_uid})
-        return rows[0][0] if rows else []
 
-    def fetch_metric_comp_demo(self, officer_uid: str):
-        rows, _ = db.cypher_query(
-            METRICS_COMPLAINANT_DEMOGRAPHICS_QUERY, {"uid": officer_uid})
-        return rows[0][0] if rows else {}
+@query_templates.shape("officer.metrics")
+def _officer_metrics_query(includes: tuple[str, ...]) -> str:
+    return (
+        "\nMATCH (o:Officer {uid: $uid})"
+        + "".join(METRIC_SUBQUERIES[include] for include in includes)
+        + "\nRETURN "
+        + ", ".join(("o.uid AS officer_uid",) + includes)
+    )
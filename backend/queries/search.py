@@ -1,12 +1,17 @@
 import re
+import threading
+import time
+from enum import Enum
 
 from neomodel import db
+from backend.database.routing import read_only
 from backend.queries.filter_resolver import FilterResolver
+from backend.queries.templates import query_templates
 
 LUCENE_RESERVED_PATTERN = re.compile(r'[+\-!(){}\[\]^"~*?:\\/|&]+')
 LUCENE_BOOLEAN_OPERATORS = {"AND", "OR", "NOT"}
 
-SEARCH_BASE_QUERY = """
+SEARCH_MATCH_UNION = """
 CALL () {
     CALL db.index.fulltext.queryNodes('officerNames',$query)  YIELD node, score
     WHERE (
@@ -60,6 +65,9 @@ CALL () {
     )
     RETURN node, score
 }
+"""
+
+SEARCH_BASE_QUERY = SEARCH_MATCH_UNION + """
 WITH node, max(score) AS score
 """
 
@@ -68,8 +76,16 @@ SEARCH_COUNT_QUERY = SEARCH_BASE_QUERY + """
 RETURN count(node) AS totalMatches
 """
 
+# Stops after $count_limit distinct matches, so the city/source EXISTS
+# filters are not evaluated for every hit of a broad prefix query.
+SEARCH_CAPPED_COUNT_QUERY = SEARCH_MATCH_UNION + """
+WITH DISTINCT node
+LIMIT $count_limit
+RETURN count(node) AS totalMatches
+"""
+
 
-SEARCH_RESULTS_QUERY = SEARCH_BASE_QUERY + """
+SEARCH_RANKING = """
 WITH node, score,
 CASE
     WHEN 'Officer' IN labels(node) THEN trim(
@@ -80,8 +96,7 @@ CASE
     )
     ELSE coalesce(node.name, '')
 END AS display_name
-RETURN node, score
-ORDER BY
+WITH node, score,
 CASE
     WHEN toLower(display_name) = $raw_query_normalized THEN 0
     WHEN toLower(display_name) STARTS WITH $raw_query_normalized THEN 1
@@ -89,16 +104,32 @@ CASE
         AND all(term IN $query_terms WHERE toLower(display_name) CONTAINS term)
         THEN 2
     ELSE 3
-END ASC,
-score DESC,
-node.uid ASC
+END AS rank_bucket
+"""
+
+
+# Resumes after the (rank_bucket, score, uid) key of a cursor. The
+# parameters are null when paging by number, so both modes share one plan.
+SEARCH_KEYSET_FILTER = """
+WITH node, score, rank_bucket
+WHERE $after_uid IS NULL
+    OR rank_bucket > $after_bucket
+    OR (rank_bucket = $after_bucket AND (
+        score < $after_score
+        OR (score = $after_score AND node.uid > $after_uid)
+    ))
+"""
+
+
+SEARCH_RESULTS_QUERY = (
+    SEARCH_BASE_QUERY + SEARCH_RANKING + SEARCH_KEYSET_FILTER + """
+RETURN node, score, rank_bucket
+ORDER BY rank_bucket ASC, score DESC, node.uid ASC
 SKIP $per_page * ($page - 1)
 LIMIT $per_page
-"""
+""")
 
-SEARCH_DETAILS_QUERY = """
-CALL () {
-    UNWIND $officer_uids AS uid
+OFFICER_DETAILS_FRAGMENT = """
     MATCH (o:Officer {uid: uid})
 
     CALL (o) {
@@ -118,7 +149,7 @@ CALL () {
         LIMIT 1
     }
 
-    RETURN "Officer" AS content_type, uid, {
+    WITH uid, {
         complaints: coalesce(o.complaint_count_cached, 0),
         allegations: coalesce(o.allegation_count_cached, 0),
         substantiated: coalesce(o.substantiated_count_cached, 0),
@@ -128,10 +159,9 @@ CALL () {
         source: s.name,
         last_updated: updated_at
     } AS result
+"""
 
-    UNION ALL
-
-    UNWIND $agency_uids AS uid
+AGENCY_DETAILS_FRAGMENT = """
     MATCH (a:Agency {uid: uid})
 
     CALL (a) {
@@ -142,17 +172,16 @@ CALL () {
         LIMIT 1
     }
 
-    RETURN "Agency" AS content_type, uid, {
+    WITH uid, {
         units: coalesce(a.unit_count_cached, 0),
         officers: coalesce(a.officer_count_cached, 0),
         complaints: coalesce(a.complaint_count_cached, 0),
         source: s.name,
         last_updated: updated_at
     } AS result
+"""
 
-    UNION ALL
-
-    UNWIND $unit_uids AS uid
+UNIT_DETAILS_FRAGMENT = """
     MATCH (u:Unit {uid: uid})
     OPTIONAL MATCH (u)-[]-(a:Agency)
 
@@ -164,7 +193,7 @@ CALL () {
         LIMIT 1
     }
 
-    RETURN "Unit" AS content_type, uid, {
+    WITH uid, {
         name: u.name,
         agency_name: a.name,
         officers: coalesce(u.officer_count_cached, 0),
@@ -172,14 +201,141 @@ CALL () {
         source: s.name,
         last_updated: updated_at
     } AS result
+"""
+
+SEARCH_DETAILS_QUERY = """
+CALL () {
+    UNWIND $officer_uids AS uid
+""" + OFFICER_DETAILS_FRAGMENT + """
+    RETURN "Officer" AS content_type, uid, result
+
+    UNION ALL
+
+    UNWIND $agency_uids AS uid
+""" + AGENCY_DETAILS_FRAGMENT + """
+    RETURN "Agency" AS content_type, uid, result
+
+    UNION ALL
+
+    UNWIND $unit_uids AS uid
+""" + UNIT_DETAILS_FRAGMENT + """
+    RETURN "Unit" AS content_type, uid, result
 }
 RETURN content_type, uid, result
 """
 
+# Fused execution: total, ranked page and per-type details in one round trip.
+# The fulltext indexes are queried once: every ranked match is collected,
+# its size is the total and the page is sliced from it, plus one row to
+# tell whether another follows.
+SEARCH_FUSED_RANKING = SEARCH_BASE_QUERY + SEARCH_RANKING + """
+WITH node, score, rank_bucket
+ORDER BY rank_bucket ASC, score DESC, node.uid ASC
+WITH collect({node: node, score: score, rank_bucket: rank_bucket}) AS ranked
+WITH
+    size(ranked) AS total,
+    ranked[$per_page * ($page - 1)..$per_page * $page + 1] AS rows
+WITH total, rows[..$per_page] AS page_rows, size(rows) > $per_page AS has_more
+"""
+
+# Without a total, the page is sorted and cut with SKIP/LIMIT, a bounded
+# top-k, and only the page and the row after it are collected.
+SEARCH_FUSED_ORDERING = (
+    SEARCH_BASE_QUERY + SEARCH_RANKING + SEARCH_KEYSET_FILTER + """
+WITH node, score, rank_bucket
+ORDER BY rank_bucket ASC, score DESC, node.uid ASC
+SKIP $per_page * ($page - 1)
+LIMIT $per_page + 1
+WITH collect({node: node, score: score, rank_bucket: rank_bucket}) AS rows
+WITH rows[..$per_page] AS page_rows, size(rows) > $per_page AS has_more
+""")
+
+# Each detail CALL aggregates, so it yields exactly one row even when the
+# page holds no node of that type.
+SEARCH_FUSED_DETAILS = """
+CALL (page_rows) {
+    UNWIND page_rows AS row
+    WITH row.node AS n
+    WHERE n:Officer
+    WITH n.uid AS uid
+""" + OFFICER_DETAILS_FRAGMENT + """
+    RETURN collect([uid, result]) AS officer_details
+}
+
+CALL (page_rows) {
+    UNWIND page_rows AS row
+    WITH row.node AS n
+    WHERE n:Agency
+    WITH n.uid AS uid
+""" + AGENCY_DETAILS_FRAGMENT + """
+    RETURN collect([uid, result]) AS agency_details
+}
+
+CALL (page_rows) {
+    UNWIND page_rows AS row
+    WITH row.node AS n
+    WHERE n:Unit
+    WITH n.uid AS uid
+""" + UNIT_DETAILS_FRAGMENT + """
+    RETURN collect([uid, result]) AS unit_details
+}
+
+RETURN
+    total,
+    has_more,
+    [row IN page_rows | [row.node, row.score, row.rank_bucket]] AS results,
+    officer_details,
+    agency_details,
+    unit_details
+"""
+
+
+SEARCH_FUSED_QUERY = SEARCH_FUSED_RANKING + SEARCH_FUSED_DETAILS
+
+# For cursor pages and cached totals, which need no count.
+SEARCH_PAGE_FUSED_QUERY = SEARCH_FUSED_ORDERING + """
+WITH page_rows, has_more, null AS total
+""" + SEARCH_FUSED_DETAILS
+
+query_templates.register("search.count", SEARCH_COUNT_QUERY)
+query_templates.register("search.capped_count", SEARCH_CAPPED_COUNT_QUERY)
+query_templates.register("search.results", SEARCH_RESULTS_QUERY)
+query_templates.register("search.details", SEARCH_DETAILS_QUERY)
+query_templates.register("search.fused", SEARCH_FUSED_QUERY)
+query_templates.register("search.page_fused", SEARCH_PAGE_FUSED_QUERY)
+
+
+class CountStrategy(str, Enum):
+    """How `totalMatches` is computed for a search page.
+
+    EXACT counts every match. CAPPED stops counting once the window
+    (the larger of the cap and the requested page) is exceeded and reports
+    the total as a lower bound. CACHED counts exactly once per normalized
+    query and filters, and reuses that total until the TTL expires.
+    """
+    EXACT = "exact"
+    CAPPED = "capped"
+    CACHED = "cached"
+
 
 class SearchQueries:
-    def __init__(self, filter_resolver: FilterResolver | None = None):
+    def __init__(
+        self,
+        filter_resolver: FilterResolver | None = None,
+        *,
+        count_strategy: CountStrategy | str = CountStrategy.EXACT,
+        count_cap: int = 1000,
+        count_cache_ttl: float = 300.0,
+        count_cache_size: int = 1024,
+    ):
         self.filter_resolver = filter_resolver or FilterResolver()
+        self.count_strategy = CountStrategy(count_strategy)
+        self.count_cap = count_cap
+        self.count_cache_ttl = count_cache_ttl
+        self.count_cache_size = count_cache_size
+        self._count_cache: dict[tuple, tuple[float, int, bool]] = {}
+        # Shared by the request threads of a worker.
+        self._count_cache_lock = threading.Lock()
 
     def tokenize_query(self, raw_query: str) -> list[str]:
         sanitized = LUCENE_RESERVED_PATTERN.sub(" ", raw_query)
@@ -207,8 +363,10 @@ class SearchQueries:
         per_page: int,
         city_uids: list[str] | None = None,
         source_uids: list[str] | None = None,
+        after: list | None = None,
     ) -> dict:
         query_terms = self.tokenize_query(query)
+        after_bucket, after_score, after_uid = self.search_keyset(after)
         return {
             "query": self.build_fulltext_query(query),
             "raw_query_normalized": " ".join(query_terms),
@@ -217,8 +375,25 @@ class SearchQueries:
             "source_uids": source_uids or [],
             "page": page,
             "per_page": per_page,
+            "after_bucket": after_bucket,
+            "after_score": after_score,
+            "after_uid": after_uid,
         }
 
+    def search_keyset(self, after: list | None) -> tuple:
+        """Validate a decoded search cursor as `(rank_bucket, score, uid)`."""
+        if after is None:
+            return None, None, None
+        if len(after) == 3:
+            bucket, score, uid = after
+            if (
+                isinstance(bucket, int)
+                and isinstance(score, (int, float))
+                and isinstance(uid, str)
+            ):
+                return bucket, score, uid
+        raise ValueError("Invalid cursor")
+
     def resolve_search_city_uids(
         self,
         *,
@@ -243,6 +418,7 @@ class SearchQueries:
             source_uid=source_uid,
         )
 
+    @read_only
     def count_search_results(
         self,
         *,
@@ -262,6 +438,98 @@ class SearchQueries:
         rows, _ = db.cypher_query(SEARCH_COUNT_QUERY, params)
         return rows[0][0] if rows else 0
 
+    def count_window(self, page: int, per_page: int) -> int:
+        return max(self.count_cap, page * per_page)
+
+    def _count_cache_key(self, params: dict) -> tuple:
+        return (
+            params["query"],
+            tuple(sorted(params["city_uids"])),
+            tuple(sorted(params["source_uids"])),
+        )
+
+    def _get_cached_count(self, params: dict) -> tuple[int, bool] | None:
+        key = self._count_cache_key(params)
+        with self._count_cache_lock:
+            entry = self._count_cache.get(key)
+            if entry is None:
+                return None
+            expires_at, total, approximate = entry
+            if expires_at <= time.monotonic():
+                self._count_cache.pop(key, None)
+                return None
+            return total, approximate
+
+    def _set_cached_count(
+        self,
+        params: dict,
+        total: int,
+        approximate: bool,
+    ) -> None:
+        now = time.monotonic()
+        with self._count_cache_lock:
+            if len(self._count_cache) >= self.count_cache_size:
+                self._count_cache = {
+                    key: entry
+                    for key, entry in self._count_cache.items()
+                    if entry[0] > now
+                }
+                if len(self._count_cache) >= self.count_cache_size:
+                    self._count_cache.pop(next(iter(self._count_cache)))
+            self._count_cache[self._count_cache_key(params)] = (
+                now + self.count_cache_ttl,
+                total,
+                approximate,
+            )
+
+    def clear_count_cache(self) -> None:
+        with self._count_cache_lock:
+            self._count_cache.clear()
+
+    @read_only
+    def count_search_matches(
+        self,
+        *,
+        query: str,
+        page: int,
+        per_page: int,
+        city_uids: list[str] | None = None,
+        source_uids: list[str] | None = None,
+    ) -> tuple[int, bool]:
+        """Count search matches using the configured `count_strategy`.
+
+        Returns:
+            tuple[int, bool]: The total and whether it is only a lower bound.
+        """
+        params = self.build_search_params(
+            query=query,
+            page=page,
+            per_page=per_page,
+            city_uids=city_uids,
+            source_uids=source_uids,
+        )
+
+        if self.count_strategy == CountStrategy.CACHED:
+            cached = self._get_cached_count(params)
+            if cached is not None:
+                return cached
+
+        if self.count_strategy == CountStrategy.CAPPED:
+            window = self.count_window(page, per_page)
+            params["count_limit"] = window + 1
+            rows, _ = db.cypher_query(SEARCH_CAPPED_COUNT_QUERY, params)
+            total = rows[0][0] if rows else 0
+            if total > window:
+                return window, True
+            return total, False
+
+        rows, _ = db.cypher_query(SEARCH_COUNT_QUERY, params)
+        total = rows[0][0] if rows else 0
+        if self.count_strategy == CountStrategy.CACHED:
+            self._set_cached_count(params, total, False)
+        return total, False
+
+    @read_only
     def fetch_search_results(
         self,
         *,
@@ -270,6 +538,7 @@ class SearchQueries:
         per_page: int,
         city_uids: list[str] | None = None,
         source_uids: list[str] | None = None,
+        after: list | None = None,
     ):
         params = self.build_search_params(
             query=query,
@@ -277,10 +546,12 @@ class SearchQueries:
             per_page=per_page,
             city_uids=city_uids,
             source_uids=source_uids,
+            after=after,
         )
         rows, _ = db.cypher_query(SEARCH_RESULTS_QUERY, params)
         return rows
 
+    @read_only
     def fetch_search_details(
         self,
         *,
@@ -304,3 +575,108 @@ class SearchQueries:
             details.setdefault(content_type, {})[uid] = row or {}
 
         return details
+
+    @read_only
+    def fetch_search_page(
+        self,
+        *,
+        query: str,
+        page: int,
+        per_page: int,
+        city_uids: list[str] | None = None,
+        source_uids: list[str] | None = None,
+    ) -> tuple[int, bool, list, dict[str, dict[str, dict]]]:
+        """Run the fused search query.
+
+        Returns the total match count, whether that total is only a lower
+        bound, the ranked `(node, score, rank_bucket)` rows for the requested
+        page and the per-type detail maps, in the same shapes as
+        `count_search_matches`, `fetch_search_results` and
+        `fetch_search_details`.
+        """
+        params = self.build_search_params(
+            query=query,
+            page=page,
+            per_page=per_page,
+            city_uids=city_uids,
+            source_uids=source_uids,
+        )
+        window = None
+        cached = None
+        if self.count_strategy == CountStrategy.CACHED:
+            cached = self._get_cached_count(params)
+
+        if cached is not None:
+            # The total is already known, so only the page is ranked.
+            rows, _ = db.cypher_query(SEARCH_PAGE_FUSED_QUERY, params)
+        else:
+            # Ranking the page visits every match, so the exact total comes
+            # with it; a capped strategy only reports less of it.
+            if self.count_strategy == CountStrategy.CAPPED:
+                window = self.count_window(page, per_page)
+            rows, _ = db.cypher_query(SEARCH_FUSED_QUERY, params)
+        if not rows:
+            return 0, False, [], {"Officer": {}, "Agency": {}, "Unit": {}}
+
+        (
+            total, _has_more, results, officer_rows, agency_rows, unit_rows
+        ) = rows[0]
+        approximate = False
+        if cached is not None:
+            total, approximate = cached
+        elif window is not None and total > window:
+            total, approximate = window, True
+        elif self.count_strategy == CountStrategy.CACHED:
+            self._set_cached_count(params, total, approximate)
+
+        details = self._fused_details(officer_rows, agency_rows, unit_rows)
+        return total, approximate, results, details
+
+    @read_only
+    def fetch_search_page_after(
+        self,
+        *,
+        query: str,
+        after: list,
+        per_page: int,
+        city_uids: list[str] | None = None,
+        source_uids: list[str] | None = None,
+    ) -> tuple[list, dict[str, dict[str, dict]], bool]:
+        """Run the fused search query for the page following a cursor.
+
+        Only one row past the page is ranked, to tell whether another page
+        follows, so the cost doesn't grow with how far the caller has read.
+
+        Returns:
+            The ranked `(node, score, rank_bucket)` rows, the per-type detail
+            maps and whether more results follow.
+        """
+        params = self.build_search_params(
+            query=query,
+            page=1,
+            per_page=per_page,
+            city_uids=city_uids,
+            source_uids=source_uids,
+            after=after,
+        )
+        rows, _ = db.cypher_query(SEARCH_PAGE_FUSED_QUERY, params)
+        if not rows:
+            return [], {"Officer": {}, "Agency": {}, "Unit": {}}, False
+
+        (
+            _total, has_more, results, officer_rows, agency_rows, unit_rows
+        ) = rows[0]
+        details = self._fused_details(officer_rows, agency_rows, unit_rows)
+        return results, details, has_more
+
+    def _fused_details(
+        self,
+        officer_rows: list,
+        agency_rows: list,
+        unit_rows: list,
+    ) -> dict[str, dict[str, dict]]:
+        return {
+            "Officer": {uid: row or {} for uid, row in officer_rows},
+            "Agency": {uid: row or {} for uid, row in agency_rows},
+            "Unit": {uid: row or {} for uid, row in unit_rows},
+        }
@@ -0,0 +1,265 @@
+import datetime
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Iterator
+
+
+class QueryTemplates:
+    """
+    Process-local catalogue of the Cypher query shapes we send to Neo4j.
+
+    Builders register under a name and are memoized by their signature, the
+    hashable arguments that decide the query text (includes, filter keys,
+    search strategy, ...). Values always travel as parameters, so each shape
+    is built once per process and Neo4j sees one query string per shape.
+    """
+
+    def __init__(self):
+        self._templates: dict[tuple[str, tuple], str] = {}
+        self._constants: dict[tuple[str, tuple], str] = {}
+        # Query text to shape name, to label the queries as they run.
+        self._names: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        name: str,
+        signature: tuple,
+        build: Callable[[], str],
+    ) -> str:
+        key = (name, signature)
+        cypher = self._templates.get(key)
+        if cypher is not None:
+            with self._lock:
+                self.hits += 1
+            return cypher
+
+        cypher = build()
+        with self._lock:
+            self.misses += 1
+            cypher = self._templates.setdefault(key, cypher)
+            self._names.setdefault(cypher, name)
+            return cypher
+
+    def shape(self, name: str):
+        """Memoize a builder function by its (hashable) arguments."""
+        def decorator(build: Callable[..., str]):
+            @wraps(build)
+            def wrapper(*args):
+                return self.get(name, args, lambda: build(*args))
+            return wrapper
+        return decorator
+
+    def register(self, name: str, cypher: str) -> str:
+        """Catalogue a constant query so it is listed with built shapes."""
+        with self._lock:
+            self._constants[(name, ())] = cypher
+            self._names.setdefault(cypher, name)
+        return cypher
+
+    def name_of(self, cypher: str) -> str | None:
+        """The name a query was registered or built under, if any."""
+        return self._names.get(cypher)
+
+    def catalogue(self) -> dict[tuple[str, tuple], str]:
+        """Every constant and built query, keyed by (name, signature)."""
+        with self._lock:
+            return {**self._constants, **self._templates}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "constants": len(self._constants),
+                "shapes": len(self._templates),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def clear(self) -> None:
+        """Forget built shapes and reset the counters."""
+        with self._lock:
+            self._templates.clear()
+            self._names = {
+                cypher: name for (name, _), cypher in self._constants.items()
+            }
+            self.hits = 0
+            self.misses = 0
+
+
+query_templates = QueryTemplates()
+
+
+def include_return_fields(
+    base_fields: list[str],
+    include_specs: dict,
+    includes: tuple[str, ...],
+) -> list[str]:
+    """Columns returned by a profile query built from `INCLUDE_SPECS`."""
+    return_fields = list(base_fields)
+    for include in includes:
+        return_fields.extend(include_specs[include]["return_fields"])
+    return return_fields
+
+
+def projection_return(
+        var: str, projected: bool, alias: str = "projection") -> str:
+    """
+    The RETURN item for a listed node: the node itself, or only the
+    `$fields` properties, as a list in the same order.
+    """
+    if projected:
+        return f"[field IN $fields | {var}[field]] AS {alias}"
+    return var
+
+
+def projected_row(fields: list[str], values: list) -> OrderedDict:
+    """Pair the values of a `projection_return` column with their fields."""
+    row = OrderedDict()
+    for field, value in zip(fields, values):
+        if hasattr(value, "to_native"):
+            value = value.to_native()
+        if isinstance(value, (datetime.datetime, datetime.date)):
+            value = value.isoformat()
+        row[field] = value
+    return row
+
+
+def uid_range(var: str) -> str:
+    """
+    Cypher that keeps the `var` nodes whose uid is in `($after, $until]`,
+    with a null `$until` meaning no upper bound.
+    """
+    return f"""
+WITH {var}
+WHERE {var}.uid > $after
+AND ($until IS NULL OR {var}.uid <= $until)
+"""
+
+
+def uid_page(var: str) -> str:
+    """
+    Cypher that keeps one uid-ordered page of `var`, the `$page_size`
+    nodes after `$after`, so a label can be walked in bounded pages.
+    """
+    return uid_range(var) + f"""
+WITH {var}
+ORDER BY {var}.uid ASC
+LIMIT $page_size
+"""
+
+
+def iter_uid_pages(
+    fetch_page: Callable[[str], list],
+    page_size: int,
+    after: str = "",
+) -> Iterator:
+    """
+    Yield the rows of every page from `fetch_page(after)`, whose rows
+    start with the uid they are ordered by, until a page comes back short.
+    Only one page is held in memory at a time.
+    """
+    while True:
+        rows = fetch_page(after)
+        yield from rows
+        if len(rows) < page_size:
+            return
+        after = rows[-1][0]
+
+
+def uid_batch(var: str, body: str) -> str:
+    """
+    Cypher that runs `body` over one uid-ordered page of the `var` nodes
+    matched so far, the `$page_size` after `$after`, up to `$until` when
+    set. `body` sees one `var` per row and must keep it in scope. Returns
+    the first and last uid of the batch and the rows it wrote.
+    """
+    return uid_page(var) + body + f"""
+RETURN
+    min({var}.uid) AS batch_start,
+    max({var}.uid) AS batch_end,
+    count({var}) AS updated
+"""
+
+
+def run_uid_batches(
+    run_batch: Callable[[str], list],
+    page_size: int,
+    after: str = "",
+) -> list[dict]:
+    """
+    Run `run_batch(after)`, a `uid_batch` query committed on its own,
+    over successive pages until one comes back short. Returns the first
+    uid, rows written and elapsed time of every batch.
+    """
+    batches = []
+    while True:
+        started = time.perf_counter()
+        [(batch_start, batch_end, updated)] = run_batch(after)
+        if updated:
+            batches.append({
+                "batch_start": batch_start,
+                "updated": updated,
+                "elapsed_ms": round(
+                    (time.perf_counter() - started) * 1000, 2),
+            })
+        if updated < page_size:
+            return batches
+        after = batch_end
+
+
+def fresh_metrics(var: str, stamp: str = "metrics_updated_at") -> str:
+    """
+    A Cypher predicate that is true when the cached metrics of `var` may
+    be served: `$metrics_fresh_after` is null, or they were refreshed
+    since then, according to their `stamp`. Never null, so it can be
+    negated.
+    """
+    return (
+        f"coalesce($metrics_fresh_after IS NULL"
+        f" OR {var}.{stamp} >= $metrics_fresh_after, false)"
+    )
+
+
+def cached_or_live(
+    var: str,
+    cached: str,
+    live: str,
+    columns: list[str],
+    stamp: str | None = None,
+) -> str:
+    """
+    A subquery that runs `cached` when the metrics of `var` are fresh and
+    `live` otherwise. With `stamp`, the cached value is only written by
+    some refreshes, which stamp it in that property instead of
+    `metrics_updated_at`, and a node without it is a cache miss. Both
+    must return `columns`.
+
+    Each branch runs in its own subquery, as one that aggregates returns
+    a row even when its branch is filtered out.
+    """
+    use_cache = fresh_metrics(var)
+    if stamp:
+        use_cache = (
+            f"({var}.{stamp} IS NOT NULL AND {fresh_metrics(var, stamp)})")
+    returned = ", ".join(columns)
+    return f"""
+CALL ({var}) {{
+  WITH {var}
+  WHERE {use_cache}
+  CALL ({var}) {{
+{cached}
+  }}
+  RETURN {returned}
+  UNION
+  WITH {var}
+  WHERE NOT {use_cache}
+  CALL ({var}) {{
+{live}
+  }}
+  RETURN {returned}
+}}
+"""
@@ -1,8 +1,18 @@
+from datetime import datetime
+
 from neomodel import db
 
+from backend.queries.allegation_summary import (
+    SUMMARY_STAMP, set_summary_arrays, summary_arrays_subquery)
+from backend.queries.clock import as_utc
+from backend.queries.dirty_set import DIRTY_UNITS, dirty_params
+from backend.queries.leaderboards import (
+    REPORTED_OFFICERS_RANKING, ranked_uids_subquery, set_ranked_uids)
+from backend.queries.templates import (
+    iter_uid_pages, run_uid_batches, uid_batch, uid_page)
 
-UNIT_METRICS_INPUT_QUERY = """
-MATCH (u:Unit)
+
+UNIT_METRICS_SUBQUERIES = """
 CALL (u) {
     OPTIONAL MATCH (u)<-[:IN_UNIT]-(:Employment)-[:HELD_BY]-(o:Officer)
     RETURN count(DISTINCT o) AS officer_count
@@ -14,14 +24,47 @@ CALL (u) {
         count(DISTINCT c) AS complaint_count,
         count(DISTINCT al) AS allegation_count
 }
+""" + summary_arrays_subquery("u", """
+    MATCH (u)<-[]-(:Employment)-[]->(:Officer)
+        -[:ACCUSED_OF]->(allege:Allegation)-[:ALLEGED]-(c:Complaint)
+""") + ranked_uids_subquery(
+    "u", REPORTED_OFFICERS_RANKING, "o", "reported_officer_uids")
+
+UNIT_METRICS_INPUT_RETURN = UNIT_METRICS_SUBQUERIES + """
 RETURN
     u.uid AS unit_uid,
     officer_count,
     complaint_count,
-    allegation_count
+    allegation_count,
+    allegation_summary,
+    reported_officer_uids
 ORDER BY unit_uid ASC
 """
 
+UNIT_METRICS_INPUT_QUERY = (
+    "\nMATCH (u:Unit)" + uid_page("u") + UNIT_METRICS_INPUT_RETURN)
+
+DIRTY_UNIT_METRICS_INPUT_QUERY = (
+    DIRTY_UNITS + uid_page("u") + UNIT_METRICS_INPUT_RETURN)
+
+UNIT_METRICS_SET = UNIT_METRICS_SUBQUERIES + """
+SET
+    u.officer_count_cached = officer_count,
+    u.complaint_count_cached = complaint_count,
+    u.allegation_count_cached = allegation_count,
+    u.metrics_updated_at = datetime($metrics_updated_at)
+""" + set_summary_arrays(
+    "u", "allegation_summary", stamp=SUMMARY_STAMP,
+    updated_at="datetime($metrics_updated_at)") + set_ranked_uids(
+    "u", "reported_officer_uids_cached", "reported_officer_uids",
+    "datetime($metrics_updated_at)")
+
+UNIT_METRICS_IN_DATABASE_QUERY = (
+    "\nMATCH (u:Unit)" + uid_batch("u", UNIT_METRICS_SET))
+
+DIRTY_UNIT_METRICS_IN_DATABASE_QUERY = (
+    DIRTY_UNITS + uid_batch("u", UNIT_METRICS_SET))
+
 UPDATE_UNIT_METRICS_CACHE_QUERY = """
 UNWIND $updates AS row
 MATCH (u:Unit {uid: row.unit_uid})
@@ -30,15 +73,101 @@ SET
     u.complaint_count_cached = row.complaint_count_cached,
     u.allegation_count_cached = row.allegation_count_cached,
     u.metrics_updated_at = datetime(row.metrics_updated_at)
+""" + set_summary_arrays(
+    "u", "row.allegation_summary", stamp=SUMMARY_STAMP,
+    updated_at="datetime(row.metrics_updated_at)") + set_ranked_uids(
+    "u", "reported_officer_uids_cached", "row.reported_officer_uids",
+    "datetime(row.metrics_updated_at)") + """
 RETURN count(u) AS updated
 """
 
+LAST_UNIT_REFRESH_QUERY = """
+MATCH (u:Unit)
+RETURN max(u.metrics_updated_at) AS last_refresh
+"""
+
 
 class UnitCacheQueries:
-    def fetch_unit_metrics_inputs(self):
-        rows, _ = db.cypher_query(UNIT_METRICS_INPUT_QUERY)
+    def fetch_unit_metrics_inputs(
+        self,
+        *,
+        after: str = "",
+        until: str | None = None,
+        page_size: int = 500,
+        since: datetime | None = None,
+    ):
+        """
+        One uid-ordered page of unit metrics inputs. With `since`, only
+        the unit nodes touched since then are included.
+        """
+        query = (
+            DIRTY_UNIT_METRICS_INPUT_QUERY if since is not None
+            else UNIT_METRICS_INPUT_QUERY
+        )
+        rows, _ = db.cypher_query(
+            query,
+            {
+                "after": after,
+                "until": until,
+                "page_size": page_size,
+                **dirty_params(since),
+            },
+        )
         return rows
 
+    def iter_unit_metrics_inputs(
+        self,
+        *,
+        after: str = "",
+        until: str | None = None,
+        page_size: int = 500,
+        since: datetime | None = None,
+    ):
+        """Stream unit metrics inputs one page at a time."""
+        return iter_uid_pages(
+            lambda page_after: self.fetch_unit_metrics_inputs(
+                after=page_after, until=until, page_size=page_size,
+                since=since),
+            page_size,
+            after,
+        )
+
+    def fetch_last_refresh(self) -> datetime | None:
+        rows, _ = db.cypher_query(LAST_UNIT_REFRESH_QUERY)
+        return as_utc(rows[0][0]) if rows else None
+
+    def refresh_unit_metrics_in_database(
+        self,
+        *,
+        batch_size: int,
+        metrics_updated_at: str,
+        since: datetime | None = None,
+        after: str = "",
+        until: str | None = None,
+    ) -> list[dict]:
+        """
+        Compute and write the cached unit metrics inside Neo4j, one
+        uid-ordered page of `batch_size` nodes per transaction. Returns
+        one entry per batch with its first uid, rows written and elapsed
+        time.
+        """
+        query = (
+            DIRTY_UNIT_METRICS_IN_DATABASE_QUERY if since is not None
+            else UNIT_METRICS_IN_DATABASE_QUERY
+        )
+        params = {
+            "page_size": batch_size,
+            "metrics_updated_at": metrics_updated_at,
+            **dirty_params(since),
+            "until": until,
+        }
+
+        def run_batch(after: str) -> list:
+            rows, _ = db.cypher_query(query, {**params, "after": after})
+            return rows
+
+        return run_uid_batches(run_batch, batch_size, after)
+
     def update_unit_metrics_cache(self, updates: list[dict]) -> int:
         if not updates:
             return 0
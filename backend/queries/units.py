@@ -1,68 +1,75 @@
+from datetime import datetime
 import logging
 
 from backend.database import db
+from backend.database.routing import read_only
+from backend.queries.allegation_summary import allegation_summary_subquery
+from backend.queries.leaderboards import (
+    REPORTED_OFFICERS_RANKING, leaderboard_subquery)
+from backend.queries.templates import (
+    cached_or_live, fresh_metrics, include_return_fields, projected_row,
+    projection_return, query_templates)
 
 UNIT_BASE_MATCH = """
 MATCH (u:Unit {uid: $uid})-[]-(a:Agency)
 """
 
-OFFICER_COUNT_SUBQUERY = """
-CALL (u) {
-  RETURN coalesce(u.officer_count_cached, 0) AS total_officers
-}
+UNIT_BATCH_MATCH = """
+UNWIND $uids AS uid
+MATCH (u:Unit {uid: uid})-[]-(a:Agency)
 """
 
-COMPLAINT_SUBQUERY = """
-CALL (u) {
+OFFICER_COUNT_SUBQUERY = cached_or_live(
+    "u",
+    """
+  RETURN coalesce(u.officer_count_cached, 0) AS total_officers
+""",
+    """
+  OPTIONAL MATCH (u)<-[:IN_UNIT]-(:Employment)-[:HELD_BY]-(o:Officer)
+  RETURN count(DISTINCT o) AS total_officers
+""",
+    columns=["total_officers"],
+)
+
+COMPLAINT_SUBQUERY = cached_or_live(
+    "u",
+    """
   RETURN
     coalesce(u.complaint_count_cached, 0) AS total_complaints,
     coalesce(u.allegation_count_cached, 0) AS total_allegations
+""",
+    """
+  OPTIONAL MATCH (u)<-[:IN_UNIT]-(:Employment)-[:HELD_BY]-(:Officer)
+      -[:ACCUSED_OF]->(al:Allegation)-[:ALLEGED]-(c:Complaint)
+  RETURN
+    count(DISTINCT c) AS total_complaints,
+    count(DISTINCT al) AS total_allegations
+""",
+    columns=["total_complaints", "total_allegations"],
+)
+
+# Null when the counts above were computed live.
+METRICS_AS_OF_SUBQUERY = """
+CALL (u) {
+  RETURN CASE WHEN """ + fresh_metrics("u") + """
+    THEN u.metrics_updated_at END AS metrics_as_of
 }
 """
 
-ALLEGATION_SUBQUERY = """
-CALL (u) {
+ALLEGATION_SUBQUERY = allegation_summary_subquery("u", """
   OPTIONAL MATCH (u)<-[]-(:Employment)-[]->(:Officer)
       -[:ACCUSED_OF]->(allege:Allegation)
   MATCH (allege)-[:ALLEGED]-(c:Complaint)
-  WITH
-    CASE
-      WHEN allege.type IS NULL OR trim(allege.type) = "" THEN "Unknown"
-      ELSE allege.type
-    END AS type,
-    count(*) AS occurrences,
-    sum(
-      CASE
-        WHEN toLower(trim(coalesce(allege.finding, ""))) = "substantiated"
-        THEN 1 ELSE 0
-      END
-    ) AS substantiated_count,
-    min(c.incident_date) AS earliest_incident_date,
-    max(c.incident_date) AS latest_incident_date
-  ORDER BY occurrences DESC, type ASC
-  RETURN collect({
-    type: type,
-    occurrences: occurrences,
-    substantiated_count: substantiated_count,
-    earliest_incident_date: earliest_incident_date,
-    latest_incident_date: latest_incident_date
-  }) AS allegation_summary
-}
-"""
+""")
 
-REPORTED_OFFICER_SUBQUERY = """
-CALL (u) {
-  MATCH (u)<-[]-(:Employment)-[]->(o:Officer)
-    -[:ACCUSED_OF]->(allege:Allegation)-[:ALLEGED]-(c:Complaint)
-  WITH
-    o,
-    count(DISTINCT c) AS complaint_count,
-    count(DISTINCT allege) AS allegation_count
-  ORDER BY complaint_count DESC, allegation_count DESC
-  LIMIT 3
-  RETURN collect(o) AS most_reported_officers
-}
-"""
+REPORTED_OFFICER_SUBQUERY = leaderboard_subquery(
+    "u",
+    REPORTED_OFFICERS_RANKING,
+    "o",
+    "reported_officer_uids_cached",
+    "Officer",
+    "most_reported_officers",
+)
 
 LOCATION_SUBQUERY = """
 CALL (u) {
@@ -76,6 +83,125 @@ CALL (u) {
 }
 """
 
+# Officer search bases, one per search-term strategy. Each ends with
+# `WITH o, e, ... score` for the count and page returns below.
+OFFICER_SEARCH_BASES = {
+    "none": """
+MATCH (u:Unit {uid: $unit_uid})<-[:IN_UNIT]-(e:Employment)
+    -[:HELD_BY]->(o:Officer)
+WHERE (coalesce($ranks, []) = [] OR e.highest_rank IN $ranks)
+AND (coalesce($statuses, []) = [] OR e.status IN $statuses)
+AND (coalesce($types, []) = [] OR e.type IN $types)
+WITH o, e, u, 0.0 AS score
+""",
+    "name": """
+CALL () {
+    CALL db.index.fulltext.queryNodes("officerNames", $term)
+    YIELD node, score
+    RETURN node AS o, score
+}
+MATCH (o)<-[:HELD_BY]-(e:Employment)-[:IN_UNIT]->(u:Unit)
+WHERE u.uid = $unit_uid
+AND (coalesce($ranks, []) = [] OR e.highest_rank IN $ranks)
+AND (coalesce($statuses, []) = [] OR e.status IN $statuses)
+AND (coalesce($types, []) = [] OR e.type IN $types)
+WITH o, e, u, score
+""",
+    "badge": """
+CALL () {
+    CALL db.index.fulltext.queryNodes("officerBadgeNumbers", $term)
+    YIELD node, score
+    RETURN node AS e, score
+}
+MATCH (e)-[:HELD_BY]->(o:Officer)
+MATCH (e)-[:IN_UNIT]->(u:Unit)
+WHERE u.uid = $unit_uid
+AND (coalesce($ranks, []) = [] OR e.highest_rank IN $ranks)
+AND (coalesce($statuses, []) = [] OR e.status IN $statuses)
+AND (coalesce($types, []) = [] OR e.type IN $types)
+WITH o, e, u, score
+""",
+    "ambiguous": """
+CALL () {
+    CALL db.index.fulltext.queryNodes("officerNames", $term)
+    YIELD node, score
+    RETURN node AS o, null AS e, score
+
+    UNION
+
+    CALL db.index.fulltext.queryNodes("officerBadgeNumbers", $term)
+    YIELD node, score
+    MATCH (node)-[:HELD_BY]->(o:Officer)
+    RETURN o, node AS e, score
+}
+MATCH (o)<-[:HELD_BY]-(all_e:Employment)-[:IN_UNIT]->(u:Unit)
+WHERE u.uid = $unit_uid
+AND (coalesce($ranks, []) = [] OR all_e.highest_rank IN $ranks)
+AND (coalesce($statuses, []) = [] OR all_e.status IN $statuses)
+AND (coalesce($types, []) = [] OR all_e.type IN $types)
+AND (e IS NULL OR all_e = e)
+WITH o, all_e AS e, score
+""",
+}
+
+OFFICER_COUNT_RETURN = """
+RETURN count(DISTINCT o) AS total_officers
+"""
+
+OFFICER_PAGE_RETURN = """
+WITH o, max(score) AS score
+RETURN o
+ORDER BY score DESC, o.last_name ASC, o.first_name ASC
+SKIP $skip
+LIMIT $limit
+"""
+
+OFFICER_EMPLOYMENT_PAGE_RETURN = """
+WITH o, e, score
+ORDER BY coalesce(e.latest_date, e.earliest_date) DESC
+WITH
+    o,
+    max(score) AS score,
+    collect(e) AS employment
+WITH
+    o,
+    score,
+    employment,
+    head(employment) AS most_recent,
+    reduce(min_date = null, stint IN employment |
+        CASE
+            WHEN min_date IS NULL THEN stint.earliest_date
+            WHEN stint.earliest_date IS NULL THEN min_date
+            WHEN stint.earliest_date < min_date
+            THEN stint.earliest_date
+            ELSE min_date
+        END
+    ) AS earliest_date,
+    reduce(max_date = null, stint IN employment |
+        CASE
+            WHEN stint.latest_date IS NULL THEN null
+            WHEN max_date IS NULL THEN stint.latest_date
+            WHEN stint.latest_date > max_date
+            THEN stint.latest_date
+            ELSE max_date
+        END
+    ) AS latest_date
+RETURN
+    o,
+    {
+        uid: most_recent.uid,
+        earliest_date: earliest_date,
+        latest_date: latest_date,
+        badge_number: most_recent.badge_number,
+        rank: most_recent.highest_rank,
+        status: most_recent.status,
+        type: most_recent.type
+    } AS employment
+ORDER BY score DESC, o.last_name ASC, o.first_name ASC
+SKIP $skip
+LIMIT $limit
+"""
+
 
 class UnitQueries:
     INCLUDE_SPECS = {
@@ -98,7 +224,11 @@ class UnitQueries:
         "location": {
             "subquery": LOCATION_SUBQUERY,
             "return_fields": ["location"],
-        }
+        },
+        "metrics_as_of": {
+            "subquery": METRICS_AS_OF_SUBQUERY,
+            "return_fields": ["metrics_as_of"],
+        },
     }
 
     def _normalize_officer_filters(self, filters: dict | None) -> dict:
@@ -127,7 +257,7 @@ class UnitQueries:
 
         return "ambiguous"
 
-    def _build_officer_search_query(
+    def _build_officer_search_params(
         self,
         unit_uid: str,
         term: str | None = None,
@@ -141,125 +271,98 @@ class UnitQueries:
             "term": term.strip() if term else None,
             **normalized,
         }
+        return strategy, params
 
-        if strategy == "none":
-            cypher = """
-            MATCH (u:Unit {uid: $unit_uid})<-[:IN_UNIT]-(e:Employment)
-            -[:HELD_BY]->(o:Officer)
-            WHERE (coalesce($ranks, []) = [] OR e.highest_rank IN $ranks)
-            AND (coalesce($statuses, []) = [] OR e.status IN $statuses)
-            AND (coalesce($types, []) = [] OR e.type IN $types)
-            WITH o, e, u, 0.0 AS score
-            """
-            return cypher, params
-
-        if strategy == "name":
-            cypher = """
-            CALL () {
-                CALL db.index.fulltext.queryNodes("officerNames", $term)
-                YIELD node, score
-                RETURN node AS o, score
-            }
-            MATCH (o)<-[:HELD_BY]-(e:Employment)-[:IN_UNIT]->(u:Unit)
-            WHERE u.uid = $unit_uid
-            AND (coalesce($ranks, []) = [] OR e.highest_rank IN $ranks)
-            AND (coalesce($statuses, []) = [] OR e.status IN $statuses)
-            AND (coalesce($types, []) = [] OR e.type IN $types)
-            WITH o, e, u, score
-            """
-            return cypher, params
-
-        if strategy == "badge":
-            cypher = """
-            CALL () {
-                CALL db.index.fulltext.queryNodes("officerBadgeNumbers", $term)
-                YIELD node, score
-                RETURN node AS e, score
-            }
-            MATCH (e)-[:HELD_BY]->(o:Officer)
-            MATCH (e)-[:IN_UNIT]->(u:Unit)
-            WHERE u.uid = $unit_uid
-            AND (coalesce($ranks, []) = [] OR e.highest_rank IN $ranks)
-            AND (coalesce($statuses, []) = [] OR e.status IN $statuses)
-            AND (coalesce($types, []) = [] OR e.type IN $types)
-            WITH o, e, u, score
-            """
-            return cypher, params
-
-        cypher = """
-        CALL () {
-            CALL db.index.fulltext.queryNodes("officerNames", $term)
-            YIELD node, score
-            RETURN node AS o, null AS e, score
-
-            UNION
-
-            CALL db.index.fulltext.queryNodes("officerBadgeNumbers", $term)
-            YIELD node, score
-            MATCH (node)-[:HELD_BY]->(o:Officer)
-            RETURN o, node AS e, score
-        }
-        MATCH (o)<-[:HELD_BY]-(all_e:Employment)-[:IN_UNIT]->(u:Unit)
-        WHERE u.uid = $unit_uid
-        AND (coalesce($ranks, []) = [] OR all_e.highest_rank IN $ranks)
-        AND (coalesce($statuses, []) = [] OR all_e.status IN $statuses)
-        AND (coalesce($types, []) = [] OR all_e.type IN $types)
-        AND (e IS NULL OR all_e = e)
-        WITH o, all_e AS e, score
-        """
-        return cypher, params
-
-    def fetch_unit_profile(self, uid: str, includes: list[str]):
-        subqueries = []
-        return_fields = ["u", "a"]
-
-        for include in includes:
-            spec = self.INCLUDE_SPECS.get(include)
-            if not spec:
-                continue
-            subqueries.append(spec["subquery"])
-            return_fields.extend(spec["return_fields"])
-
-        cypher = (
-            UNIT_BASE_MATCH
-            + "\n"
-            + "\n".join(subqueries)
-            + "\nRETURN "
-            + ", ".join(return_fields)
-        )
+    @read_only
+    def fetch_unit_profile(
+        self,
+        uid: str,
+        includes: list[str],
+        fields: list[str] | None = None,
+        metrics_fresh_after: datetime | None = None,
+    ):
+        includes = tuple(
+            include for include in self.INCLUDE_SPECS if include in includes)
+        cypher = _unit_profile_query(includes, False, bool(fields))
+        return_fields = include_return_fields(
+            ["u", "a"], self.INCLUDE_SPECS, includes)
         logging.debug(f"Executing Cypher query for unit profile: {cypher}")
 
-        rows, _ = db.cypher_query(cypher, {"uid": uid}, resolve_objects=True)
+        rows, _ = db.cypher_query(
+            cypher,
+            {
+                "uid": uid,
+                "fields": fields or [],
+                "metrics_fresh_after": metrics_fresh_after,
+            },
+            resolve_objects=True)
         if not rows:
             raise ValueError("Unit not found")
         logging.debug(f"Cypher query  rows: {rows[0]}")
 
         row = rows[0]
-        return {field: row[idx] for idx, field in enumerate(return_fields)}
+        result = {field: row[idx] for idx, field in enumerate(return_fields)}
+        if fields:
+            result["u"] = projected_row(fields, result["u"])
+        return result
 
+    @read_only
+    def fetch_unit_profiles(
+        self,
+        uids: list[str],
+        includes: list[str],
+        fields: list[str] | None = None,
+        metrics_fresh_after: datetime | None = None,
+    ) -> dict[str, dict]:
+        """Fetch several unit profiles in one query, keyed by uid.
+
+        Unknown uids are left out of the result.
+        """
+        includes = tuple(
+            include for include in self.INCLUDE_SPECS if include in includes)
+        cypher = _unit_profile_query(includes, True, bool(fields))
+        return_fields = include_return_fields(
+            ["u", "a"], self.INCLUDE_SPECS, includes)
+
+        rows, _ = db.cypher_query(
+            cypher,
+            {
+                "uids": uids,
+                "fields": fields or [],
+                "metrics_fresh_after": metrics_fresh_after,
+            },
+            resolve_objects=True)
+        profiles = {}
+        for row in rows:
+            result = dict(zip(return_fields, row))
+            if fields:
+                result["u"] = projected_row(fields, result["u"])
+                uid = result["u"]["uid"]
+            else:
+                uid = result["u"].uid
+            profiles.setdefault(uid, result)
+        return profiles
+
+    @read_only
     def count_unit_officers(
             self,
             unit_uid: str,
             term: str | None = None,
             filters: dict | None = None
     ) -> int:
-        base_query, params = self._build_officer_search_query(
+        strategy, params = self._build_officer_search_params(
             unit_uid=unit_uid,
             term=term,
             filters=filters,
         )
 
-        query = (
-            base_query
-            + """
-            RETURN count(DISTINCT o) AS total_officers
-            """
-        )
+        query = _unit_officers_query(strategy, "count")
         logging.warning(
             f"Counting unit officers: {query} with params: {params}")
         rows, _ = db.cypher_query(query, params)
         return rows[0][0] if rows else 0
 
+    @read_only
     def fetch_unit_officers(
         self,
         unit_uid: str,
@@ -269,7 +372,7 @@ class UnitQueries:
         term: str | None = None,
         filters: dict | None = None,
     ):
-        base_query, params = self._build_officer_search_query(
+        strategy, params = self._build_officer_search_params(
             unit_uid=unit_uid,
             term=term,
             filters=filters,
@@ -280,65 +383,9 @@ class UnitQueries:
         })
 
         if include_employment:
-            query = (
-                base_query
-                + """
-                WITH o, e, score
-                ORDER BY coalesce(e.latest_date, e.earliest_date) DESC
-                WITH
-                    o,
-                    max(score) AS score,
-                    collect(e) AS employment
-                WITH
-                    o,
-                    score,
-                    employment,
-                    head(employment) AS most_recent,
-                    reduce(min_date = null, stint IN employment |
-                        CASE
-                            WHEN min_date IS NULL THEN stint.earliest_date
-                            WHEN stint.earliest_date IS NULL THEN min_date
-                            WHEN stint.earliest_date < min_date
-                            THEN stint.earliest_date
-                            ELSE min_date
-                        END
-                    ) AS earliest_date,
-                    reduce(max_date = null, stint IN employment |
-                        CASE
-                            WHEN stint.latest_date IS NULL THEN null
-                            WHEN max_date IS NULL THEN stint.latest_date
-                            WHEN stint.latest_date > max_date
-                            THEN stint.latest_date
-                            ELSE max_date
-                        END
-                    ) AS latest_date
-                RETURN
-                    o,
-                    {
-                        uid: most_recent.uid,
-                        earliest_date: earliest_date,
-                        latest_date: latest_date,
-                        badge_number: most_recent.badge_number,
-                        rank: most_recent.highest_rank,
-                        status: most_recent.status,
-                        type: most_recent.type
-                    } AS employment
-                ORDER BY score DESC, o.last_name ASC, o.first_name ASC
-                SKIP $skip
-                LIMIT $limit
-                """
-            )
+            query = _unit_officers_query(strategy, "employment")
         else:
-            query = (
-                base_query
-                + """
-                WITH o, max(score) AS score
-                RETURN o
-                ORDER BY score DESC, o.last_name ASC, o.first_name ASC
-                SKIP $skip
-                LIMIT $limit
-                """
-            )
+            query = _unit_officers_query(strategy, "page")
 
         logging.debug(
             "Executing Cypher query: {} with params: {}".format(
@@ -349,3 +396,34 @@ class UnitQueries:
         logging.debug(
             "Cypher query for unit officers returned rows: {}".format(rows))
         return rows
+
+
+@query_templates.shape("unit.profile")
+def _unit_profile_query(
+    includes: tuple[str, ...],
+    batch: bool,
+    projected: bool,
+) -> str:
+    return_fields = include_return_fields(
+        ["u", "a"], UnitQueries.INCLUDE_SPECS, includes)
+    return_fields[0] = projection_return("u", projected, alias="u")
+    return (
+        (UNIT_BATCH_MATCH if batch else UNIT_BASE_MATCH)
+        + "\n"
+        + "\n".join(
+            UnitQueries.INCLUDE_SPECS[include]["subquery"]
+            for include in includes
+        )
+        + "\nRETURN "
+        + ", ".join(return_fields)
+    )
+
+
+@query_templates.shape("unit.officers")
+def _unit_officers_query(strategy: str, mode: str) -> str:
+    returns = {
+        "count": OFFICER_COUNT_RETURN,
+        "page": OFFICER_PAGE_RETURN,
+        "employment": OFFICER_EMPLOYMENT_PAGE_RETURN,
+    }
+    return OFFICER_SEARCH_BASES[strategy] + returns[mode]
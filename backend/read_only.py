@@ -0,0 +1,145 @@
+"""
+The read only serving mode: an ASGI application that answers GET and
+HEAD requests for search and the officer, agency, unit and location
+blueprints, and refuses everything else. Run it next to the WSGI app,
+e.g. `uvicorn backend.asgi:app`, and send those reads to it.
+
+The event loop holds any number of open requests. Each one runs the
+Flask app, with its existing routes, services, queries and serializers,
+on a pool of at most ASGI_READ_THREADS threads, so only that many wait
+on Neo4j at once and the rest queue without a thread of their own.
+"""
+import asyncio
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from flask import Flask
+
+from backend.api import create_app
+from backend.routes.agencies import bp as agencies_bp
+from backend.routes.locations import bp as locations_bp
+from backend.routes.officers import bp as officers_bp
+from backend.routes.search import bp as search_bp
+from backend.routes.units import bp as units_bp
+
+READ_METHODS = ("GET", "HEAD")
+READ_BLUEPRINTS = (search_bp, officers_bp, agencies_bp, units_bp, locations_bp)
+
+
+class ReadOnlyApp:
+    """Serve the read routes of `app` over ASGI from a bounded pool."""
+
+    def __init__(self, app: Flask, max_threads: int):
+        self.app = app
+        self.prefixes = tuple(bp.url_prefix for bp in READ_BLUEPRINTS)
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_threads, thread_name_prefix="read")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        body = await self._read_body(receive)
+        if not self._is_read_route(scope["path"]):
+            status, headers, content = 404, [], b"Not Found"
+        elif scope["method"] not in READ_METHODS:
+            status, headers, content = 405, [
+                (b"allow", ", ".join(READ_METHODS).encode())
+            ], b"Method Not Allowed"
+        else:
+            loop = asyncio.get_running_loop()
+            status, headers, content = await loop.run_in_executor(
+                self.executor, self._run_wsgi, scope, body)
+
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": headers,
+        })
+        await send({"type": "http.response.body", "body": content})
+
+    def _is_read_route(self, path: str) -> bool:
+        return any(
+            path == prefix or path.startswith(prefix + "/")
+            for prefix in self.prefixes
+        )
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.executor.shutdown(wait=True)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                return body
+
+    def _run_wsgi(self, scope, body: bytes):
+        """Run one request through the Flask app on a pool thread."""
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response["status"] = int(status.split(" ", 1)[0])
+            response["headers"] = [
+                (name.lower().encode("latin-1"), value.encode("latin-1"))
+                for name, value in headers
+            ]
+
+        chunks = self.app(_environ(scope, body), start_response)
+        try:
+            content = b"".join(chunks)
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
+        return response["status"], response["headers"], content
+
+
+def _environ(scope, body: bytes) -> dict:
+    """The WSGI environ of an ASGI http `scope`."""
+    server_name, server_port = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", ""),
+        "PATH_INFO": scope["path"],
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server_name,
+        "SERVER_PORT": str(server_port),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": (scope.get("client") or ("", 0))[0],
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for name, value in scope.get("headers", []):
+        name = name.decode("latin-1").upper().replace("-", "_")
+        value = value.decode("latin-1")
+        if name in ("CONTENT_TYPE", "CONTENT_LENGTH"):
+            environ[name] = value
+            continue
+        key = f"HTTP_{name}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def create_read_app(config: Optional[str] = None) -> ReadOnlyApp:
+    """Create the read only ASGI application."""
+    app = create_app(config, start_importer=False)
+    return ReadOnlyApp(app, app.config["ASGI_READ_THREADS"])
@@ -3,7 +3,7 @@ import logging
 from backend.auth.jwt import min_role_required
 from backend.schemas import (
     validate_request, add_pagination_wrapper, ordered_jsonify,
-    args_to_dict,
+    args_to_dict, add_cursor_wrapper, keyset_cursor,
     NodeConflictException)
 from backend.mixpanel.mix import track_to_mp
 from backend.database.models.user import UserRole, User
@@ -16,10 +16,12 @@ from flask import Blueprint, abort, request, jsonify
 from flask_jwt_extended import get_jwt
 from flask_jwt_extended.view_decorators import jwt_required
 from backend.dto.agency import (
-    AgencyQueryParams, GetAgencyParams, GetAgencyOfficersParams,
+    AgencyQueryParams, GetAgencyParams, GetAgencyBatchParams,
+    GetAgencyOfficersParams,
     CreateAgency, UpdateAgency,
     GetAgencyUnitsParams, RelevantAgencyLookupParams)
 from backend.services.agency_service import AgencyService
+from backend.routes.conditional import change_queries, conditional_get
 from backend.queries.filter_resolver import FilterResolver
 
 
@@ -68,10 +70,41 @@ def create_agency():
         abort(400, description=str(e))
 
 
+# Get several agency profiles
+@bp.route("/batch", methods=["GET"])
+@jwt_required()
+@min_role_required(UserRole.PUBLIC)
+def get_agency_batch():
+    """Get several agency profiles in one request.
+    Accepts Query Parameters:
+    uid: agency UID, repeated once per agency
+    include: related data to add to every profile, as for a single agency
+    Returns the profiles in request order, and the uids that were not found.
+    """
+    raw = {
+        **request.args,
+        "uid": request.args.getlist("uid"),
+        "include": request.args.getlist("include"),
+    }
+    try:
+        params = GetAgencyBatchParams(**raw)
+    except Exception as e:
+        logging.debug(f"Invalid query params: {e}")
+        abort(400, description=str(e))
+
+    response = agency_service.get_agency_profiles(
+        uids=params.uids,
+        includes=params.include or [],
+        fields=params.fields,
+    )
+    return ordered_jsonify(response), 200
+
+
 # Get agency profile
 @bp.route("/<agency_uid>", methods=["GET"])
 @jwt_required()
 @min_role_required(UserRole.PUBLIC)
+@conditional_get("Agency", uid_arg="agency_uid")
 def get_agency(agency_uid: str):
     """Get an agency profile.
     Adds optional related data based on 'include' query parameter.
@@ -94,6 +127,7 @@ def get_agency(agency_uid: str):
         agency_data = agency_service.get_agency_profile(
             agency_uid=agency_uid,
             includes=params.include or [],
+            fields=params.fields,
         )
         return ordered_jsonify(agency_data), 200
     except ValueError:
@@ -152,6 +186,7 @@ def delete_agency(agency_id: str):
     try:
         name = agency.name
         agency.delete()
+        change_queries.touch_labels(["Agency"])
         track_to_mp(
             request,
             "delete_agency",
@@ -168,16 +203,19 @@ def delete_agency(agency_id: str):
 @bp.route("", methods=["GET"])
 @jwt_required()
 @min_role_required(UserRole.PUBLIC)
+@conditional_get("Agency")
 def get_all_agencies():
     """Get all agencies.
     Accepts Query Parameters for pagination:
     per_page: number of results per page
     page: page number
+    cursor: resume after the `next_cursor` of a previous page
     term: filter on agency name
     hq_city: filter on agency city
     hq_state: filter on agency state
     hq_zip: filter on agency zipcode
     jurisdiction: filter on agency jurisdiction
+    fields: comma-separated properties to return instead of full agencies
     """
     logging.debug(request.args)
     # --- Validate query parameters ---
@@ -231,6 +269,37 @@ def get_all_agencies():
     if (params.source or params.source_uid) and not source_uids:
         return jsonify({"message": "No results found matching the query"}), 200
 
+    ranked = bool(search_term)
+    # Search results have their own shape, so `fields` only projects the
+    # plain listing.
+    fields = None if params.searchResult else params.fields
+
+    # --- Resume after a cursor, without counting ---
+    if params.after is not None:
+        try:
+            rows = Agency.search(
+                query=search_term,
+                filters=filters,
+                city_uids=city_uids,
+                source_uids=source_uids,
+                after=params.after,
+                limit=params.per_page + 1,
+                with_score=True,
+                fields=fields,
+            )
+        except ValueError as e:
+            abort(400, description=str(e))
+        has_more = len(rows) > params.per_page
+        rows = rows[:params.per_page]
+        page, return_func = _agency_page(
+            [row for row, _score in rows], params.searchResult, bool(fields))
+        response = add_cursor_wrapper(
+            page_data=page,
+            per_page=params.per_page,
+            next_cursor=keyset_cursor(rows[-1], ranked) if has_more else None,
+        )
+        return return_func(response), 200
+
     # --- Count total matches ---
     row_count = Agency.search(
         query=search_term,
@@ -247,45 +316,54 @@ def get_all_agencies():
         return jsonify({"message": "Page number exceeds total results"}), 400
 
     # --- Fetch paginated results ---
-    results = Agency.search(
+    rows = Agency.search(
         query=search_term,
         filters=filters,
         city_uids=city_uids,
         source_uids=source_uids,
         skip=params.skip,
         limit=params.limit,
+        with_score=True,
+        fields=fields,
     )
-
-    # --- Optional searchResult output ---
-    if params.searchResult:
-        details = fetch_details(
-            [row.get("uid") for row in results], "Agency")
-        agencies = [build_agency_result(
-            row, details.get(row.get("uid"), {})) for row in results]
-        page = [item.model_dump() for item in agencies if item]
-        return_func = jsonify
-    else:
-        page = [
-            (
-                row
-                if isinstance(row, Agency)
-                else Agency.inflate(row)
-            ).to_dict(include_relationships=False)
-            for row in results
-        ]
-        return_func = ordered_jsonify
+    page, return_func = _agency_page(
+        [row for row, _score in rows], params.searchResult, bool(fields))
 
     # Add pagination wrapper
+    has_more = params.skip + len(rows) < row_count
     response = add_pagination_wrapper(
         page_data=page,
         total=row_count,
         page_number=params.page,
-        per_page=params.per_page
+        per_page=params.per_page,
+        next_cursor=(
+            keyset_cursor(rows[-1], ranked) if has_more and rows else None),
     )
 
     return return_func(response), 200
 
 
+def _agency_page(results, search_result: bool, projected: bool = False):
+    # --- Optional searchResult output ---
+    if search_result:
+        details = fetch_details(
+            [row.get("uid") for row in results], "Agency")
+        agencies = [build_agency_result(
+            row, details.get(row.get("uid"), {})) for row in results]
+        return [item.model_dump() for item in agencies if item], jsonify
+    if projected:
+        return list(results), ordered_jsonify
+    page = [
+        (
+            row
+            if isinstance(row, Agency)
+            else Agency.inflate(row)
+        ).to_dict(include_relationships=False)
+        for row in results
+    ]
+    return page, ordered_jsonify
+
+
 @bp.route("/relevant", methods=["GET"])
 @jwt_required()
 @min_role_required(UserRole.PUBLIC)
@@ -11,6 +11,10 @@ from backend.database.models.source import Source
 from backend.database.models.attachment import Attachment
 from backend.database.models.civilian import Civilian
 from backend.database.models.officer import Officer
+from backend.queries.metric_deltas import MetricDeltaQueries, merge_touched
+from backend.routes.conditional import change_queries
+from backend.services.location_service import LOCATION_LABELS
+from backend.services.response_cache import response_cache
 from .tmp.pydantic.complaints import (
     CreateComplaint, UpdateComplaint,
     CreateAllegation, CreateInvestigation, CreatePenalty,
@@ -18,9 +22,25 @@ from .tmp.pydantic.complaints import (
 from flask import Blueprint, abort, request, jsonify
 from flask_jwt_extended import get_jwt, verify_jwt_in_request
 from flask_jwt_extended.view_decorators import jwt_required
+from neomodel import db
 
 
 bp = Blueprint("complaint_routes", __name__, url_prefix="/api/v1/complaints")
+metric_deltas = MetricDeltaQueries()
+
+
+def invalidate_metrics(touched: dict[str, list]) -> None:
+    """
+    Drop the cached responses of the nodes a metric delta moved, by label,
+    and bump the list validators of their labels.
+    """
+    for label, uids in touched.items():
+        for uid in uids:
+            response_cache.invalidate_node(uid, [label])
+    change_queries.touch_labels(
+        label for label, uids in touched.items() if uids)
+    if touched.get("CityNode"):
+        response_cache.invalidate_labels(LOCATION_LABELS)
 
 
 def create_allegation(
@@ -43,19 +63,21 @@ def create_allegation(
     if officer is None:
         raise ValueError(f"Officer with UID {officer_uid} not found")
 
-    allegation = None
     try:
-        allegation = Allegation(**a_data).save()
-        allegation.accused.connect(officer)
-        allegation.complaint.connect(complaint)
+        # The cached metrics move in the same transaction, so a failed
+        # connection leaves neither the allegation nor the new counts.
+        with db.transaction:
+            allegation = Allegation(**a_data).save()
+            allegation.accused.connect(officer)
+            allegation.complaint.connect(complaint)
+            touched = metric_deltas.allegation_added(allegation.uid)
         logging.info(
             f"Allegation {allegation.uid} created for Complaint {complaint.uid}"
         )
     except Exception as e:
         logging.error(f"Error creating allegation: {e}")
-        if allegation:
-            allegation.delete()
         raise AttributeError(f"Failed to create allegation: {e}")
+    invalidate_metrics(touched)
 
     # Handle complainant
     try:
@@ -92,13 +114,12 @@ def update_allegation(
     complainant_data = a_data.pop("complainant", None)
 
     # Update Officer for Allegation
+    officer = None
     if officer_uid:
         officer = Officer.nodes.get_or_none(uid=officer_uid)
         if officer is None:
             # Raise an error if the officer is not found
             raise ValueError(f"Officer with UID {officer_uid} not found")
-        else:
-            allegation.accused.replace(officer)
 
     if complainant_data:
         # See if there is a complainant already connected
@@ -114,12 +135,20 @@ def update_allegation(
             allegation.complainant.connect(complainant)
 
     try:
-        Allegation.from_dict(a_data, allegation.uid)
+        # The allegation leaves the counts as it was and comes back as it
+        # is, so a new accused officer or finding moves the right ones.
+        with db.transaction:
+            removed = metric_deltas.allegation_removed(allegation.uid)
+            if officer is not None:
+                allegation.accused.replace(officer)
+            Allegation.from_dict(a_data, allegation.uid)
+            added = metric_deltas.allegation_added(allegation.uid)
         logging.info(f"Allegation {allegation.uid} updated")
     except Exception as e:
         logging.error(f"Error updating allegation: {e}")
         raise AttributeError(
             f"Failed to update allegation: {e}")
+    invalidate_metrics(merge_touched(removed, added))
     return allegation
 
 
@@ -313,12 +342,15 @@ def create_complaint():
         loc = Location.from_dict(location_data)
 
     try:
-        complaint = Complaint.from_dict(complaint_data)
-        complaint.location.connect(loc)
-        complaint.source_org.connect(source, source_details)
+        with db.transaction:
+            complaint = Complaint.from_dict(complaint_data)
+            complaint.location.connect(loc)
+            complaint.source_org.connect(source, source_details)
+            touched = metric_deltas.complaint_added(complaint.uid)
     except Exception as e:
         logger.error(f"Error creating complaint: {e}")
         abort(400, description=str(e))
+    invalidate_metrics(touched)
 
     # Add attachments
     if attachments:
@@ -464,10 +496,13 @@ def update_complaint(complaint_uid: str):
     if c is None:
         abort(404, description="Complaint not found")
     try:
-        c = Complaint.from_dict(body.model_dump(), complaint_uid)
+        with db.transaction:
+            c = Complaint.from_dict(body.model_dump(), complaint_uid)
+            touched = metric_deltas.complaint_edited(complaint_uid)
         c.refresh()
     except Exception as e:
         abort(400, description=str(e))
+    invalidate_metrics(touched)
 
     track_to_mp(
         request,
@@ -504,7 +539,10 @@ def delete_complaint(complaint_uid: str):
 
     try:
         uid = c.uid
-        c.delete()
+        with db.transaction:
+            touched = metric_deltas.complaint_removed(uid)
+            c.delete()
+        invalidate_metrics(touched)
         track_to_mp(
             request,
             "delete_complaint",
@@ -675,7 +713,10 @@ def delete_complaint_allegation(complaint_uid: str, allegation_uid: str):
 
     try:
         uid = allegation.uid
-        allegation.delete()
+        with db.transaction:
+            touched = metric_deltas.allegation_removed(uid)
+            allegation.delete()
+        invalidate_metrics(touched)
         track_to_mp(
             request,
             "delete_complaint_allegation",
@@ -0,0 +1,72 @@
+import hashlib
+from datetime import datetime
+from functools import wraps
+
+from flask import make_response, request
+from werkzeug.wrappers import Response
+
+from backend.queries.changes import ChangeQueries
+
+change_queries = ChangeQueries()
+
+
+def conditional_get(label: str, uid_arg: str | None = None):
+    """
+    Add ETag and Last-Modified validators to a GET endpoint, and answer a
+    matching If-None-Match or If-Modified-Since with 304 before the view
+    runs its queries.
+
+    For a profile (`uid_arg` names the view argument holding the uid),
+    the validators follow the node's newest Change and metrics refresh.
+    For a list, they follow the watermark of `label`, which every change
+    to and deletion of a `label` node bumps. The query string is part of
+    the ETag, since it selects the representation.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if uid_arg is not None:
+                found, last_modified = (
+                    change_queries.fetch_node_last_modified(
+                        label, kwargs[uid_arg]))
+                if not found:
+                    # Let the view answer with its own 404.
+                    return view(*args, **kwargs)
+                version = kwargs[uid_arg]
+            else:
+                version, last_modified = (
+                    change_queries.fetch_label_last_modified(label))
+                version = str(version)
+
+            if last_modified is None:
+                return view(*args, **kwargs)
+
+            etag = make_etag(label, version, last_modified)
+            if not_modified(etag, last_modified):
+                response = Response(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            response.last_modified = last_modified
+            return response
+        return wrapper
+    return decorator
+
+
+def make_etag(label: str, version: str, last_modified: datetime) -> str:
+    args = sorted(
+        (key, value) for key in request.args
+        for value in request.args.getlist(key))
+    digest = hashlib.sha1(
+        f"{label}:{version}:{last_modified.isoformat()}:{args}".encode())
+    return digest.hexdigest()
+
+
+def not_modified(etag: str, last_modified: datetime) -> bool:
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    since = request.if_modified_since
+    return since is not None and last_modified <= since
@@ -1,7 +1,11 @@
-from flask import Blueprint
+from flask import Blueprint, current_app
+from flask_jwt_extended.view_decorators import jwt_required
 from pydantic import BaseModel
 
+from ..auth.jwt import min_role_required
+from ..database.models.user import UserRole
 from ..schemas import spec
+from ..services.cache_freshness_service import CacheFreshnessService
 
 bp = Blueprint("healthcheck", __name__, url_prefix="/api/v1")
 
@@ -30,3 +34,19 @@ def healthcheck():
     """Verifies service health and returns the api version"""
     check_db()
     return {"apiVersion": spec.config.version}, 200
+
+
+@bp.route("/healthcheck/cache", methods=["GET"])
+@jwt_required()
+@min_role_required(UserRole.ADMIN)
+def cache_freshness():
+    """Reports how recently each label's cached metrics were refreshed"""
+    return CacheFreshnessService().freshness_report(), 200
+
+
+@bp.route("/healthcheck/pool", methods=["GET"])
+@jwt_required()
+@min_role_required(UserRole.ADMIN)
+def pool_metrics():
+    """Reports the usage of the Neo4j connection pool of this worker"""
+    return current_app.config["DB_POOL_METRICS"].snapshot(), 200
@@ -5,12 +5,13 @@ from backend.schemas import (validate_request, ordered_jsonify, args_to_dict)
 from backend.database.models.user import UserRole, User
 from backend.database.models.officer import Officer
 from backend.services.officer_service import OfficerService
+from backend.routes.conditional import change_queries, conditional_get
 from flask import Blueprint, abort, request, jsonify
 from flask_jwt_extended import get_jwt
 from flask_jwt_extended.view_decorators import jwt_required
 from backend.dto.officer import (
-    OfficerSearchParams, GetOfficerParams, GetOfficerMetricsParams,
-    CreateOfficer, UpdateOfficer)
+    OfficerSearchParams, GetOfficerParams, GetOfficerBatchParams,
+    GetOfficerMetricsParams, CreateOfficer, UpdateOfficer)
 
 
 bp = Blueprint("officer_routes", __name__, url_prefix="/api/v1/officers")
@@ -55,16 +56,43 @@ def create_officer():
         abort(400, description=str(e))
 
 
+# Get several officer profiles
+@bp.route("/batch", methods=["GET"])
+@jwt_required()
+@min_role_required(UserRole.PUBLIC)
+def get_officer_batch():
+    """Get several officer profiles in one request.
+    Accepts Query Parameters:
+    uid: officer UID, repeated once per officer
+    include: related data to add to every profile, as for a single officer
+    Returns the profiles in request order, and the uids that were not found.
+    """
+    raw = {
+        **request.args,
+        "uid": request.args.getlist("uid"),
+        "include": request.args.getlist("include"),
+    }
+    try:
+        params = GetOfficerBatchParams(**raw)
+    except Exception as e:
+        logging.debug(f"Invalid query params: {e}")
+        abort(400, description=str(e))
+
+    response = officer_service.get_officers(
+        uids=params.uids,
+        includes=params.include or [],
+        fields=params.fields)
+    return ordered_jsonify(response)
+
+
 # Get an officer profile
 @bp.route("/<officer_uid>", methods=["GET"])
 @jwt_required()
 @min_role_required(UserRole.PUBLIC)
+@conditional_get("Officer", uid_arg="officer_uid")
 def get_officer(officer_uid: str):
     """Get an officer profile.
     """
-    o = Officer.nodes.get_or_none(uid=officer_uid)
-    if o is None:
-        abort(404, description="Officer not found")
     raw = {
         **request.args,  # copies simple values
         "include": request.args.getlist("include"),
@@ -77,7 +105,8 @@ def get_officer(officer_uid: str):
 
     response = officer_service.get_officer(
         officer_uid=officer_uid,
-        includes=params.include or [])
+        includes=params.include or [],
+        fields=params.fields)
     return ordered_jsonify(response)
 
 
@@ -85,12 +114,15 @@ def get_officer(officer_uid: str):
 @bp.route("", methods=["GET"])
 @jwt_required()
 @min_role_required(UserRole.PUBLIC)
+@conditional_get("Officer")
 def get_all_officers():
     """Get all officers.
     Accepts Query Parameters for pagination:
     per_page: number of results per page
     page: page number
+    cursor: resume after the `next_cursor` of a previous page
     term: filter on officer name
+    fields: comma-separated properties to return instead of full officers
     """
     raw = {
         **args_to_dict(
@@ -176,6 +208,7 @@ def delete_officer(officer_uid: str):
     try:
         uid = o.uid
         o.delete()
+        change_queries.touch_labels(["Officer"])
         track_to_mp(
             request,
             "delete_officer",
@@ -210,9 +243,6 @@ def get_employment(officer_uid: str):
 def get_officer_metrics(officer_uid: str):
     """Retrieve an officer's metrics summary.
     """
-    o = Officer.nodes.get_or_none(uid=officer_uid)
-    if o is None:
-        abort(404, description="Officer not found")
     raw = {
         **request.args,  # copies simple values
         "include": request.args.getlist("include"),
@@ -3,6 +3,7 @@ import logging
 from backend.auth.jwt import min_role_required
 from backend.dto.search import SearchQueryParams
 from backend.database.models.user import UserRole
+from backend.queries.search import CountStrategy, SearchQueries
 from backend.services.search_service import SearchService
 from backend.schemas import args_to_dict
 from flask import Blueprint, abort, request
@@ -11,7 +12,16 @@ from flask import jsonify
 
 
 bp = Blueprint("search_routes", __name__, url_prefix="/api/v1/search")
-search_service = SearchService()
+search_service = SearchService(SearchQueries())
+
+
+@bp.record_once
+def configure_count_strategy(state):
+    # Exact totals unless SEARCH_COUNT_STRATEGY opts in to capped or
+    # cached ones, which flag `total_approximate` when they are not exact.
+    search_service.queries.count_strategy = CountStrategy(
+        state.app.config.get("SEARCH_COUNT_STRATEGY", CountStrategy.EXACT)
+    )
 
 
 # Text Search Endpoint
@@ -23,6 +33,7 @@ def text_search():
     Accepts Query Parameters for pagination:
     per_page: number of results per page
     page: page number
+    cursor: resume after the `next_cursor` of a previous page
     """
     try:
         query_params = SearchQueryParams(**args_to_dict(
@@ -42,5 +53,6 @@ def text_search():
         state=query_params.state,
         source=query_params.source,
         source_uid=query_params.source_uid,
+        after=query_params.after,
     )
     return jsonify(response), status_code
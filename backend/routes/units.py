@@ -2,12 +2,13 @@ import logging
 from backend.auth.jwt import min_role_required
 from backend.schemas import ordered_jsonify
 from backend.database.models.user import UserRole
-from backend.database.models.agency import Unit
 from flask import Blueprint, abort, request, jsonify
 from flask_jwt_extended.view_decorators import jwt_required
 from backend.dto.unit import (
-    UnitQueryParams, GetUnitParams, GetUnitOfficersParams)
+    UnitQueryParams, GetUnitParams, GetUnitBatchParams,
+    GetUnitOfficersParams)
 from backend.services.unit_service import UnitService
+from backend.routes.conditional import conditional_get
 
 bp = Blueprint("unit_routes", __name__, url_prefix="/api/v1/units")
 unit_service = UnitService()
@@ -16,14 +17,17 @@ unit_service = UnitService()
 @bp.route("", methods=["GET"])
 @jwt_required()
 @min_role_required(UserRole.PUBLIC)
+@conditional_get("Unit")
 def get_all_units():
     """Get all units.
     Accepts Query Parameters for pagination:
     per_page: number of results per page
     page: page number
+    cursor: resume after the `next_cursor` of a previous page
     name: filter on unit name
     city: filter on unit city
     state: filter on unit state
+    fields: comma-separated properties to return instead of full units
     """
     try:
         params = UnitQueryParams(**request.args)
@@ -38,14 +42,40 @@ def get_all_units():
     return jsonify(response), status_code
 
 
+@bp.route("/batch", methods=["GET"])
+@jwt_required()
+@min_role_required(UserRole.PUBLIC)
+def get_unit_batch():
+    """Get several units in one request.
+    Accepts Query Parameters:
+    uid: unit UID, repeated once per unit
+    include: related data to add to every unit, as for a single unit
+    Returns the units in request order, and the uids that were not found.
+    """
+    raw = {
+        **request.args,
+        "uid": request.args.getlist("uid"),
+        "include": request.args.getlist("include"),
+    }
+    try:
+        params = GetUnitBatchParams(**raw)
+    except Exception as e:
+        logging.debug(f"Invalid query params: {e}")
+        abort(400, description=str(e))
+
+    response = unit_service.get_units(
+        uids=params.uids,
+        includes=params.include or [],
+        fields=params.fields)
+    return ordered_jsonify(response), 200
+
+
 @bp.route("/<uid>", methods=["GET"])
 @jwt_required()
 @min_role_required(UserRole.PUBLIC)
+@conditional_get("Unit", uid_arg="uid")
 def get_unit(uid: str):
     """Get unit details by UID."""
-    unit = Unit.nodes.get_or_none(uid=uid)
-    if not unit:
-        abort(404, description="Unit not found")
     raw = {
         **request.args,
         "include": request.args.getlist("include"),
@@ -56,9 +86,13 @@ def get_unit(uid: str):
         logging.debug(f"Invalid query params: {e}")
         abort(400, description=str(e))
 
-    unit_data = unit_service.get_unit(
-        uid=uid,
-        includes=params.include or [])
+    try:
+        unit_data = unit_service.get_unit(
+            uid=uid,
+            includes=params.include or [],
+            fields=params.fields)
+    except ValueError:
+        abort(404, description="Unit not found")
     return ordered_jsonify(unit_data), 200
 
 
@@ -16,7 +16,8 @@ from neomodel import (
     RelationshipTo,
     RelationshipFrom, Relationship,
     RelationshipManager, RelationshipDefinition,
-    UniqueIdProperty, StructuredRel, StructuredNode,
+    UniqueIdProperty, StructuredNode,
+    INCOMING, OUTGOING,
     db
 )
 from neomodel.exceptions import DoesNotExist
@@ -24,6 +25,9 @@ from neomodel.exceptions import DoesNotExist
 from backend.database.models.infra.locations import (
     StateNode, CityNode
 )
+from backend.dto.common import encode_cursor
+from backend.queries.templates import (
+    projected_row, projection_return, query_templates)
 
 
 spec = SpecTree(
@@ -216,7 +220,8 @@ def paginate_results(
 # Add pagination to a list of data and return a response dict.
 def add_pagination_wrapper(
         page_data: list, total: int,
-        page_number: int = 1, per_page: int = 20):
+        page_number: int = 1, per_page: int = 20,
+        approximate: bool = False, next_cursor: str | None = None):
     """
     Add the paginated response properties to a preselected page of results.
     Args:
@@ -224,6 +229,11 @@ def add_pagination_wrapper(
         page_number (int): The page number to return.
         per_page (int): The number of items per page.
         max_per_page (int): The maximum number of items per page.
+        approximate (bool): Whether `total` is a lower bound, e.g. a
+            capped count. The response is flagged with `total_approximate`
+            and the page range check is left to the caller.
+        next_cursor (str): Token that resumes after the last item, if any
+            items follow this page.
     Returns:
         dict: The paginated data.
     """
@@ -236,15 +246,96 @@ def add_pagination_wrapper(
             "pages": 0
         }
     expected_total_pages = math.ceil(total / per_page)
-    if not page_number <= expected_total_pages:
+    if not approximate and not page_number <= expected_total_pages:
         abort(400, description="Page number exceeds total results")
-    return {
+    response = {
         "results": page_data,
         "page": page_number,
         "per_page": per_page,
         "total": total,
         "pages": expected_total_pages
     }
+    if approximate:
+        response["total_approximate"] = True
+    if next_cursor:
+        response["next_cursor"] = next_cursor
+    return response
+
+
+def add_cursor_wrapper(
+        page_data: list, per_page: int = 20,
+        next_cursor: str | None = None):
+    """
+    Wrap a page fetched by cursor. No total is reported, since counting
+    every match would defeat the point of resuming after a sort key.
+    Args:
+        page_data (list): The page of results.
+        per_page (int): The number of items per page.
+        next_cursor (str): Token that resumes after the last item, or None
+            when this is the last page.
+    Returns:
+        dict: The wrapped page.
+    """
+    return {
+        "results": page_data,
+        "per_page": per_page,
+        "next_cursor": next_cursor,
+    }
+
+
+def add_batch_wrapper(uids: list[str], items: dict[str, dict]):
+    """
+    Wrap the result of a batch lookup.
+    Args:
+        uids (list): The requested uids, in response order.
+        items (dict): The serialized records that were found, keyed by uid.
+    Returns:
+        dict: The found records in request order, and the uids that were
+            not found.
+    """
+    return {
+        "results": [items[uid] for uid in uids if uid in items],
+        "missing": [uid for uid in uids if uid not in items],
+    }
+
+
+# Keyset filter for listings ordered by `score DESC, uid ASC`. The
+# parameters are always bound, so the query shape doesn't change with the
+# cursor.
+RANKED_KEYSET_FILTER = """
+($after_uid IS NULL
+    OR score < $after_score
+    OR (score = $after_score AND {var}.uid > $after_uid))
+"""
+
+
+def keyset_params(after: list | None, ranked: bool) -> dict:
+    """
+    Build the `$after_*` parameters from a decoded cursor.
+    Ranked listings resume after `(score, uid)`, unranked ones, which
+    are ordered by uid alone, after `(uid,)`.
+    Raises:
+        ValueError: If the cursor doesn't match the listing's sort key.
+    """
+    if after is None:
+        return {"after_score": None, "after_uid": None}
+    if ranked and len(after) == 2:
+        score, uid = after
+        if isinstance(score, (int, float)) and isinstance(uid, str):
+            return {"after_score": score, "after_uid": uid}
+    if not ranked and len(after) == 1 and isinstance(after[0], str):
+        return {"after_score": None, "after_uid": after[0]}
+    raise ValueError("Invalid cursor")
+
+
+def keyset_cursor(row: tuple, ranked: bool) -> str:
+    """
+    Encode the `(node, score)` row returned by a `with_score` search as
+    the cursor for the page that follows it.
+    """
+    node, score = row
+    uid = node.uid if isinstance(node, StructuredNode) else node.get("uid")
+    return encode_cursor(score, uid) if ranked else encode_cursor(uid)
 
 
 def args_to_dict(args, always_list=frozenset()) -> dict:
@@ -311,21 +402,19 @@ class RelQuery:
 
     # ---- executors ----
     def _compose(self, count_only: bool = False) -> Tuple[str, Dict[str, Any]]:
-        parts = [self._base]
-        if self._where:
-            parts.append("WHERE " + " AND ".join(self._where))
-        if count_only:
-            parts.append(f"RETURN count({self._ret}) AS c")
-        else:
-            if self._distinct:
-                parts.append(f"RETURN DISTINCT {self._ret} AS node")
-            else:
-                parts.append(f"RETURN {self._ret} AS node")
-            if self._order:
-                parts.append(f"ORDER BY {self._order}")
-            if self._limit is not None:
-                parts.append(f"LIMIT {self._limit}")
-        return " ".join(parts) + ";", self._params
+        params = dict(self._params)
+        if not count_only and self._limit is not None:
+            params["rel_query_limit"] = self._limit
+        cypher = _rel_query_cypher(
+            self._base,
+            tuple(self._where),
+            self._ret,
+            count_only,
+            self._distinct,
+            self._order,
+            not count_only and self._limit is not None,
+        )
+        return cypher, params
 
     def all(self):
         cy, params = self._compose()
@@ -365,6 +454,61 @@ class RelQuery:
         return rows[0][0] if rows else 0
 
 
+@query_templates.shape("rel_query")
+def _rel_query_cypher(
+    base: str,
+    where: Tuple[str, ...],
+    ret: str,
+    count_only: bool,
+    distinct: bool,
+    order: Optional[str],
+    limited: bool,
+) -> str:
+    parts = [base]
+    if where:
+        parts.append("WHERE " + " AND ".join(where))
+    if count_only:
+        parts.append(f"RETURN count({ret}) AS c")
+    else:
+        if distinct:
+            parts.append(f"RETURN DISTINCT {ret} AS node")
+        else:
+            parts.append(f"RETURN {ret} AS node")
+        if order:
+            parts.append(f"ORDER BY {order}")
+        if limited:
+            parts.append("LIMIT $rel_query_limit")
+    return " ".join(parts) + ";"
+
+
+def _relationship_pattern(definition: dict) -> str:
+    """The `(n)-[r]-(m)` pattern of a relationship definition."""
+    rel_type = definition.get("relation_type")
+    rel = f"[r:`{rel_type}`]" if rel_type else "[r]"
+    node = f"(m:{definition['node_class'].__label__})"
+    if definition["direction"] == OUTGOING:
+        return f"(n)-{rel}->{node}"
+    if definition["direction"] == INCOMING:
+        return f"(n)<-{rel}-{node}"
+    return f"(n)-{rel}-{node}"
+
+
+def _relationships_cypher(definitions: dict) -> str:
+    parts = ["MATCH (n) WHERE elementId(n) = $element_id"]
+    for idx, definition in enumerate(definitions.values()):
+        pattern = _relationship_pattern(definition)
+        parts.append(
+            "CALL (n) { "
+            f"MATCH {pattern} "
+            "WITH m, r LIMIT $relationship_limit "
+            f"RETURN collect([m, r]) AS rel_{idx} "
+            "}"
+        )
+    parts.append("RETURN " + ", ".join(
+        f"rel_{idx}" for idx in range(len(definitions))))
+    return "\n".join(parts)
+
+
 # Update Enums to work well with NeoModel
 class PropertyEnum(Enum):
     """Use this Enum to convert the options to a dictionary."""
@@ -419,37 +563,8 @@ class JsonSerializable:
 
         # Optionally add related nodes
         if include_relationships and isinstance(self, StructuredNode):
-            relationships = {
-                key: value for key, value in self.__class__.__dict__.items()
-                if isinstance(value, RelationshipDefinition)
-            }
-            for key, relationship_def in relationships.items():
-                if key in all_excludes:
-                    continue
-
-                rel_manager = getattr(self, key, None)
-                if isinstance(rel_manager, RelationshipManager):
-                    related_nodes = rel_manager.all()[0:relationship_limit]
-                    # Limit the number of related nodes to serialize
-                    if relationship_def.definition.get('model', None):
-                        # If there is a relationship model, serialize it as well
-                        obj_props[key] = [
-                            {
-                                'node': node.to_dict(
-                                    include_relationships=False),
-                                'relationship': rel_manager.relationship(
-                                    node).to_dict() if isinstance(
-                                        rel_manager.relationship(
-                                            node), StructuredRel) else {}
-                            }
-                            for node in related_nodes
-                        ]
-                    else:
-                        # No specific relationship model, just serialize nodes
-                        obj_props[key] = [
-                            node.to_dict(include_relationships=False)
-                            for node in related_nodes
-                        ]
+            obj_props.update(self._serialize_relationships(
+                all_excludes, relationship_limit))
         # Add virtual relationships
         if include_relationships:
             for rel_name in self.__virtual_relationships__:
@@ -465,6 +580,77 @@ class JsonSerializable:
 
         return obj_props
 
+    def _serialize_relationships(
+            self, excludes: set, relationship_limit: int) -> dict:
+        """
+        Serialize every defined relationship of the node with one query.
+
+        Each relationship is read in its own subquery that stops after
+        `relationship_limit` rows, so large relationships are never loaded
+        in full and relationship properties come back with their nodes.
+        """
+        definitions = {}
+        for key, value in self.__class__.__dict__.items():
+            if key in excludes or not isinstance(
+                    value, RelationshipDefinition):
+                continue
+            rel_manager = getattr(self, key, None)
+            if isinstance(rel_manager, RelationshipManager):
+                definitions[key] = rel_manager.definition
+        if not definitions:
+            return {}
+
+        cypher = query_templates.get(
+            "to_dict.relationships",
+            (self.__class__.__name__, tuple(definitions)),
+            lambda: _relationships_cypher(definitions),
+        )
+        rows, _ = db.cypher_query(cypher, {
+            "element_id": self.element_id,
+            "relationship_limit": relationship_limit,
+        })
+        related = rows[0] if rows else [[] for _ in definitions]
+
+        serialized = {}
+        for (key, definition), pairs in zip(definitions.items(), related):
+            node_class = definition["node_class"]
+            model = definition.get("model")
+            if model:
+                # If there is a relationship model, serialize it as well
+                serialized[key] = [
+                    {
+                        "node": node_class.inflate(node).to_dict(
+                            include_relationships=False),
+                        "relationship": model.inflate(rel).to_dict(),
+                    }
+                    for node, rel in pairs
+                ]
+            else:
+                # No specific relationship model, just serialize nodes
+                serialized[key] = [
+                    node_class.inflate(node).to_dict(
+                        include_relationships=False)
+                    for node, _ in pairs
+                ]
+        return serialized
+
+    @classmethod
+    def projection_fields(cls, fields: list[str]) -> list[str]:
+        """
+        Check requested `fields=` against the public properties of the
+        model. `uid` always comes first, so projected rows can still be
+        paged by cursor and linked to their profile.
+
+        Raises:
+            ValueError: If a field is unknown or hidden.
+        """
+        public = set(cls.defined_properties(aliases=False, rels=False))
+        public -= set(getattr(cls, "__hidden_properties__", []))
+        invalid = [field for field in fields if field not in public]
+        if invalid:
+            raise ValueError(f"Invalid fields: {', '.join(invalid)}")
+        return list(dict.fromkeys(["uid", *fields]))
+
     def to_json(self):
         """Convert the node instance into a JSON string."""
         return ordered_jsonify(self.to_dict())
@@ -667,19 +853,26 @@ class SearchableMixin:
         limit: int = 25,
         inflate: bool = False,
         extra_params: dict | None = None,
+        after: list | None = None,
+        with_score: bool = False,
+        fields: list[str] | None = None,
     ):
         """
         Generic search executor for any node label.
 
         Args:
             label: Neo4j node label
-            index: Optional fulltext index Cypher snippet (from search)
+            index: Optional fulltext index Cypher snippet (from search),
+                yielding `n` and `score`
             filters: Dict of field->value for exact matches
             query: Optional fulltext search term
             count: Return count instead of nodes
             skip: Pagination offset
             limit: Pagination limit
             extra_params: Additional parameters to pass to the Cypher query
+            after: Decoded cursor; results resume after this sort key
+            with_score: Return `(node, score)` pairs instead of nodes
+            fields: Return only these properties, as dicts, instead of nodes
 
         Returns:
             int if count=True, else list of nodes
@@ -688,6 +881,8 @@ class SearchableMixin:
         params = filters.copy()
         if extra_params:
             params.update(extra_params)
+        ranked = bool(index)
+        params.update(keyset_params(after, ranked))
 
         cypher_parts = []
 
@@ -698,20 +893,32 @@ class SearchableMixin:
         cypher_parts.append(f"MATCH (n:{label})")
 
         # Property filters
-        if filters:
-            where_clause = " AND ".join(f"n.{k} = ${k}" for k in filters)
-            if any("WHERE" in part for part in cypher_parts):
-                # Append to existing WHERE from fulltext
-                cypher_parts.append("AND " + where_clause)
-            else:
-                cypher_parts.append("WHERE " + where_clause)
+        where_clauses = [f"n.{k} = ${k}" for k in filters]
+        if not count and not ranked and after is not None:
+            where_clauses.append("n.uid > $after_uid")
+        if where_clauses:
+            cypher_parts.append("WHERE " + " AND ".join(where_clauses))
 
         # Return count or nodes
         if count:
             cypher_parts.append("RETURN count(n) AS count")
+        elif ranked:
+            cypher_parts.append(
+                "WITH n, score WHERE "
+                + RANKED_KEYSET_FILTER.format(var="n"))
+            cypher_parts.append(
+                f"RETURN {projection_return('n', bool(fields))}, score "
+                "ORDER BY score DESC, n.uid ASC "
+                "SKIP $skip LIMIT $limit")
         else:
-            cypher_parts.append("RETURN n SKIP $skip LIMIT $limit")
+            cypher_parts.append(
+                f"RETURN {projection_return('n', bool(fields))}, "
+                "0.0 AS score ORDER BY n.uid ASC "
+                "SKIP $skip LIMIT $limit")
+        if not count:
             params.update({"skip": skip, "limit": limit})
+            if fields:
+                params["fields"] = fields
 
         cypher = "\n".join(cypher_parts)
 
@@ -721,4 +928,8 @@ class SearchableMixin:
 
         if count:
             return rows[0][0] if rows else 0
+        if fields:
+            rows = [[projected_row(fields, row[0]), row[1]] for row in rows]
+        if with_score:
+            return [(row[0], row[1]) for row in rows]
         return [row[0] for row in rows]
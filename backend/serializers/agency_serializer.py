@@ -7,6 +7,7 @@ from backend.serializers.search_serializer import (
 )
 from backend.serializers.location_serializer import serialize_location
 from backend.serializers.complaint_serializer import format_allegation_summary
+from backend.serializers.unit_serializer import serialize_metrics_as_of
 
 
 def serialize_reported_units(units: list[dict] | list) -> list[dict]:
@@ -34,7 +35,8 @@ def serialize_reported_units(units: list[dict] | list) -> list[dict]:
 
 def serialize_agency_profile(result: dict, includes: list[str]) -> dict:
     agency = result["a"]
-    data = agency.to_dict()
+    # A `fields=` projection arrives as a dict of just those properties
+    data = agency if isinstance(agency, dict) else agency.to_dict()
 
     if "units" in includes:
         data["total_units"] = result.get("total_units", 0)
@@ -62,4 +64,8 @@ def serialize_agency_profile(result: dict, includes: list[str]) -> dict:
     if "location" in includes:
         data["location"] = serialize_location(result.get("location"))
 
+    if "metrics_as_of" in includes:
+        data["metrics_as_of"] = serialize_metrics_as_of(
+            result.get("metrics_as_of"))
+
     return data
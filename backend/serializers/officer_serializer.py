@@ -59,7 +59,8 @@ def serialize_officer_profile(
     employment_history=None,
     allegation_summary=None,
 ):
-    data = officer.to_dict()
+    # A `fields=` projection arrives as a dict of just those properties
+    data = officer if isinstance(officer, dict) else officer.to_dict()
     data["sources"] = sources or []
 
     if employment_history is not None:
@@ -35,11 +35,21 @@ def serialize_reported_officers(officers):
     return dumped
 
 
+def serialize_metrics_as_of(value) -> str | None:
+    """When the cached counts were computed, None if they were live."""
+    if value is None:
+        return None
+    if hasattr(value, "to_native"):
+        value = value.to_native()
+    return value.replace(tzinfo=None).isoformat()
+
+
 def serialize_unit_profile(result: dict, includes: list[str]) -> dict:
     unit = result["u"]
     agency = result["a"]
 
-    data = unit.to_dict()
+    # A `fields=` projection arrives as a dict of just those properties
+    data = unit if isinstance(unit, dict) else unit.to_dict()
     data["agency"] = agency.to_dict(
         include_relationships=False) if agency else None
 
@@ -63,4 +73,8 @@ def serialize_unit_profile(result: dict, includes: list[str]) -> dict:
     if "location" in includes:
         data["location"] = serialize_location(result.get("location"))
 
+    if "metrics_as_of" in includes:
+        data["metrics_as_of"] = serialize_metrics_as_of(
+            result.get("metrics_as_of"))
+
     return data
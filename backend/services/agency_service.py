@@ -5,7 +5,10 @@ from backend.database.models.agency import Agency
 from backend.database.models.source import Source
 from backend.database.models.user import User
 from backend.queries.agencies import AgencyQueries
-from backend.schemas import add_pagination_wrapper, NodeConflictException
+from backend.schemas import (
+    add_batch_wrapper, add_pagination_wrapper, NodeConflictException)
+from backend.services.cache_freshness_service import metrics_fresh_after
+from backend.services.response_cache import response_cache
 from backend.serializers.agency_serializer import (
     serialize_agency_profile
 )
@@ -16,14 +19,37 @@ class AgencyService:
     def __init__(self):
         self.queries = AgencyQueries()
 
-    def get_agency_profile(self, agency_uid: str, includes: list[str]) -> dict:
-        result = self.queries.fetch_agency_profile(agency_uid, includes)
+    @response_cache.cached(
+        "agency.profile", ttl=300, unordered=("includes", "fields"))
+    def get_agency_profile(
+        self,
+        agency_uid: str,
+        includes: list[str],
+        fields: list[str] | None = None,
+    ) -> dict:
+        result = self.queries.fetch_agency_profile(
+            agency_uid, includes, fields,
+            metrics_fresh_after=metrics_fresh_after())
         logging.debug(f"Fetched agency profile result: {result}")
         if result is None:
             raise ValueError("Agency not found")
 
         return serialize_agency_profile(result, includes)
 
+    def get_agency_profiles(
+        self,
+        uids: list[str],
+        includes: list[str],
+        fields: list[str] | None = None,
+    ) -> dict:
+        results = self.queries.fetch_agency_profiles(
+            uids, includes, fields,
+            metrics_fresh_after=metrics_fresh_after())
+        return add_batch_wrapper(uids, {
+            uid: serialize_agency_profile(result, includes)
+            for uid, result in results.items()
+        })
+
     def _get_source_with_publish_access(
         self,
         source_uid: str | None,
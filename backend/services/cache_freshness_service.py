@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+from flask import current_app, has_app_context
+
+from backend.queries.clock import as_utc, utc_now
+from backend.queries.freshness import CACHE_TIMESTAMPS, FreshnessQueries
+
+# Age buckets of the freshness report, newest first.
+FRESHNESS_BUCKETS = (
+    ("1h", timedelta(hours=1)),
+    ("1d", timedelta(days=1)),
+    ("7d", timedelta(days=7)),
+    ("30d", timedelta(days=30)),
+)
+
+
+def metrics_fresh_after(now: datetime | None = None) -> datetime | None:
+    """
+    The oldest `metrics_updated_at` profiles may serve under the
+    METRICS_MAX_AGE policy, or None when the cache is always served.
+    """
+    max_age = (
+        current_app.config.get("METRICS_MAX_AGE")
+        if has_app_context() else None
+    )
+    if max_age is None:
+        return None
+    return as_utc(now or utc_now()) - timedelta(seconds=max_age)
+
+
+class CacheFreshnessService:
+    def __init__(self, queries: FreshnessQueries | None = None):
+        self.queries = queries or FreshnessQueries()
+
+    def freshness_report(self, now: datetime | None = None) -> dict:
+        """
+        For every cached label, how many nodes were never refreshed, the
+        oldest and newest refresh, and how many fall in each age bucket.
+        """
+        now = as_utc(now or utc_now())
+        cutoffs = [now - age for _name, age in FRESHNESS_BUCKETS]
+        names = [name for name, _age in FRESHNESS_BUCKETS] + ["older"]
+
+        report = {}
+        for label, field in CACHE_TIMESTAMPS.items():
+            total, refreshed, newer, oldest, newest = (
+                self.queries.fetch_freshness(label, cutoffs))
+            # `newer` is cumulative, newest bucket first.
+            counts = newer + [refreshed]
+            oldest, newest = as_utc(oldest), as_utc(newest)
+            report[label] = {
+                "field": field,
+                "total": total,
+                "missing": total - refreshed,
+                "oldest": oldest.isoformat() if oldest else None,
+                "newest": newest.isoformat() if newest else None,
+                "distribution": {
+                    name: counts[i] - (counts[i - 1] if i else 0)
+                    for i, name in enumerate(names)
+                },
+            }
+        return report
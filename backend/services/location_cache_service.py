@@ -1,12 +1,22 @@
 from datetime import datetime
 import math
 
+from backend.queries.changes import ChangeQueries
+from backend.queries.clock import utc_now
 from backend.queries.location_cache import LocationCacheQueries
+from backend.services.location_service import LOCATION_LABELS
+from backend.services.response_cache import response_cache
+from backend.services.sharded_refresh import run_sharded
 
 
 class LocationCacheService:
-    def __init__(self, queries: LocationCacheQueries | None = None):
+    def __init__(
+        self,
+        queries: LocationCacheQueries | None = None,
+        change_queries: ChangeQueries | None = None,
+    ):
         self.queries = queries or LocationCacheQueries()
+        self.change_queries = change_queries or ChangeQueries()
 
     @staticmethod
     def compute_richness_score(
@@ -28,11 +38,25 @@ class LocationCacheService:
         self,
         *,
         batch_size: int = 500,
+        incremental: bool = False,
+        since: datetime | None = None,
+        after: str = "",
+        until: str | None = None,
     ) -> dict:
-        rows = self.queries.fetch_city_richness_inputs()
+        updated_at = utc_now().isoformat()
+        if not incremental:
+            since = None
+        elif since is None:
+            since = self.queries.fetch_last_city_refresh()
+        rows = self.queries.iter_city_richness_inputs(
+            after=after,
+            until=until,
+            page_size=batch_size,
+            since=since,
+        )
         updates: list[dict] = []
+        seen = 0
         updated = 0
-        updated_at = datetime.now().isoformat()
 
         for (
             city_uid,
@@ -41,6 +65,7 @@ class LocationCacheService:
             officer_count,
             complaint_count,
         ) in rows:
+            seen += 1
             updates.append(
                 {
                     "city_uid": city_uid,
@@ -65,20 +90,35 @@ class LocationCacheService:
             updated += self.queries.update_city_richness_cache(updates)
 
         return {
-            "cities_seen": len(rows),
+            "cities_seen": seen,
             "cities_updated": updated,
             "richness_updated_at": updated_at,
+            "city_mode": "incremental" if since is not None else "full",
         }
 
     def refresh_county_richness_cache(
         self,
         *,
         batch_size: int = 500,
+        incremental: bool = False,
+        since: datetime | None = None,
+        after: str = "",
+        until: str | None = None,
     ) -> dict:
-        rows = self.queries.fetch_county_richness_inputs()
+        updated_at = utc_now().isoformat()
+        if not incremental:
+            since = None
+        elif since is None:
+            since = self.queries.fetch_last_county_refresh()
+        rows = self.queries.iter_county_richness_inputs(
+            after=after,
+            until=until,
+            page_size=batch_size,
+            since=since,
+        )
         updates: list[dict] = []
+        seen = 0
         updated = 0
-        updated_at = datetime.now().isoformat()
 
         for (
             county_uid,
@@ -87,6 +127,7 @@ class LocationCacheService:
             officer_count,
             complaint_count,
         ) in rows:
+            seen += 1
             updates.append(
                 {
                     "county_uid": county_uid,
@@ -111,20 +152,41 @@ class LocationCacheService:
             updated += self.queries.update_county_richness_cache(updates)
 
         return {
-            "counties_seen": len(rows),
+            "counties_seen": seen,
             "counties_updated": updated,
             "richness_updated_at": updated_at,
+            "county_mode": "incremental" if since is not None else "full",
         }
 
     def refresh_location_richness_cache(
         self,
         *,
         batch_size: int = 500,
+        incremental: bool = False,
+        workers: int = 1,
     ) -> dict:
-        city_result = self.refresh_city_richness_cache(batch_size=batch_size)
-        county_result = self.refresh_county_richness_cache(
+        """
+        Refresh cities, then counties. An incremental refresh only
+        recomputes the places reachable from a Change made since each
+        level's previous refresh. With several `workers`, each level is
+        split into uid shards refreshed concurrently.
+        """
+        city_result = run_sharded(
+            self.refresh_city_richness_cache,
+            workers,
+            last_refresh=self.queries.fetch_last_city_refresh,
+            batch_size=batch_size,
+            incremental=incremental,
+        )
+        county_result = run_sharded(
+            self.refresh_county_richness_cache,
+            workers,
+            last_refresh=self.queries.fetch_last_county_refresh,
             batch_size=batch_size,
+            incremental=incremental,
         )
+        response_cache.invalidate_labels(LOCATION_LABELS)
+        self.change_queries.touch_labels(LOCATION_LABELS)
         return {
             **city_result,
             **county_result,
@@ -1,11 +1,20 @@
 from backend.queries.locations import LocationQueries
 from backend.schemas import add_pagination_wrapper
+from backend.services.response_cache import response_cache
+
+# The lists carry the cached counts and richness scores, which the
+# metrics refreshes and deltas rewrite. Those invalidate LOCATION_LABELS,
+# and the short TTL bounds staleness in workers they cannot reach.
+LOCATION_TTL = 300
+LOCATION_LABELS = ("CityNode", "CountyNode", "StateNode")
 
 
 class LocationService:
     def __init__(self, queries: LocationQueries | None = None):
         self.queries = queries or LocationQueries()
 
+    @response_cache.cached(
+        "locations.cities", ttl=LOCATION_TTL, labels=LOCATION_LABELS)
     def list_cities(
         self,
         *,
@@ -63,6 +72,8 @@ class LocationService:
         )
         return response, 200
 
+    @response_cache.cached(
+        "locations.counties", ttl=LOCATION_TTL, labels=LOCATION_LABELS)
     def list_counties(
         self,
         *,
@@ -120,6 +131,8 @@ class LocationService:
         )
         return response, 200
 
+    @response_cache.cached(
+        "locations.states", ttl=LOCATION_TTL, labels=LOCATION_LABELS)
     def list_states(
         self,
         *,
@@ -164,6 +177,8 @@ class LocationService:
         )
         return response, 200
 
+    @response_cache.cached(
+        "locations.nearby_cities", ttl=LOCATION_TTL, labels=LOCATION_LABELS)
     def list_nearby_cities(
         self,
         *,
@@ -206,6 +221,8 @@ class LocationService:
             "pages": 1 if results else 0,
         }, 200
 
+    @response_cache.cached(
+        "locations.relevant_cities", ttl=LOCATION_TTL, labels=LOCATION_LABELS)
     def list_relevant_cities(
         self,
         *,
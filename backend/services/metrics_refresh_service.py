@@ -0,0 +1,254 @@
+from collections import defaultdict
+import time
+
+from backend.queries.changes import ChangeQueries
+from backend.queries.clock import utc_now
+from backend.queries.metrics_rollup import MetricsRollupQueries
+from backend.services.location_cache_service import LocationCacheService
+from backend.services.location_service import LOCATION_LABELS
+from backend.services.response_cache import response_cache
+
+REFRESHED_LABELS = ("Officer", "Unit", "Agency") + LOCATION_LABELS
+
+
+class MetricsRefreshService:
+    """
+    Refresh every cached metric from one pass over the officer subgraph.
+
+    The per-label refreshes each traverse Officer -> Allegation ->
+    Complaint again. Here officers are read once, page by page, and their
+    unit, complaint and allegation uids are rolled up in memory to units,
+    agencies, cities and counties. Writes follow the dependency order
+    officer, unit, agency, city, county. Memory grows with the number of
+    distinct (unit, complaint) pairs, so the per-label refreshes remain
+    the choice for very large graphs.
+
+    Only counts and richness are rewritten here. The stored allegation
+    summaries, rankings and complaint histories keep their own stamps,
+    so they go stale until a per-label refresh rewrites them.
+    """
+
+    def __init__(
+        self,
+        queries: MetricsRollupQueries | None = None,
+        change_queries: ChangeQueries | None = None,
+    ):
+        self.queries = queries or MetricsRollupQueries()
+        self.change_queries = change_queries or ChangeQueries()
+
+    def refresh_all_metrics_cache(self, *, batch_size: int = 500) -> dict:
+        updated_at = utc_now().isoformat()
+        timings: dict[str, float] = {}
+        summary: dict = {}
+
+        started = time.perf_counter()
+        unit_officers: dict[str, set] = defaultdict(set)
+        unit_complaints: dict[str, set] = defaultdict(set)
+        unit_allegations: dict[str, set] = defaultdict(set)
+        officer_updates = _Batches(
+            self.queries.update_officer_metrics_cache, batch_size)
+
+        for (
+            officer_uid,
+            unit_uids,
+            complaint_uids,
+            allegation_uids,
+            substantiated_count,
+        ) in self.queries.iter_officer_rollup_inputs(page_size=batch_size):
+            officer_updates.add(
+                {
+                    "officer_uid": officer_uid,
+                    "complaint_count_cached": len(complaint_uids),
+                    "allegation_count_cached": len(allegation_uids),
+                    "substantiated_count_cached": substantiated_count,
+                    "metrics_updated_at": updated_at,
+                }
+            )
+            for unit_uid in unit_uids:
+                unit_officers[unit_uid].add(officer_uid)
+                unit_complaints[unit_uid].update(complaint_uids)
+                unit_allegations[unit_uid].update(allegation_uids)
+
+        summary["officers_seen"] = officer_updates.seen
+        summary["officers_updated"] = officer_updates.flush()
+        timings["officers"] = _elapsed_ms(started)
+
+        started = time.perf_counter()
+        agency_units: dict[str, set] = defaultdict(set)
+        agency_officers: dict[str, set] = defaultdict(set)
+        agency_complaints: dict[str, set] = defaultdict(set)
+        agency_allegations: dict[str, set] = defaultdict(set)
+        unit_updates = _Batches(
+            self.queries.update_unit_metrics_cache, batch_size)
+
+        for unit_uid, agency_uids in self.queries.fetch_unit_agencies():
+            officers = unit_officers.pop(unit_uid, set())
+            complaints = unit_complaints.pop(unit_uid, set())
+            allegations = unit_allegations.pop(unit_uid, set())
+            unit_updates.add(
+                {
+                    "unit_uid": unit_uid,
+                    "officer_count_cached": len(officers),
+                    "complaint_count_cached": len(complaints),
+                    "allegation_count_cached": len(allegations),
+                    "metrics_updated_at": updated_at,
+                }
+            )
+            for agency_uid in agency_uids:
+                agency_units[agency_uid].add(unit_uid)
+                agency_officers[agency_uid].update(officers)
+                agency_complaints[agency_uid].update(complaints)
+                agency_allegations[agency_uid].update(allegations)
+
+        summary["units_seen"] = unit_updates.seen
+        summary["units_updated"] = unit_updates.flush()
+        timings["units"] = _elapsed_ms(started)
+
+        started = time.perf_counter()
+        city_agencies: dict[str, set] = defaultdict(set)
+        city_officers: dict[str, set] = defaultdict(set)
+        agency_updates = _Batches(
+            self.queries.update_agency_metrics_cache, batch_size)
+
+        for agency_uid, city_uids in self.queries.fetch_agency_cities():
+            officers = agency_officers.pop(agency_uid, set())
+            agency_updates.add(
+                {
+                    "agency_uid": agency_uid,
+                    "unit_count_cached": len(
+                        agency_units.pop(agency_uid, ())),
+                    "officer_count_cached": len(officers),
+                    "complaint_count_cached": len(
+                        agency_complaints.pop(agency_uid, ())),
+                    "allegation_count_cached": len(
+                        agency_allegations.pop(agency_uid, ())),
+                    "metrics_updated_at": updated_at,
+                }
+            )
+            for city_uid in city_uids:
+                city_agencies[city_uid].add(agency_uid)
+                city_officers[city_uid].update(officers)
+
+        summary["agencies_seen"] = agency_updates.seen
+        summary["agencies_updated"] = agency_updates.flush()
+        timings["agencies"] = _elapsed_ms(started)
+
+        started = time.perf_counter()
+        county_population: dict[str, int] = defaultdict(int)
+        county_agencies: dict[str, set] = defaultdict(set)
+        county_officers: dict[str, set] = defaultdict(set)
+        county_complaints: dict[str, set] = defaultdict(set)
+        city_updates = _Batches(
+            self.queries.update_city_richness_cache, batch_size)
+
+        for (
+            city_uid,
+            population,
+            county_uids,
+            complaint_uids,
+        ) in self.queries.fetch_city_rollup_inputs():
+            agencies = city_agencies.pop(city_uid, set())
+            officers = city_officers.pop(city_uid, set())
+            city_updates.add(
+                _richness_update(
+                    "city_uid",
+                    city_uid,
+                    population=population,
+                    agencies=agencies,
+                    officers=officers,
+                    complaints=complaint_uids,
+                    updated_at=updated_at,
+                )
+            )
+            for county_uid in county_uids:
+                county_population[county_uid] += population or 0
+                county_agencies[county_uid].update(agencies)
+                county_officers[county_uid].update(officers)
+                county_complaints[county_uid].update(complaint_uids)
+
+        summary["cities_seen"] = city_updates.seen
+        summary["cities_updated"] = city_updates.flush()
+        timings["cities"] = _elapsed_ms(started)
+
+        started = time.perf_counter()
+        county_updates = _Batches(
+            self.queries.update_county_richness_cache, batch_size)
+
+        for county_uid in self.queries.fetch_county_uids():
+            county_updates.add(
+                _richness_update(
+                    "county_uid",
+                    county_uid,
+                    population=county_population[county_uid],
+                    agencies=county_agencies[county_uid],
+                    officers=county_officers[county_uid],
+                    complaints=county_complaints[county_uid],
+                    updated_at=updated_at,
+                )
+            )
+
+        summary["counties_seen"] = county_updates.seen
+        summary["counties_updated"] = county_updates.flush()
+        timings["counties"] = _elapsed_ms(started)
+        response_cache.invalidate_labels(REFRESHED_LABELS)
+        self.change_queries.touch_labels(REFRESHED_LABELS)
+
+        return {
+            **summary,
+            "metrics_updated_at": updated_at,
+            "richness_updated_at": updated_at,
+            "mode": "full",
+            "timings_ms": timings,
+        }
+
+
+class _Batches:
+    """Collects cache updates and writes them `batch_size` at a time."""
+
+    def __init__(self, write, batch_size: int):
+        self.write = write
+        self.batch_size = batch_size
+        self.pending: list[dict] = []
+        self.seen = 0
+        self.updated = 0
+
+    def add(self, update: dict) -> None:
+        self.seen += 1
+        self.pending.append(update)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        if self.pending:
+            self.updated += self.write(self.pending)
+            self.pending = []
+        return self.updated
+
+
+def _richness_update(
+    key: str,
+    uid: str,
+    *,
+    population: int,
+    agencies,
+    officers,
+    complaints,
+    updated_at: str,
+) -> dict:
+    return {
+        key: uid,
+        "agency_count_cached": len(agencies),
+        "officer_count_cached": len(officers),
+        "complaint_count_cached": len(complaints),
+        "richness_score_cached": LocationCacheService.compute_richness_score(
+            agency_count=len(agencies),
+            officer_count=len(officers),
+            complaint_count=len(complaints),
+            population=population,
+        ),
+        "richness_updated_at": updated_at,
+    }
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
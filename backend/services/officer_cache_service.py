@@ -1,34 +1,68 @@
 from datetime import datetime
 
+from backend.queries.changes import ChangeQueries
+from backend.queries.clock import utc_now
 from backend.queries.officer_cache import OfficerCacheQueries
+from backend.services.response_cache import response_cache
 
 
 class OfficerCacheService:
-    def __init__(self, queries: OfficerCacheQueries | None = None):
+    def __init__(
+        self,
+        queries: OfficerCacheQueries | None = None,
+        change_queries: ChangeQueries | None = None,
+    ):
         self.queries = queries or OfficerCacheQueries()
+        self.change_queries = change_queries or ChangeQueries()
 
     def refresh_officer_metrics_cache(
         self,
         *,
         batch_size: int = 500,
+        incremental: bool = False,
+        since: datetime | None = None,
+        after: str = "",
+        until: str | None = None,
     ) -> dict:
-        rows = self.queries.fetch_officer_metrics_inputs()
+        """
+        Recompute the cached officer metrics. An incremental refresh only
+        recomputes the officers reachable from a Change newer than `since`,
+        which defaults to the previous refresh; it falls back to a full
+        refresh when there is no previous one. `after` and `until` limit
+        the refresh to one uid range, for sharded runs.
+        """
+        # Taken before reading, so changes made during the refresh are
+        # picked up by the next incremental run.
+        updated_at = utc_now().isoformat()
+        if not incremental:
+            since = None
+        elif since is None:
+            since = self.queries.fetch_last_refresh()
+        rows = self.queries.iter_officer_metrics_inputs(
+            after=after,
+            until=until,
+            page_size=batch_size,
+            since=since,
+        )
         updates: list[dict] = []
+        seen = 0
         updated = 0
-        updated_at = datetime.now().isoformat()
 
         for (
             officer_uid,
             complaint_count,
             allegation_count,
             substantiated_count,
+            complaint_history,
         ) in rows:
+            seen += 1
             updates.append(
                 {
                     "officer_uid": officer_uid,
                     "complaint_count_cached": complaint_count,
                     "allegation_count_cached": allegation_count,
                     "substantiated_count_cached": substantiated_count,
+                    "complaint_history": complaint_history,
                     "metrics_updated_at": updated_at,
                 }
             )
@@ -39,9 +73,50 @@ class OfficerCacheService:
 
         if updates:
             updated += self.queries.update_officer_metrics_cache(updates)
+        response_cache.invalidate_labels(["Officer"])
+        self.change_queries.touch_labels(["Officer"])
+
+        return {
+            "officers_seen": seen,
+            "officers_updated": updated,
+            "metrics_updated_at": updated_at,
+            "mode": "incremental" if since is not None else "full",
+        }
+
+    def refresh_officer_metrics_cache_in_database(
+        self,
+        *,
+        batch_size: int = 500,
+        incremental: bool = False,
+        since: datetime | None = None,
+        after: str = "",
+        until: str | None = None,
+    ) -> dict:
+        """
+        Same result as `refresh_officer_metrics_cache`, but computed and
+        written inside Neo4j a page at a time, so no rows travel to
+        Python. Reports the timing of every batch.
+        """
+        updated_at = utc_now().isoformat()
+        if not incremental:
+            since = None
+        elif since is None:
+            since = self.queries.fetch_last_refresh()
+        batches = self.queries.refresh_officer_metrics_in_database(
+            batch_size=batch_size,
+            metrics_updated_at=updated_at,
+            since=since,
+            after=after,
+            until=until,
+        )
+        updated = sum(batch["updated"] for batch in batches)
+        response_cache.invalidate_labels(["Officer"])
+        self.change_queries.touch_labels(["Officer"])
 
         return {
-            "officers_seen": len(rows),
+            "officers_seen": updated,
             "officers_updated": updated,
             "metrics_updated_at": updated_at,
+            "mode": "incremental" if since is not None else "full",
+            "batches": batches,
         }
@@ -6,6 +6,8 @@ from backend.database.models.source import Source
 from backend.database.models.user import User
 from backend.queries.filter_resolver import FilterResolver
 from backend.queries.officers import OfficerQueries
+from backend.services.cache_freshness_service import metrics_fresh_after
+from backend.services.response_cache import response_cache
 from backend.serializers.officer_serializer import (
     serialize_officer_sources,
     serialize_employment_history,
@@ -14,19 +16,15 @@ from backend.serializers.officer_serializer import (
     serialize_officer_list,
     serialize_officer_search_results,
 )
-from backend.schemas import add_pagination_wrapper
+from backend.schemas import (
+    add_batch_wrapper, add_cursor_wrapper, add_pagination_wrapper,
+    keyset_cursor)
 
 
 class OfficerService:
     def __init__(self):
         self.queries = OfficerQueries()
         self.filter_resolver = FilterResolver()
-        self.METRIC_FETCHERS = {
-            "allegation_types": self.queries.fetch_metric_a_types,
-            "allegation_outcomes": self.queries.fetch_metric_a_outcomes,
-            "complaint_history": self.queries.fetch_metric_comp_history,
-            "complainant_demographics": self.queries.fetch_metric_comp_demo,
-        }
 
     def _get_source_with_publish_access(
         self,
@@ -128,33 +126,44 @@ class OfficerService:
 
         return officer.to_dict()
 
-    def get_officer(self, officer_uid: str, includes: list[str]) -> dict:
-        officer = Officer.nodes.get_or_none(uid=officer_uid)
-        if officer is None:
+    @response_cache.cached(
+        "officer.profile", ttl=300, unordered=("includes", "fields"))
+    def get_officer(
+        self,
+        officer_uid: str,
+        includes: list[str],
+        fields: list[str] | None = None,
+    ) -> dict:
+        results = self.queries.fetch_officer_profiles(
+            [officer_uid], includes, fields)
+        if officer_uid not in results:
             abort(404, description="Officer not found")
+        return self._serialize_profile(results[officer_uid])
 
-        sources = serialize_officer_sources(
-            self.queries.fetch_sources(officer_uid)
-        )
-
-        employment_history = None
-        allegation_summary = None
-
-        if "employment" in includes:
-            employment_history = serialize_employment_history(
-                self.queries.fetch_emp_history(officer_uid)
-            )
-
-        if "allegations" in includes:
-            allegation_summary = serialize_allegation_summary(
-                self.queries.fetch_alleg_summary(officer_uid)
-            )
-
+    def get_officers(
+        self,
+        uids: list[str],
+        includes: list[str],
+        fields: list[str] | None = None,
+    ) -> dict:
+        results = self.queries.fetch_officer_profiles(uids, includes, fields)
+        return add_batch_wrapper(uids, {
+            uid: self._serialize_profile(result)
+            for uid, result in results.items()
+        })
+
+    def _serialize_profile(self, result: dict) -> dict:
+        employment_history = result.get("employment_history")
+        allegation_summary = result.get("allegation_summary")
         return serialize_officer_profile(
-            officer=officer,
-            sources=sources,
-            employment_history=employment_history,
-            allegation_summary=allegation_summary,
+            officer=result["o"],
+            sources=serialize_officer_sources(result["sources"]),
+            employment_history=(
+                serialize_employment_history(employment_history)
+                if employment_history is not None else None),
+            allegation_summary=(
+                serialize_allegation_summary(allegation_summary)
+                if allegation_summary is not None else None),
         )
 
     def list_officers(self, params):
@@ -175,7 +184,7 @@ class OfficerService:
             return {
                 "message": "No results found matching the query"}, 200, False
 
-        row_count = Officer.search(
+        search_filters = dict(
             name=params.officer_name,
             rank=params.officer_rank,
             unit=params.unit,
@@ -187,8 +196,38 @@ class OfficerService:
             active_before=params.active_before,
             city_uids=city_uids,
             source_uids=source_uids,
-            count=True,
         )
+        ranked = bool(params.officer_name or params.officer_rank)
+        # Search results have their own shape, so `fields` only projects
+        # the plain listing.
+        fields = None if params.searchResult else params.fields
+
+        if params.after is not None:
+            try:
+                rows = Officer.search(
+                    **search_filters,
+                    after=params.after,
+                    limit=params.per_page + 1,
+                    inflate=not params.searchResult,
+                    with_score=True,
+                    fields=fields,
+                )
+            except ValueError as e:
+                return {"message": str(e)}, 400, False
+            has_more = len(rows) > params.per_page
+            rows = rows[:params.per_page]
+            page, use_ordered = self._serialize_officer_page(
+                [officer for officer, _score in rows],
+                params.searchResult, bool(fields))
+            response = add_cursor_wrapper(
+                page_data=page,
+                per_page=params.per_page,
+                next_cursor=(
+                    keyset_cursor(rows[-1], ranked) if has_more else None),
+            )
+            return response, 200, use_ordered
+
+        row_count = Officer.search(**search_filters, count=True)
 
         if row_count == 0:
             return {
@@ -198,38 +237,38 @@ class OfficerService:
             return {
                 "message": "Page number exceeds total results"}, 400, False
 
-        results = Officer.search(
-            name=params.officer_name,
-            rank=params.officer_rank,
-            unit=params.unit,
-            agency=params.agency,
-            agency_uid=params.agency_uid,
-            badge_number=params.badge_number,
-            ethnicity=params.ethnicity,
-            active_after=params.active_after,
-            active_before=params.active_before,
-            city_uids=city_uids,
-            source_uids=source_uids,
+        rows = Officer.search(
+            **search_filters,
             skip=params.skip,
             limit=params.limit,
             inflate=not params.searchResult,
+            with_score=True,
+            fields=fields,
         )
+        page, use_ordered = self._serialize_officer_page(
+            [officer for officer, _score in rows],
+            params.searchResult, bool(fields))
 
-        if params.searchResult:
-            page = serialize_officer_search_results(results)
-            use_ordered = False
-        else:
-            page = serialize_officer_list(results)
-            use_ordered = True
-
+        has_more = params.skip + len(rows) < row_count
         response = add_pagination_wrapper(
             page_data=page,
             total=row_count,
             page_number=params.page,
             per_page=params.per_page,
+            next_cursor=(
+                keyset_cursor(rows[-1], ranked) if has_more and rows
+                else None),
         )
         return response, 200, use_ordered
 
+    def _serialize_officer_page(
+            self, results, search_result: bool, projected: bool = False):
+        if search_result:
+            return serialize_officer_search_results(results), False
+        if projected:
+            return list(results), True
+        return serialize_officer_list(results), True
+
     def get_officer_employment(self, officer_uid: str) -> list[dict]:
         officer = Officer.nodes.get_or_none(uid=officer_uid)
         if officer is None:
@@ -247,19 +286,14 @@ class OfficerService:
 
     def get_officer_metrics(
             self, officer_uid: str, includes: list[str]) -> dict:
-        officer = Officer.nodes.get_or_none(uid=officer_uid)
-        if officer is None:
+        # One round trip checks the officer and computes every metric.
+        metrics = self.queries.fetch_officer_metrics(
+            officer_uid, includes or [],
+            metrics_fresh_after=metrics_fresh_after())
+        if metrics is None:
             abort(404, description="Officer not found")
 
         if not includes:
             abort(400, description="Include parameter is required.")
 
-        response = {"officer_uid": officer_uid}
-
-        for include in includes:
-            fetcher = self.METRIC_FETCHERS.get(include)
-            if not fetcher:
-                continue
-            response[include] = fetcher(officer_uid)
-
-        return response
+        return {"officer_uid": officer_uid, **metrics}
@@ -0,0 +1,325 @@
+import hashlib
+import inspect
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Iterable
+
+
+class LocalCacheBackend:
+    """
+    In-process LRU of serialized responses. Each entry is indexed by its
+    tags so that invalidating a node drops every entry that referenced it.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str, frozenset]] = (
+            OrderedDict())
+        self._tags: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, payload, _tags = entry
+            if expires_at <= time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def set(
+        self,
+        key: str,
+        payload: str,
+        ttl: float,
+        tags: Iterable[str],
+    ) -> None:
+        tags = frozenset(tags)
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, payload, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys |= self._tags.get(tag, set())
+            for key in keys:
+                self._drop(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisCacheBackend:
+    """
+    Shared backend, so every API worker sees the same entries and the same
+    invalidations. Tags are Redis sets of the keys that carry them.
+    Requires the optional `redis` package.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        prefix: str = "npdi:response:",
+        tag_ttl: int = 86400,
+    ):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self.tag_ttl = tag_ttl
+
+    def get(self, key: str) -> str | None:
+        payload = self.client.get(self.prefix + key)
+        return payload.decode() if payload is not None else None
+
+    def set(
+        self,
+        key: str,
+        payload: str,
+        ttl: float,
+        tags: Iterable[str],
+    ) -> None:
+        pipe = self.client.pipeline()
+        pipe.set(self.prefix + key, payload, ex=max(int(ttl), 1))
+        for tag in tags:
+            pipe.sadd(self._tag_key(tag), key)
+            pipe.expire(self._tag_key(tag), self.tag_ttl)
+        pipe.execute()
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        keys = self.client.sunion(tag_keys) if tag_keys else set()
+        pipe = self.client.pipeline()
+        for key in keys:
+            pipe.delete(self.prefix + key.decode())
+        for tag_key in tag_keys:
+            pipe.delete(tag_key)
+        pipe.execute()
+        return len(keys)
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(match=self.prefix + "*"):
+            self.client.delete(key)
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+
+class ResponseCache:
+    """
+    Caches the results of read-heavy service methods.
+
+    Entries are keyed by the endpoint name and its normalized arguments,
+    and expire after a per-endpoint TTL. Every uid that appears in a cached
+    result, plus any labels the endpoint declares, becomes a tag on the
+    entry. `invalidate_node` drops the entries tagged with a changed node.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        enabled: bool = True,
+        ttls: dict[str, float] | None = None,
+    ):
+        self.backend = backend or LocalCacheBackend()
+        self.enabled = enabled
+        self.ttls = dict(ttls or {})
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def init_app(self, app) -> None:
+        self.enabled = app.config.get("RESPONSE_CACHE_ENABLED", False)
+        self.ttls.update(app.config.get("RESPONSE_CACHE_TTLS") or {})
+        url = app.config.get("RESPONSE_CACHE_URL")
+        if url:
+            self.backend = RedisCacheBackend(url)
+        else:
+            self.backend = LocalCacheBackend(
+                app.config.get("RESPONSE_CACHE_SIZE", 2048))
+
+    def cached(
+        self,
+        name: str,
+        ttl: float,
+        labels: tuple[str, ...] = (),
+        unordered: tuple[str, ...] = (),
+    ):
+        """
+        Cache a service method under `name` for `ttl` seconds, unless
+        `RESPONSE_CACHE_TTLS` overrides it.
+
+        Args:
+            labels: Node labels whose changes invalidate every entry, for
+                results that could gain new nodes (such as search).
+            unordered: Arguments whose order does not matter, such as
+                `includes`, and which are sorted when building the key.
+        """
+        def decorator(func: Callable):
+            signature = inspect.signature(func)
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                params = {
+                    key: value for key, value in bound.arguments.items()
+                    if key != "self"
+                }
+                key = cache_key(name, params, unordered)
+
+                payload = self._backend_call("get", key)
+                if payload is not None:
+                    self._count(hit=True)
+                    return _decode(payload)
+                self._count(hit=False)
+
+                result = func(*args, **kwargs)
+                payload = _encode(result)
+                if payload is not None:
+                    tags = {f"label:{label}" for label in labels}
+                    tags |= {f"uid:{uid}" for uid in referenced_uids(result)}
+                    self._backend_call(
+                        "set", key, payload, self.ttls.get(name, ttl), tags)
+                return result
+
+            wrapper.uncached = func
+            return wrapper
+        return decorator
+
+    def invalidate_node(self, uid: str, labels: Iterable[str] = ()) -> int:
+        """Drop every entry that references `uid` or watches its labels."""
+        tags = [f"uid:{uid}"] + [f"label:{label}" for label in labels]
+        return self._backend_call("invalidate", tags) or 0
+
+    def invalidate_labels(self, labels: Iterable[str]) -> int:
+        """Drop every entry that watches any of `labels`."""
+        tags = [f"label:{label}" for label in labels]
+        return self._backend_call("invalidate", tags) or 0
+
+    def clear(self) -> None:
+        self._backend_call("clear")
+        with self._stats_lock:
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    def _count(self, hit: bool) -> None:
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _backend_call(self, method: str, *args):
+        # A cache outage should slow responses down, not fail them.
+        try:
+            return getattr(self.backend, method)(*args)
+        except Exception as e:
+            logging.warning(f"Response cache {method} failed: {e}")
+            return None
+
+
+def cache_key(name: str, params: dict, unordered: tuple[str, ...] = ()) -> str:
+    """Key for `name` called with `params`, whatever their spelling."""
+    normalized = {
+        key: _normalize(value, key in unordered)
+        for key, value in params.items()
+    }
+    digest = hashlib.sha1(
+        json.dumps(normalized, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f"{name}:{digest}"
+
+
+def referenced_uids(value) -> set[str]:
+    """Every `uid` found anywhere in a serialized result."""
+    uids = set()
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            uid = item.get("uid")
+            if isinstance(uid, str):
+                uids.add(uid)
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return uids
+
+
+def _normalize(value, unordered: bool = False):
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in sorted(value.items())}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_normalize(item) for item in value]
+        if unordered or isinstance(value, (set, frozenset)):
+            return sorted(set(items), key=str)
+        return items
+    return value
+
+
+def _encode(result) -> str | None:
+    """
+    Serialize a result for the cache, or return None when it should not
+    be cached: `(payload, status)` results other than 200, and anything
+    that is not plain JSON.
+    """
+    if isinstance(result, tuple):
+        if len(result) != 2 or result[1] != 200:
+            return None
+        entry = {"status": result[1], "value": result[0]}
+    else:
+        entry = {"value": result}
+    try:
+        return json.dumps(entry)
+    except (TypeError, ValueError):
+        return None
+
+
+def _decode(payload: str):
+    entry = json.loads(payload)
+    if "status" in entry:
+        return entry["value"], entry["status"]
+    return entry["value"]
+
+
+response_cache = ResponseCache(enabled=False)
@@ -1,5 +1,7 @@
-from backend.schemas import add_pagination_wrapper
+from backend.dto.common import encode_cursor
+from backend.schemas import add_cursor_wrapper, add_pagination_wrapper
 from backend.queries.search import SearchQueries
+from backend.services.response_cache import response_cache
 from backend.serializers.search_serializer import (
     build_agency_result,
     build_officer_result,
@@ -10,9 +12,21 @@ from backend.serializers.search_serializer import (
 
 
 class SearchService:
-    def __init__(self, queries: SearchQueries | None = None):
+    def __init__(
+        self,
+        queries: SearchQueries | None = None,
+        *,
+        fused: bool = True,
+    ):
         self.queries = queries or SearchQueries()
+        # When fused, the total, the ranked page and the result details are
+        # fetched in a single round trip instead of three.
+        self.fused = fused
 
+    # Any new or changed officer, agency or unit could enter the results.
+    @response_cache.cached(
+        "search.text", ttl=120, labels=("Officer", "Agency", "Unit"),
+        unordered=("city", "city_uid", "source", "source_uid"))
     def search_text(
         self,
         *,
@@ -24,6 +38,7 @@ class SearchService:
         state: str | None = None,
         source: str | list[str] | None = None,
         source_uid: str | list[str] | None = None,
+        after: list | None = None,
     ) -> tuple[dict, int]:
         city_uids = self.queries.resolve_search_city_uids(
             city=city,
@@ -40,13 +55,40 @@ class SearchService:
         if (source or source_uid) and not source_uids:
             return {"message": "No results found matching the query"}, 200
 
-        total_results = self.queries.count_search_results(
-            query=query,
-            page=page,
-            per_page=per_page,
-            city_uids=city_uids,
-            source_uids=source_uids,
-        )
+        if after is not None:
+            try:
+                self.queries.search_keyset(after)
+            except ValueError as e:
+                return {"message": str(e)}, 400
+            return self._search_after(
+                query=query,
+                after=after,
+                per_page=per_page,
+                city_uids=city_uids,
+                source_uids=source_uids,
+            )
+
+        if self.fused:
+            (
+                total_results,
+                approximate,
+                results,
+                details,
+            ) = self.queries.fetch_search_page(
+                query=query,
+                page=page,
+                per_page=per_page,
+                city_uids=city_uids,
+                source_uids=source_uids,
+            )
+        else:
+            total_results, approximate = self.queries.count_search_matches(
+                query=query,
+                page=page,
+                per_page=per_page,
+                city_uids=city_uids,
+                source_uids=source_uids,
+            )
 
         if total_results == 0:
             return {"message": "No results found matching the query"}, 200
@@ -55,37 +97,74 @@ class SearchService:
         if total_results <= skip:
             return {"message": "Page number exceeds total results"}, 400
 
-        results = self.queries.fetch_search_results(
-            query=query,
-            page=page,
+        if not self.fused:
+            results = self.queries.fetch_search_results(
+                query=query,
+                page=page,
+                per_page=per_page,
+                city_uids=city_uids,
+                source_uids=source_uids,
+            )
+            details = self._fetch_details(results)
+
+        if approximate and not results:
+            return {"message": "Page number exceeds total results"}, 400
+
+        has_more = approximate or skip + len(results) < total_results
+        response = add_pagination_wrapper(
+            page_data=self._build_page(results, details),
+            total=total_results,
+            page_number=page,
             per_page=per_page,
-            city_uids=city_uids,
-            source_uids=source_uids,
+            approximate=approximate,
+            next_cursor=self._next_cursor(results) if has_more else None,
         )
-        buckets = group_nodes_by_type(results)
-        details = self.queries.fetch_search_details(
-            officer_uids=[
-                node.get("uid")
-                for node in buckets.get("Officer", [])
-                if node.get("uid")
-            ],
-            agency_uids=[
-                node.get("uid")
-                for node in buckets.get("Agency", [])
-                if node.get("uid")
-            ],
-            unit_uids=[
-                node.get("uid")
-                for node in buckets.get("Unit", [])
-                if node.get("uid")
-            ],
+        return response, 200
+
+    def _search_after(
+        self,
+        *,
+        query: str,
+        after: list,
+        per_page: int,
+        city_uids: list[str],
+        source_uids: list[str],
+    ) -> tuple[dict, int]:
+        if self.fused:
+            results, details, has_more = self.queries.fetch_search_page_after(
+                query=query,
+                after=after,
+                per_page=per_page,
+                city_uids=city_uids,
+                source_uids=source_uids,
+            )
+        else:
+            results = self.queries.fetch_search_results(
+                query=query,
+                page=1,
+                per_page=per_page + 1,
+                city_uids=city_uids,
+                source_uids=source_uids,
+                after=after,
+            )
+            has_more = len(results) > per_page
+            results = results[:per_page]
+            details = self._fetch_details(results)
+
+        response = add_cursor_wrapper(
+            page_data=self._build_page(results, details),
+            per_page=per_page,
+            next_cursor=self._next_cursor(results) if has_more else None,
         )
+        return response, 200
+
+    def _build_page(self, results, details) -> list[dict]:
         officer_details = details.get("Officer", {})
         agency_details = details.get("Agency", {})
         unit_details = details.get("Unit", {})
 
         page_data = []
-        for node, _score in results:
+        for node, *_ in results:
             content_type = get_node_type(node)
             uid = node.get("uid") if hasattr(node, "get") else None
 
@@ -99,11 +178,30 @@ class SearchService:
                 continue
 
             page_data.append(item.model_dump())
+        return page_data
 
-        response = add_pagination_wrapper(
-            page_data=page_data,
-            total=total_results,
-            page_number=page,
-            per_page=per_page,
+    def _next_cursor(self, results) -> str | None:
+        if not results:
+            return None
+        node, score, rank_bucket = results[-1]
+        return encode_cursor(rank_bucket, score, node.get("uid"))
+
+    def _fetch_details(self, results) -> dict[str, dict[str, dict]]:
+        buckets = group_nodes_by_type(results)
+        return self.queries.fetch_search_details(
+            officer_uids=[
+                node.get("uid")
+                for node in buckets.get("Officer", [])
+                if node.get("uid")
+            ],
+            agency_uids=[
+                node.get("uid")
+                for node in buckets.get("Agency", [])
+                if node.get("uid")
+            ],
+            unit_uids=[
+                node.get("uid")
+                for node in buckets.get("Unit", [])
+                if node.get("uid")
+            ],
         )
-        return response, 200
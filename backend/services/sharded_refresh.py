@@ -0,0 +1,77 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable
+
+# Uids are uuid4 hex strings, already uniformly hashed, so splitting the
+# space of their first four hex digits gives evenly sized shards.
+SHARD_KEY_SPACE = 16 ** 4
+
+
+def shard_bounds(workers: int) -> list[tuple[str, str | None]]:
+    """
+    Split the uid space into `workers` ranges of `(after, until]`. The
+    first range starts before every uid and the last one has no upper
+    bound, so uids that are not hex still land in exactly one shard.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    cuts = [
+        format(i * SHARD_KEY_SPACE // workers, "04x")
+        for i in range(1, workers)
+    ]
+    return list(zip([""] + cuts, cuts + [None]))
+
+
+def merge_refresh_results(results: list[dict]) -> dict:
+    """
+    Combine the summaries of sharded refreshes: counts are summed, batch
+    lists are concatenated, and the earliest `*_updated_at` is kept, so
+    the next incremental run starts before every shard did.
+    """
+    merged: dict = {}
+    for result in results:
+        for key, value in result.items():
+            if key not in merged:
+                merged[key] = list(value) if isinstance(value, list) else value
+            elif isinstance(value, list):
+                merged[key].extend(value)
+            elif isinstance(value, int) and not isinstance(value, bool):
+                merged[key] += value
+            elif key.endswith("_updated_at"):
+                merged[key] = min(merged[key], value)
+    return merged
+
+
+def run_sharded(
+    refresh: Callable[..., dict],
+    workers: int,
+    *,
+    last_refresh: Callable[[], datetime | None],
+    **kwargs,
+) -> dict:
+    """
+    Run `refresh` once per uid shard on a pool of `workers` threads and
+    merge their summaries. `refresh` must accept `after`, `until` and
+    `since`.
+
+    An incremental run reads `last_refresh` once, before any shard
+    writes, and hands every shard the same `since`. A shard that looked
+    it up itself could see the stamp another shard had just written and
+    skip the changes in between. With no previous refresh, every shard
+    runs in full.
+    """
+    if kwargs.get("incremental") and kwargs.get("since") is None:
+        kwargs["since"] = last_refresh()
+        kwargs["incremental"] = kwargs["since"] is not None
+    if workers == 1:
+        return refresh(**kwargs)
+
+    # neomodel connects each thread through the app's shared driver, so
+    # the shards only open sessions of their own.
+    def run_shard(bounds: tuple[str, str | None]) -> dict:
+        after, until = bounds
+        return refresh(after=after, until=until, **kwargs)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(run_shard, shard_bounds(workers)))
+    return merge_refresh_results(results)
@@ -1,34 +1,70 @@
 from datetime import datetime
 
+from backend.queries.changes import ChangeQueries
+from backend.queries.clock import utc_now
 from backend.queries.unit_cache import UnitCacheQueries
+from backend.services.response_cache import response_cache
 
 
 class UnitCacheService:
-    def __init__(self, queries: UnitCacheQueries | None = None):
+    def __init__(
+        self,
+        queries: UnitCacheQueries | None = None,
+        change_queries: ChangeQueries | None = None,
+    ):
         self.queries = queries or UnitCacheQueries()
+        self.change_queries = change_queries or ChangeQueries()
 
     def refresh_unit_metrics_cache(
         self,
         *,
         batch_size: int = 500,
+        incremental: bool = False,
+        since: datetime | None = None,
+        after: str = "",
+        until: str | None = None,
     ) -> dict:
-        rows = self.queries.fetch_unit_metrics_inputs()
+        """
+        Recompute the cached unit metrics. An incremental refresh only
+        recomputes the units reachable from a Change newer than `since`,
+        which defaults to the previous refresh; it falls back to a full
+        refresh when there is no previous one. `after` and `until` limit
+        the refresh to one uid range, for sharded runs.
+        """
+        # Taken before reading, so changes made during the refresh are
+        # picked up by the next incremental run.
+        updated_at = utc_now().isoformat()
+        if not incremental:
+            since = None
+        elif since is None:
+            since = self.queries.fetch_last_refresh()
+        rows = self.queries.iter_unit_metrics_inputs(
+            after=after,
+            until=until,
+            page_size=batch_size,
+            since=since,
+        )
         updates: list[dict] = []
+        seen = 0
         updated = 0
-        updated_at = datetime.now().isoformat()
 
         for (
             unit_uid,
             officer_count,
             complaint_count,
             allegation_count,
+            allegation_summary,
+            reported_officer_uids,
         ) in rows:
+            seen += 1
             updates.append(
                 {
                     "unit_uid": unit_uid,
                     "officer_count_cached": officer_count,
                     "complaint_count_cached": complaint_count,
                     "allegation_count_cached": allegation_count,
+                    "allegation_summary": allegation_summary,
+                    "reported_officer_uids": reported_officer_uids,
                     "metrics_updated_at": updated_at,
                 }
             )
@@ -39,9 +75,50 @@ class UnitCacheService:
 
         if updates:
             updated += self.queries.update_unit_metrics_cache(updates)
+        response_cache.invalidate_labels(["Unit"])
+        self.change_queries.touch_labels(["Unit"])
+
+        return {
+            "units_seen": seen,
+            "units_updated": updated,
+            "metrics_updated_at": updated_at,
+            "mode": "incremental" if since is not None else "full",
+        }
+
+    def refresh_unit_metrics_cache_in_database(
+        self,
+        *,
+        batch_size: int = 500,
+        incremental: bool = False,
+        since: datetime | None = None,
+        after: str = "",
+        until: str | None = None,
+    ) -> dict:
+        """
+        Same result as `refresh_unit_metrics_cache`, but computed and
+        written inside Neo4j a page at a time, so no rows travel to
+        Python. Reports the timing of every batch.
+        """
+        updated_at = utc_now().isoformat()
+        if not incremental:
+            since = None
+        elif since is None:
+            since = self.queries.fetch_last_refresh()
+        batches = self.queries.refresh_unit_metrics_in_database(
+            batch_size=batch_size,
+            metrics_updated_at=updated_at,
+            since=since,
+            after=after,
+            until=until,
+        )
+        updated = sum(batch["updated"] for batch in batches)
+        response_cache.invalidate_labels(["Unit"])
+        self.change_queries.touch_labels(["Unit"])
 
         return {
-            "units_seen": len(rows),
+            "units_seen": updated,
             "units_updated": updated,
             "metrics_updated_at": updated_at,
+            "mode": "incremental" if since is not None else "full",
+            "batches": batches,
         }
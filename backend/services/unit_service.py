@@ -1,6 +1,10 @@
 from backend.database.models.agency import Unit
 from backend.queries.units import UnitQueries
-from backend.schemas import add_pagination_wrapper
+from backend.schemas import (
+    add_batch_wrapper, add_cursor_wrapper, add_pagination_wrapper,
+    keyset_cursor)
+from backend.services.cache_freshness_service import metrics_fresh_after
+from backend.services.response_cache import response_cache
 from backend.serializers.unit_serializer import (
     serialize_unit_list,
     serialize_unit_search_results,
@@ -24,6 +28,37 @@ class UnitService:
             }.items() if v
         }
 
+        ranked = bool(search_term)
+        # Search results have their own shape, so `fields` only projects
+        # the plain listing.
+        fields = None if params.searchResult else params.fields
+
+        if params.after is not None:
+            try:
+                rows = Unit.search(
+                    query=search_term,
+                    filters=filters,
+                    after=params.after,
+                    limit=params.per_page + 1,
+                    inflate=not params.searchResult,
+                    with_score=True,
+                    fields=fields,
+                )
+            except ValueError as e:
+                return {"message": str(e)}, 400, False
+            has_more = len(rows) > params.per_page
+            rows = rows[:params.per_page]
+            page, use_ordered = self._serialize_unit_page(
+                [unit for unit, _score in rows],
+                params.searchResult, bool(fields))
+            response = add_cursor_wrapper(
+                page_data=page,
+                per_page=params.per_page,
+                next_cursor=(
+                    keyset_cursor(rows[-1], ranked) if has_more else None),
+            )
+            return response, 200, use_ordered
+
         row_count = Unit.search(query=search_term, filters=filters, count=True)
 
         if row_count == 0:
@@ -33,36 +68,72 @@ class UnitService:
         if row_count <= params.skip:
             return {"message": "Page number exceeds total results"}, 400, False
 
-        results = Unit.search(
+        rows = Unit.search(
             query=search_term,
             filters=filters,
             skip=params.skip,
             limit=params.per_page,
             inflate=not params.searchResult,
+            with_score=True,
+            fields=fields,
         )
+        page, use_ordered = self._serialize_unit_page(
+            [unit for unit, _score in rows],
+            params.searchResult, bool(fields))
 
-        if params.searchResult:
-            page = serialize_unit_search_results(results)
-            use_ordered = False
-        else:
-            page = serialize_unit_list(results)
-            use_ordered = True
-
+        has_more = params.skip + len(rows) < row_count
         response = add_pagination_wrapper(
             page_data=page,
             total=row_count,
             page_number=params.page,
             per_page=params.per_page,
+            next_cursor=(
+                keyset_cursor(rows[-1], ranked) if has_more and rows
+                else None),
         )
         return response, 200, use_ordered
 
-    def get_unit(self, uid: str, includes: list[str]) -> dict:
-        result = self.queries.fetch_unit_profile(uid=uid, includes=includes)
+    def _serialize_unit_page(
+            self, results, search_result: bool, projected: bool = False):
+        if search_result:
+            return serialize_unit_search_results(results), False
+        if projected:
+            return list(results), True
+        return serialize_unit_list(results), True
+
+    @response_cache.cached(
+        "unit.profile", ttl=300, unordered=("includes", "fields"))
+    def get_unit(
+        self,
+        uid: str,
+        includes: list[str],
+        fields: list[str] | None = None,
+    ) -> dict:
+        result = self.queries.fetch_unit_profile(
+            uid=uid,
+            includes=includes,
+            fields=fields,
+            metrics_fresh_after=metrics_fresh_after(),
+        )
         if not result:
             raise ValueError("Unit not found")
 
         return serialize_unit_profile(result, includes)
 
+    def get_units(
+        self,
+        uids: list[str],
+        includes: list[str],
+        fields: list[str] | None = None,
+    ) -> dict:
+        results = self.queries.fetch_unit_profiles(
+            uids, includes, fields,
+            metrics_fresh_after=metrics_fresh_after())
+        return add_batch_wrapper(uids, {
+            uid: serialize_unit_profile(result, includes)
+            for uid, result in results.items()
+        })
+
     def list_unit_officers(
         self,
         unit_uid: str,
@@ -1,11 +1,27 @@
+import argparse
+
 from backend.api import create_app
 from backend.services.location_cache_service import LocationCacheService
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Refresh cached city and county richness fields.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of uid shards to refresh concurrently.",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
+    args = parse_args()
     app = create_app()
     with app.app_context():
-        result = LocationCacheService().refresh_location_richness_cache()
+        result = LocationCacheService().refresh_location_richness_cache(
+            workers=args.workers)
         print(result)
 
 
@@ -0,0 +1,13 @@
+from backend.api import create_app
+from backend.services.metrics_refresh_service import MetricsRefreshService
+
+
+def main() -> None:
+    app = create_app()
+    with app.app_context():
+        result = MetricsRefreshService().refresh_all_metrics_cache()
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
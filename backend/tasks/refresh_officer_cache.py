@@ -1,11 +1,32 @@
+import argparse
+
 from backend.api import create_app
 from backend.services.officer_cache_service import OfficerCacheService
+from backend.services.sharded_refresh import run_sharded
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Refresh cached officer metric fields.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of uid shards to refresh concurrently.",
+    )
+    return parser.parse_args()
 
 
 def main() -> None:
+    args = parse_args()
     app = create_app()
     with app.app_context():
-        result = OfficerCacheService().refresh_officer_metrics_cache()
+        service = OfficerCacheService()
+        result = run_sharded(
+            service.refresh_officer_metrics_cache,
+            args.workers,
+            last_refresh=service.queries.fetch_last_refresh,
+        )
         print(result)
 
 
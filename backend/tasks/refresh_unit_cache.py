@@ -1,11 +1,32 @@
+import argparse
+
 from backend.api import create_app
 from backend.services.unit_cache_service import UnitCacheService
+from backend.services.sharded_refresh import run_sharded
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Refresh cached unit metric fields.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of uid shards to refresh concurrently.",
+    )
+    return parser.parse_args()
 
 
 def main() -> None:
+    args = parse_args()
     app = create_app()
     with app.app_context():
-        result = UnitCacheService().refresh_unit_metrics_cache()
+        service = UnitCacheService()
+        result = run_sharded(
+            service.refresh_unit_metrics_cache,
+            args.workers,
+            last_refresh=service.queries.fetch_last_refresh,
+        )
         print(result)
 
 
@@ -388,3 +388,68 @@ def test_bad_query_param(client, access_token):
 
     assert "Extra inputs are not permitted" in res.get_data(as_text=True)
     assert res.status_code == 400
+
+
+def test_agency_cursor_pagination(client, example_agencies, access_token):
+    expected = sorted(agency.uid for agency in Agency.nodes.all())
+    seen = []
+    cursor = None
+
+    while True:
+        query_string = {"per_page": 2}
+        if cursor:
+            query_string["cursor"] = cursor
+        res = client.get(
+            "/api/v1/agencies",
+            query_string=query_string,
+            headers={"Authorization": "Bearer {0}".format(access_token)},
+        )
+        assert res.status_code == 200
+        seen.extend(agency["uid"] for agency in res.json["results"])
+        cursor = res.json.get("next_cursor")
+        if not cursor:
+            break
+
+    assert seen == expected
+
+
+def test_get_agency_batch(client, example_agencies, access_token):
+    agencies = list(example_agencies.values())
+    uids = [agencies[1].uid, "missing-agency", agencies[0].uid]
+
+    res = client.get(
+        "/api/v1/agencies/batch",
+        query_string={"uid": uids, "include": ["units", "officers"]},
+        headers={"Authorization": "Bearer {0}".format(access_token)},
+    )
+
+    assert res.status_code == 200
+    assert [a["uid"] for a in res.json["results"]] == [
+        agencies[1].uid, agencies[0].uid]
+    assert res.json["missing"] == ["missing-agency"]
+    assert res.json["results"][0]["name"] == agencies[1].name
+    assert "total_units" in res.json["results"][0]
+
+
+def test_get_agencies_with_fields(client, example_agencies, access_token):
+    seen = []
+    cursor = None
+
+    while True:
+        query_string = {"per_page": 2, "fields": "name"}
+        if cursor:
+            query_string["cursor"] = cursor
+        res = client.get(
+            "/api/v1/agencies",
+            query_string=query_string,
+            headers={"Authorization": "Bearer {0}".format(access_token)},
+        )
+        assert res.status_code == 200
+        for agency in res.json["results"]:
+            assert list(agency) == ["uid", "name"]
+        seen.extend(agency["uid"] for agency in res.json["results"])
+        cursor = res.json.get("next_cursor")
+        if not cursor:
+            break
+
+    assert seen == sorted(agency.uid for agency in Agency.nodes.all())
@@ -1,28 +1,62 @@
+from datetime import datetime
+
 from backend.services.agency_cache_service import AgencyCacheService
 
+SUMMARY = {
+    "types": ["Force"],
+    "occurrences": [2],
+    "substantiated": [1],
+    "earliest": ["2020-01-01"],
+    "latest": [""],
+}
+TOP = ["u-1"]
+
 
 class StubAgencyCacheQueries:
-    def __init__(self, rows):
+    def __init__(self, rows, dirty_rows=(), last_refresh=None):
         self.rows = rows
+        self.dirty_rows = list(dirty_rows)
+        self.last_refresh = last_refresh
+        self.since_calls = []
         self.update_calls = []
+        self.touched_labels = []
+
+    def iter_agency_metrics_inputs(
+            self, *, page_size, since, after="", until=None):
+        if since is None:
+            return iter(self.rows)
+        self.since_calls.append(since)
+        return iter(self.dirty_rows)
 
-    def fetch_agency_metrics_inputs(self):
-        return self.rows
+    def fetch_last_refresh(self):
+        return self.last_refresh
+
+    def refresh_agency_metrics_in_database(
+            self, *, batch_size, metrics_updated_at, since, after="",
+            until=None):
+        self.since_calls.append(since)
+        return [
+            {"batch_start": "a-1", "updated": batch_size, "elapsed_ms": 12},
+            {"batch_start": "a-3", "updated": 1, "elapsed_ms": 3},
+        ]
 
     def update_agency_metrics_cache(self, updates):
         self.update_calls.append(updates)
         return len(updates)
 
+    def touch_labels(self, labels):
+        self.touched_labels.extend(labels)
+
 
 def test_refresh_agency_metrics_cache_batches_updates():
     queries = StubAgencyCacheQueries(
         [
-            ("a-1", 2, 10, 4, 7),
-            ("a-2", 1, 3, 1, 2),
-            ("a-3", 0, 0, 0, 0),
+            ("a-1", 2, 10, 4, 7, SUMMARY, TOP),
+            ("a-2", 1, 3, 1, 2, SUMMARY, TOP),
+            ("a-3", 0, 0, 0, 0, SUMMARY, TOP),
         ]
     )
-    service = AgencyCacheService(queries=queries)
+    service = AgencyCacheService(queries=queries, change_queries=queries)
 
     result = service.refresh_agency_metrics_cache(batch_size=2)
 
@@ -36,6 +70,8 @@ def test_refresh_agency_metrics_cache_batches_updates():
             "officer_count_cached": 10,
             "complaint_count_cached": 4,
             "allegation_count_cached": 7,
+            "allegation_summary": SUMMARY,
+            "reported_unit_uids": TOP,
             "metrics_updated_at": result["metrics_updated_at"],
         },
         {
@@ -44,6 +80,8 @@ def test_refresh_agency_metrics_cache_batches_updates():
             "officer_count_cached": 3,
             "complaint_count_cached": 1,
             "allegation_count_cached": 2,
+            "allegation_summary": SUMMARY,
+            "reported_unit_uids": TOP,
             "metrics_updated_at": result["metrics_updated_at"],
         },
     ]
@@ -54,6 +92,47 @@ def test_refresh_agency_metrics_cache_batches_updates():
             "officer_count_cached": 0,
             "complaint_count_cached": 0,
             "allegation_count_cached": 0,
+            "allegation_summary": SUMMARY,
+            "reported_unit_uids": TOP,
             "metrics_updated_at": result["metrics_updated_at"],
         },
     ]
+
+
+def test_refresh_agency_metrics_cache_incremental():
+    last_refresh = datetime(2024, 5, 1, 3, 0)
+    queries = StubAgencyCacheQueries(
+        [],
+        dirty_rows=[("a-2", 1, 3, 1, 2, SUMMARY, TOP)],
+        last_refresh=last_refresh,
+    )
+    service = AgencyCacheService(queries=queries, change_queries=queries)
+
+    result = service.refresh_agency_metrics_cache(incremental=True)
+
+    assert queries.since_calls == [last_refresh]
+    assert result["agencies_seen"] == 1
+    assert result["mode"] == "incremental"
+    assert queries.update_calls[0][0]["agency_uid"] == "a-2"
+
+
+def test_first_incremental_agency_refresh_is_full():
+    queries = StubAgencyCacheQueries([("a-2", 1, 3, 1, 2, SUMMARY, TOP)])
+    service = AgencyCacheService(queries=queries, change_queries=queries)
+
+    result = service.refresh_agency_metrics_cache(incremental=True)
+
+    assert queries.since_calls == []
+    assert result["mode"] == "full"
+
+
+def test_refresh_agency_metrics_cache_in_database_reports_batches():
+    queries = StubAgencyCacheQueries([])
+    service = AgencyCacheService(queries=queries, change_queries=queries)
+
+    result = service.refresh_agency_metrics_cache_in_database(batch_size=2)
+
+    assert queries.since_calls == [None]
+    assert result["agencies_updated"] == 3
+    assert [batch["elapsed_ms"] for batch in result["batches"]] == [12, 3]
+    assert queries.touched_labels == ["Agency"]
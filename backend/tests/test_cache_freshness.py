@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+
+from flask import Flask
+
+from backend.services.cache_freshness_service import (
+    CacheFreshnessService,
+    metrics_fresh_after,
+)
+
+
+class StubFreshnessQueries:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def fetch_freshness(self, label, cutoffs):
+        self.calls.append((label, cutoffs))
+        return self.rows.get(label, (0, 0, [0] * len(cutoffs), None, None))
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_freshness_report_summarizes_buckets():
+    queries = StubFreshnessQueries({
+        "Unit": (
+            6, 4, [3, 3, 3, 3], utc(2024, 1, 1), utc(2024, 5, 1, 11, 59)),
+    })
+    now = utc(2024, 5, 1, 12)
+
+    report = CacheFreshnessService(queries=queries).freshness_report(now)
+
+    assert report["Unit"] == {
+        "field": "metrics_updated_at",
+        "total": 6,
+        "missing": 2,
+        "oldest": "2024-01-01T00:00:00+00:00",
+        "newest": "2024-05-01T11:59:00+00:00",
+        "distribution": {"1h": 3, "1d": 0, "7d": 0, "30d": 0, "older": 1},
+    }
+    assert report["CityNode"]["field"] == "richness_updated_at"
+    assert report["CityNode"]["total"] == 0
+    assert queries.calls[0][1][0] == utc(2024, 5, 1, 11)
+
+
+def test_metrics_fresh_after_follows_max_age():
+    app = Flask(__name__)
+    now = utc(2024, 5, 1, 12)
+
+    assert metrics_fresh_after(now) is None
+    with app.app_context():
+        assert metrics_fresh_after(now) is None
+        app.config["METRICS_MAX_AGE"] = 3600
+        assert metrics_fresh_after(now) == utc(2024, 5, 1, 11)
@@ -2,10 +2,16 @@ from __future__ import annotations
 import pytest
 from datetime import datetime, date
 import math
+from neomodel import db
 from backend.database import (
     Complaint, Source, Officer, Location, RecordType,
     Allegation, Civilian, Investigation, Penalty
 )
+from backend.database.models.infra.locations import CityNode
+from backend.routes import complaints as complaint_routes
+from backend.services.agency_cache_service import AgencyCacheService
+from backend.services.officer_cache_service import OfficerCacheService
+from backend.services.unit_cache_service import UnitCacheService
 
 mock_complaint = {
     "record_id": "202202712",
@@ -328,6 +334,30 @@ def test_update_complaint(
     assert c.outcome_of_contact == update["outcome_of_contact"]
 
 
+def test_update_complaint_marks_history_stale(
+        client, db_session, contributor_access_token,
+        example_complaint, example_allegation, example_officer):
+    """An edited complaint leaves the stored series to live reads."""
+    db.cypher_query(
+        """
+        MATCH (o:Officer {uid: $uid})
+        SET o.complaint_history_updated_at = datetime()
+        """,
+        {"uid": example_officer.uid},
+    )
+
+    res = client.patch(
+        f"/api/v1/complaints/{example_complaint.uid}",
+        json={"incident_date": "2019-06-01"},
+        headers={"Authorization": f"Bearer {contributor_access_token}"},
+    )
+
+    assert res.status_code == 200
+    officer = Officer.nodes.get(uid=example_officer.uid)
+    assert officer.complaint_history_updated_at is None
+    assert officer.metrics_changed_at is not None
+
+
 def test_update_complaint_no_edit_permission(
         client, access_token, example_complaint):
     # Verify that a user without edit permissions cannot update
@@ -422,6 +452,312 @@ def test_create_allegation(
     assert a_obj.accused.single().uid == new_allegation["accused_uid"]
 
 
+def test_allegation_write_through_metrics(
+    client, db_session, contributor_access_token,
+    example_complaint, example_officer
+):
+    """Creating and deleting an allegation moves the officer's counts."""
+    db.cypher_query(
+        """
+        MATCH (o:Officer {uid: $uid})
+        SET o.complaint_count_cached = 2,
+            o.allegation_count_cached = 3,
+            o.substantiated_count_cached = 1,
+            o.metrics_updated_at = datetime()
+        """,
+        {"uid": example_officer.uid},
+    )
+    headers = {"Authorization": f"Bearer {contributor_access_token}"}
+
+    def cached_counts():
+        officer = Officer.nodes.get(uid=example_officer.uid)
+        return (
+            officer.complaint_count_cached,
+            officer.allegation_count_cached,
+            officer.substantiated_count_cached,
+        )
+
+    res = client.post(
+        f"/api/v1/complaints/{example_complaint.uid}/allegations",
+        json={
+            "allegation": "New allegation",
+            "finding": "Substantiated",
+            "accused_uid": example_officer.uid,
+        },
+        headers=headers,
+    )
+    assert res.status_code == 201
+    assert cached_counts() == (3, 4, 2)
+    assert Officer.nodes.get(
+        uid=example_officer.uid).metrics_changed_at is not None
+
+    res = client.delete(
+        f"/api/v1/complaints/{example_complaint.uid}"
+        f"/allegations/{res.json['uid']}",
+        headers=headers,
+    )
+    assert res.status_code == 204
+    assert cached_counts() == (2, 3, 1)
+
+
+def set_cached_counts(officer_uid, complaints, allegations, substantiated):
+    db.cypher_query(
+        """
+        MATCH (o:Officer {uid: $uid})
+        SET o.complaint_count_cached = $complaints,
+            o.allegation_count_cached = $allegations,
+            o.substantiated_count_cached = $substantiated,
+            o.metrics_updated_at = datetime()
+        """,
+        {
+            "uid": officer_uid,
+            "complaints": complaints,
+            "allegations": allegations,
+            "substantiated": substantiated,
+        },
+    )
+
+
+def cached_officer_counts(officer_uid):
+    officer = Officer.nodes.get(uid=officer_uid)
+    return (
+        officer.complaint_count_cached,
+        officer.allegation_count_cached,
+        officer.substantiated_count_cached,
+    )
+
+
+def test_update_allegation_moves_metrics(
+    client, db_session, contributor_access_token,
+    example_complaint, example_officer
+):
+    """A new accused officer and finding move both officers' counts."""
+    other_officer = Officer(first_name="Jane", last_name="Roe").save()
+    set_cached_counts(example_officer.uid, 2, 3, 1)
+    set_cached_counts(other_officer.uid, 0, 0, 0)
+    headers = {"Authorization": f"Bearer {contributor_access_token}"}
+
+    res = client.post(
+        f"/api/v1/complaints/{example_complaint.uid}/allegations",
+        json={
+            "allegation": "New allegation",
+            "finding": "Unsubstantiated",
+            "accused_uid": example_officer.uid,
+        },
+        headers=headers,
+    )
+    assert res.status_code == 201
+    assert cached_officer_counts(example_officer.uid) == (3, 4, 1)
+
+    res = client.patch(
+        f"/api/v1/complaints/{example_complaint.uid}"
+        f"/allegations/{res.json['uid']}",
+        json={
+            "allegation": "New allegation",
+            "finding": "Substantiated",
+            "accused_uid": other_officer.uid,
+        },
+        headers=headers,
+    )
+    assert res.status_code == 200
+    assert cached_officer_counts(example_officer.uid) == (2, 3, 1)
+    assert cached_officer_counts(other_officer.uid) == (1, 1, 1)
+
+
+def test_delete_complaint_moves_metrics(
+    client, db_session, contributor_access_token,
+    source_admin_access_token, example_complaint, example_officer
+):
+    """Deleting a complaint takes it and its allegations out of the counts."""
+    city = CityNode(
+        name="New York", complaint_count_cached=4,
+        richness_score_cached=20.0).save()
+    example_complaint.location.single().city_node.connect(city)
+    set_cached_counts(example_officer.uid, 2, 3, 1)
+    for finding in ("Substantiated", "Exonerated"):
+        res = client.post(
+            f"/api/v1/complaints/{example_complaint.uid}/allegations",
+            json={
+                "allegation": "New allegation",
+                "finding": finding,
+                "accused_uid": example_officer.uid,
+            },
+            headers={"Authorization": f"Bearer {contributor_access_token}"},
+        )
+        assert res.status_code == 201
+    assert cached_officer_counts(example_officer.uid) == (3, 5, 2)
+
+    res = client.delete(
+        f"/api/v1/complaints/{example_complaint.uid}",
+        headers={"Authorization": f"Bearer {source_admin_access_token}"},
+    )
+
+    assert res.status_code == 204
+    assert cached_officer_counts(example_officer.uid) == (2, 3, 1)
+    city = CityNode.nodes.get(uid=city.uid)
+    assert city.complaint_count_cached == 3
+    assert city.richness_score_cached == 15.0
+
+
+def test_allegation_write_through_marks_stored_data_stale(
+    client, db_session, contributor_access_token,
+    example_complaint, example_officer, example_employment
+):
+    """Stored data a delta cannot move falls back to live reads."""
+    db.cypher_query(
+        """
+        MATCH (o:Officer {uid: $uid})-[:HELD_BY]-(:Employment)
+            -[:IN_UNIT]->(u:Unit)-[:ESTABLISHED_BY]-(a:Agency)
+        SET u.allegation_summary_updated_at = datetime(),
+            a.allegation_summary_updated_at = datetime(),
+            u.ranking_updated_at = datetime(),
+            a.ranking_updated_at = datetime()
+        """,
+        {"uid": example_officer.uid},
+    )
+
+    res = client.post(
+        f"/api/v1/complaints/{example_complaint.uid}/allegations",
+        json={
+            "allegation": "New allegation",
+            "accused_uid": example_officer.uid,
+        },
+        headers={"Authorization": f"Bearer {contributor_access_token}"},
+    )
+    assert res.status_code == 201
+
+    rows, _ = db.cypher_query(
+        """
+        MATCH (u:Unit)-[:ESTABLISHED_BY]-(a:Agency)
+        WHERE u.uid = $unit_uid
+        RETURN
+            u.allegation_summary_updated_at,
+            a.allegation_summary_updated_at,
+            u.ranking_updated_at,
+            a.ranking_updated_at
+        """,
+        {"unit_uid": example_employment.unit.single().uid},
+    )
+    assert rows == [[None, None, None, None]]
+
+
+def test_incremental_refresh_follows_route_writes(
+    client, db_session, contributor_access_token,
+    example_source, example_officer, example_employment
+):
+    """A complaint created through the API is refreshed incrementally."""
+    refreshes = [
+        OfficerCacheService().refresh_officer_metrics_cache,
+        UnitCacheService().refresh_unit_metrics_cache,
+        AgencyCacheService().refresh_agency_metrics_cache,
+    ]
+    for refresh in refreshes:
+        refresh()
+    # Stale values that only a recomputation puts right.
+    db.cypher_query(
+        """
+        MATCH (o:Officer {uid: $uid})-[:HELD_BY]-(:Employment)
+            -[:IN_UNIT]->(u:Unit)-[:ESTABLISHED_BY]-(a:Agency)
+        SET o.complaint_count_cached = 99,
+            u.complaint_count_cached = 99,
+            a.complaint_count_cached = 99
+        """,
+        {"uid": example_officer.uid},
+    )
+
+    res = client.post(
+        "/api/v1/complaints",
+        json={
+            "record_id": "C-incremental",
+            "source_uid": example_source.uid,
+            "source_details": mock_complaint["source_details"],
+            "incident_date": mock_complaint["incident_date"],
+            "location": mock_complaint["location"],
+            "allegations": [{
+                "allegation": "Refusal to process civilian complaint",
+                "type": "Abuse of Authority",
+                "finding": "Substantiated",
+                "accused_uid": example_officer.uid,
+            }],
+        },
+        headers={"Authorization": f"Bearer {contributor_access_token}"},
+    )
+    assert res.status_code == 201
+
+    for refresh in refreshes:
+        assert refresh(incremental=True)["mode"] == "incremental"
+
+    rows, _ = db.cypher_query(
+        """
+        MATCH (o:Officer {uid: $uid})-[:HELD_BY]-(:Employment)
+            -[:IN_UNIT]->(u:Unit)-[:ESTABLISHED_BY]-(a:Agency)
+        RETURN
+            o.complaint_count_cached,
+            u.complaint_count_cached,
+            a.complaint_count_cached
+        """,
+        {"uid": example_officer.uid},
+    )
+    assert rows == [[1, 1, 1]]
+
+
+def test_invalidate_metrics_drops_touched_nodes(monkeypatch):
+    invalidated, touched_labels = [], []
+    monkeypatch.setattr(
+        complaint_routes.response_cache, "invalidate_node",
+        lambda uid, labels: invalidated.append((uid, labels)))
+    monkeypatch.setattr(
+        complaint_routes.response_cache, "invalidate_labels",
+        lambda labels: invalidated.append(tuple(labels)))
+    monkeypatch.setattr(
+        complaint_routes.change_queries, "touch_labels",
+        lambda labels: touched_labels.extend(labels))
+
+    complaint_routes.invalidate_metrics({
+        "Officer": ["o-1"], "Unit": ["u-1", "u-2"], "Agency": [],
+    })
+
+    assert invalidated == [
+        ("o-1", ["Officer"]), ("u-1", ["Unit"]), ("u-2", ["Unit"])]
+    assert touched_labels == ["Officer", "Unit"]
+
+    complaint_routes.invalidate_metrics({"CityNode": ["city-1"]})
+    assert invalidated[-1] == ("CityNode", "CountyNode", "StateNode")
+
+
+def test_allegation_write_through_keeps_history_sorted(
+    client, db_session, contributor_access_token,
+    example_complaint, example_officer
+):
+    """A year new to the stored series is inserted in order."""
+    year = example_complaint.incident_date.year
+    db.cypher_query(
+        """
+        MATCH (o:Officer {uid: $uid})
+        SET o.complaint_history_years_cached = [$year - 2, $year + 1],
+            o.complaint_history_counts_cached = [1, 1],
+            o.complaint_history_closed_cached = [0, 1]
+        """,
+        {"uid": example_officer.uid, "year": year},
+    )
+
+    res = client.post(
+        f"/api/v1/complaints/{example_complaint.uid}/allegations",
+        json={
+            "allegation": "New allegation",
+            "accused_uid": example_officer.uid,
+        },
+        headers={"Authorization": f"Bearer {contributor_access_token}"},
+    )
+    assert res.status_code == 201
+
+    officer = Officer.nodes.get(uid=example_officer.uid)
+    assert officer.complaint_history_years_cached == [
+        year - 2, year, year + 1]
+    assert officer.complaint_history_counts_cached == [1, 1, 1]
+    assert officer.complaint_history_closed_cached == [0, 1, 1]
+
+
 def test_update_allegation(
     client, db_session, contributor_access_token,
     example_complaint, example_allegation
@@ -942,3 +1278,53 @@ def test_create_complaint_with_multiple_allegations(
     expected_civ_ids = {f"{complaint.uid}-1", f"{complaint.uid}-2",
                         f"{complaint.uid}-3"}
     assert civ_ids_seen == expected_civ_ids
+
+
+def test_complaint_to_dict_query_count(db_session, example_complaint):
+    """Benchmark: relationships are read in one query, whatever their size.
+
+    Before, each relationship cost a query, plus two per related node when
+    it had a relationship model (10 queries for this complaint).
+    """
+    from neomodel import db
+
+    queries = []
+    cypher_query = db.cypher_query
+
+    def counting_cypher_query(query, params=None, **kwargs):
+        queries.append(query)
+        return cypher_query(query, params, **kwargs)
+
+    db.cypher_query = counting_cypher_query
+    try:
+        data = example_complaint.to_dict()
+    finally:
+        db.cypher_query = cypher_query
+
+    # One query for the defined relationships, one per virtual relationship
+    assert len(queries) == 1 + len(Complaint.__virtual_relationships__)
+    assert data["location"][0]["city"] == "New York"
+    assert data["source_org"][0]["relationship"]["record_type"] == (
+        RecordType.government.value)
+    assert data["police_witnesses"] == []
+
+
+def test_to_dict_reads_relationships_in_one_query(monkeypatch):
+    queries = []
+
+    def fake_cypher_query(query, params=None, **kwargs):
+        queries.append((query, params))
+        return [], []
+
+    monkeypatch.setattr("backend.schemas.db.cypher_query", fake_cypher_query)
+    complaint = Complaint(uid="complaint-1")
+    complaint.element_id_property = "4:test:1"
+
+    data = complaint.to_dict(relationship_limit=5)
+
+    relationship_query, params = queries[0]
+    assert params == {"element_id": "4:test:1", "relationship_limit": 5}
+    assert relationship_query.count("CALL (n)") == 5
+    assert "MATCH (n)-[r:`HAS_SOURCE`]->(m:Source)" in relationship_query
+    assert data["source_org"] == []
+    assert data["attachments"] == []
@@ -0,0 +1,88 @@
+from datetime import datetime, timezone
+
+import pytest
+from flask import Flask, jsonify
+
+from backend.routes.conditional import change_queries, conditional_get
+
+
+class StubChangeQueries:
+    def __init__(self, last_modified):
+        self.last_modified = last_modified
+
+    def fetch_node_last_modified(self, label, uid):
+        if uid == "missing":
+            return False, None
+        return True, self.last_modified
+
+    def fetch_label_last_modified(self, label):
+        return 3, self.last_modified
+
+
+@pytest.fixture
+def stub_client(monkeypatch):
+    stub = StubChangeQueries(datetime(2024, 5, 1, 12, tzinfo=timezone.utc))
+    for name in ("fetch_node_last_modified", "fetch_label_last_modified"):
+        monkeypatch.setattr(change_queries, name, getattr(stub, name))
+
+    app = Flask(__name__)
+    calls = []
+
+    @app.route("/officers/<uid>")
+    @conditional_get("Officer", uid_arg="uid")
+    def get_officer(uid):
+        calls.append(uid)
+        if uid == "missing":
+            return jsonify(message="Officer not found"), 404
+        return jsonify(uid=uid)
+
+    @app.route("/officers")
+    @conditional_get("Officer")
+    def get_officers():
+        calls.append("list")
+        return jsonify(results=[])
+
+    yield app.test_client(), stub, calls
+
+
+def test_profile_answers_304_without_running_view(stub_client):
+    client, _stub, calls = stub_client
+    res = client.get("/officers/o-1")
+    etag = res.headers["ETag"]
+
+    assert res.headers["Last-Modified"] == "Wed, 01 May 2024 12:00:00 GMT"
+
+    res = client.get("/officers/o-1", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+    res = client.get(
+        "/officers/o-1",
+        headers={"If-Modified-Since": "Wed, 01 May 2024 12:00:00 GMT"})
+    assert res.status_code == 304
+    assert calls == ["o-1"]
+
+
+def test_etag_follows_changes_and_query(stub_client):
+    client, stub, calls = stub_client
+    etag = client.get("/officers/o-1").headers["ETag"]
+
+    res = client.get(
+        "/officers/o-1?include=employment", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+
+    stub.last_modified = datetime(2024, 5, 2, tzinfo=timezone.utc)
+    res = client.get("/officers/o-1", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+
+
+def test_missing_profile_and_lists(stub_client):
+    client, _stub, calls = stub_client
+
+    res = client.get("/officers/missing")
+    assert res.status_code == 404
+    assert "ETag" not in res.headers
+
+    etag = client.get("/officers").headers["ETag"]
+    res = client.get("/officers", headers={"If-None-Match": etag})
+    assert res.status_code == 304
+    assert calls == ["missing", "list"]
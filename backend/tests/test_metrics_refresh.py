@@ -0,0 +1,135 @@
+from datetime import datetime, timezone
+
+from backend.services.metrics_refresh_service import MetricsRefreshService
+
+
+class StubMetricsRollupQueries:
+    def __init__(self):
+        self.writes = []
+        self.touched_labels = []
+
+    def iter_officer_rollup_inputs(self, *, page_size):
+        return iter([
+            ("o-1", ["u-1"], ["c-1", "c-2"], ["al-1", "al-2"], 1),
+            ("o-2", ["u-1", "u-2"], ["c-2"], ["al-3"], 0),
+            ("o-3", [], [], [], 0),
+        ])
+
+    def fetch_unit_agencies(self):
+        return [("u-1", ["a-1"]), ("u-2", ["a-1"]), ("u-3", [])]
+
+    def fetch_agency_cities(self):
+        return [("a-1", ["city-1"]), ("a-2", ["city-2"])]
+
+    def fetch_city_rollup_inputs(self):
+        return [
+            ("city-1", 999, ["county-1"], ["c-1"]),
+            ("city-2", 0, ["county-1"], []),
+        ]
+
+    def fetch_county_uids(self):
+        return ["county-1", "county-2"]
+
+    def touch_labels(self, labels):
+        self.touched_labels.extend(labels)
+
+    def __getattr__(self, name):
+        if not name.startswith("update_"):
+            raise AttributeError(name)
+
+        def write(updates):
+            self.writes.append((name, list(updates)))
+            return len(updates)
+        return write
+
+
+def by_uid(queries, method, key):
+    return {
+        row[key]: row
+        for name, updates in queries.writes if name == method
+        for row in updates
+    }
+
+
+def test_refresh_all_metrics_cache_rolls_up_officer_pass():
+    queries = StubMetricsRollupQueries()
+    service = MetricsRefreshService(queries=queries, change_queries=queries)
+
+    result = service.refresh_all_metrics_cache(batch_size=2)
+
+    officers = by_uid(queries, "update_officer_metrics_cache", "officer_uid")
+    assert officers["o-1"]["complaint_count_cached"] == 2
+    assert officers["o-1"]["substantiated_count_cached"] == 1
+
+    units = by_uid(queries, "update_unit_metrics_cache", "unit_uid")
+    assert units["u-1"]["officer_count_cached"] == 2
+    assert units["u-1"]["complaint_count_cached"] == 2
+    assert units["u-1"]["allegation_count_cached"] == 3
+    assert units["u-3"]["officer_count_cached"] == 0
+
+    agencies = by_uid(queries, "update_agency_metrics_cache", "agency_uid")
+    assert agencies["a-1"]["unit_count_cached"] == 2
+    assert agencies["a-1"]["officer_count_cached"] == 2
+    assert agencies["a-2"]["unit_count_cached"] == 0
+
+    cities = by_uid(queries, "update_city_richness_cache", "city_uid")
+    assert cities["city-1"]["agency_count_cached"] == 1
+    assert cities["city-1"]["officer_count_cached"] == 2
+    assert cities["city-1"]["richness_score_cached"] == 22.0
+
+    counties = by_uid(queries, "update_county_richness_cache", "county_uid")
+    assert counties["county-1"]["agency_count_cached"] == 2
+    assert counties["county-1"]["complaint_count_cached"] == 1
+    assert counties["county-2"]["richness_score_cached"] == 0
+
+    assert result["officers_updated"] == 3
+    assert result["counties_updated"] == 2
+    assert list(result["timings_ms"]) == [
+        "officers", "units", "agencies", "cities", "counties"]
+
+
+def test_refresh_all_metrics_cache_writes_in_dependency_order():
+    queries = StubMetricsRollupQueries()
+    service = MetricsRefreshService(queries=queries, change_queries=queries)
+
+    service.refresh_all_metrics_cache(batch_size=2)
+
+    order = []
+    for name, _updates in queries.writes:
+        if name not in order:
+            order.append(name)
+    assert order == [
+        "update_officer_metrics_cache",
+        "update_unit_metrics_cache",
+        "update_agency_metrics_cache",
+        "update_city_richness_cache",
+        "update_county_richness_cache",
+    ]
+    assert queries.touched_labels == [
+        "Officer", "Unit", "Agency", "CityNode", "CountyNode", "StateNode"]
+
+
+def test_refresh_all_metrics_cache_leaves_summaries_stale(
+        client, example_unit, access_token, monkeypatch):
+    stale = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    example_unit.allegation_types_cached = ["Force"]
+    example_unit.allegation_occurrences_cached = [3]
+    example_unit.allegation_substantiated_cached = [0]
+    example_unit.allegation_earliest_cached = [""]
+    example_unit.allegation_latest_cached = [""]
+    example_unit.allegation_summary_updated_at = stale
+    example_unit.save()
+
+    MetricsRefreshService().refresh_all_metrics_cache()
+    example_unit.refresh()
+    monkeypatch.setitem(client.application.config, "METRICS_MAX_AGE", 3600)
+    res = client.get(
+        f"/api/v1/units/{example_unit.uid}",
+        query_string={"include": "allegations"},
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+
+    assert example_unit.metrics_updated_at > stale
+    assert example_unit.allegation_summary_updated_at == stale
+    assert res.status_code == 200
+    assert res.json["allegation_summary"] == []
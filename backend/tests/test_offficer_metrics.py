@@ -1,5 +1,6 @@
 from __future__ import annotations
 import pytest
+from datetime import date, datetime, timezone
 from backend.database import (
     Officer
 )
@@ -102,6 +103,36 @@ def test_get_complaint_history(
             break
 
 
+def test_get_complaint_history_reads_stored_series(
+        client, example_officer, access_token):
+    # The stored series is served without counting complaints, and years
+    # missing from it are zero
+    year = date.today().year
+    example_officer.complaint_history_years_cached = [year - 10, year - 1]
+    example_officer.complaint_history_counts_cached = [4, 3]
+    example_officer.complaint_history_closed_cached = [4, 2]
+    example_officer.complaint_history_updated_at = datetime.now(timezone.utc)
+    example_officer.save()
+
+    res = client.get(
+        f"/api/v1/officers/{example_officer.uid}/metrics",
+        query_string={
+            "include": ["complaint_history"]
+        },
+        headers={"Authorization": f"Bearer {access_token}"}
+    )
+
+    assert res.status_code == 200
+    history = res.json["complaint_history"]
+    assert [year_data["year"] for year_data in history] == [
+        year - offset for offset in range(7)]
+    assert history[1] == {
+        "year": year - 1, "complaint_count": 3, "closed_count": 2}
+    assert all(
+        year_data["complaint_count"] == 0
+        for year_data in history if year_data["year"] != year - 1)
+
+
 def test_get_allegation_types(
         client, example_officer, example_allegation, access_token):
     # Test that we can get officer complaint history from metrics endpoint
@@ -153,3 +184,30 @@ def test_get_complainant_demo(
     assert "officer_uid" in res.json
     assert res.json["officer_uid"] == example_officer.uid
     assert "complainant_demographics" in res.json
+
+
+def test_get_metrics_combines_includes(
+        client, example_officer, example_allegation, access_token):
+    # Several metrics are returned together, and unknown officers are 404
+    res = client.get(
+        f"/api/v1/officers/{example_officer.uid}/metrics",
+        query_string={
+            "include": ["allegation_types", "complaint_history"]
+        },
+        headers={"Authorization": f"Bearer {access_token}"}
+    )
+
+    assert res.status_code == 200
+    assert res.json["officer_uid"] == example_officer.uid
+    assert "allegation_types" in res.json
+    assert len(res.json["complaint_history"]) == 7
+
+    res = client.get(
+        "/api/v1/officers/not-an-officer/metrics",
+        query_string={
+            "include": ["allegation_types"]
+        },
+        headers={"Authorization": f"Bearer {access_token}"}
+    )
+
+    assert res.status_code == 404
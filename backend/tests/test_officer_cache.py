@@ -1,28 +1,55 @@
+from datetime import datetime
+
 from backend.services.officer_cache_service import OfficerCacheService
 
+HISTORY = {"years": [2021, 2023], "complaints": [1, 2], "closed": [1, 0]}
+
 
 class StubOfficerCacheQueries:
-    def __init__(self, rows):
+    def __init__(self, rows, dirty_rows=(), last_refresh=None):
         self.rows = rows
+        self.dirty_rows = list(dirty_rows)
+        self.last_refresh = last_refresh
+        self.since_calls = []
         self.update_calls = []
+        self.touched_labels = []
+
+    def iter_officer_metrics_inputs(
+            self, *, page_size, since, after="", until=None):
+        if since is None:
+            return iter(self.rows)
+        self.since_calls.append(since)
+        return iter(self.dirty_rows)
 
-    def fetch_officer_metrics_inputs(self):
-        return self.rows
+    def fetch_last_refresh(self):
+        return self.last_refresh
+
+    def refresh_officer_metrics_in_database(
+            self, *, batch_size, metrics_updated_at, since, after="",
+            until=None):
+        self.since_calls.append(since)
+        return [
+            {"batch_start": "o-1", "updated": batch_size, "elapsed_ms": 12},
+            {"batch_start": "o-3", "updated": 1, "elapsed_ms": 3},
+        ]
 
     def update_officer_metrics_cache(self, updates):
         self.update_calls.append(updates)
         return len(updates)
 
+    def touch_labels(self, labels):
+        self.touched_labels.extend(labels)
+
 
 def test_refresh_officer_metrics_cache_batches_updates():
     queries = StubOfficerCacheQueries(
         [
-            ("o-1", 4, 7, 2),
-            ("o-2", 1, 2, 0),
-            ("o-3", 0, 0, 0),
+            ("o-1", 4, 7, 2, HISTORY),
+            ("o-2", 1, 2, 0, HISTORY),
+            ("o-3", 0, 0, 0, HISTORY),
         ]
     )
-    service = OfficerCacheService(queries=queries)
+    service = OfficerCacheService(queries=queries, change_queries=queries)
 
     result = service.refresh_officer_metrics_cache(batch_size=2)
 
@@ -35,6 +62,7 @@ def test_refresh_officer_metrics_cache_batches_updates():
             "complaint_count_cached": 4,
             "allegation_count_cached": 7,
             "substantiated_count_cached": 2,
+            "complaint_history": HISTORY,
             "metrics_updated_at": result["metrics_updated_at"],
         },
         {
@@ -42,6 +70,7 @@ def test_refresh_officer_metrics_cache_batches_updates():
             "complaint_count_cached": 1,
             "allegation_count_cached": 2,
             "substantiated_count_cached": 0,
+            "complaint_history": HISTORY,
             "metrics_updated_at": result["metrics_updated_at"],
         },
     ]
@@ -51,6 +80,43 @@ def test_refresh_officer_metrics_cache_batches_updates():
             "complaint_count_cached": 0,
             "allegation_count_cached": 0,
             "substantiated_count_cached": 0,
+            "complaint_history": HISTORY,
             "metrics_updated_at": result["metrics_updated_at"],
         },
     ]
+
+
+def test_refresh_officer_metrics_cache_incremental():
+    last_refresh = datetime(2024, 5, 1, 3, 0)
+    queries = StubOfficerCacheQueries(
+        [], dirty_rows=[("o-2", 1, 2, 1, HISTORY)], last_refresh=last_refresh)
+    service = OfficerCacheService(queries=queries, change_queries=queries)
+
+    result = service.refresh_officer_metrics_cache(incremental=True)
+
+    assert queries.since_calls == [last_refresh]
+    assert result["officers_seen"] == 1
+    assert result["mode"] == "incremental"
+    assert queries.update_calls[0][0]["officer_uid"] == "o-2"
+
+
+def test_first_incremental_officer_refresh_is_full():
+    queries = StubOfficerCacheQueries([("o-2", 1, 2, 1, HISTORY)])
+    service = OfficerCacheService(queries=queries, change_queries=queries)
+
+    result = service.refresh_officer_metrics_cache(incremental=True)
+
+    assert queries.since_calls == []
+    assert result["mode"] == "full"
+
+
+def test_refresh_officer_metrics_cache_in_database_reports_batches():
+    queries = StubOfficerCacheQueries([])
+    service = OfficerCacheService(queries=queries, change_queries=queries)
+
+    result = service.refresh_officer_metrics_cache_in_database(batch_size=2)
+
+    assert queries.since_calls == [None]
+    assert result["officers_updated"] == 3
+    assert [batch["elapsed_ms"] for batch in result["batches"]] == [12, 3]
+    assert queries.touched_labels == ["Officer"]
@@ -1,7 +1,7 @@
 from __future__ import annotations
 import pytest
 import math
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from backend.database import (
     Officer, Unit, Agency, Employment
 )
@@ -185,6 +185,54 @@ def test_get_officer(client, example_officer, access_token):
     assert res.json["ethnicity"] == example_officer.ethnicity
 
 
+def test_get_officer_conditional(
+        client, example_officer, example_source, access_token,
+        add_test_change):
+    url = f"/api/v1/officers/{example_officer.uid}"
+    res = client.get(url)
+    etag = res.headers["ETag"]
+
+    assert res.status_code == 200
+    assert res.headers["Last-Modified"]
+
+    res = client.get(url, headers={"If-None-Match": etag})
+    assert res.status_code == 304
+    assert res.headers["ETag"] == etag
+    assert not res.data
+
+    res = client.get(
+        url, headers={"If-Modified-Since": res.headers["Last-Modified"]})
+    assert res.status_code == 304
+
+    res = client.get(
+        url, query_string={"include": "employment"},
+        headers={"If-None-Match": etag})
+    assert res.status_code == 200
+
+    add_test_change(
+        example_officer, example_source,
+        timestamp=datetime.now() + timedelta(seconds=5))
+    res = client.get(url, headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+
+
+def test_get_officers_follows_label_watermark(
+        client, example_officer, example_source, access_token,
+        add_test_change):
+    url = "/api/v1/officers"
+    headers = {"Authorization": f"Bearer {access_token}"}
+    etag = client.get(url, headers=headers).headers["ETag"]
+
+    res = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert res.status_code == 304
+
+    add_test_change(example_officer, example_source)
+    res = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+
+
 """
 @pytest.mark.parametrize(
     ("query", "expected_officer_names"),
@@ -1016,3 +1064,174 @@ def test_filter_officers_by_multiple_agency_uids(
     assert res.status_code == 200
     result_uids = {item["uid"] for item in res.json["results"]}
     assert result_uids == {first_officer.uid, second_officer.uid}
+
+
+def test_officer_cursor_pagination(
+        client, db_session, access_token, example_officers):
+    expected = sorted(officer.uid for officer in Officer.nodes.all())
+    seen = []
+
+    res = client.get(
+        "/api/v1/officers",
+        query_string={"per_page": 1},
+        headers={"Authorization": "Bearer {0}".format(access_token)},
+    )
+    assert res.status_code == 200
+    seen.extend(officer["uid"] for officer in res.json["results"])
+    cursor = res.json.get("next_cursor")
+
+    while cursor:
+        res = client.get(
+            "/api/v1/officers",
+            query_string={"per_page": 1, "cursor": cursor},
+            headers={"Authorization": "Bearer {0}".format(access_token)},
+        )
+        assert res.status_code == 200
+        assert "total" not in res.json
+        seen.extend(officer["uid"] for officer in res.json["results"])
+        cursor = res.json["next_cursor"]
+
+    assert seen == expected
+
+
+def test_officer_invalid_cursor(client, db_session, access_token):
+    res = client.get(
+        "/api/v1/officers",
+        query_string={"cursor": "not-a-cursor"},
+        headers={"Authorization": "Bearer {0}".format(access_token)},
+    )
+    assert res.status_code == 400
+
+
+def test_officer_search_reuses_query_shape(monkeypatch):
+    queries = []
+
+    def fake_cypher_query(query, params, resolve_objects=False):
+        queries.append((query, params))
+        return [], []
+
+    monkeypatch.setattr(
+        "backend.database.models.officer.db.cypher_query", fake_cypher_query
+    )
+
+    Officer.search(name="John", skip=0, limit=10)
+    Officer.search(name="O'Brien", skip=20, limit=5)
+    Officer.search(name="Doe", unit=["Patrol"])
+
+    (first, first_params), (second, second_params), (third, _) = queries
+    assert first == second
+    assert "O'Brien" not in second
+    assert second_params["name"] == "O'Brien"
+    assert second_params["skip"] == 20
+    assert third != first
+
+
+def test_officer_search_rank_traverses_employment(monkeypatch):
+    queries = []
+    monkeypatch.setattr(
+        "backend.database.models.officer.db.cypher_query",
+        lambda query, params, **kwargs: queries.append(query) or ([], []),
+    )
+
+    Officer.search(rank="Captain")
+
+    assert "(e:Employment)" in queries[0]
+
+
+def test_get_officer_batch(
+        client, db_session, access_token, example_officers):
+    officers = list(example_officers.values())
+    uids = [officers[1].uid, "missing-officer", officers[0].uid]
+
+    res = client.get(
+        "/api/v1/officers/batch",
+        query_string={"uid": uids, "include": ["employment", "allegations"]},
+        headers={"Authorization": "Bearer {0}".format(access_token)},
+    )
+
+    assert res.status_code == 200
+    assert [o["uid"] for o in res.json["results"]] == [
+        officers[1].uid, officers[0].uid]
+    assert res.json["missing"] == ["missing-officer"]
+    for officer in res.json["results"]:
+        assert officer["employment_history"] == []
+        assert officer["allegation_summary"] == []
+
+
+def test_get_officer_batch_requires_uids(client, db_session, access_token):
+    res = client.get(
+        "/api/v1/officers/batch",
+        headers={"Authorization": "Bearer {0}".format(access_token)},
+    )
+    assert res.status_code == 400
+
+
+def test_officer_batch_is_one_query(monkeypatch):
+    from backend.queries.officers import OfficerQueries
+
+    queries = []
+    monkeypatch.setattr(
+        "backend.queries.officers.db.cypher_query",
+        lambda query, params, **kwargs: queries.append(params) or ([], []),
+    )
+
+    profiles = OfficerQueries().fetch_officer_profiles(
+        ["a", "b", "c"], ["employment", "allegations"])
+
+    assert profiles == {}
+    assert len(queries) == 1
+    assert queries[0]["uids"] == ["a", "b", "c"]
+
+
+def test_get_officer_with_fields(client, example_officer, access_token):
+    res = client.get(
+        f"/api/v1/officers/{example_officer.uid}",
+        query_string={"fields": "first_name,last_name"},
+        headers={"Authorization": "Bearer {0}".format(access_token)},
+    )
+
+    assert res.status_code == 200
+    assert res.json["uid"] == example_officer.uid
+    assert res.json["first_name"] == example_officer.first_name
+    assert res.json["last_name"] == example_officer.last_name
+    assert "gender" not in res.json
+    assert "sources" in res.json
+
+
+def test_get_officer_with_fields_not_found(client, db_session, access_token):
+    res = client.get(
+        "/api/v1/officers/missing-officer",
+        query_string={"fields": "first_name"},
+        headers={"Authorization": "Bearer {0}".format(access_token)},
+    )
+    assert res.status_code == 404
+
+
+def test_officer_search_projects_fields(monkeypatch):
+    calls = []
+
+    def fake_cypher_query(query, params, resolve_objects=False):
+        calls.append((query, params, resolve_objects))
+        return [[["officer-1", "Jane"], 0.0]], []
+
+    monkeypatch.setattr(
+        "backend.database.models.officer.db.cypher_query", fake_cypher_query
+    )
+
+    rows = Officer.search(fields=["uid", "first_name"])
+
+    query, params, resolve_objects = calls[0]
+    assert "[field IN $fields | o[field]]" in query
+    assert params["fields"] == ["uid", "first_name"]
+    assert resolve_objects is False
+    assert rows == [{"uid": "officer-1", "first_name": "Jane"}]
+
+
+def test_officer_fields_param_is_validated():
+    from backend.dto.officer import OfficerSearchParams
+
+    params = OfficerSearchParams(fields="last_name, first_name")
+    assert params.fields == ["uid", "last_name", "first_name"]
+
+    with pytest.raises(ValueError):
+        OfficerSearchParams(fields="first_name,not_a_field")
@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+import pytest
+
+from backend.database.pool import PoolMetrics
+
+
+class StubConnection:
+    def __init__(self, in_use):
+        self.in_use = in_use
+
+
+class StubPool:
+    def __init__(self, connections, fail=False):
+        self.connections = {"neo4j:7687": connections}
+        self.fail = fail
+
+    def acquire(self, *args, **kwargs):
+        if self.fail:
+            raise RuntimeError("timed out")
+        return self.connections["neo4j:7687"][0]
+
+    def in_use_connection_count(self, address):
+        return sum(c.in_use for c in self.connections[address])
+
+
+def test_pool_metrics_report_usage_and_waits():
+    pool = StubPool([StubConnection(True), StubConnection(False)])
+    metrics = PoolMetrics(max_size=4).attach(SimpleNamespace(_pool=pool))
+
+    pool.acquire(database="neo4j")
+    pool.acquire(database="neo4j")
+    snapshot = metrics.snapshot()
+
+    assert snapshot["max_size"] == 4
+    assert snapshot["in_use"] == 1
+    assert snapshot["idle"] == 1
+    assert snapshot["utilization"] == 0.25
+    assert snapshot["acquisitions"] == 2
+    assert snapshot["acquisition_failures"] == 0
+    assert snapshot["wait_ms_max"] <= snapshot["wait_ms_total"]
+
+
+def test_pool_metrics_count_failed_acquisitions():
+    pool = StubPool([], fail=True)
+    metrics = PoolMetrics(max_size=4).attach(SimpleNamespace(_pool=pool))
+
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+    assert metrics.snapshot()["acquisition_failures"] == 1
+    metrics.reset()
+    assert metrics.snapshot()["acquisitions"] == 0
+
+
+def test_pool_metrics_degrade_without_pool_internals():
+    metrics = PoolMetrics(max_size=4).attach(SimpleNamespace())
+    snapshot = metrics.snapshot()
+
+    assert snapshot["max_size"] == 4
+    assert snapshot["in_use"] is None
+    assert snapshot["utilization"] is None
+    assert snapshot["acquisitions"] == 0
+
+    pool = SimpleNamespace(acquire=lambda: None)
+    snapshot = PoolMetrics(max_size=4).attach(
+        SimpleNamespace(_pool=pool)).snapshot()
+    assert snapshot["in_use"] is None
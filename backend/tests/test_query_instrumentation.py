@@ -0,0 +1,81 @@
+import logging
+
+from flask import Flask, g
+from neomodel.sync_.core import Database
+
+from backend.database import instrumentation
+from backend.database.instrumentation import (
+    QueryInstrumentation,
+    query_shape_id,
+)
+from backend.queries.templates import QueryTemplates
+
+
+def instrumented_app(**settings):
+    app = Flask(__name__)
+    app.config.update(settings)
+    queries = QueryInstrumentation()
+    queries.init_app(app)
+
+    @app.route("/profile")
+    def profile():
+        queries.record("MATCH (o:Officer) RETURN o", 0.004, 1)
+        for _ in range(3):
+            queries.record("MATCH (u:Unit)  RETURN u", 0.002, 2)
+        return g.query_stats.summary()
+
+    return app
+
+
+def test_request_stats_and_server_timing_header():
+    app = instrumented_app(SERVER_TIMING=True)
+
+    response = app.test_client().get("/profile")
+
+    assert response.json["queries"] == 4
+    assert response.json["rows"] == 7
+    assert response.json["db_ms"] == 10.0
+    assert list(response.json["shapes"].values()) == [3, 1]
+    assert response.headers["Server-Timing"] == (
+        'db;dur=10.0;desc="4 queries, 7 rows"')
+
+
+def test_slow_and_repeated_queries_are_logged(caplog):
+    app = instrumented_app(SLOW_QUERY_MS=3, REPEATED_QUERY_LIMIT=2)
+
+    with caplog.at_level(logging.WARNING):
+        response = app.test_client().get("/profile")
+
+    assert "Server-Timing" not in response.headers
+    messages = [record.getMessage() for record in caplog.records]
+    assert len(messages) == 2
+    assert messages[0].startswith("Slow Cypher query cypher:")
+    assert messages[1].endswith("3 times")
+
+
+def test_query_shape_id_prefers_catalogued_name(monkeypatch):
+    templates = QueryTemplates()
+    templates.register("officer.by_uid", "MATCH (o) RETURN o")
+    monkeypatch.setattr(instrumentation, "query_templates", templates)
+
+    assert query_shape_id("MATCH (o) RETURN o") == "officer.by_uid"
+    assert query_shape_id("MATCH (u)\n  RETURN u") == (
+        query_shape_id("MATCH (u) RETURN u"))
+
+
+def test_cypher_query_is_timed(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(
+        Database, "cypher_query",
+        lambda self, query, params=None: ([[1], [2]], ["n"]),
+    )
+    monkeypatch.setattr(
+        instrumentation.query_instrumentation, "record",
+        lambda query, seconds, rows: recorded.append((query, rows)),
+    )
+    instrumentation._instrument_cypher_query()
+
+    results, _ = Database.cypher_query(object(), "MATCH (n) RETURN n")
+
+    assert results == [[1], [2]]
+    assert recorded == [("MATCH (n) RETURN n", 2)]
@@ -0,0 +1,206 @@
+from datetime import datetime
+from itertools import product
+
+from neomodel import db
+
+from backend.database.models.agency import Agency
+from backend.database.models.officer import (
+    OfficerSearchPath,
+    _officer_search_cypher,
+)
+from backend.database.models.source import Source
+from backend.queries.agency_cache import (
+    AGENCY_METRICS_IN_DATABASE_QUERY,
+    DIRTY_AGENCY_METRICS_IN_DATABASE_QUERY,
+    DIRTY_AGENCY_METRICS_INPUT_QUERY,
+)
+from backend.queries.location_cache import (
+    DIRTY_CITY_RICHNESS_INPUT_QUERY,
+    DIRTY_COUNTY_RICHNESS_INPUT_QUERY,
+)
+from backend.queries.metric_deltas import (
+    ALLEGATION_DELTA_QUERY,
+    COMPLAINT_DELTA_QUERY,
+)
+from backend.queries.metrics_rollup import (
+    CITY_ROLLUP_INPUT_QUERY,
+    OFFICER_ROLLUP_INPUT_QUERY,
+)
+from backend.queries.officer_cache import (
+    DIRTY_OFFICER_METRICS_IN_DATABASE_QUERY,
+    DIRTY_OFFICER_METRICS_INPUT_QUERY,
+    OFFICER_METRICS_IN_DATABASE_QUERY,
+)
+from backend.queries.unit_cache import (
+    DIRTY_UNIT_METRICS_IN_DATABASE_QUERY,
+    DIRTY_UNIT_METRICS_INPUT_QUERY,
+    UNIT_METRICS_IN_DATABASE_QUERY,
+)
+from backend.queries.changes import (
+    VALIDATED_LABELS,
+    _node_validator_query,
+)
+from backend.queries.agencies import (
+    AgencyQueries,
+    _agency_officers_query,
+    _agency_profile_query,
+)
+from backend.queries.officers import (
+    METRIC_SUBQUERIES,
+    OfficerQueries,
+    _officer_metrics_query,
+    _officer_profiles_query,
+)
+from backend.queries.templates import (
+    QueryTemplates,
+    iter_uid_pages,
+    query_templates,
+    run_uid_batches,
+)
+from backend.queries.units import (
+    UnitQueries,
+    _unit_officers_query,
+    _unit_profile_query,
+)
+from backend.schemas import _rel_query_cypher
+
+
+def test_registry_builds_each_shape_once():
+    templates = QueryTemplates()
+    builds = []
+
+    @templates.shape("example")
+    def build(kind, count):
+        builds.append((kind, count))
+        return f"MATCH (n:{kind}) RETURN {'count(n)' if count else 'n'}"
+
+    assert build("Unit", True) == build("Unit", True)
+    build("Unit", False)
+
+    assert builds == [("Unit", True), ("Unit", False)]
+    assert templates.stats() == {
+        "constants": 0, "shapes": 2, "hits": 1, "misses": 2}
+
+
+def test_registry_catalogues_constants():
+    templates = QueryTemplates()
+    templates.register("example.constant", "RETURN 1")
+    templates.clear()
+
+    assert templates.catalogue() == {("example.constant", ()): "RETURN 1"}
+
+
+def test_agency_search_reuses_shape_across_values(monkeypatch):
+    queries = []
+    monkeypatch.setattr(
+        "backend.database.models.agency.db.cypher_query",
+        lambda query, params, **kwargs: queries.append(query) or ([], []),
+    )
+
+    Agency.search(query="boston", filters={"hq_state": "MA"})
+    Agency.search(query="chicago", filters={"hq_state": "IL"}, skip=25)
+    Agency.search(filters={"hq_state": ["MA", "IL"]})
+
+    assert queries[0] is queries[1]
+    assert queries[2] != queries[0]
+
+
+def test_iter_uid_pages_walks_pages_after_last_uid():
+    rows = [(f"u-{i}", i) for i in range(5)]
+    calls = []
+
+    def fetch_page(after):
+        calls.append(after)
+        return [row for row in rows if row[0] > after][:2]
+
+    assert list(iter_uid_pages(fetch_page, 2)) == rows
+    assert calls == ["", "u-1", "u-3"]
+
+
+def test_run_uid_batches_pages_after_last_uid():
+    uids = [f"u-{i}" for i in range(5)]
+    calls = []
+
+    def run_batch(after):
+        calls.append(after)
+        page = [uid for uid in uids if uid > after][:2]
+        return [(min(page, default=None), max(page, default=None), len(page))]
+
+    batches = run_uid_batches(run_batch, 2)
+
+    assert [batch["batch_start"] for batch in batches] == ["u-0", "u-2", "u-4"]
+    assert [batch["updated"] for batch in batches] == [2, 2, 1]
+    assert calls == ["", "u-1", "u-3"]
+
+
+def test_rel_query_limit_is_a_parameter():
+    first = _rel_query_cypher(
+        "MATCH (a)-[]-(u:Unit)", (), "u", False, False, None, True)
+    second = _rel_query_cypher(
+        "MATCH (a)-[]-(u:Unit)", (), "u", False, False, None, True)
+
+    assert first is second
+    assert "LIMIT $rel_query_limit" in first
+
+
+def test_explain_query_templates(db_session):
+    """Build every known shape and make sure Neo4j can plan it."""
+    for fulltext, path, mode, projected in product(
+        (None, "name", "rank"), OfficerSearchPath, ("count", "page", "after"),
+        (False, True),
+    ):
+        _officer_search_cypher(fulltext, path, mode, projected)
+    for strategy, mode in product(
+        ("none", "name", "badge", "ambiguous"),
+        ("count", "page", "employment"),
+    ):
+        _unit_officers_query(strategy, mode)
+        _agency_officers_query(strategy, mode)
+    for batch, projected in product((False, True), (False, True)):
+        _unit_profile_query(
+            tuple(UnitQueries.INCLUDE_SPECS), batch, projected)
+        _agency_profile_query(
+            tuple(AgencyQueries.INCLUDE_SPECS), batch, projected)
+    for projected in (False, True):
+        _officer_profiles_query(tuple(OfficerQueries.INCLUDE_SPECS), projected)
+    _officer_metrics_query(tuple(METRIC_SUBQUERIES))
+    for label in VALIDATED_LABELS:
+        _node_validator_query(label)
+    Source.filter_sources(name="example")
+    Agency.search(query="example", filters={"hq_state": "MA"})
+    Agency.search(filters={"hq_state": "MA"}, fields=["uid", "name"])
+
+    for (name, signature), cypher in query_templates.catalogue().items():
+        try:
+            db.cypher_query("EXPLAIN " + cypher)
+        except Exception as e:
+            raise AssertionError(f"{name}{signature} failed to plan: {e}")
+
+
+def test_explain_refresh_queries(db_session):
+    for cypher in (
+        OFFICER_METRICS_IN_DATABASE_QUERY,
+        UNIT_METRICS_IN_DATABASE_QUERY,
+        AGENCY_METRICS_IN_DATABASE_QUERY,
+        DIRTY_OFFICER_METRICS_IN_DATABASE_QUERY,
+        DIRTY_UNIT_METRICS_IN_DATABASE_QUERY,
+        DIRTY_AGENCY_METRICS_IN_DATABASE_QUERY,
+        DIRTY_OFFICER_METRICS_INPUT_QUERY,
+        DIRTY_UNIT_METRICS_INPUT_QUERY,
+        DIRTY_AGENCY_METRICS_INPUT_QUERY,
+        DIRTY_CITY_RICHNESS_INPUT_QUERY,
+        DIRTY_COUNTY_RICHNESS_INPUT_QUERY,
+        OFFICER_ROLLUP_INPUT_QUERY,
+        CITY_ROLLUP_INPUT_QUERY,
+        ALLEGATION_DELTA_QUERY,
+        COMPLAINT_DELTA_QUERY,
+    ):
+        db.cypher_query(
+            "EXPLAIN " + cypher,
+            {
+                "since": datetime.now(),
+                "after": "",
+                "page_size": 500,
+                "batch_size": 500,
+                "metrics_updated_at": datetime.now().isoformat(),
+            })
@@ -0,0 +1,83 @@
+import asyncio
+import threading
+
+from flask import Flask, request
+
+from backend.read_only import ReadOnlyApp
+
+
+def read_app():
+    app = Flask(__name__)
+
+    @app.route("/api/v1/search", methods=["GET", "POST"])
+    def search():
+        return {
+            "query": request.args.get("query"),
+            "thread": threading.current_thread().name,
+        }
+
+    @app.route("/api/v1/auth/login", methods=["GET"])
+    def login():
+        return {}
+
+    return ReadOnlyApp(app, max_threads=2)
+
+
+def call(app, method, path, query_string=b""):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app({
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query_string,
+        "headers": [(b"host", b"localhost")],
+    }, receive, send))
+    start, body = messages
+    return start["status"], body["body"]
+
+
+def test_read_routes_run_on_the_pool():
+    status, body = call(read_app(), "GET", "/api/v1/search", b"query=smith")
+
+    assert status == 200
+    assert b'"query":"smith"' in body.replace(b" ", b"")
+    assert b'"thread":"read' in body.replace(b" ", b"")
+
+
+def test_writes_and_other_routes_are_refused():
+    app = read_app()
+
+    assert call(app, "POST", "/api/v1/search")[0] == 405
+    assert call(app, "GET", "/api/v1/auth/login")[0] == 404
+    assert call(app, "GET", "/api/v1/searches")[0] == 404
+
+
+def test_concurrent_reads_share_the_bounded_pool():
+    app = read_app()
+    threads = set()
+    entered = threading.Barrier(2, timeout=5)
+
+    @app.app.route("/api/v1/officers/slow")
+    def slow():
+        entered.wait()
+        threads.add(threading.current_thread().name)
+        return {}
+
+    async def both():
+        loop = asyncio.get_running_loop()
+        path = "/api/v1/officers/slow"
+        return await asyncio.gather(*(
+            loop.run_in_executor(None, call, app, "GET", path)
+            for _ in range(2)
+        ))
+
+    assert [status for status, _ in asyncio.run(both())] == [200, 200]
+    assert len(threads) == 2
+    assert all(name.startswith("read") for name in threads)
@@ -0,0 +1,112 @@
+import pytest
+from flask import Flask
+from neomodel.sync_.core import TransactionProxy
+
+from backend.database import routing
+from backend.database.pool import create_driver
+
+
+class RecordingDatabase:
+    """Stands in for neomodel's `db`, recording the transactions begun."""
+
+    driver = object()
+
+    def __init__(self):
+        self._active_transaction = None
+        self.begun = []
+        self.ended = []
+
+    @property
+    def read_transaction(self):
+        return TransactionProxy(self, access_mode="READ")
+
+    def begin(self, access_mode=None, **parameters):
+        self.begun.append(access_mode)
+        self._active_transaction = access_mode
+
+    def commit(self):
+        self.ended.append("commit")
+        self._active_transaction = None
+
+    def rollback(self):
+        self.ended.append("rollback")
+        self._active_transaction = None
+
+
+def routed_app(monkeypatch, enabled=True):
+    recording = RecordingDatabase()
+    monkeypatch.setattr(routing, "db", recording)
+    app = Flask(__name__)
+    app.config["GRAPH_ROUTING"] = enabled
+    return app, recording
+
+
+def test_read_only_helpers_run_in_a_read_transaction(monkeypatch):
+    app, recording = routed_app(monkeypatch)
+
+    @routing.read_only
+    def fetch():
+        return recording._active_transaction
+
+    with app.app_context():
+        assert fetch() == "READ"
+    assert recording.begun == ["READ"]
+    assert recording.ended == ["commit"]
+
+
+def test_read_only_helper_joins_an_open_transaction(monkeypatch):
+    app, recording = routed_app(monkeypatch)
+    recording._active_transaction = "WRITE"
+
+    @routing.read_only
+    def fetch():
+        return recording._active_transaction
+
+    with app.app_context():
+        assert fetch() == "WRITE"
+    assert recording.begun == []
+
+
+def test_failed_read_is_rolled_back(monkeypatch):
+    app, recording = routed_app(monkeypatch)
+
+    @routing.read_only
+    def fetch():
+        raise RuntimeError("boom")
+
+    with app.app_context(), pytest.raises(RuntimeError):
+        fetch()
+    assert recording.ended == ["rollback"]
+
+
+def test_read_routing_is_off_by_default(monkeypatch):
+    app, recording = routed_app(monkeypatch, enabled=False)
+
+    @routing.read_only
+    def fetch():
+        return recording._active_transaction
+
+    with app.app_context():
+        assert fetch() is None
+    assert fetch() is None
+    assert recording.begun == []
+
+
+@pytest.mark.parametrize(("enabled", "driver_class"), [
+    (True, "Neo4jDriver"),
+    (False, "BoltDriver"),
+])
+def test_driver_scheme_follows_routing_switch(enabled, driver_class):
+    driver = create_driver({
+        "GRAPH_NM_URI": "localhost:7687",
+        "GRAPH_USER": "neo4j",
+        "GRAPH_PASSWORD": "password",
+        "GRAPH_POOL_SIZE": 10,
+        "GRAPH_POOL_ACQUISITION_TIMEOUT": 5,
+        "GRAPH_POOL_MAX_LIFETIME": 60,
+        "GRAPH_POOL_KEEP_ALIVE": True,
+        "GRAPH_ROUTING": enabled,
+    })
+
+    assert type(driver).__name__ == driver_class
+    driver.close()
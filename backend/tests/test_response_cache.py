@@ -0,0 +1,207 @@
+import pytest
+from flask import Flask
+
+from backend.services.location_cache_service import LocationCacheService
+from backend.services.location_service import LocationService
+from backend.services.response_cache import (
+    LocalCacheBackend,
+    ResponseCache,
+    cache_key,
+    response_cache,
+)
+from backend.services.unit_cache_service import UnitCacheService
+from backend.services.unit_service import UnitService
+
+
+class StubLocationQueries:
+    def __init__(self):
+        self.calls = 0
+
+    def count_matching_states(self, *, term):
+        self.calls += 1
+        return 1
+
+    def fetch_matching_states(self, *, term, skip, limit):
+        return [("state-ma", "Massachusetts", "MA")]
+
+
+@pytest.fixture
+def enabled_cache(monkeypatch):
+    monkeypatch.setattr(response_cache, "enabled", True)
+    monkeypatch.setattr(response_cache, "backend", LocalCacheBackend())
+    monkeypatch.setattr(response_cache, "hits", 0)
+    monkeypatch.setattr(response_cache, "misses", 0)
+    yield response_cache
+
+
+def test_local_backend_evicts_least_recently_used():
+    backend = LocalCacheBackend(max_entries=2)
+    backend.set("a", "1", 60, ["uid:a"])
+    backend.set("b", "2", 60, ["uid:b"])
+    backend.get("a")
+    backend.set("c", "3", 60, ["uid:c"])
+
+    assert backend.get("a") == "1"
+    assert backend.get("b") is None
+    assert backend.invalidate(["uid:b"]) == 0
+
+
+def test_local_backend_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(
+        "backend.services.response_cache.time.monotonic", lambda: now[0])
+    backend = LocalCacheBackend()
+    backend.set("a", "1", 10, [])
+
+    assert backend.get("a") == "1"
+    now[0] += 11
+    assert backend.get("a") is None
+
+
+def test_cache_key_normalizes_params():
+    first = cache_key(
+        "unit.profile",
+        {"uid": " u-1 ", "includes": ["officers", "sources"]},
+        unordered=("includes",),
+    )
+    second = cache_key(
+        "unit.profile",
+        {"uid": "u-1", "includes": ["sources", "officers", "sources"]},
+        unordered=("includes",),
+    )
+
+    assert first == second
+    assert first != cache_key(
+        "agency.profile", {"uid": "u-1", "includes": ["officers", "sources"]},
+        unordered=("includes",))
+
+
+def test_cached_serves_repeat_calls_until_invalidated():
+    cache = ResponseCache()
+    calls = []
+
+    @cache.cached("example", ttl=60, labels=("Officer",))
+    def get_profile(uid, includes):
+        calls.append(uid)
+        return {"uid": uid, "agency": {"uid": "agency-1"}}
+
+    assert get_profile("o-1", []) == get_profile("o-1", [])
+    assert calls == ["o-1"]
+
+    assert cache.invalidate_node("agency-1") == 1
+    get_profile("o-1", [])
+    assert cache.invalidate_node("other", ["Officer"]) == 1
+    get_profile("o-1", [])
+    assert calls == ["o-1", "o-1", "o-1"]
+    assert cache.stats() == {"hits": 1, "misses": 3}
+
+
+def test_cached_skips_errors_and_non_200_results():
+    cache = ResponseCache()
+    calls = []
+
+    @cache.cached("example", ttl=60)
+    def search(term):
+        calls.append(term)
+        if term == "missing":
+            raise ValueError("not found")
+        return {"message": "Page number exceeds total results"}, 400
+
+    for _ in range(2):
+        assert search("boston") == (
+            {"message": "Page number exceeds total results"}, 400)
+        with pytest.raises(ValueError):
+            search("missing")
+
+    assert calls == ["boston", "missing", "boston", "missing"]
+
+
+def test_list_states_is_cached(enabled_cache):
+    queries = StubLocationQueries()
+    service = LocationService(queries=queries)
+
+    first = service.list_states(term="mass")
+    second = service.list_states(term=" mass ", page=1)
+
+    assert first == second
+    assert first[1] == 200
+    assert queries.calls == 1
+
+
+class StubLocationCacheQueries:
+    def iter_city_richness_inputs(self, **kwargs):
+        return iter(())
+
+    def iter_county_richness_inputs(self, **kwargs):
+        return iter(())
+
+    def fetch_last_city_refresh(self):
+        return None
+
+    def fetch_last_county_refresh(self):
+        return None
+
+    def touch_labels(self, labels):
+        return None
+
+
+def test_location_refresh_invalidates_cached_lists(enabled_cache):
+    queries = StubLocationQueries()
+    service = LocationService(queries=queries)
+    service.list_states(term="mass")
+
+    stub = StubLocationCacheQueries()
+    LocationCacheService(
+        queries=stub, change_queries=stub
+    ).refresh_location_richness_cache()
+    service.list_states(term="mass")
+
+    assert queries.calls == 2
+
+
+class StubUnitCacheQueries:
+    def iter_unit_metrics_inputs(self, **kwargs):
+        return iter([("u-1", 1, 1, 1, {}, [])])
+
+    def update_unit_metrics_cache(self, updates):
+        return len(updates)
+
+    def touch_labels(self, labels):
+        return None
+
+
+def test_unit_refresh_invalidates_cached_searches(enabled_cache):
+    calls = []
+
+    @response_cache.cached("example.search", ttl=60, labels=("Unit",))
+    def search(term):
+        calls.append(term)
+        return {"results": []}
+
+    search("boston")
+    stub = StubUnitCacheQueries()
+    UnitCacheService(
+        queries=stub, change_queries=stub
+    ).refresh_unit_metrics_cache()
+    search("boston")
+
+    assert calls == ["boston", "boston"]
+
+
+def test_cache_is_off_without_a_shared_backend():
+    cache = ResponseCache()
+    cache.init_app(Flask(__name__))
+    assert cache.enabled is False
+
+
+def test_add_change_invalidates_cached_profile(
+        enabled_cache, example_unit, example_source, add_test_change):
+    service = UnitService()
+    service.get_unit(uid=example_unit.uid, includes=[])
+    service.get_unit(uid=example_unit.uid, includes=[])
+    assert enabled_cache.hits == 1
+
+    add_test_change(example_unit, example_source)
+    service.get_unit(uid=example_unit.uid, includes=[])
+
+    assert enabled_cache.hits == 1
@@ -3,7 +3,26 @@ import pytest
 
 @pytest.mark.parametrize(
     ("page", "expected_status_code"),
-    [("/", 200), ("/api/v1/healthcheck", 200)],
+    [
+        ("/", 200),
+        ("/api/v1/healthcheck", 200),
+        ("/api/v1/healthcheck/pool", 401),
+        ("/api/v1/healthcheck/cache", 401),
+    ],
 )
 def test_simple_routes(client, page, expected_status_code):
     assert client.get(page).status_code == expected_status_code
+
+
+@pytest.mark.parametrize(
+    ("token", "expected_status_code"),
+    [("access_token", 403), ("admin_access_token", 200)],
+)
+def test_pool_healthcheck_is_admin_only(
+        client, request, token, expected_status_code):
+    res = client.get(
+        "/api/v1/healthcheck/pool",
+        headers={
+            "Authorization": f"Bearer {request.getfixturevalue(token)}"},
+    )
+    assert res.status_code == expected_status_code
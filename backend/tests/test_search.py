@@ -1,6 +1,8 @@
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import pytest
+from flask import Flask
 
 from backend.database.models.agency import Agency, Unit
 from backend.database.models.infra.locations import (
@@ -10,7 +12,13 @@ from backend.database.models.infra.locations import (
 )
 from backend.database.models.officer import Officer
 from backend.database.models.source import Source
-from backend.queries.search import SearchQueries
+from backend.queries import search as search_module
+from backend.routes import search as search_routes
+from backend.queries.search import CountStrategy, SearchQueries
+from backend.dto.common import decode_cursor, encode_cursor
+from backend.dto.search import SearchQueryParams
+from backend.schemas import add_pagination_wrapper, keyset_params
+from backend.services.search_service import SearchService
 
 
 search_queries = SearchQueries()
@@ -482,6 +490,295 @@ def test_search_uses_latest_change_source(
     assert officer_result["last_updated"] is not None
 
 
+def test_fused_search_matches_legacy_search(
+        db_session, example_officer, example_agency, example_unit):
+    kwargs = {"query": "example", "page": 1, "per_page": 10}
+
+    fused = SearchService().search_text(**kwargs)
+    legacy = SearchService(fused=False).search_text(**kwargs)
+
+    assert fused == legacy
+    assert fused[1] == 200
+
+
+class StubFusedSearchQueries(SearchQueries):
+    def __init__(self, total, approximate=False):
+        super().__init__()
+        self.total = total
+        self.approximate = approximate
+        self.calls = []
+
+    def fetch_search_page(self, **kwargs):
+        self.calls.append(("fetch_search_page", kwargs))
+        return (
+            self.total,
+            self.approximate,
+            [],
+            {"Officer": {}, "Agency": {}, "Unit": {}},
+        )
+
+    def count_search_results(self, **kwargs):
+        raise AssertionError("fused search must not run the count query")
+
+    def fetch_search_results(self, **kwargs):
+        raise AssertionError("fused search must not run the results query")
+
+    def fetch_search_details(self, **kwargs):
+        raise AssertionError("fused search must not run the details query")
+
+
+def test_fused_search_uses_single_query():
+    queries = StubFusedSearchQueries(total=0)
+    service = SearchService(queries=queries)
+
+    response, status = service.search_text(query="john", page=1, per_page=5)
+
+    assert status == 200
+    assert response == {"message": "No results found matching the query"}
+    assert [name for name, _ in queries.calls] == ["fetch_search_page"]
+
+
+def test_fused_search_rejects_page_past_end():
+    service = SearchService(queries=StubFusedSearchQueries(total=5))
+
+    response, status = service.search_text(query="john", page=2, per_page=5)
+
+    assert status == 400
+    assert response == {"message": "Page number exceeds total results"}
+
+
+def test_approximate_search_rejects_empty_page():
+    service = SearchService(
+        queries=StubFusedSearchQueries(total=1000, approximate=True)
+    )
+
+    response, status = service.search_text(query="john", page=3, per_page=5)
+
+    assert status == 400
+    assert response == {"message": "Page number exceeds total results"}
+
+
+def test_capped_count_reports_lower_bound(monkeypatch):
+    queries = SearchQueries(count_strategy=CountStrategy.CAPPED, count_cap=10)
+    calls = []
+
+    def fake_cypher_query(query, params):
+        calls.append(params)
+        return [[params["count_limit"]]], ["totalMatches"]
+
+    monkeypatch.setattr(
+        "backend.queries.search.db.cypher_query", fake_cypher_query
+    )
+
+    assert queries.count_search_matches(
+        query="john", page=1, per_page=5
+    ) == (10, True)
+    assert queries.count_search_matches(
+        query="john", page=4, per_page=5
+    ) == (20, True)
+    assert [params["count_limit"] for params in calls] == [11, 21]
+
+
+def test_fused_search_limits_before_collecting(monkeypatch):
+    query = search_module.SEARCH_PAGE_FUSED_QUERY
+    assert query.index("LIMIT $per_page + 1") < query.index(
+        "collect({node: node")
+
+    calls = []
+
+    def fake_cypher_query(query, params):
+        calls.append(query)
+        return [[None, True, [["node", 1.0, 0]], [], [], []]], []
+
+    monkeypatch.setattr(
+        "backend.queries.search.db.cypher_query", fake_cypher_query
+    )
+
+    results, _details, has_more = SearchQueries().fetch_search_page_after(
+        query="john", after=[0, 1.0, "uid"], per_page=1
+    )
+
+    assert calls == [search_module.SEARCH_PAGE_FUSED_QUERY]
+    assert results == [["node", 1.0, 0]]
+    assert has_more is True
+
+
+def test_fused_search_queries_the_indexes_once(monkeypatch):
+    assert search_module.SEARCH_FUSED_QUERY.count(
+        "db.index.fulltext.queryNodes('officerNames'") == 1
+
+    queries = SearchQueries(count_strategy=CountStrategy.CAPPED, count_cap=10)
+    calls = []
+
+    def fake_cypher_query(query, params):
+        calls.append(query)
+        return [[25, True, [["node", 1.0, 0]], [], [], []]], []
+
+    monkeypatch.setattr(
+        "backend.queries.search.db.cypher_query", fake_cypher_query
+    )
+
+    total, approximate, results, _details = queries.fetch_search_page(
+        query="john", page=1, per_page=5)
+
+    assert calls == [search_module.SEARCH_FUSED_QUERY]
+    assert (total, approximate) == (10, True)
+    assert results == [["node", 1.0, 0]]
+
+
+def test_cached_count_reuses_total_until_ttl(monkeypatch):
+    queries = SearchQueries(count_strategy=CountStrategy.CACHED)
+    calls = []
+
+    def fake_cypher_query(query, params):
+        calls.append(params)
+        return [[42]], ["totalMatches"]
+
+    monkeypatch.setattr(
+        "backend.queries.search.db.cypher_query", fake_cypher_query
+    )
+
+    first = queries.count_search_matches(
+        query="john", page=1, per_page=5, city_uids=["b", "a"]
+    )
+    second = queries.count_search_matches(
+        query="john", page=2, per_page=10, city_uids=["a", "b"]
+    )
+
+    assert first == second == (42, False)
+    assert len(calls) == 1
+
+    queries.count_cache_ttl = 0
+    queries.clear_count_cache()
+    queries.count_search_matches(query="john", page=1, per_page=5)
+    queries.count_search_matches(query="john", page=1, per_page=5)
+    assert len(calls) == 3
+
+
+def test_count_cache_is_safe_across_threads():
+    queries = SearchQueries(
+        count_strategy=CountStrategy.CACHED, count_cache_size=8
+    )
+
+    def fill(offset):
+        for i in range(500):
+            params = {
+                "query": f"q{offset + i}",
+                "city_uids": [],
+                "source_uids": [],
+            }
+            queries._set_cached_count(params, i, False)
+            queries._get_cached_count(params)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for future in [pool.submit(fill, n * 1000) for n in range(8)]:
+            future.result()
+
+    assert len(queries._count_cache) <= 8
+
+
+def test_pagination_wrapper_flags_approximate_total():
+    response = add_pagination_wrapper(
+        [{"uid": "a"}],
+        total=1000,
+        page_number=60,
+        per_page=20,
+        approximate=True,
+    )
+
+    assert response["total"] == 1000
+    assert response["page"] == 60
+    assert response["total_approximate"] is True
+
+
+class StubNode(dict):
+    labels = frozenset()
+
+
+class StubCursorSearchQueries(SearchQueries):
+    def __init__(self, results, has_more):
+        super().__init__()
+        self.results = results
+        self.has_more = has_more
+        self.calls = []
+
+    def fetch_search_page_after(self, **kwargs):
+        self.calls.append(("fetch_search_page_after", kwargs))
+        return (
+            self.results,
+            {"Officer": {}, "Agency": {}, "Unit": {}},
+            self.has_more,
+        )
+
+    def fetch_search_page(self, **kwargs):
+        raise AssertionError("cursor search must not count or skip")
+
+
+def test_cursor_search_resumes_after_sort_key():
+    node = StubNode(uid="agency-2")
+    queries = StubCursorSearchQueries(
+        results=[(node, 1.5, 2)], has_more=True)
+    service = SearchService(queries=queries)
+
+    response, status = service.search_text(
+        query="agency",
+        page=1,
+        per_page=1,
+        after=[1, 2.0, "agency-1"],
+    )
+
+    assert status == 200
+    assert "total" not in response
+    assert decode_cursor(response["next_cursor"]) == [2, 1.5, "agency-2"]
+    assert queries.calls[0][1]["after"] == [1, 2.0, "agency-1"]
+
+
+def test_cursor_search_ends_without_next_cursor():
+    service = SearchService(
+        queries=StubCursorSearchQueries(results=[], has_more=False))
+
+    response, status = service.search_text(
+        query="agency", page=1, per_page=1, after=[1, 2.0, "agency-1"])
+
+    assert status == 200
+    assert response["next_cursor"] is None
+
+
+def test_cursor_search_rejects_foreign_cursor():
+    service = SearchService(
+        queries=StubCursorSearchQueries(results=[], has_more=False))
+
+    response, status = service.search_text(
+        query="agency", page=1, per_page=1, after=["agency-1"])
+
+    assert status == 400
+    assert response == {"message": "Invalid cursor"}
+
+
+def test_cursor_round_trips_sort_key():
+    token = encode_cursor(0, 3.25, "officer-uid")
+
+    assert "=" not in token
+    assert decode_cursor(token) == [0, 3.25, "officer-uid"]
+
+
+@pytest.mark.parametrize("token", ["not-a-cursor", encode_cursor()])
+def test_search_params_reject_malformed_cursor(token):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        SearchQueryParams(term="john", cursor=token)
+
+
+def test_keyset_params_match_listing_order():
+    assert keyset_params(None, ranked=True) == {
+        "after_score": None, "after_uid": None}
+    assert keyset_params([1.5, "a"], ranked=True) == {
+        "after_score": 1.5, "after_uid": "a"}
+    assert keyset_params(["a"], ranked=False) == {
+        "after_score": None, "after_uid": "a"}
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        keyset_params(["a"], ranked=True)
+
+
 def test_build_fulltext_query_applies_prefix_wildcards():
     assert search_queries.build_fulltext_query("john doe") == "john* doe*"
 
@@ -515,3 +812,19 @@ def test_tokenize_query_strips_reserved_characters_and_operators():
         "unit",
         "test",
     ]
+
+
+def test_search_route_counts_exactly_unless_configured():
+    strategy = search_routes.search_service.queries.count_strategy
+    try:
+        Flask(__name__).register_blueprint(search_routes.bp)
+        assert search_routes.search_service.queries.count_strategy == (
+            CountStrategy.EXACT)
+
+        app = Flask(__name__)
+        app.config["SEARCH_COUNT_STRATEGY"] = "capped"
+        app.register_blueprint(search_routes.bp)
+        assert search_routes.search_service.queries.count_strategy == (
+            CountStrategy.CAPPED)
+    finally:
+        search_routes.search_service.queries.count_strategy = strategy
@@ -0,0 +1,119 @@
+from datetime import datetime, timezone
+from threading import Lock
+from uuid import uuid4
+
+import pytest
+
+from backend.services.sharded_refresh import (
+    merge_refresh_results,
+    run_sharded,
+    shard_bounds,
+)
+from backend.services.unit_cache_service import UnitCacheService
+
+LAST_REFRESH = datetime(2024, 5, 1, tzinfo=timezone.utc)
+
+
+class AdvancingUnitCacheQueries:
+    """Moves the last refresh forward as soon as a shard writes."""
+
+    def __init__(self):
+        self.last_refresh = LAST_REFRESH
+        self.since_calls = []
+        self.touched_labels = []
+        self.lock = Lock()
+
+    def fetch_last_refresh(self):
+        return self.last_refresh
+
+    def iter_unit_metrics_inputs(
+            self, *, page_size, since, after="", until=None):
+        with self.lock:
+            self.since_calls.append(since)
+        return iter([(f"{after}-u", 1, 1, 1, {}, [])])
+
+    def update_unit_metrics_cache(self, updates):
+        self.last_refresh = datetime.fromisoformat(
+            updates[0]["metrics_updated_at"])
+        return len(updates)
+
+    def touch_labels(self, labels):
+        self.touched_labels.extend(labels)
+
+
+def test_shard_bounds_cover_the_uid_space():
+    assert shard_bounds(1) == [("", None)]
+    assert shard_bounds(4) == [
+        ("", "4000"), ("4000", "8000"), ("8000", "c000"), ("c000", None)]
+    with pytest.raises(ValueError):
+        shard_bounds(0)
+
+
+def test_run_sharded_refreshes_every_uid_once():
+    uids = [uuid4().hex for _ in range(200)] + ["custom-uid", "Z-1"]
+    refreshed = []
+
+    def refresh(*, batch_size, after="", until=None):
+        shard = [
+            uid for uid in uids
+            if uid > after and (until is None or uid <= until)
+        ]
+        refreshed.extend(shard)
+        return {
+            "units_seen": len(shard),
+            "units_updated": len(shard),
+            "metrics_updated_at": f"2024-05-01T00:00:0{len(shard) % 10}",
+            "mode": "full",
+            "batches": [
+                {"batch_start": min(shard), "updated": len(shard)}],
+        }
+
+    result = run_sharded(
+        refresh, 4, last_refresh=lambda: None, batch_size=50)
+
+    assert sorted(refreshed) == sorted(uids)
+    assert result["units_seen"] == len(uids)
+    assert result["mode"] == "full"
+    assert len(result["batches"]) == 4
+
+
+def test_run_sharded_gives_every_shard_the_same_since():
+    queries = AdvancingUnitCacheQueries()
+    service = UnitCacheService(queries=queries, change_queries=queries)
+
+    result = run_sharded(
+        service.refresh_unit_metrics_cache,
+        4,
+        last_refresh=queries.fetch_last_refresh,
+        incremental=True,
+    )
+
+    assert queries.last_refresh > LAST_REFRESH
+    assert queries.since_calls == [LAST_REFRESH] * 4
+    assert result["mode"] == "incremental"
+
+
+def test_run_sharded_runs_in_full_without_a_previous_refresh():
+    queries = AdvancingUnitCacheQueries()
+    queries.last_refresh = None
+    service = UnitCacheService(queries=queries, change_queries=queries)
+
+    result = run_sharded(
+        service.refresh_unit_metrics_cache,
+        2,
+        last_refresh=queries.fetch_last_refresh,
+        incremental=True,
+    )
+
+    assert queries.since_calls == [None, None]
+    assert result["mode"] == "full"
+
+
+def test_merge_refresh_results_keeps_earliest_timestamp():
+    merged = merge_refresh_results([
+        {"cities_seen": 2, "richness_updated_at": "2024-05-01T00:00:02"},
+        {"cities_seen": 3, "richness_updated_at": "2024-05-01T00:00:01"},
+    ])
+
+    assert merged == {
+        "cities_seen": 5, "richness_updated_at": "2024-05-01T00:00:01"}
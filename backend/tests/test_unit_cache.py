@@ -1,28 +1,62 @@
+from datetime import datetime
+
 from backend.services.unit_cache_service import UnitCacheService
 
+SUMMARY = {
+    "types": ["Force"],
+    "occurrences": [2],
+    "substantiated": [1],
+    "earliest": ["2020-01-01"],
+    "latest": [""],
+}
+TOP = ["o-1"]
+
 
 class StubUnitCacheQueries:
-    def __init__(self, rows):
+    def __init__(self, rows, dirty_rows=(), last_refresh=None):
         self.rows = rows
+        self.dirty_rows = list(dirty_rows)
+        self.last_refresh = last_refresh
+        self.since_calls = []
         self.update_calls = []
+        self.touched_labels = []
+
+    def iter_unit_metrics_inputs(
+            self, *, page_size, since, after="", until=None):
+        if since is None:
+            return iter(self.rows)
+        self.since_calls.append(since)
+        return iter(self.dirty_rows)
 
-    def fetch_unit_metrics_inputs(self):
-        return self.rows
+    def fetch_last_refresh(self):
+        return self.last_refresh
+
+    def refresh_unit_metrics_in_database(
+            self, *, batch_size, metrics_updated_at, since, after="",
+            until=None):
+        self.since_calls.append(since)
+        return [
+            {"batch_start": "u-1", "updated": batch_size, "elapsed_ms": 12},
+            {"batch_start": "u-3", "updated": 1, "elapsed_ms": 3},
+        ]
 
     def update_unit_metrics_cache(self, updates):
         self.update_calls.append(updates)
         return len(updates)
 
+    def touch_labels(self, labels):
+        self.touched_labels.extend(labels)
+
 
 def test_refresh_unit_metrics_cache_batches_updates():
     queries = StubUnitCacheQueries(
         [
-            ("u-1", 10, 4, 7),
-            ("u-2", 3, 1, 2),
-            ("u-3", 0, 0, 0),
+            ("u-1", 10, 4, 7, SUMMARY, TOP),
+            ("u-2", 3, 1, 2, SUMMARY, TOP),
+            ("u-3", 0, 0, 0, SUMMARY, TOP),
         ]
     )
-    service = UnitCacheService(queries=queries)
+    service = UnitCacheService(queries=queries, change_queries=queries)
 
     result = service.refresh_unit_metrics_cache(batch_size=2)
 
@@ -35,6 +69,8 @@ def test_refresh_unit_metrics_cache_batches_updates():
             "officer_count_cached": 10,
             "complaint_count_cached": 4,
             "allegation_count_cached": 7,
+            "allegation_summary": SUMMARY,
+            "reported_officer_uids": TOP,
             "metrics_updated_at": result["metrics_updated_at"],
         },
         {
@@ -42,6 +78,8 @@ def test_refresh_unit_metrics_cache_batches_updates():
             "officer_count_cached": 3,
             "complaint_count_cached": 1,
             "allegation_count_cached": 2,
+            "allegation_summary": SUMMARY,
+            "reported_officer_uids": TOP,
             "metrics_updated_at": result["metrics_updated_at"],
         },
     ]
@@ -51,6 +89,62 @@ def test_refresh_unit_metrics_cache_batches_updates():
             "officer_count_cached": 0,
             "complaint_count_cached": 0,
             "allegation_count_cached": 0,
+            "allegation_summary": SUMMARY,
+            "reported_officer_uids": TOP,
             "metrics_updated_at": result["metrics_updated_at"],
         },
     ]
+    assert queries.touched_labels == ["Unit"]
+
+
+def test_refresh_unit_metrics_cache_incremental():
+    last_refresh = datetime(2024, 5, 1, 3, 0)
+    queries = StubUnitCacheQueries(
+        [],
+        dirty_rows=[("u-2", 3, 1, 2, SUMMARY, TOP)],
+        last_refresh=last_refresh,
+    )
+    service = UnitCacheService(queries=queries, change_queries=queries)
+
+    result = service.refresh_unit_metrics_cache(incremental=True)
+
+    assert queries.since_calls == [last_refresh]
+    assert result["units_seen"] == 1
+    assert result["mode"] == "incremental"
+    assert queries.update_calls[0][0]["unit_uid"] == "u-2"
+
+
+def test_first_incremental_unit_refresh_is_full():
+    queries = StubUnitCacheQueries([("u-2", 3, 1, 2, SUMMARY, TOP)])
+    service = UnitCacheService(queries=queries, change_queries=queries)
+
+    result = service.refresh_unit_metrics_cache(incremental=True)
+
+    assert queries.since_calls == []
+    assert result["mode"] == "full"
+
+
+def test_refresh_unit_metrics_cache_in_database_reports_batches():
+    queries = StubUnitCacheQueries([])
+    service = UnitCacheService(queries=queries, change_queries=queries)
+
+    result = service.refresh_unit_metrics_cache_in_database(batch_size=2)
+
+    assert queries.since_calls == [None]
+    assert result["units_updated"] == 3
+    assert [batch["elapsed_ms"] for batch in result["batches"]] == [12, 3]
+    assert queries.touched_labels == ["Unit"]
+
+
+def test_refresh_unit_metrics_in_database_writes_counts(example_unit):
+    result = UnitCacheService().refresh_unit_metrics_cache_in_database(
+        batch_size=1)
+    example_unit.refresh()
+
+    assert result["units_updated"] == len(result["batches"])
+    assert example_unit.officer_count_cached == 0
+    assert example_unit.metrics_updated_at is not None
+    assert example_unit.allegation_types_cached == []
+    assert example_unit.allegation_summary_updated_at is not None
+    assert example_unit.reported_officer_uids_cached == []
+    assert example_unit.ranking_updated_at is not None
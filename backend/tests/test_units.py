@@ -1,10 +1,11 @@
 from __future__ import annotations
 import math
 import pytest
-from datetime import date
+from datetime import date, datetime, timezone
 from backend.database import (
     Unit
 )
+from backend.services.unit_cache_service import UnitCacheService
 
 
 mock_units = {
@@ -82,6 +83,19 @@ def test_get_all_units(client, example_units, access_token):
     assert res.json["results"].__len__() == total_units
 
 
+def test_unit_list_etag_follows_metrics_refresh(
+        client, example_unit, access_token):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    etag = client.get("/api/v1/units", headers=headers).headers["ETag"]
+
+    UnitCacheService().refresh_unit_metrics_cache()
+    res = client.get(
+        "/api/v1/units", headers={**headers, "If-None-Match": etag})
+
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
+
+
 def test_get_search_result(client, example_unit, access_token):
     expected_ct = Unit.nodes.filter(
         name__icontains='Precinct 1'
@@ -130,3 +144,171 @@ def test_unit_pagination(client, example_units, access_token):
     )
     assert res.status_code == 400
     assert res.json == {"message": "Page number exceeds total results"}
+
+
+def test_unit_cursor_pagination(client, example_units, access_token):
+    expected = sorted(unit.uid for unit in Unit.nodes.all())
+    seen = []
+    cursor = None
+
+    while True:
+        query_string = {"per_page": 1}
+        if cursor:
+            query_string["cursor"] = cursor
+        res = client.get(
+            "/api/v1/units",
+            query_string=query_string,
+            headers={"Authorization": "Bearer {0}".format(access_token)},
+        )
+        assert res.status_code == 200
+        seen.extend(unit["uid"] for unit in res.json["results"])
+        cursor = res.json.get("next_cursor")
+        if not cursor:
+            break
+
+    assert seen == expected
+
+
+def test_get_unit_batch(client, example_units, access_token):
+    uids = [
+        example_units["unit_charlie"].uid,
+        "missing-unit",
+        example_units["unit_alpha"].uid,
+        example_units["unit_charlie"].uid,
+    ]
+
+    res = client.get(
+        "/api/v1/units/batch",
+        query_string={"uid": uids},
+        headers={"Authorization": "Bearer {0}".format(access_token)},
+    )
+
+    assert res.status_code == 200
+    assert [u["name"] for u in res.json["results"]] == [
+        "Unit Charlie", "Unit Alpha"]
+    assert res.json["missing"] == ["missing-unit"]
+    assert res.json["results"][0]["agency"]["uid"]
+
+
+def test_get_units_with_fields(client, example_units, access_token):
+    res = client.get(
+        "/api/v1/units",
+        query_string={"fields": "name,hq_city"},
+        headers={"Authorization": "Bearer {0}".format(access_token)},
+    )
+
+    assert res.status_code == 200
+    assert {u["name"] for u in res.json["results"]} >= {
+        "Unit Alpha", "Unit Bravo", "Unit Charlie"}
+    for unit in res.json["results"]:
+        assert list(unit) == ["uid", "name", "hq_city"]
+
+
+def test_get_unit_with_fields(client, example_unit, access_token):
+    res = client.get(
+        f"/api/v1/units/{example_unit.uid}",
+        query_string={"fields": "name"},
+        headers={"Authorization": "Bearer {0}".format(access_token)},
+    )
+
+    assert res.status_code == 200
+    assert res.json["uid"] == example_unit.uid
+    assert res.json["name"] == example_unit.name
+    assert "website_url" not in res.json
+    assert res.json["agency"]["uid"]
+
+
+def test_get_units_with_hidden_field(client, access_token):
+    res = client.get(
+        "/api/v1/units",
+        query_string={"fields": "officer_count_cached"},
+        headers={"Authorization": "Bearer {0}".format(access_token)},
+    )
+    assert res.status_code == 400
+
+
+def test_get_unit_falls_back_to_live_counts(
+        app, client, example_unit, example_employment, access_token):
+    example_unit.officer_count_cached = 7
+    example_unit.save()
+    app.config["METRICS_MAX_AGE"] = 3600
+    try:
+        res = client.get(
+            f"/api/v1/units/{example_unit.uid}",
+            query_string={"include": ["officers", "metrics_as_of"]},
+            headers={"Authorization": "Bearer {0}".format(access_token)},
+        )
+    finally:
+        app.config["METRICS_MAX_AGE"] = None
+
+    assert res.status_code == 200
+    assert res.json["total_officers"] == 1
+    assert res.json["metrics_as_of"] is None
+
+
+def test_get_unit_serves_fresh_cached_counts(
+        client, example_unit, example_employment, access_token):
+    example_unit.officer_count_cached = 7
+    example_unit.save()
+
+    res = client.get(
+        f"/api/v1/units/{example_unit.uid}",
+        query_string={"include": ["officers"]},
+        headers={"Authorization": "Bearer {0}".format(access_token)},
+    )
+
+    assert res.status_code == 200
+    assert res.json["total_officers"] == 7
+
+
+def test_get_unit_reads_stored_allegation_summary(
+        client, example_unit, access_token):
+    example_unit.allegation_types_cached = ["Force", "Unknown"]
+    example_unit.allegation_occurrences_cached = [3, 1]
+    example_unit.allegation_substantiated_cached = [1, 0]
+    example_unit.allegation_earliest_cached = ["2020-01-15", ""]
+    example_unit.allegation_latest_cached = ["2022-03-01", ""]
+    example_unit.allegation_summary_updated_at = datetime.now(timezone.utc)
+    example_unit.save()
+
+    res = client.get(
+        f"/api/v1/units/{example_unit.uid}",
+        query_string={"include": "allegations"},
+        headers={"Authorization": "Bearer {0}".format(access_token)},
+    )
+
+    assert res.status_code == 200
+    assert res.json["allegation_summary"] == [
+        {
+            "type": "Force",
+            "occurrences": 3,
+            "substantiated_count": 1,
+            "earliest_incident_date": "2020-01-15",
+            "latest_incident_date": "2022-03-01",
+        },
+        {
+            "type": "Unknown",
+            "occurrences": 1,
+            "substantiated_count": 0,
+            "earliest_incident_date": None,
+            "latest_incident_date": None,
+        },
+    ]
+
+
+def test_get_unit_reads_stored_reported_officers(
+        client, example_unit, example_officer, access_token):
+    example_unit.reported_officer_uids_cached = [example_officer.uid]
+    example_unit.ranking_updated_at = datetime.now(timezone.utc)
+    example_unit.save()
+
+    res = client.get(
+        f"/api/v1/units/{example_unit.uid}",
+        query_string={"include": "reported_officers"},
+        headers={"Authorization": "Bearer {0}".format(access_token)},
+    )
+
+    assert res.status_code == 200
+    assert [
+        officer["uid"] for officer in res.json["most_reported_officers"]
+    ] == [example_officer.uid]